@@ -0,0 +1,229 @@
+# =============================================================================
+# 🗄️ BLOB STORE - เก็บไฟล์ตาม SHA-256 (content-addressed) + reference count
+# =============================================================================
+"""
+Content-addressed upload storage.
+
+Files live at ``uploads/<area>/<ab>/<cd>/<sha256>.<ext>`` — sharded two
+levels deep so no directory grows unbounded — and are still served by the
+``/uploads`` static mount, so stored ``file_path`` / URLs keep working.
+
+Each blob has one ``file_blobs`` document (``_id`` = "<area>:<sha256>") that
+counts the DB documents pointing at it. An identical re-upload only bumps the
+count and moves its temp file over the existing one (same bytes), so one copy
+is kept on disk. Extraction results are cached by content hash separately
+(services/extraction_cache.py).
+
+``release_blob`` never deletes a blob inline. The last release only stamps
+``released_at``. ``BlobCollector`` later removes blobs that have stayed
+unreferenced for ``BLOB_GC_GRACE`` seconds (``collect_blobs``). Deleting
+inline raced with an identical re-upload: the upload could upsert a fresh
+document and keep the on-disk file just before the release unlinked it.
+The sweep deletes the document only while its refcount is still 0. It then
+moves the file aside and restores it if a re-upload recreated the document
+meanwhile (same hash → same bytes).
+
+Files saved before this module existed (flat ``{user_id}_{uuid}`` names) have
+no blob document; ``release_blob`` simply deletes them as before.
+
+Usage:
+    blob = await store_blob(db, file, "resumes", max_size=..., allowed_kinds=PDF_KINDS)
+    blob.path, blob.sha256, blob.deduplicated
+    await release_blob(db, resume["file_path"])
+    await collect_blobs(db)                          # → files removed
+"""
+
+import asyncio
+import logging
+import os
+import posixpath
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from fastapi import UploadFile
+from pymongo import ReturnDocument
+
+from core.indexes import declare_index
+from core.uploads import StoredUpload, remove_quietly, stream_to_temp
+
+logger = logging.getLogger(__name__)
+
+BLOB_COLLECTION = "file_blobs"
+UPLOAD_ROOT = "uploads"
+
+BLOB_GC_INTERVAL = int(os.getenv("BLOB_GC_INTERVAL", "3600"))  # วินาที, 0 = ปิด
+BLOB_GC_GRACE = int(os.getenv("BLOB_GC_GRACE", "3600"))        # วินาทีหลัง release ครั้งสุดท้าย
+
+# Extension follows the sniffed format, so .jpg / .jpeg re-uploads share one blob
+KIND_EXTENSIONS = {"pdf": ".pdf", "jpeg": ".jpg", "png": ".png", "gif": ".gif", "webp": ".webp"}
+
+
+@dataclass
+class StoredBlob(StoredUpload):
+    deduplicated: bool = False
+
+
+# release_blob ค้นหาด้วย path
+declare_index(BLOB_COLLECTION, [("path", 1)], query={"path": "?"}, unique=True)
+
+
+def blob_path(area: str, sha256: str, kind: str) -> str:
+    """Relative, forward-slash path (works as a URL and on every OS)."""
+    return posixpath.join(UPLOAD_ROOT, area, sha256[:2], sha256[2:4], f"{sha256}{KIND_EXTENSIONS[kind]}")
+
+
+def blob_id(area: str, sha256: str) -> str:
+    return f"{area}:{sha256}"
+
+
+def _place(tmp_path: str, dest_path: str) -> bool:
+    """Move the temp file into place (same bytes if the blob exists) → True if it was new."""
+    existed = os.path.exists(dest_path)
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    os.replace(tmp_path, dest_path)
+    return not existed
+
+
+async def store_blob(db, file: UploadFile, area: str, *, max_size: int,
+                     allowed_kinds: Iterable[str]) -> StoredBlob:
+    """Stream ``file`` and store it content-addressed under ``uploads/<area>/``.
+
+    Raises:
+        UploadRejected: see core.uploads.stream_to_temp
+    """
+    tmp = await stream_to_temp(
+        file, posixpath.join(UPLOAD_ROOT, area), max_size=max_size, allowed_kinds=allowed_kinds,
+    )
+    path = blob_path(area, tmp.sha256, tmp.kind)
+    try:
+        await db[BLOB_COLLECTION].update_one(
+            {"_id": blob_id(area, tmp.sha256)},
+            {
+                "$inc": {"refcount": 1},
+                "$set": {"last_used_at": datetime.now(timezone.utc)},
+                "$unset": {"released_at": ""},
+                "$setOnInsert": {
+                    "area": area, "sha256": tmp.sha256, "path": path,
+                    "size": tmp.size, "kind": tmp.kind,
+                    "created_at": datetime.now(timezone.utc),
+                },
+            },
+            upsert=True,
+        )
+        written = await asyncio.to_thread(_place, tmp.path, path)
+    except BaseException:
+        await asyncio.to_thread(remove_quietly, tmp.path)
+        raise
+
+    deduplicated = not written
+    if deduplicated:
+        logger.info(f"[BlobStore] Dedup hit {area}/{tmp.sha256[:12]} ({tmp.size} bytes not written)")
+    return StoredBlob(
+        path=path, size=tmp.size, sha256=tmp.sha256, kind=tmp.kind,
+        deduplicated=deduplicated,
+    )
+
+
+async def release_blob(db, file_path: Optional[str]) -> None:
+    """Drop one reference to ``file_path``; the last one leaves the blob to ``collect_blobs``."""
+    if not file_path:
+        return
+    path = file_path.replace("\\", "/").lstrip("/")
+    blob = await db[BLOB_COLLECTION].find_one_and_update(
+        {"path": path}, {"$inc": {"refcount": -1}}, return_document=ReturnDocument.AFTER,
+    )
+    if blob is None:
+        # Legacy flat upload — owned by exactly one document
+        await asyncio.to_thread(remove_quietly, path)
+        return
+    if blob["refcount"] <= 0:
+        await db[BLOB_COLLECTION].update_one(
+            {"_id": blob["_id"], "refcount": {"$lte": 0}},
+            {"$set": {"released_at": datetime.now(timezone.utc)}},
+        )
+
+
+# =============================================================================
+# GC - ลบ blob ที่ไม่มีใครอ้างถึงเกิน grace period
+# =============================================================================
+
+declare_index(BLOB_COLLECTION, [("released_at", 1)], query={"released_at": {"$lte": "?"}}, sparse=True)
+
+
+def _set_aside(path: str) -> Optional[str]:
+    trash = f"{path}.gc"
+    try:
+        os.replace(path, trash)
+    except FileNotFoundError:
+        return None
+    return trash
+
+
+async def _unlink_unless_reuploaded(db, blob: dict) -> bool:
+    """Remove an unreferenced blob's file; put it back if an upload re-created the blob meanwhile."""
+    trash = await asyncio.to_thread(_set_aside, blob["path"])
+    if trash is None:
+        return False
+    if await db[BLOB_COLLECTION].find_one({"_id": blob["_id"]}, {"_id": 1}):
+        # อัปโหลดไฟล์เดียวกันเข้ามาหลังลบ document — เนื้อหาเหมือนเดิม (hash เดียวกัน) คืนที่เดิม
+        await asyncio.to_thread(os.replace, trash, blob["path"])
+        return False
+    await asyncio.to_thread(remove_quietly, trash)
+    return True
+
+
+async def collect_blobs(db, grace: int = BLOB_GC_GRACE) -> int:
+    """Delete blobs unreferenced for ``grace`` seconds → number of files removed"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+    removed = 0
+    async for blob in db[BLOB_COLLECTION].find({"released_at": {"$lte": cutoff}}, {"path": 1}):
+        # re-check: อาจมีอัปโหลดใหม่อ้างถึง blob นี้หลัง find
+        result = await db[BLOB_COLLECTION].delete_one({"_id": blob["_id"], "refcount": {"$lte": 0}})
+        if result.deleted_count and await _unlink_unless_reuploaded(db, blob):
+            removed += 1
+    if removed:
+        logger.info(f"[BlobStore] Removed {removed} unreferenced blob(s)")
+    return removed
+
+
+class BlobCollector:
+    """Background task: ``collect_blobs`` every ``interval`` seconds"""
+
+    def __init__(self, get_db, interval: int = BLOB_GC_INTERVAL):
+        self.get_db = get_db
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"[BlobStore] Collector every {self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await collect_blobs(self.get_db())
+            except Exception as e:
+                logger.error(f"[BlobStore] Collect failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+_collector: Optional[BlobCollector] = None
+
+
+def get_blob_collector(get_db=None) -> BlobCollector:
+    global _collector
+    if _collector is None:
+        _collector = BlobCollector(get_db)
+    return _collector
+
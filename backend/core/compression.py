@@ -0,0 +1,48 @@
+# =============================================================================
+# 🗜️ COMPRESSION - บีบอัดข้อความยาวก่อนเก็บลง MongoDB (zstd / zlib)
+# =============================================================================
+"""
+Text compression for large stored strings (extracted PDF text).
+
+zstd when the ``zstandard`` package is installed, zlib otherwise. The codec
+name is stored next to the bytes, so documents written with either codec
+stay readable after the dependency is added or removed (reading zstd data
+without ``zstandard`` installed raises).
+
+Usage:
+    codec, data = compress_text(text)
+    text = decompress_text(codec, data)
+"""
+
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+DEFAULT_CODEC = "zstd" if ZSTD_AVAILABLE else "zlib"
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    """UTF-8 encode and compress → ``(codec, data)``."""
+    raw = (text or "").encode("utf-8")
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == "zlib":
+        return codec, zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd-compressed text requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(bytes(data)).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(bytes(data)).decode("utf-8")
+    raise ValueError(f"Unknown codec: {codec}")
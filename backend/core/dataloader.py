@@ -0,0 +1,123 @@
+# =============================================================================
+# 📦 DATALOADER - รวม lookup ทีละ document ให้เป็น $in query เดียวต่อ request
+# =============================================================================
+"""
+Request-scoped batching loader for per-document Mongo lookups.
+
+Routes that walk a list and call ``find_one`` per item (job of each
+application, resume of each applicant, ...) pay one round trip per item.
+``DataLoader.load`` calls issued in the same event-loop tick — e.g. through
+``load_many`` / ``asyncio.gather`` — are coalesced into a single
+``find({field: {"$in": [...]}})`` and the results are cached for the rest
+of the request, so a repeated id never hits the database twice.
+
+One loader per request: ``get_dataloader`` is a FastAPI dependency, and
+FastAPI caches dependencies per request, so every ``Depends(get_dataloader)``
+in the same request shares one instance (and its cache).
+
+Usage:
+    loader: DataLoader = Depends(get_dataloader)
+    jobs = await loader.load_many("jobs", [app["job_id"] for app in applications])
+    resume = await loader.load("resumes", student_id, field="user_id",
+                               projection={"file_path": 1}, sort=[("created_at", -1)])
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from fastapi import Depends
+
+from core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# (collection, field, projection, sort) — loads with the same key share one query
+BatchKey = Tuple[str, str, Optional[Tuple], Optional[Tuple]]
+
+
+def _freeze(value: Optional[Any]) -> Optional[Tuple]:
+    if value is None:
+        return None
+    items = value.items() if isinstance(value, dict) else value
+    return tuple(tuple(item) if isinstance(item, (list, tuple)) else item for item in items)
+
+
+class DataLoader:
+    """Batch + cache ``find`` by id/field for one request"""
+
+    def __init__(self, db):
+        self.db = db
+        self.round_trips = 0
+        self._cache: Dict[Tuple[BatchKey, Any], asyncio.Future] = {}
+        self._pending: Dict[BatchKey, Dict[Any, asyncio.Future]] = {}
+
+    async def load(self, collection: str, value: Any, field: str = "_id",
+                   projection: Optional[Dict[str, int]] = None,
+                   sort: Optional[Sequence[Tuple[str, int]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Document whose ``field`` equals ``value`` (first by ``sort`` when several match), or None.
+
+        ``_id`` values given as strings are converted to ObjectId; invalid ids → None
+        without a query.
+        """
+        if value is None:
+            return None
+        if field == "_id" and not isinstance(value, ObjectId):
+            if not ObjectId.is_valid(str(value)):
+                return None
+            value = ObjectId(str(value))
+
+        key = (collection, field, _freeze(projection), _freeze(sort))
+        future = self._cache.get((key, value))
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._cache[(key, value)] = future
+            batch = self._pending.setdefault(key, {})
+            if not batch:
+                # dispatch หลัง load อื่น ๆ ใน tick เดียวกันลงทะเบียนครบ
+                asyncio.get_running_loop().call_soon(self._schedule, key)
+            batch[value] = future
+        return await asyncio.shield(future)
+
+    async def load_many(self, collection: str, values: Iterable[Any], **kwargs) -> List[Optional[Dict[str, Any]]]:
+        """``load`` for each value concurrently (one query) → documents in the same order"""
+        return list(await asyncio.gather(*(self.load(collection, v, **kwargs) for v in values)))
+
+    def _schedule(self, key: BatchKey) -> None:
+        asyncio.ensure_future(self._dispatch(key))
+
+    async def _dispatch(self, key: BatchKey) -> None:
+        batch = self._pending.pop(key, {})
+        if not batch:
+            return
+        collection, field, projection, sort = key
+        if projection is not None:
+            projection = {**dict(projection), field: 1}
+
+        try:
+            self.round_trips += 1
+            cursor = self.db[collection].find({field: {"$in": list(batch)}}, projection)
+            if sort:
+                cursor = cursor.sort(list(sort))
+            docs = await cursor.to_list(length=None)
+        except Exception as e:
+            logger.error(f"[DataLoader] {collection}.{field} batch of {len(batch)} failed: {e}")
+            for value, future in batch.items():
+                self._cache.pop((key, value), None)  # ให้ลองใหม่ได้
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found: Dict[Any, Dict[str, Any]] = {}
+        for doc in docs:
+            found.setdefault(doc.get(field), doc)  # แรกสุดตาม sort
+        for value, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(value))
+
+
+def get_dataloader(db=Depends(get_database)) -> DataLoader:
+    """FastAPI dependency — one DataLoader per request"""
+    return DataLoader(db)
@@ -0,0 +1,224 @@
+# =============================================================================
+# 📇 INDEXES - ประกาศ index ไว้ข้างโค้ดที่ query และสร้างตอน startup
+# =============================================================================
+"""
+Declared MongoDB indexes, ensured at startup and checked with ``explain()``.
+
+scripts/init_database.py used to create indexes for collections the app no
+longer queries (``job_positions``, ``matching_results``, ...). The live
+collections (``jobs``, ``applications``, ``resumes``, ``certificates``,
+``notifications``) were only indexed if someone ran the right section of the
+script.
+
+Modules now declare the indexes their queries need, next to those queries.
+Each declaration can also name the query it serves:
+
+    declare_index("applications", [("job_id", 1), ("ai_score", -1), ("_id", 1)],
+                  query={"job_id": "?"}, sort=AI_SCORE_DESC)
+
+``IndexManager`` (started from main.py) creates every declared index in a
+background task, so requests are served while indexes build. It then runs
+the declared backfills (``declare_backfill`` — e.g. search tokens for jobs
+written before the field existed) and ``explain()`` on each declared query and logs a warning for any plan that
+still contains a COLLSCAN. ``create_index`` is idempotent. A declaration that
+conflicts with an existing index (same keys, other options) is logged and
+skipped, not dropped.
+
+Declarations run at import time. ``load_declarations()`` imports every module
+in ``INDEX_MODULES``, for scripts that do not import the whole app
+(scripts/init_database.py, scripts/check_indexes.py).
+
+Usage:
+    await ensure_indexes(db)                   # → names of indexes ensured
+    report = await check_query_plans(db)       # → [{"name", "stages", "collscan"}, ...]
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEX_STARTUP = os.getenv("INDEX_STARTUP", "true").lower() == "true"
+
+# modules ที่ประกาศ index (import แล้ว declaration จะลงทะเบียนเอง)
+INDEX_MODULES = (
+    "core.resume_store",
+    "core.blob_store",
+    "services.notification_service",
+    "services.application_stats",
+    "services.cert_cache",
+    "services.job_search",
+    "routes.admin",
+    "routes.company",
+    "routes.certificate",
+    "routes.job",
+)
+
+
+class IndexSpec(NamedTuple):
+    collection: str
+    keys: List[Tuple[str, int]]
+    options: Dict[str, Any]
+    query: Optional[Dict[str, Any]]  # query ตัวอย่างที่ index นี้ต้องรองรับ (สำหรับ explain)
+    sort: Optional[List[Tuple[str, int]]]
+
+    @property
+    def name(self) -> str:
+        return self.options.get("name") or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+_declared: Dict[Tuple[str, str], IndexSpec] = {}
+_backfills: Dict[str, Callable[[Any], Awaitable[int]]] = {}
+
+
+def declare_index(collection: str, keys: Sequence[Tuple[str, int]], query: Optional[Dict[str, Any]] = None,
+                  sort: Optional[Sequence[Tuple[str, int]]] = None, **options) -> IndexSpec:
+    """Register an index (``options`` go to ``create_index``); declaring it twice is harmless"""
+    spec = IndexSpec(collection, list(keys), options, query, list(sort) if sort else None)
+    _declared[(collection, spec.name)] = spec
+    return spec
+
+
+def declared_indexes() -> List[IndexSpec]:
+    return list(_declared.values())
+
+
+def declare_backfill(name: str, backfill: Callable[[Any], Awaitable[int]]) -> None:
+    """Register ``await backfill(db) → documents updated``, run by IndexManager after the indexes"""
+    _backfills[name] = backfill
+
+
+def declared_backfills() -> Dict[str, Callable[[Any], Awaitable[int]]]:
+    return dict(_backfills)
+
+
+async def run_backfills(db) -> Dict[str, int]:
+    """Run every declared backfill → documents updated per name (failures are logged and skipped)"""
+    updated = {}
+    for name, backfill in declared_backfills().items():
+        try:
+            updated[name] = await backfill(db)
+        except Exception as e:
+            logger.warning(f"[Indexes] Backfill {name} failed: {e}")
+    return updated
+
+
+def load_declarations() -> None:
+    """Import every module in ``INDEX_MODULES`` so its declarations are registered"""
+    for module in INDEX_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"[Indexes] Could not import {module}: {e}")
+
+
+async def ensure_indexes(db, specs: Optional[List[IndexSpec]] = None) -> List[str]:
+    """``create_index`` for each spec → names ensured (conflicts are logged and skipped)"""
+    ensured = []
+    for spec in specs if specs is not None else declared_indexes():
+        try:
+            await db[spec.collection].create_index(spec.keys, **spec.options)
+            ensured.append(f"{spec.collection}.{spec.name}")
+        except OperationFailure as e:
+            logger.warning(f"[Indexes] {spec.collection}.{spec.name} not created: {e}")
+    return ensured
+
+
+def plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Stage names of a winning plan tree (classic and slot-based engine layouts)"""
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        for key in ("queryPlan", "inputStage", "winningPlan"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def explain_query(db, spec: IndexSpec) -> Dict[str, Any]:
+    cursor = db[spec.collection].find(spec.query)
+    if spec.sort:
+        cursor = cursor.sort(spec.sort)
+    plan = await cursor.limit(1).explain()
+    stages = plan_stages(plan.get("queryPlanner", {}).get("winningPlan", {}))
+    return {
+        "name": f"{spec.collection}.{spec.name}",
+        "query": spec.query,
+        "sort": spec.sort,
+        "stages": stages,
+        "collscan": "COLLSCAN" in stages,
+    }
+
+
+async def check_query_plans(db, specs: Optional[List[IndexSpec]] = None) -> List[Dict[str, Any]]:
+    """``explain()`` every declared query → one report row each; COLLSCAN plans are logged"""
+    report = []
+    for spec in specs if specs is not None else declared_indexes():
+        if spec.query is None:
+            continue
+        try:
+            row = await explain_query(db, spec)
+        except Exception as e:
+            logger.warning(f"[Indexes] explain failed for {spec.collection}.{spec.name}: {e}")
+            continue
+        if row["collscan"]:
+            logger.warning(f"[Indexes] COLLSCAN: {spec.collection}.find({spec.query}) sort={spec.sort}")
+        report.append(row)
+    return report
+
+
+class IndexManager:
+    """Background task at startup: ensure declared indexes, run backfills, then check query plans"""
+
+    def __init__(self, get_db, enabled: bool = INDEX_STARTUP):
+        self.get_db = get_db
+        self.enabled = enabled
+        self.report: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            load_declarations()
+            db = self.get_db()
+            ensured = await ensure_indexes(db)
+            backfilled = await run_backfills(db)
+            self.report = await check_query_plans(db)
+            collscans = sum(row["collscan"] for row in self.report)
+            logger.info(f"[Indexes] {len(ensured)} indexes ensured, {sum(backfilled.values())} documents backfilled, "
+                        f"{len(self.report)} query plans checked, {collscans} COLLSCAN")
+        except Exception as e:
+            logger.error(f"[Indexes] Startup index check failed: {e}")
+
+
+_manager: Optional[IndexManager] = None
+
+
+def get_index_manager(get_db=None) -> IndexManager:
+    global _manager
+    if _manager is None:
+        _manager = IndexManager(get_db)
+    return _manager
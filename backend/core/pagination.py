@@ -0,0 +1,114 @@
+# =============================================================================
+# 📄 PAGINATION - Keyset (cursor) pagination แทน skip/limit
+# =============================================================================
+"""
+Keyset pagination on an indexed sort key plus ``_id`` as tie-breaker.
+
+``skip(n)`` makes MongoDB walk and discard ``n`` documents, so deep pages get
+slower and slower, and rows shift between pages when data changes. A keyset
+page instead starts right after the last row of the previous page:
+
+    sort [("created_at", -1), ("_id", -1)], last row (t, id) →
+    {"$or": [{"created_at": {"$lt": t}},
+             {"created_at": t, "_id": {"$lt": id}},
+             {"created_at": None}]}          # nulls sort last in a descending sort
+
+The cursor handed to clients is opaque: the last row's sort values plus the
+sort field names, as Extended JSON (keeps datetime / ObjectId types) in
+url-safe base64. A cursor from a different sort is rejected with 400.
+
+Endpoints keep their old ``skip`` / ``page`` parameters. Without a cursor
+they page the old way, but still return the next cursor so clients can switch.
+List endpoints return the cursor in the ``X-Next-Cursor`` header. Object
+endpoints return it as ``next_cursor``.
+
+Usage:
+    page = await keyset_page(db.jobs, query, JOBS_SORT, limit, cursor=cursor, skip=skip)
+    page.items, page.next_cursor
+"""
+
+import base64
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from bson import json_util
+from fastapi import HTTPException, status
+
+SortSpec = Sequence[Tuple[str, int]]  # [(field, ±1), ("_id", ±1)]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CREATED_DESC: SortSpec = [("created_at", -1), ("_id", -1)]
+SUBMITTED_DESC: SortSpec = [("submitted_at", -1), ("_id", -1)]
+AI_SCORE_DESC: SortSpec = [("ai_score", -1), ("_id", 1)]
+
+
+class Page(NamedTuple):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+def _get(doc: Dict[str, Any], field: str) -> Any:
+    for part in field.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    """Cursor pointing just after ``doc`` in ``sort`` order"""
+    payload = {"s": [f for f, _ in sort], "v": [_get(doc, f) for f, _ in sort]}
+    return base64.urlsafe_b64encode(json_util.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """Sort values stored in ``cursor`` → 400 if it is malformed or was made for another sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        if payload["s"] != [f for f, _ in sort] or len(values) != len(sort):
+            raise ValueError("cursor made for another sort")
+        return values
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict[str, Any]:
+    """Filter for rows strictly after ``values`` in ``sort`` order (sort key + unique tie-breaker)"""
+    (field, direction), (tie_field, tie_direction) = sort
+    value, tie = values
+    branches = [{field: value, tie_field: {"$lt" if tie_direction == -1 else "$gt": tie}}]
+    if value is None:
+        # null/missing sort lowest: after them in ascending order come all non-null values
+        if direction == 1:
+            branches.append({field: {"$ne": None}})
+    else:
+        branches.append({field: {"$lt" if direction == -1 else "$gt": value}})
+        if direction == -1:
+            branches.append({field: None})
+    return {"$or": branches}
+
+
+def with_cursor(query: Dict[str, Any], sort: SortSpec, cursor: Optional[str]) -> Dict[str, Any]:
+    """``query`` narrowed to rows after ``cursor`` (unchanged without a cursor)"""
+    if not cursor:
+        return query
+    after = keyset_filter(sort, decode_cursor(cursor, sort))
+    return {"$and": [query, after]} if query else after
+
+
+def page_from(docs: List[Dict[str, Any]], sort: SortSpec, limit: int) -> Page:
+    """``docs`` fetched with ``limit + 1`` → the page and the cursor for the next one"""
+    items = docs[:limit]
+    has_more = len(docs) > limit
+    return Page(items, encode_cursor(items[-1], sort) if has_more and items else None)
+
+
+async def keyset_page(collection, query: Dict[str, Any], sort: SortSpec, limit: int,
+                      cursor: Optional[str] = None, skip: int = 0,
+                      projection: Optional[Dict[str, Any]] = None) -> Page:
+    """One page of ``collection.find(query)`` in ``sort`` order — cursor wins over ``skip``"""
+    cursor_query = collection.find(with_cursor(query, sort, cursor), projection).sort(list(sort))
+    if skip and not cursor:
+        cursor_query = cursor_query.skip(skip)
+    docs = await cursor_query.limit(limit + 1).to_list(length=limit + 1)
+    return page_from(docs, sort, limit)
@@ -0,0 +1,123 @@
+# =============================================================================
+# 📚 RESUME STORE - แยกข้อความ Resume ยาว ๆ ออกจาก document ที่อ่านบ่อย
+# =============================================================================
+"""
+Resume reads without the extracted text.
+
+Matching, recommendations, apply and gap analysis only need
+``extracted_features`` (+ ``cert_llm_analyses``), but a bare
+``db.resumes.find_one`` also pulls ``extracted_text`` — up to 15 KB per read.
+
+Text now lives in ``resume_texts`` (``_id`` = resume ``_id``), compressed with
+core/compression.py, and is loaded only where the text itself is shown or
+re-analyzed. The resume document keeps ``text_length`` for list / status views.
+Resumes written before the split still carry an inline ``extracted_text``;
+``load_resume_text`` reads either (scripts/migrate_resume_texts.py moves them).
+
+Projections:
+    MATCHING_PROJECTION  — features for matching endpoints
+    SUMMARY_PROJECTION   — everything except the text (lists, status, ownership)
+    FILE_PROJECTION      — file_path only (resume PDF links)
+
+Usage:
+    resume = await find_latest_processed_resume(db, user_id)        # matching fields
+    n = await save_resume_text(db, resume_id, text)                  # + $set text_length: n
+    text = await load_resume_text(db, resume)                        # detail view
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from core.compression import compress_text, decompress_text
+from core.indexes import declare_index
+
+RESUME_TEXT_COLLECTION = "resume_texts"
+
+MATCHING_PROJECTION = {
+    "user_id": 1, "status": 1, "uploaded_at": 1,
+    "extracted_features": 1, "extracted_data": 1, "cert_llm_analyses": 1,
+}
+SUMMARY_PROJECTION = {"extracted_text": 0}
+FILE_PROJECTION = {"file_path": 1}
+
+
+def _oid(resume_id: Any) -> ObjectId:
+    return resume_id if isinstance(resume_id, ObjectId) else ObjectId(str(resume_id))
+
+
+def text_length(resume: Dict[str, Any]) -> int:
+    """Length of the extracted text, without loading it."""
+    if "text_length" in resume:
+        return resume["text_length"] or 0
+    return len(resume.get("extracted_text") or "")
+
+
+# -----------------------------------------------------------------------------
+# Text (on demand)
+# -----------------------------------------------------------------------------
+
+def _text_fields(text: str) -> Dict[str, Any]:
+    codec, data = compress_text(text or "")
+    return {"codec": codec, "data": data, "chars": len(text or ""), "updated_at": datetime.now(timezone.utc)}
+
+
+def text_update(resume_id: Any, text: str) -> UpdateOne:
+    """``resume_texts`` upsert for ``bulk_write``."""
+    return UpdateOne({"_id": _oid(resume_id)}, {"$set": _text_fields(text)}, upsert=True)
+
+
+async def save_resume_text(db, resume_id: Any, text: str) -> int:
+    """Store ``text`` for the resume → its length (caller sets ``text_length`` on the resume)."""
+    await db[RESUME_TEXT_COLLECTION].update_one(
+        {"_id": _oid(resume_id)}, {"$set": _text_fields(text)}, upsert=True,
+    )
+    return len(text or "")
+
+
+async def load_resume_text(db, resume: Dict[str, Any]) -> str:
+    """Extracted text of ``resume`` (a resume document with at least ``_id``)."""
+    if resume.get("extracted_text"):
+        return resume["extracted_text"]  # written before the split
+    doc = await db[RESUME_TEXT_COLLECTION].find_one({"_id": _oid(resume["_id"])})
+    return decompress_text(doc["codec"], doc["data"]) if doc else ""
+
+
+async def delete_resume_texts(db, resume_ids: Iterable[Any]) -> None:
+    ids = [_oid(r) for r in resume_ids]
+    if ids:
+        await db[RESUME_TEXT_COLLECTION].delete_many({"_id": {"$in": ids}})
+
+
+# -----------------------------------------------------------------------------
+# Projected reads
+# -----------------------------------------------------------------------------
+
+declare_index("resumes", [("user_id", 1), ("status", 1), ("uploaded_at", -1)],
+              query={"user_id": "?", "status": "processed"}, sort=[("uploaded_at", -1)])
+# รายการ resume ของผู้ใช้ + $lookup ใน applicants pipeline
+declare_index("resumes", [("user_id", 1), ("uploaded_at", -1)],
+              query={"user_id": "?"}, sort=[("uploaded_at", -1)])
+
+
+async def find_latest_processed_resume(db, user_id: str,
+                                       projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+    """Latest processed resume with LLM features (no extraction error / rule-based fallback), else the latest processed one."""
+    projection = projection or MATCHING_PROJECTION
+    resume = await db.resumes.find_one(
+        {
+            "user_id": user_id,
+            "status": "processed",
+            "extracted_features.extraction_error": {"$exists": False},
+            "extracted_features.fallback_reason": {"$exists": False},
+        },
+        projection,
+        sort=[("uploaded_at", -1)],
+    )
+    if not resume:
+        resume = await db.resumes.find_one(
+            {"user_id": user_id, "status": "processed"}, projection, sort=[("uploaded_at", -1)],
+        )
+    return resume
@@ -0,0 +1,161 @@
+# =============================================================================
+# 📤 STREAMING UPLOADS - รับไฟล์ทีละ chunk (ไม่ buffer ทั้งไฟล์ใน RAM)
+# =============================================================================
+"""
+Streaming upload helper shared by resume / certificate / profile image /
+company logo uploads.
+
+    - magic bytes checked on the first chunk — a fake file is rejected
+      before the rest of the body is read
+    - size limit checked per chunk — aborts as soon as it is crossed
+    - SHA-256 computed while streaming
+    - chunks go to a temp file next to the destination (file I/O off the
+      event loop), renamed into place atomically only when everything passed
+
+Usage:
+    stored = await save_upload(file, "uploads/resumes/x.pdf",
+                               max_size=MAX_FILE_SIZE, allowed_kinds=PDF_KINDS)
+    stored.path, stored.size, stored.sha256, stored.kind
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+# Enough bytes to tell every supported format apart (WEBP needs 12)
+HEAD_SIZE = 16
+
+PDF_KINDS = frozenset({"pdf"})
+IMAGE_KINDS = frozenset({"jpeg", "png", "gif", "webp"})
+
+
+def sniff_kind(head: bytes) -> Optional[str]:
+    """Detect the file format from its first bytes (None = unknown)."""
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+    kind: str
+
+
+class UploadRejected(HTTPException):
+    """400 raised while streaming. ``reason``: empty | bad_magic | too_large."""
+
+    def __init__(self, reason: str, detail: str) -> None:
+        super().__init__(status_code=400, detail=detail)
+        self.reason = reason
+
+
+def _check_kind(head: bytes, allowed: frozenset) -> str:
+    kind = sniff_kind(head)
+    if kind is None or kind not in allowed:
+        raise UploadRejected("bad_magic", "รูปแบบไฟล์ไม่ถูกต้อง (Invalid magic bytes)")
+    return kind
+
+
+def _open_temp(directory: str) -> tuple[str, BinaryIO]:
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+    return tmp_path, open(tmp_path, "wb")
+
+
+def _discard(fh: BinaryIO, tmp_path: str) -> None:
+    fh.close()
+    remove_quietly(tmp_path)
+
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def stream_to_temp(file: UploadFile, directory: str, *, max_size: int,
+                         allowed_kinds: Iterable[str], chunk_size: int = CHUNK_SIZE) -> StoredUpload:
+    """Stream ``file`` into a temp file inside ``directory``; validate on the way.
+
+    The returned ``path`` is the temp file — the caller renames it into place
+    (same directory/filesystem → atomic) or removes it.
+
+    Raises:
+        UploadRejected: empty file, unknown/disallowed format, or over ``max_size``
+    """
+    allowed = frozenset(allowed_kinds)
+    max_mb = max_size / (1024 * 1024)
+    digest = hashlib.sha256()
+    size = 0
+    kind: Optional[str] = None
+    head = b""
+
+    tmp_path, fh = await asyncio.to_thread(_open_temp, directory)
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            if kind is None:
+                # Usually decided on the first chunk; a short read waits for more bytes
+                head += chunk[:HEAD_SIZE - len(head)]
+                if len(head) >= HEAD_SIZE:
+                    kind = _check_kind(head, allowed)
+
+            size += len(chunk)
+            if size > max_size:
+                raise UploadRejected("too_large", f"ไฟล์ใหญ่เกินไป (สูงสุด {max_mb:g}MB)")
+
+            digest.update(chunk)
+            await asyncio.to_thread(fh.write, chunk)
+
+        if size == 0:
+            raise UploadRejected("empty", "ไฟล์ว่างเปล่า")
+        if kind is None:
+            kind = _check_kind(head, allowed)  # whole file shorter than HEAD_SIZE
+
+        await asyncio.to_thread(fh.close)
+    except BaseException:
+        await asyncio.to_thread(_discard, fh, tmp_path)
+        raise
+
+    return StoredUpload(path=tmp_path, size=size, sha256=digest.hexdigest(), kind=kind)
+
+
+async def save_upload(file: UploadFile, dest_path: str, *, max_size: int,
+                      allowed_kinds: Iterable[str], chunk_size: int = CHUNK_SIZE) -> StoredUpload:
+    """Stream ``file`` to ``dest_path``; validate magic bytes and size on the way.
+
+    Raises:
+        UploadRejected: empty file, unknown/disallowed format, or over ``max_size``
+    """
+    stored = await stream_to_temp(
+        file, os.path.dirname(dest_path) or ".",
+        max_size=max_size, allowed_kinds=allowed_kinds, chunk_size=chunk_size,
+    )
+    try:
+        await asyncio.to_thread(os.replace, stored.path, dest_path)
+    except BaseException:
+        await asyncio.to_thread(remove_quietly, stored.path)
+        raise
+    stored.path = dest_path
+    return stored
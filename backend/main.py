@@ -3,7 +3,7 @@
 # =============================================================================
 # 🚀 FASTAPI MAIN APPLICATION - AI Resume Screening System
 # =============================================================================
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
@@ -25,6 +25,7 @@ sys.path.insert(0, current_dir)
 
 # Import database functions
 from core.database import connect_to_mongo, close_mongo_connection, test_connection, get_database
+from core.pagination import CREATED_DESC, NEXT_CURSOR_HEADER, keyset_page
 
 # Import route modules with error handling
 from routes.auth import router as auth_router
@@ -37,6 +38,11 @@ from routes.matching import router as matching_router
 from routes.certificate import router as certificate_router
 
 from core.auth import get_current_user_data
+from services.pdf_pool import get_pdf_pool
+from core.blob_store import get_blob_collector
+from core.indexes import get_index_manager
+from services.application_counters import get_counter_reconciler
+from services.job_search import SEARCH_EXCLUDE, parse_query, search_fields, search_jobs
 # ลอง import job router แบบ safe
 try:
     from routes.job import router as job_router
@@ -104,6 +110,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "Accept", "Origin"],
+    expose_headers=["X-Total-Count", "X-Total-Pages", "X-Next-Cursor"],
 )
 
 # =============================================================================
@@ -191,6 +198,15 @@ async def startup_event():
     """
     logger.info("Starting AI Resume Screening System...")
     await connect_to_mongo()
+
+    # สร้าง index ที่ประกาศไว้ + backfill (เช่น search token ของงานเดิม) + ตรวจ explain() เบื้องหลัง (ไม่บล็อก request)
+    get_index_manager(get_database).start()
+
+    # แก้ applications_count / status_counts ที่คลาดเคลื่อนเป็นระยะ
+    get_counter_reconciler(get_database).start()
+
+    # ลบไฟล์ upload ที่ไม่มีใครอ้างถึงเกิน grace period เป็นระยะ
+    get_blob_collector(get_database).start()
     
     # ตรวจสอบ uploads folder
     uploads_dirs = ["uploads/profiles", "uploads/resumes", "uploads/companies", "uploads/certificates"]
@@ -219,7 +235,11 @@ async def shutdown_event():
     - ปิดการเชื่อมต่อฐานข้อมูล
     """
     logger.info("Shutting down AI Resume Screening System...")
+    await get_index_manager().stop()
+    await get_counter_reconciler().stop()
+    await get_blob_collector().stop()
     await close_mongo_connection()
+    get_pdf_pool().shutdown()
     logger.info("Application stopped successfully!")
 
 # =============================================================================
@@ -333,29 +353,22 @@ async def manual_test_jobs():
 
 @app.get("/api/jobs")
 async def manual_get_jobs(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     search: Optional[str] = None,
     department: Optional[str] = None,
     is_remote: Optional[bool] = None,
+    cursor: Optional[str] = None,
     db=Depends(get_database)
 ):
-    """📋 ดึงรายการงานทั้งหมด (Manual)"""
+    """📋 ดึงรายการงานทั้งหมด (Manual) — cursor หน้าถัดไปใน header X-Next-Cursor"""
     try:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         # สร้าง filter query
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         filter_query = {"is_active": True}
         
-        # ค้นหาด้วยข้อความ
-        if search:
-            search_regex = {"$regex": search, "$options": "i"}
-            filter_query["$or"] = [
-                {"title": search_regex},
-                {"description": search_regex},
-                {"company_name": search_regex}
-            ]
-        
         # กรองตามแผนก
         if department:
             filter_query["department"] = department
@@ -367,8 +380,15 @@ async def manual_get_jobs(
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         # ดึงข้อมูลจากฐานข้อมูล
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
-        cursor = db.jobs.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
-        jobs = await cursor.to_list(length=limit)
+        if parse_query(search):
+            # ค้นหาด้วยข้อความ → เรียงตาม relevance แบ่งหน้าด้วย skip (services/job_search.py)
+            jobs = await search_jobs(db, filter_query, search, skip, limit, prefix=True)
+        else:
+            page = await keyset_page(db.jobs, filter_query, CREATED_DESC, limit, cursor=cursor, skip=skip,
+                                     projection=SEARCH_EXCLUDE)
+            jobs = page.items
+            if page.next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         # ⭐ แปลง ObjectId เป็น string
@@ -386,8 +406,8 @@ async def manual_get_jobs(
             job.setdefault("is_remote", False)
             job.setdefault("positions_available", 1)
 
-            # ── Live count from applications collection (not cached field) ──
-            job["applications_count"] = await db.applications.count_documents({"job_id": job["id"]})
+            # applications_count ดูแลโดย services/application_counters.py (+ reconciler)
+            job.setdefault("applications_count", 0)
 
             if "created_at" in job:
                 if hasattr(job["created_at"], "isoformat"):
@@ -411,7 +431,8 @@ async def manual_get_jobs(
 
         return result_jobs
 
-        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error fetching jobs: %s", e)
         return {
@@ -445,7 +466,7 @@ async def manual_get_job_by_id(
         job = await db.jobs.find_one({
             "_id": ObjectId(job_id)
             # 📝 แปลง string → ObjectId เพื่อค้นหา
-        })
+        }, SEARCH_EXCLUDE)
         
         if not job:
             raise HTTPException(
@@ -559,12 +580,13 @@ async def manual_create_job(
         if company_logo:
             update_fields["company_logo"] = company_logo
         job_data.update(update_fields)
+        job_data.update(search_fields(job_data))
         
         # บันทึกลงฐานข้อมูล
         result = await db.jobs.insert_one(job_data)
         
         # ดึงข้อมูลที่สร้างแล้ว
-        created_job = await db.jobs.find_one({"_id": result.inserted_id})
+        created_job = await db.jobs.find_one({"_id": result.inserted_id}, SEARCH_EXCLUDE)
         created_job["id"] = str(created_job["_id"])
         created_job.pop("_id", None)
         
@@ -1,5 +1,5 @@
 # backend/routes/admin.py - Updated Version
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from datetime import datetime, timezone
 from bson import ObjectId
 from typing import List, Optional
@@ -9,6 +9,9 @@ from pymongo import ASCENDING, DESCENDING
 from core.models import UserType
 from core.auth import require_admin, get_current_user_data, hash_password
 from core.database import get_database
+from core.indexes import declare_index
+from core.pagination import CREATED_DESC, NEXT_CURSOR_HEADER, keyset_page
+from services.user_stats import get_user_stats, invalidate_user_stats
 
 # Create router
 router = APIRouter(prefix="/admin", tags=["Admin Management"])
@@ -84,26 +87,8 @@ async def get_admin_dashboard(admin_data: dict = Depends(require_admin)):
     try:
         db = get_database()
         
-        # นับจำนวน users ทั้งหมด
-        total_users = await db.users.count_documents({})
-        
-        # นับตาม user_type
-        student_count = await db.users.count_documents({"user_type": "Student"})
-        hr_count = await db.users.count_documents({"user_type": "HR"})
-        admin_count = await db.users.count_documents({"user_type": "Admin"})
-        
-        # นับตาม status
-        active_users = await db.users.count_documents({"is_active": True})
-        inactive_users = await db.users.count_documents({"is_active": False})
-        
-        return AdminStatsResponse(
-            total_users=total_users,
-            student_count=student_count,
-            hr_count=hr_count,
-            admin_count=admin_count,
-            active_users=active_users,
-            inactive_users=inactive_users
-        )
+        # นับทุก role / status ใน $group เดียว (cache สั้น ๆ ร่วมกับ /profile/dashboard)
+        return AdminStatsResponse(**await get_user_stats(db))
         
     except Exception as e:
         raise HTTPException(
@@ -114,16 +99,21 @@ async def get_admin_dashboard(admin_data: dict = Depends(require_admin)):
 # =============================================================================
 # USER MANAGEMENT - จัดการผู้ใช้
 # =============================================================================
+declare_index("users", [("created_at", -1), ("_id", -1)], query={}, sort=CREATED_DESC)
+
+
 @router.get("/users", response_model=List[UserListResponse])
 async def get_all_users(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     user_type: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
     admin_data: dict = Depends(require_admin)
 ):
-    """ดึงรายการผู้ใช้ทั้งหมด พร้อม pagination และ filter"""
+    """ดึงรายการผู้ใช้ทั้งหมด พร้อม pagination และ filter — cursor หน้าถัดไปอยู่ใน header X-Next-Cursor"""
     try:
         db = get_database()
         
@@ -146,9 +136,11 @@ async def get_all_users(
         # คำนวณ skip และ limit
         skip = (page - 1) * limit
         
-        # ดึงข้อมูล users
-        cursor = db.users.find(filter_query).sort("created_at", DESCENDING).skip(skip).limit(limit)
-        users = await cursor.to_list(length=limit)
+        # ดึงข้อมูล users (keyset ตาม created_at/_id เมื่อส่ง cursor มา)
+        users_page = await keyset_page(db.users, filter_query, CREATED_DESC, limit, cursor=cursor, skip=skip)
+        users = users_page.items
+        if users_page.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = users_page.next_cursor
         
         # แปลงข้อมูล
         result = []
@@ -167,6 +159,8 @@ async def get_all_users(
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -360,6 +354,7 @@ async def update_user(
             {"_id": existing_user["_id"]},
             {"$set": update_data}
         )
+        invalidate_user_stats()
         
         if result.modified_count == 0:
             raise HTTPException(
@@ -427,6 +422,7 @@ async def delete_user(
         
         # ลบ user
         await db.users.delete_one({"_id": existing_user["_id"]})
+        invalidate_user_stats()
         
         # ลบ role assignments
         await db.user_role_assignments.delete_many({"user_id": existing_user["_id"]})
@@ -489,6 +485,7 @@ async def create_user(
         # บันทึก user
         result = await db.users.insert_one(user_doc)
         user_id = result.inserted_id
+        invalidate_user_stats()
         
         # สร้าง role assignment
         try:
@@ -16,6 +16,7 @@ from core.auth import (
     get_current_user_id, ACCESS_TOKEN_EXPIRE_MINUTES, blacklist_token
 )
 from core.database import get_database
+from services.user_stats import invalidate_user_stats
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -246,6 +247,7 @@ async def verify_register_otp(data: VerifyRegisterOTPRequest):
     })
     result  = await db.users.insert_one(user_doc)
     user_id = result.inserted_id
+    invalidate_user_stats()
 
     await _assign_student_role(db, user_id)
     _pending_registrations.pop(data.email, None)
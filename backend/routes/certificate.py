@@ -5,14 +5,15 @@ Certificate Upload & Management API
 Endpoints:
     - POST /upload     — อัปโหลด Certificate (PDF/Image)
                          → extract text → LLM analyze → auto-sync กับ resume
+    - POST /upload-batch — อัปโหลดหลายไฟล์ → LLM call เดียว + sync/rescore ครั้งเดียว
     - GET  /my/list    — ดูรายการ Certificate ของฉัน
+    - GET  /cache/stats — (Admin) hit ratio ของ cert analysis cache
     - DELETE /{id}      — ลบ Certificate + auto-sync
 """
 
-import io
+import asyncio
 import logging
 import os
-import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional
@@ -21,9 +22,16 @@ from bson import ObjectId
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel
 
-from core.auth import get_current_user_id
+from core.auth import get_current_user_id, require_admin
+from core.blob_store import StoredBlob, release_blob, store_blob
 from core.database import get_database
+from core.indexes import declare_index
+from core.dataloader import DataLoader
+from core.uploads import UploadRejected
+from services.cert_cache import CACHE_COLLECTION, get_cert_cache
 from services.llm_service import LLMService
+from services.extraction_cache import extract_cached
+from services.pdf_pool import PDFExtractionError
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +39,11 @@ router = APIRouter(prefix="/certificates", tags=["Certificates"])
 
 # Always relative so URLs work on any machine / deployment environment
 UPLOAD_FOLDER = "uploads/certificates"
+BLOB_AREA = "certificates"  # uploads/certificates/ab/cd/<sha256>.<ext> (core/blob_store.py)
 ALLOWED_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".webp"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB per file
+MAX_BATCH_FILES = 10
+ALLOWED_KINDS = {"pdf", "jpeg", "png", "webp"}  # checked against magic bytes
 
 Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
 
@@ -79,6 +90,13 @@ class CertificateResponse(BaseModel):
     message: str = ""
 
 
+class CertificateBatchResponse(BaseModel):
+    certificates: List[CertificateResponse]
+    total: int
+    analyzed: int
+    message: str = ""
+
+
 class CertificateListResponse(BaseModel):
     certificates: List[dict]
     total: int
@@ -88,20 +106,17 @@ class CertificateListResponse(BaseModel):
 # HELPERS
 # =============================================================================
 
-def _extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from a certificate PDF using pdfplumber."""
+async def _extract_text_from_pdf(db, blob: StoredBlob) -> str:
+    """Extract plain text from a saved certificate PDF (pdfplumber, in the PDF process pool).
+
+    Same bytes extracted before (any user, same extractor version) → cached text.
+    """
     try:
-        import pdfplumber
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            pages_text = []
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    pages_text.append(text.strip())
-            return "\n".join(pages_text).strip()
-    except Exception as e:
-        logger.warning(f"[Certificate] PDF extraction failed: {e}")
+        extraction = await extract_cached(db, blob.path, "certificate", blob.sha256)
+    except PDFExtractionError as e:
+        logger.warning(f"[Certificate] PDF extraction aborted ({e.kind}): {e}")
         return ""
+    return extraction.text.strip()
 
 
 def _guess_cert_name_from_text(text: str, fallback: str) -> str:
@@ -115,6 +130,18 @@ def _guess_cert_name_from_text(text: str, fallback: str) -> str:
     return fallback
 
 
+async def _holder_names(user_id: str, db) -> List[str]:
+    """ชื่อเจ้าของ cert — ใช้ mask ออกก่อนทำ template fingerprint"""
+    try:
+        user = await db.users.find_one({"_id": ObjectId(user_id)}, {"full_name": 1, "username": 1})
+    except Exception:
+        return []
+    if not user:
+        return []
+    full_name = (user.get("full_name") or "").strip()
+    return [n for n in [full_name, *full_name.split(), user.get("username")] if n]
+
+
 async def _sync_cert_urls(user_id: str, db) -> None:
     """
     Re-build `certificate_urls`, `has_cert_files`, and `cert_llm_analyses`
@@ -187,21 +214,18 @@ async def _recalculate_application_scores(user_id: str, db) -> None:
         from routes.job import get_resume_features, convert_job_to_requirements
         
         matching_service = MatchingService()
+
+        # Resume features are the same for every application — load once
+        resume_features = await get_resume_features(user_id, db, has_cert_files=True) or {}
+
+        # All jobs in one query instead of one find_one per application
+        jobs = await DataLoader(db).load_many("jobs", [app.get("job_id") for app in applications])
         
-        for app in applications:
+        for app, job in zip(applications, jobs):
             try:
-                job_id = app.get("job_id")
-                if not job_id:
-                    continue
-                    
-                # Get job details
-                from bson import ObjectId
-                job = await db.jobs.find_one({"_id": ObjectId(job_id)})
                 if not job:
                     continue
                 
-                # Get updated resume features with new certificates
-                resume_features = await get_resume_features(user_id, db, has_cert_files=True) or {}
                 job_requirements = convert_job_to_requirements(job)
                 
                 # Recalculate AI score
@@ -232,6 +256,74 @@ async def _recalculate_application_scores(user_id: str, db) -> None:
 # UPLOAD
 # =============================================================================
 
+def _validate_extension(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ไฟล์ไม่รองรับ — ใช้ได้เฉพาะ {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return ext
+
+
+async def _save_cert_file(db, file: UploadFile) -> StoredBlob:
+    """Stream into content-addressed storage (relative path, e.g. uploads/certificates/ab/cd/<sha>.pdf).
+
+    Magic bytes and MAX_FILE_SIZE are checked while streaming (UploadRejected → 400).
+    """
+    return await store_blob(db, file, BLOB_AREA, max_size=MAX_FILE_SIZE, allowed_kinds=ALLOWED_KINDS)
+
+
+def _build_cert_doc(user_id: str, file_name: str, stored: StoredBlob, ext: str,
+                    extracted_text: str, llm_analysis: Optional[dict],
+                    llm_analysis_source: Optional[str]) -> dict:
+    base_name = os.path.splitext(file_name)[0]
+    extracted_cert_name = _guess_cert_name_from_text(extracted_text, base_name) if extracted_text else None
+    return {
+        "user_id": user_id,
+        "file_name": file_name,
+        "file_path": stored.path,
+        "file_size": stored.size,
+        "file_sha256": stored.sha256,
+        "file_type": ext.replace(".", ""),
+        "certificate_name": base_name,
+        "extracted_text": extracted_text,
+        "extracted_cert_name": extracted_cert_name,
+        "llm_analysis": llm_analysis,          # Full LLM result dict or None
+        "llm_analysis_source": llm_analysis_source,  # "llm" | "cache" | None
+        "llm_cert_name": (llm_analysis.get("cert_name") or extracted_cert_name) if llm_analysis else None,
+        "is_valid_cert": llm_analysis.get("is_valid_cert", False) if llm_analysis else None,
+        "uploaded_at": datetime.now(timezone.utc),
+    }
+
+
+def _cert_response(cert_doc: dict, cert_id, message: str) -> CertificateResponse:
+    return CertificateResponse(
+        id=str(cert_id),
+        user_id=cert_doc["user_id"],
+        file_name=cert_doc["file_name"],
+        file_path=cert_doc["file_path"],
+        file_size=cert_doc["file_size"],
+        certificate_name=cert_doc["certificate_name"],
+        extracted_cert_name=cert_doc["extracted_cert_name"],
+        llm_cert_name=cert_doc["llm_cert_name"],
+        is_valid_cert=cert_doc["is_valid_cert"],
+        uploaded_at=cert_doc["uploaded_at"],
+        message=message,
+    )
+
+
+def _log_analysis(file_name: str, cert_doc: dict) -> None:
+    llm_analysis = cert_doc["llm_analysis"]
+    logger.info(
+        f"[Certificate] LLM result ({cert_doc['llm_analysis_source']}) for '{file_name}': "
+        f"name='{cert_doc['llm_cert_name']}' "
+        f"domain='{llm_analysis.get('domain')}' "
+        f"tags={llm_analysis.get('relevance_tags')} "
+        f"valid={cert_doc['is_valid_cert']}"
+    )
+
+
 @router.post("/upload", response_model=CertificateResponse, status_code=status.HTTP_201_CREATED)
 async def upload_certificate(
     file: UploadFile = File(..., description="Certificate file (PDF/Image)"),
@@ -245,87 +337,56 @@ async def upload_certificate(
     2. Save to disk
     3. Extract text from PDF (pdfplumber)
     4. LLM analyze cert content → domain, skills_covered, relevance_tags, is_valid_cert
+       (template cache hit → reuse previous analysis, no LLM call)
     5. Save to MongoDB
     6. Auto-sync certificate_urls + cert_llm_analyses → all resumes of user
     """
 
-    # Validate extension
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"ไฟล์ไม่รองรับ — ใช้ได้เฉพาะ {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-
-    # Read and validate size
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="ไฟล์มีขนาดใหญ่เกิน 10MB")
+    ext = _validate_extension(file.filename)
 
-    # Save file — use UPLOAD_FOLDER (relative) so stored path is always relative
-    unique_id = uuid.uuid4().hex[:12]
-    safe_name = f"{user_id}_{unique_id}{ext}"
-    file_path = os.path.join(UPLOAD_FOLDER, safe_name)  # e.g. uploads/certificates/xxx.pdf
-
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    base_name = os.path.splitext(file.filename)[0]
+    # Stream to disk — size / magic bytes validated while reading
+    stored = await _save_cert_file(db, file)
 
     # ── Step 3: Extract text from PDF cert ──
     extracted_text = ""
-    extracted_cert_name = None
-
     if ext == ".pdf":
-        extracted_text = _extract_text_from_pdf(content)
+        extracted_text = await _extract_text_from_pdf(db, stored)
         if extracted_text:
-            extracted_cert_name = _guess_cert_name_from_text(extracted_text, base_name)
-            logger.info(
-                f"[Certificate] Extracted {len(extracted_text)} chars "
-                f"from '{file.filename}' — heuristic name: '{extracted_cert_name}'"
-            )
+            logger.info(f"[Certificate] Extracted {len(extracted_text)} chars from '{file.filename}'")
         else:
             logger.info(f"[Certificate] image-only cert PDF: {file.filename}")
 
     # ── Step 4: LLM analyze cert ──
     llm_analysis = None
-    llm_cert_name = None
-    is_valid_cert = None
+    llm_analysis_source = None
 
     if extracted_text:
+        # Same template (course/issuer) already analyzed → reuse, skip the LLM call
+        cert_cache = get_cert_cache()
+        holder_names = await _holder_names(user_id, db)
+        llm_analysis = await cert_cache.lookup(db, extracted_text, holder_names)
+        if llm_analysis:
+            llm_analysis_source = "cache"
+
         llm_svc = _get_llm_service()
-        if llm_svc.is_ready():
+        if llm_analysis is None and llm_svc.is_ready():
             logger.info(f"[Certificate] Running LLM cert analysis for '{file.filename}'...")
             llm_analysis = llm_svc.analyze_certificate(extracted_text)
             if llm_analysis:
-                llm_cert_name = llm_analysis.get("cert_name") or extracted_cert_name
-                is_valid_cert = llm_analysis.get("is_valid_cert", False)
-                logger.info(
-                    f"[Certificate] LLM result: name='{llm_cert_name}' "
-                    f"domain='{llm_analysis.get('domain')}' "
-                    f"tags={llm_analysis.get('relevance_tags')} "
-                    f"valid={is_valid_cert}"
-                )
+                llm_analysis_source = "llm"
+                await cert_cache.store(db, extracted_text, llm_analysis, holder_names)
             else:
                 logger.warning(f"[Certificate] LLM analysis returned None for '{file.filename}'")
-        else:
+        elif llm_analysis is None:
             logger.warning("[Certificate] LLM service not ready — skipping cert analysis")
 
     # ── Step 5: Save to MongoDB ──
-    cert_doc = {
-        "user_id": user_id,
-        "file_name": file.filename,
-        "file_path": file_path,
-        "file_size": len(content),
-        "file_type": ext.replace(".", ""),
-        "certificate_name": base_name,
-        "extracted_text": extracted_text,
-        "extracted_cert_name": extracted_cert_name,
-        "llm_analysis": llm_analysis,          # Full LLM result dict or None
-        "llm_cert_name": llm_cert_name,
-        "is_valid_cert": is_valid_cert,
-        "uploaded_at": datetime.now(timezone.utc),
-    }
+    cert_doc = _build_cert_doc(
+        user_id, file.filename, stored, ext,
+        extracted_text, llm_analysis, llm_analysis_source,
+    )
+    if llm_analysis:
+        _log_analysis(file.filename, cert_doc)
 
     result = await db.certificates.insert_one(cert_doc)
     logger.info(f"[Certificate] Saved cert {result.inserted_id} for user {user_id}")
@@ -336,22 +397,106 @@ async def upload_certificate(
     # ── Step 7: Recalculate AI scores for existing applications ──
     await _recalculate_application_scores(user_id, db)
 
-    return CertificateResponse(
-        id=str(result.inserted_id),
-        user_id=user_id,
-        file_name=file.filename,
-        file_path=file_path,
-        file_size=len(content),
-        certificate_name=base_name,
-        extracted_cert_name=extracted_cert_name,
-        llm_cert_name=llm_cert_name,
-        is_valid_cert=is_valid_cert,
-        uploaded_at=cert_doc["uploaded_at"],
-        message=(
-            "อัปโหลด Certificate สำเร็จ — LLM วิเคราะห์แล้ว"
-            if llm_analysis else
-            "อัปโหลด Certificate สำเร็จ — ไม่สามารถอ่าน text ได้ (image cert)"
-        ),
+    return _cert_response(
+        cert_doc, result.inserted_id,
+        "อัปโหลด Certificate สำเร็จ — LLM วิเคราะห์แล้ว"
+        if llm_analysis else
+        "อัปโหลด Certificate สำเร็จ — ไม่สามารถอ่าน text ได้ (image cert)",
+    )
+
+
+@router.post("/upload-batch", response_model=CertificateBatchResponse, status_code=status.HTTP_201_CREATED)
+async def upload_certificates_batch(
+    files: List[UploadFile] = File(..., description=f"Certificate files (max {MAX_BATCH_FILES})"),
+    user_id: str = Depends(get_current_user_id),
+    db=Depends(get_database),
+):
+    """อัปโหลด Certificate หลายไฟล์พร้อมกัน
+
+    ต่างจาก /upload ทีละไฟล์:
+    - extract text ทุกไฟล์แบบขนาน
+    - cache miss ทั้งหมดวิเคราะห์ใน LLM request เดียว (ผลเป็น array แยกตามไฟล์)
+    - sync resume + คำนวณ AI score ใหม่ครั้งเดียวต่อ batch
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="ไม่พบไฟล์")
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"อัปโหลดได้สูงสุด {MAX_BATCH_FILES} ไฟล์ต่อครั้ง")
+
+    # Validate extensions before writing anything to disk
+    exts = [_validate_extension(f.filename) for f in files]
+
+    # Stream each file; a rejected file removes the ones already saved
+    stored_files: List[StoredBlob] = []
+    try:
+        for f in files:
+            stored_files.append(await _save_cert_file(db, f))
+    except UploadRejected as e:
+        for stored in stored_files:
+            await release_blob(db, stored.path)
+        raise HTTPException(status_code=400, detail=f"ไฟล์ '{f.filename}': {e.detail}")
+
+    # ── Extract text (parallel, in the PDF process pool) ──
+    async def _extract(stored: StoredBlob, ext: str) -> str:
+        return await _extract_text_from_pdf(db, stored) if ext == ".pdf" else ""
+
+    texts = await asyncio.gather(*(_extract(s, e) for s, e in zip(stored_files, exts)))
+
+    # ── Cache lookup, then ONE LLM call for all misses ──
+    keys = [f"cert_{i + 1}" for i in range(len(files))]
+    analyses: dict = {}
+    sources: dict = {}
+    cert_cache = get_cert_cache()
+    holder_names = await _holder_names(user_id, db)
+    misses = {}
+    for key, text in zip(keys, texts):
+        if not text:
+            continue
+        cached = await cert_cache.lookup(db, text, holder_names)
+        if cached:
+            analyses[key], sources[key] = cached, "cache"
+        else:
+            misses[key] = text
+
+    llm_svc = _get_llm_service()
+    if misses and llm_svc.is_ready():
+        logger.info(f"[Certificate] Batch LLM analysis for {len(misses)} cert(s)...")
+        batch = await asyncio.to_thread(llm_svc.analyze_certificates_batch, misses)
+        for key, analysis in batch.items():
+            if analysis:
+                analyses[key], sources[key] = analysis, "llm"
+                await cert_cache.store(db, misses[key], analysis, holder_names)
+    elif misses:
+        logger.warning("[Certificate] LLM service not ready — skipping cert analysis")
+
+    # ── Save all docs ──
+    cert_docs = [
+        _build_cert_doc(user_id, f.filename, stored, ext, text,
+                        analyses.get(key), sources.get(key))
+        for key, f, stored, ext, text in zip(keys, files, stored_files, exts, texts)
+    ]
+    for f, doc in zip(files, cert_docs):
+        if doc["llm_analysis"]:
+            _log_analysis(f.filename, doc)
+    result = await db.certificates.insert_many(cert_docs)
+    logger.info(f"[Certificate] Saved {len(cert_docs)} cert(s) for user {user_id} (batch)")
+
+    # ── Sync + rescore ONCE for the whole batch ──
+    await _sync_cert_urls(user_id, db)
+    await _recalculate_application_scores(user_id, db)
+
+    certificates = [
+        _cert_response(
+            doc, cert_id,
+            "LLM วิเคราะห์แล้ว" if doc["llm_analysis"] else "ไม่สามารถอ่าน text ได้ (image cert)",
+        )
+        for doc, cert_id in zip(cert_docs, result.inserted_ids)
+    ]
+    return CertificateBatchResponse(
+        certificates=certificates,
+        total=len(certificates),
+        analyzed=len(analyses),
+        message=f"อัปโหลด Certificate สำเร็จ {len(certificates)} ไฟล์ — LLM วิเคราะห์แล้ว {len(analyses)} ไฟล์",
     )
 
 
@@ -359,6 +504,11 @@ async def upload_certificate(
 # LIST
 # =============================================================================
 
+# รายการของฉัน + การคำนวณคะแนนใหม่ + $lookup ใน applicants pipeline
+declare_index("certificates", [("user_id", 1), ("uploaded_at", -1)],
+              query={"user_id": "?"}, sort=[("uploaded_at", -1)])
+
+
 @router.get("/my/list", response_model=CertificateListResponse)
 async def get_my_certificates(
     user_id: str = Depends(get_current_user_id),
@@ -390,6 +540,21 @@ async def get_my_certificates(
     return CertificateListResponse(certificates=result, total=len(result))
 
 
+# =============================================================================
+# CACHE STATS
+# =============================================================================
+
+@router.get("/cache/stats")
+async def get_cert_cache_stats(
+    admin_data: dict = Depends(require_admin),
+    db=Depends(get_database),
+):
+    """(Admin) สถิติ cert analysis cache — hit ratio ของ process นี้ + จำนวน template ที่เก็บไว้"""
+    stats = get_cert_cache().stats()
+    stats["templates_stored"] = await db[CACHE_COLLECTION].count_documents({})
+    return stats
+
+
 # =============================================================================
 # DELETE
 # =============================================================================
@@ -412,13 +577,8 @@ async def delete_certificate(
     if not cert:
         raise HTTPException(status_code=404, detail="Certificate not found")
 
-    # Delete file from disk
-    file_path = cert.get("file_path", "")
-    if file_path and os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except OSError:
-            pass
+    # Delete file from disk (once no other document references the blob)
+    await release_blob(db, cert.get("file_path"))
 
     # Delete from DB
     await db.certificates.delete_one({"_id": ObjectId(certificate_id)})
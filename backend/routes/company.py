@@ -1,11 +1,9 @@
 # backend/routes/company.py - Company Management Routes
 import os
-import uuid
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response, UploadFile, File
 from datetime import datetime, timezone
 from bson import ObjectId
 from typing import List, Optional
-from pymongo import ASCENDING, DESCENDING
 
 # Local imports
 from core.models import (
@@ -14,10 +12,101 @@ from core.models import (
 )
 from core.auth import require_admin, require_hr_or_admin, get_current_user_data
 from core.database import get_database
+from core.indexes import declare_index
+from core.pagination import CREATED_DESC, NEXT_CURSOR_HEADER, page_from, with_cursor
+from core.blob_store import release_blob, store_blob
+from services.job_search import reindex_jobs
 
 # Create router
 router = APIRouter(prefix="/companies", tags=["Company Management"])
 
+# =============================================================================
+# HR COUNT AGGREGATION — join assignments + users ครั้งเดียวต่อ query
+# =============================================================================
+
+def company_hr_stats_stages() -> list:
+    """
+    Stages ที่เติม hr_count / active_hr_count ให้ทุก company ใน pipeline
+
+    ใช้ต่อท้าย $match/$limit ของ companies → join company_hr_assignments กับ users
+    เฉพาะ companies ในหน้านั้น แทน count_documents + aggregate ต่อบริษัท
+    """
+    return [
+        {"$lookup": {
+            "from": "company_hr_assignments",
+            "let": {"company_id": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$company_id", "$$company_id"]}}},
+                {"$lookup": {
+                    "from": "users",
+                    "let": {"user_id": "$user_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$_id", "$$user_id"]}}},
+                        {"$project": {"_id": 0, "is_active": 1}},
+                    ],
+                    "as": "user",
+                }},
+                {"$group": {
+                    "_id": None,
+                    "hr_count": {"$sum": 1},
+                    "active_hr_count": {"$sum": {"$cond": [{"$in": [True, "$user.is_active"]}, 1, 0]}},
+                }},
+            ],
+            "as": "hr_stats",
+        }},
+        {"$set": {"hr_stats": {"$first": "$hr_stats"}}},
+    ]
+
+
+def companies_page_pipeline(filter_query: dict, skip: int, limit: int, cursor: Optional[str] = None) -> list:
+    """
+    หน้าหนึ่งของ companies + HR counts + total ใน $facet เดียว
+
+    ดึง limit + 1 แถวเพื่อรู้ว่ามีหน้าถัดไป; ส่ง cursor มา → keyset แทน $skip
+    (total ยังนับตาม filter เดิมทั้งหมด)
+    """
+    page_stages = [{"$match": with_cursor({}, CREATED_DESC, cursor)}] if cursor else [{"$skip": skip}]
+    return [
+        {"$match": filter_query},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "companies": [
+                {"$sort": dict(CREATED_DESC)},
+                *page_stages,
+                {"$limit": limit + 1},
+                *company_hr_stats_stages(),
+            ],
+        }},
+    ]
+
+
+async def _find_company_with_hr_stats(db, company_id) -> Optional[dict]:
+    companies = await db.companies.aggregate([
+        {"$match": {"_id": company_id}},
+        *company_hr_stats_stages(),
+    ]).to_list(length=1)
+    return companies[0] if companies else None
+
+
+def _company_response(company: dict) -> CompanyResponse:
+    hr_stats = company.get("hr_stats") or {}
+    return CompanyResponse(
+        id=str(company["_id"]),
+        name=company["name"],
+        industry=company["industry"],
+        description=company.get("description"),
+        location=company.get("location"),
+        website=company.get("website"),
+        contact_email=company.get("contact_email"),
+        contact_phone=company.get("contact_phone"),
+        logo_url=company.get("logo_url"),
+        is_active=company["is_active"],
+        created_at=company["created_at"],
+        updated_at=company.get("updated_at"),
+        hr_count=hr_stats.get("hr_count", 0),
+        active_hr_count=hr_stats.get("active_hr_count", 0)
+    )
+
 # =============================================================================
 # ADMIN - COMPANY MANAGEMENT
 # =============================================================================
@@ -85,16 +174,25 @@ async def create_company(
             detail="Failed to create company"
         )
 
+declare_index("companies", [("created_at", -1), ("_id", -1)], query={}, sort=CREATED_DESC)
+
+
 @router.get("", response_model=List[CompanyResponse])
 async def get_companies(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     industry: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
     admin_data: dict = Depends(require_admin)
 ):
-    """ดึงรายการ Companies ทั้งหมด (Admin เท่านั้น)"""
+    """
+    ดึงรายการ Companies ทั้งหมด (Admin เท่านั้น)
+
+    จำนวนทั้งหมดอยู่ใน header X-Total-Count, cursor หน้าถัดไปใน X-Next-Cursor
+    """
     try:
         db = get_database()
         
@@ -117,53 +215,27 @@ async def get_companies(
         # คำนวณ skip และ limit
         skip = (page - 1) * limit
         
-        # ดึงข้อมูล companies
-        cursor = db.companies.find(filter_query).sort("created_at", DESCENDING).skip(skip).limit(limit)
-        companies = await cursor.to_list(length=limit)
+        # companies ในหน้า + HR counts + total ใน query เดียว
+        facet = await db.companies.aggregate(
+            companies_page_pipeline(filter_query, skip, limit, cursor)
+        ).to_list(length=1)
+        facet = facet[0] if facet else {"total": [], "companies": []}
+        total = facet["total"][0]["count"] if facet["total"] else 0
         
-        # แปลงข้อมูลและนับ HR
-        result = []
-        for company in companies:
-            # นับ HR ในแต่ละ company
-            hr_count = await db.company_hr_assignments.count_documents({
-                "company_id": company["_id"]
-            })
-            
-            # นับ active HR
-            active_hr_pipeline = [
-                {"$match": {"company_id": company["_id"]}},
-                {"$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }},
-                {"$match": {"user.is_active": True}},
-                {"$count": "active_count"}
-            ]
-            
-            active_hr_result = await db.company_hr_assignments.aggregate(active_hr_pipeline).to_list(length=1)
-            active_hr_count = active_hr_result[0]["active_count"] if active_hr_result else 0
-            
-            result.append(CompanyResponse(
-                id=str(company["_id"]),
-                name=company["name"],
-                industry=company["industry"],
-                description=company.get("description"),
-                location=company.get("location"),
-                website=company.get("website"),
-                contact_email=company.get("contact_email"),
-                contact_phone=company.get("contact_phone"),
-                logo_url=company.get("logo_url"),
-                is_active=company["is_active"],
-                created_at=company["created_at"],
-                updated_at=company.get("updated_at"),
-                hr_count=hr_count,
-                active_hr_count=active_hr_count
-            ))
+        # pagination metadata ใน header — body ยังเป็น list เหมือนเดิม
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Pages"] = str((total + limit - 1) // limit)
+        
+        page_result = page_from(facet["companies"], CREATED_DESC, limit)
+        if page_result.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = page_result.next_cursor
+        
+        result = [_company_response(company) for company in page_result.items]
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -179,10 +251,8 @@ async def get_company_by_id(
     try:
         db = get_database()
         
-        try:
-            company = await db.companies.find_one({"_id": ObjectId(company_id)})
-        except:
-            company = await db.companies.find_one({"_id": company_id})
+        oid = ObjectId(company_id) if ObjectId.is_valid(company_id) else company_id
+        company = await _find_company_with_hr_stats(db, oid)
         
         if not company:
             raise HTTPException(
@@ -190,42 +260,7 @@ async def get_company_by_id(
                 detail="Company not found"
             )
         
-        # นับ HR
-        hr_count = await db.company_hr_assignments.count_documents({
-            "company_id": company["_id"]
-        })
-        
-        # นับ active HR
-        active_hr_pipeline = [
-            {"$match": {"company_id": company["_id"]}},
-            {"$lookup": {
-                "from": "users",
-                "localField": "user_id",
-                "foreignField": "_id",
-                "as": "user"
-            }},
-            {"$match": {"user.is_active": True}},
-            {"$count": "active_count"}
-        ]
-        
-        active_hr_result = await db.company_hr_assignments.aggregate(active_hr_pipeline).to_list(length=1)
-        active_hr_count = active_hr_result[0]["active_count"] if active_hr_result else 0
-        
-        return CompanyResponse(
-            id=str(company["_id"]),
-            name=company["name"],
-            industry=company["industry"],
-            description=company.get("description"),
-            location=company.get("location"),
-            website=company.get("website"),
-            contact_email=company.get("contact_email"),
-            contact_phone=company.get("contact_phone"),
-            is_active=company["is_active"],
-            created_at=company["created_at"],
-            updated_at=company.get("updated_at"),
-            hr_count=hr_count,
-            active_hr_count=active_hr_count
-        )
+        return _company_response(company)
         
     except HTTPException:
         raise
@@ -296,29 +331,10 @@ async def update_company(
                 detail="No changes made"
             )
         
-        # ดึงข้อมูลที่อัปเดตแล้ว
-        updated_company = await db.companies.find_one({"_id": existing_company["_id"]})
+        # ดึงข้อมูลที่อัปเดตแล้ว + HR counts ใน aggregation เดียว
+        updated_company = await _find_company_with_hr_stats(db, existing_company["_id"])
         
-        # นับ HR
-        hr_count = await db.company_hr_assignments.count_documents({
-            "company_id": updated_company["_id"]
-        })
-        
-        return CompanyResponse(
-            id=str(updated_company["_id"]),
-            name=updated_company["name"],
-            industry=updated_company["industry"],
-            description=updated_company.get("description"),
-            location=updated_company.get("location"),
-            website=updated_company.get("website"),
-            contact_email=updated_company.get("contact_email"),
-            contact_phone=updated_company.get("contact_phone"),
-            is_active=updated_company["is_active"],
-            created_at=updated_company["created_at"],
-            updated_at=updated_company.get("updated_at"),
-            hr_count=hr_count,
-            active_hr_count=0  # จะคำนวณใหม่ถ้าต้องการ
-        )
+        return _company_response(updated_company)
         
     except HTTPException:
         raise
@@ -682,6 +698,8 @@ COMPANY_LOGO_DIR = "uploads/company_logos"
 os.makedirs(COMPANY_LOGO_DIR, exist_ok=True)
 LOGO_ALLOWED_EXT = {".jpg", ".jpeg", ".png", ".webp"}
 LOGO_MAX_SIZE = 5 * 1024 * 1024  # 5MB
+LOGO_ALLOWED_KINDS = {"jpeg", "png", "webp"}  # checked against magic bytes
+LOGO_BLOB_AREA = "company_logos"  # core/blob_store.py
 
 
 async def _get_hr_company(user_data: dict):
@@ -750,6 +768,7 @@ async def hr_update_company(
                 {"company_id": str(company["_id"])},
                 {"$set": {"company_name": update_data["name"]}}
             )
+            await reindex_jobs(db, {"company_id": str(company["_id"])})
 
         updated = await db.companies.find_one({"_id": company["_id"]})
         return {
@@ -795,27 +814,20 @@ async def hr_upload_company_logo(
                 detail=f"ไฟล์ไม่รองรับ — ใช้ได้เฉพาะ {', '.join(LOGO_ALLOWED_EXT)}"
             )
 
-        content = await file.read()
-        if len(content) > LOGO_MAX_SIZE:
-            raise HTTPException(status_code=400, detail="ไฟล์มีขนาดใหญ่เกิน 5MB")
+        # Stream new file — size / magic bytes checked while reading,
+        # stored content-addressed (uploads/company_logos/ab/cd/<sha>.png)
+        blob = await store_blob(db, file, LOGO_BLOB_AREA, max_size=LOGO_MAX_SIZE,
+                                allowed_kinds=LOGO_ALLOWED_KINDS)
 
-        # Remove old logo file
+        # Release old logo file (deleted once nothing references it)
         old_logo = company.get("logo_url", "")
         if old_logo and old_logo.startswith("/uploads/company_logos/"):
-            old_path = old_logo.lstrip("/")
-            if os.path.exists(old_path):
-                try:
-                    os.remove(old_path)
-                except Exception:
-                    pass
-
-        # Save new file
-        filename = f"{str(company['_id'])}_{uuid.uuid4().hex[:10]}{ext}"
-        file_path = os.path.join(COMPANY_LOGO_DIR, filename)
-        with open(file_path, "wb") as f:
-            f.write(content)
+            try:
+                await release_blob(db, old_logo)
+            except Exception:
+                pass
 
-        logo_url = f"/uploads/company_logos/{filename}"
+        logo_url = f"/{blob.path}"
 
         # Update company document
         await db.companies.update_one(
@@ -854,13 +866,11 @@ async def hr_delete_company_logo(
         if not logo_url:
             raise HTTPException(status_code=404, detail="ไม่มีโลโก้บริษัท")
 
-        # Delete file
-        file_path = logo_url.lstrip("/")
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception:
-                pass
+        # Delete file (once nothing else references the blob)
+        try:
+            await release_blob(db, logo_url)
+        except Exception:
+            pass
 
         await db.companies.update_one(
             {"_id": company["_id"]},
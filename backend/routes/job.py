@@ -10,16 +10,26 @@ Endpoints:
 
 import logging
 import os
+import re
 from datetime import datetime, timezone
 from typing import List, Optional
 
 from bson import ObjectId
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 
 from core.auth import get_current_user_data, get_current_user_id
 from core.database import get_database
+from core.dataloader import DataLoader, get_dataloader
+from core.indexes import declare_index
+from core.pagination import (
+    AI_SCORE_DESC, CREATED_DESC, NEXT_CURSOR_HEADER, SUBMITTED_DESC, keyset_page, page_from, with_cursor,
+)
+from core.resume_store import FILE_PROJECTION, find_latest_processed_resume
 from core.utils import generate_unique_id
+from services.application_counters import count_added, count_status_change
+from services.application_stats import job_stats
+from services.job_search import SEARCH_EXCLUDE, autocomplete, parse_query, search_fields, search_pipeline, text_filter
 from services.matching_service import MatchingService
 
 logger = logging.getLogger(__name__)
@@ -198,22 +208,9 @@ async def get_resume_features(user_id: str, db, has_cert_files: bool = None) ->
         dict ที่มี education, skills, projects, experience_months, ...
         หรือ None ถ้าไม่มี resume / ยังไม่ได้ extract
     """
-    # 1st try: processed resume without extraction_error (same as matching.py)
-    resume = await db.resumes.find_one(
-        {
-            "user_id": user_id,
-            "status": "processed",
-            "extracted_features.extraction_error": {"$exists": False}
-        },
-        sort=[("uploaded_at", -1)]
-    )
-
-    # 2nd try: any processed resume
-    if not resume:
-        resume = await db.resumes.find_one(
-            {"user_id": user_id, "status": "processed"},
-            sort=[("uploaded_at", -1)]
-        )
+    # processed resume without extraction_error, else any processed (same as matching.py)
+    # — features only, extracted_text stays in resume_texts
+    resume = await find_latest_processed_resume(db, user_id)
 
     if not resume:
         return None
@@ -278,6 +275,8 @@ def transform_job_data(job: dict) -> dict:
 
     result = {}
     for key, value in job.items():
+        if key in SEARCH_EXCLUDE:
+            continue
         if key == "_id":
             result["id"] = str(value)
         else:
@@ -292,6 +291,37 @@ def normalize_score(score_0_100: float) -> float:
     return round(score_0_100 / 100.0, 2)
 
 
+# รายการใบสมัคร (ผู้สมัครของ HR / ใบสมัครของนักศึกษา) ส่งเฉพาะ field ที่แถวในรายการใช้ —
+# resume_data ทั้งก้อน, xgboost_features_at_decision, status_history, cert analyses
+# อยู่ที่ GET /jobs/applications/{app_id} (โหลดเมื่อกางรายละเอียด)
+APPLICATION_SUMMARY_PROJECTION = {
+    field: 1 for field in (
+        "application_code", "job_id", "job_title", "company_name",
+        "student_id", "student_name", "student_email",
+        "status", "ai_score", "ai_method", "ai_feedback", "matching_breakdown", "matching_zone",
+        "resume_file_url", "certificate_urls", "portfolio_url", "interview",
+        "hr_reason", "decided_at", "submitted_at", "updated_at",
+        # แถวผู้สมัครแสดง skills + จำนวนเดือนประสบการณ์
+        "resume_data.skills", "resume_data.experience_months", "resume_data.total_experience_months",
+    )
+}
+
+
+def application_item(app: dict) -> dict:
+    """ใบสมัคร → dict สำหรับ response (ObjectId → str, datetime → ISO, _id → id)"""
+    item = {}
+    for key, value in app.items():
+        if isinstance(value, ObjectId):
+            item[key] = str(value)
+        elif hasattr(value, "isoformat"):
+            item[key] = value.isoformat()
+        else:
+            item[key] = value
+    if "_id" in item:
+        item["id"] = item.pop("_id")
+    return item
+
+
 # =============================================================================
 # HEALTH CHECK
 # =============================================================================
@@ -351,8 +381,13 @@ async def get_detailed_analytics(
     current_user: dict = Depends(get_current_user_data),
     db=Depends(get_database),
     company_id: Optional[str] = Query(None),
+    source: str = Query("live", pattern="^(live|rollup)$"),
 ):
-    """HR/Admin ดูสถิติเชิงลึก — Admin สามารถส่ง company_id เพื่อดู dashboard ของบริษัทอื่นได้"""
+    """
+    HR/Admin ดูสถิติเชิงลึก — Admin สามารถส่ง company_id เพื่อดู dashboard ของบริษัทอื่นได้
+
+    source=rollup อ่านจาก application_daily_stats (เร็วกว่าเมื่อประวัติยาว, ข้อมูล ณ รอบ rollup ล่าสุด)
+    """
     user_type = current_user.get("user_type")
     if user_type not in ["HR", "Admin"]:
         raise HTTPException(status_code=403, detail="HR or Admin only")
@@ -367,57 +402,19 @@ async def get_detailed_analytics(
         # Admin ส่ง company_id มา → filter เฉพาะบริษัทนั้น
         job_filter["company_id"] = company_id
 
-    jobs = await db.jobs.find(job_filter).sort("created_at", -1).to_list(length=100)
+    jobs = await db.jobs.find(
+        job_filter, {"title": 1, "is_active": 1}
+    ).sort("created_at", -1).to_list(length=100)
 
-    per_job = []
-    total_accepted = 0
-    total_rejected = 0
-    total_pending = 0
-    total_apps = 0
-    all_scores = []
+    # นับ/เฉลี่ย/histogram ฝั่ง MongoDB — ไม่ดึงใบสมัครทั้งก้อนมาที่ Python
+    return await job_stats(db, jobs, source=source)
 
-    for job in jobs:
-        jid = str(job["_id"])
-        apps = await db.applications.find({"job_id": jid}).to_list(length=500)
-
-        accepted = sum(1 for a in apps if a.get("status") == "accepted")
-        rejected = sum(1 for a in apps if a.get("status") == "rejected")
-        pending = sum(1 for a in apps if a.get("status") == "pending")
-        scores = [a.get("ai_score", 0) for a in apps if a.get("ai_score") is not None]
-        avg_score = round(sum(scores) / len(scores) * 100, 1) if scores else 0
-
-        total_accepted += accepted
-        total_rejected += rejected
-        total_pending += pending
-        total_apps += len(apps)
-        all_scores.extend(scores)
-
-        per_job.append({
-            "job_id": jid,
-            "title": job.get("title", ""),
-            "is_active": job.get("is_active", False),
-            "total": len(apps),
-            "accepted": accepted,
-            "rejected": rejected,
-            "pending": pending,
-            "avg_ai_score": avg_score,
-        })
 
-    overall_avg = round(sum(all_scores) / len(all_scores) * 100, 1) if all_scores else 0
-    acceptance_rate = round(total_accepted / total_apps * 100, 1) if total_apps else 0
-
-    return {
-        "summary": {
-            "total_jobs": len(jobs),
-            "total_applications": total_apps,
-            "total_accepted": total_accepted,
-            "total_rejected": total_rejected,
-            "total_pending": total_pending,
-            "acceptance_rate": acceptance_rate,
-            "avg_ai_score": overall_avg,
-        },
-        "per_job": per_job,
-    }
+APPLICANT_SORTS = {
+    "ai_score": AI_SCORE_DESC,
+    "name": [("student_name", 1), ("_id", 1)],
+    "date": SUBMITTED_DESC,
+}
 
 
 @router.get("/all-applicants")
@@ -428,8 +425,11 @@ async def get_all_applicants(
     status_filter: Optional[str] = Query(None),
     sort_by: Optional[str] = Query("ai_score"),
     company_id: Optional[str] = Query(None),
+    limit: int = Query(200, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    loader: DataLoader = Depends(get_dataloader),
 ):
-    """HR/Admin ดูผู้สมัครทุกตำแหน่ง — สำหรับ cross-job search"""
+    """HR/Admin ดูผู้สมัครทุกตำแหน่ง — สำหรับ cross-job search (หน้าถัดไปใช้ next_cursor)"""
     user_type = current_user.get("user_type")
     if user_type not in ["HR", "Admin"]:
         raise HTTPException(status_code=403, detail="HR or Admin only")
@@ -447,69 +447,53 @@ async def get_all_applicants(
         job_ids.append(str(job["_id"]))
 
     if not job_ids:
-        return {"applicants": []}
+        return {"applicants": [], "next_cursor": None}
 
     app_filter = {"job_id": {"$in": job_ids}}
     if status_filter and status_filter != "all":
         app_filter["status"] = status_filter
+    if search:
+        # ค้นหาใน query (ไม่กรองหลังดึง) → แบ่งหน้าได้ถูกต้อง
+        search_regex = {"$regex": re.escape(search), "$options": "i"}
+        app_filter["$or"] = [
+            {"student_name": search_regex},
+            {"student_email": search_regex},
+            {"job_title": search_regex},
+        ]
 
-    sort_field = "ai_score"
-    sort_dir = -1
-    if sort_by == "name":
-        sort_field = "student_name"
-        sort_dir = 1
-    elif sort_by == "date":
-        sort_field = "submitted_at"
-        sort_dir = -1
+    sort = APPLICANT_SORTS.get(sort_by, AI_SCORE_DESC)
+    page = await keyset_page(db.applications, app_filter, sort, limit, cursor=cursor,
+                             projection=APPLICATION_SUMMARY_PROJECTION)
 
-    applications = await db.applications.find(app_filter).sort(
-        sort_field, sort_dir
-    ).to_list(length=200)
+    result = [application_item(app) for app in page.items]
 
-    result = []
-    for app in applications:
-        if search:
-            s = search.lower()
-            name = (app.get("student_name") or "").lower()
-            email = (app.get("student_email") or "").lower()
-            title = (app.get("job_title") or "").lower()
-            if s not in name and s not in email and s not in title:
-                continue
-
-        item = {}
-        for key, value in app.items():
-            if isinstance(value, ObjectId):
-                item[key] = str(value)
-            elif hasattr(value, "isoformat"):
-                item[key] = value.isoformat()
-            else:
-                item[key] = value
-        if "_id" in item:
-            item["id"] = item.pop("_id")
-
-        if not item.get("resume_file_url") and item.get("student_id"):
-            resume = await db.resumes.find_one(
-                {"user_id": item["student_id"]},
-                sort=[("created_at", -1)]
-            )
-            if resume:
-                fp = resume.get("file_path", "")
-                if fp:
-                    item["resume_file_url"] = "/" + fp.replace("\\", "/")
-
-        result.append(item)
+    # Backfill resume_file_url — resume ของผู้สมัครทุกคนใน query เดียว
+    missing = [item for item in result if not item.get("resume_file_url") and item.get("student_id")]
+    resumes = await loader.load_many(
+        "resumes", [item["student_id"] for item in missing],
+        field="user_id", projection=FILE_PROJECTION, sort=[("created_at", -1)],
+    )
+    for item, resume in zip(missing, resumes):
+        fp = (resume or {}).get("file_path", "")
+        if fp:
+            item["resume_file_url"] = "/" + fp.replace("\\", "/")
 
-    return {"applicants": result}
+    return {"applicants": result, "next_cursor": page.next_cursor}
 
 
 # =============================================================================
 # HR-SPECIFIC JOB LISTING — กรองเฉพาะงานของบริษัทตัวเอง
 # =============================================================================
 
+declare_index("jobs", [("company_id", 1), ("created_at", -1), ("_id", -1)],
+              query={"company_id": "?"}, sort=CREATED_DESC)
+
+
 @router.get("/my-company")
 async def get_my_company_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     search: Optional[str] = None,
     department: Optional[str] = None,
     is_active: Optional[str] = None,
@@ -532,34 +516,42 @@ async def get_my_company_jobs(
     elif user_type == "Admin" and company_id:
         job_filter["company_id"] = company_id
 
-    if search:
-        job_filter["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"department": {"$regex": search, "$options": "i"}},
-        ]
     if department:
         job_filter["department"] = department
     if is_active is not None:
         job_filter["is_active"] = is_active.lower() == "true"
 
-    total_count = await db.jobs.count_documents(job_filter)
-    cursor = db.jobs.find(job_filter).sort("created_at", -1).skip(skip).limit(limit)
-    jobs = await cursor.to_list(length=limit)
+    # ค้นหา → เรียงตาม relevance แบ่งหน้าด้วย skip (ไม่มี cursor)
+    text_query = parse_query(search, prefix=True)
+    if text_query:
+        total_count = await db.jobs.count_documents(text_filter(job_filter, text_query))
+        jobs = await db.jobs.aggregate(search_pipeline(job_filter, text_query, skip, limit)).to_list(length=limit)
+        next_cursor = None
+    else:
+        total_count = await db.jobs.count_documents(job_filter)
+        page = await keyset_page(db.jobs, job_filter, CREATED_DESC, limit, cursor=cursor, skip=skip)
+        jobs, next_cursor = page.items, page.next_cursor
 
-    jobs_data = []
-    for job in jobs:
-        app_count = await db.applications.count_documents({"job_id": str(job["_id"])})
-        job_dict = transform_job_data(job)
-        job_dict["applications_count"] = app_count
-        jobs_data.append(job_dict)
+    # applications_count / status_counts ดูแลโดย services/application_counters.py
+    jobs_data = [transform_job_data(job) for job in jobs]
 
     return {
         "jobs": jobs_data,
         "total_count": total_count,
+        "next_cursor": next_cursor,
     }
 
 
+@router.get("/autocomplete")
+async def autocomplete_jobs(
+    q: str = Query("", max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    db=Depends(get_database),
+):
+    """คำแนะนำชื่อตำแหน่งงานระหว่างพิมพ์ (public) — token สุดท้ายจับแบบ prefix"""
+    return {"suggestions": await autocomplete(db, q, limit)}
+
+
 # =============================================================================
 # AI RECOMMENDATIONS (Student)
 # =============================================================================
@@ -654,40 +646,42 @@ async def get_not_ready_jobs(
     }
 
 
+# รายการใบสมัครของนักศึกษา + ตรวจสมัครซ้ำ (student_id, job_id)
+declare_index("applications", [("student_id", 1), ("submitted_at", -1), ("_id", -1)],
+              query={"student_id": "?"}, sort=SUBMITTED_DESC)
+
+
 @router.get("/my-applications")
 async def get_my_applications(
+    response: Response,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     user_id: str = Depends(get_current_user_id),
     db=Depends(get_database),
+    loader: DataLoader = Depends(get_dataloader),
 ):
-    """Student ดูรายการงานที่สมัครไว้ (เรียงจากใหม่สุด)"""
-    applications = await db.applications.find(
-        {"student_id": user_id}
-    ).sort("submitted_at", -1).to_list(length=100)
+    """Student ดูรายการงานที่สมัครไว้ (เรียงจากใหม่สุด) — cursor หน้าถัดไปใน header X-Next-Cursor"""
+    page = await keyset_page(db.applications, {"student_id": user_id}, SUBMITTED_DESC, limit, cursor=cursor,
+                             projection=APPLICATION_SUMMARY_PROJECTION)
+    applications = page.items
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    # job ของทุกใบสมัครใน query เดียว
+    job_docs = await loader.load_many(
+        "jobs", [app.get("job_id") for app in applications],
+        projection={"title": 1, "company_name": 1},
+    )
+    job_doc_by_app = {app["_id"]: job for app, job in zip(applications, job_docs)}
 
     result = []
     for app in applications:
-        item = {}
-        for key, value in app.items():
-            if isinstance(value, ObjectId):
-                item[key] = str(value)
-            elif hasattr(value, "isoformat"):
-                item[key] = value.isoformat()
-            else:
-                item[key] = value
-
-        if "_id" in item:
-            item["id"] = item.pop("_id")
-
-        job_id = app.get("job_id")
-        if job_id:
-            try:
-                oid = ObjectId(job_id) if isinstance(job_id, str) else job_id
-                job_doc = await db.jobs.find_one({"_id": oid})
-                if job_doc:
-                    item["job_title"] = job_doc.get("title", "ตำแหน่งงาน")
-                    item["company_name"] = job_doc.get("company_name", "บริษัท")
-            except Exception:
-                pass
+        item = application_item(app)
+
+        job_doc = job_doc_by_app.get(app["_id"])
+        if job_doc:
+            item["job_title"] = job_doc.get("title", "ตำแหน่งงาน")
+            item["company_name"] = job_doc.get("company_name", "บริษัท")
 
         result.append(item)
 
@@ -747,40 +741,43 @@ async def create_job(
         "created_at": datetime.now(timezone.utc),
     }
 
+    job_doc.update(search_fields(job_doc))
+
     result = await db.jobs.insert_one(job_doc)
     created_job = await db.jobs.find_one({"_id": result.inserted_id})
 
     return transform_job_data(created_job)
 
 
+declare_index("jobs", [("is_active", 1), ("created_at", -1), ("_id", -1)],
+              query={"is_active": True}, sort=CREATED_DESC)
+
+
 @router.get("")
 async def get_jobs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=50),
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
     db=Depends(get_database),
 ):
-    """ดูรายการงานทั้งหมด (public, เรียงจากใหม่สุด)"""
-    filter_query = {"is_active": True}
+    """ดูรายการงานทั้งหมด (public, เรียงจากใหม่สุด) — cursor หน้าถัดไปใน header X-Next-Cursor
 
-    if search:
-        filter_query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"company_name": {"$regex": search, "$options": "i"}},
-        ]
+    มี search → เรียงตาม relevance (services/job_search.py) แบ่งหน้าด้วย skip
+    """
+    filter_query = {"is_active": True}
 
-    cursor = db.jobs.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
-    jobs = await cursor.to_list(length=limit)
+    text_query = parse_query(search, prefix=True)
+    if text_query:
+        jobs = await db.jobs.aggregate(search_pipeline(filter_query, text_query, skip, limit)).to_list(length=limit)
+        return [transform_job_data(job) for job in jobs]
 
-    result = []
-    for job in jobs:
-        job_dict = transform_job_data(job)
-        # Live count — always reflects actual DB state
-        job_dict["applications_count"] = await db.applications.count_documents({"job_id": job_dict["id"]})
-        result.append(job_dict)
+    page = await keyset_page(db.jobs, filter_query, CREATED_DESC, limit, cursor=cursor, skip=skip)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
 
-    return result
+    return [transform_job_data(job) for job in page.items]
 
 
 @router.get("/{job_id}")
@@ -797,10 +794,7 @@ async def get_job_detail(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job_dict = transform_job_data(job)
-    # Live count — always reflects actual DB state
-    job_dict["applications_count"] = await db.applications.count_documents({"job_id": job_dict["id"]})
-    return job_dict
+    return transform_job_data(job)
 
 
 @router.put("/{job_id}")
@@ -837,6 +831,7 @@ async def update_job(
 
     update_data = job_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_data.update(search_fields({**existing_job, **update_data}))
 
     result = await db.jobs.update_one(
         {"_id": ObjectId(job_id)},
@@ -942,6 +937,7 @@ async def apply_job(
     # ดึง resume file path สำหรับ HR ดู PDF
     resume_doc = await db.resumes.find_one(
         {"user_id": user_id},
+        FILE_PROJECTION,
         sort=[("created_at", -1)]
     )
     resume_file_url = ""
@@ -975,11 +971,7 @@ async def apply_job(
     }
 
     result = await db.applications.insert_one(app_doc)
-
-    await db.jobs.update_one(
-        {"_id": ObjectId(job_id)},
-        {"$inc": {"applications_count": 1}},
-    )
+    await count_added(db, job_id, app_doc["status"])
 
     logger.info("[Jobs] User %s applied to job %s (score: %s)", user_id, job_id, ai_score)
 
@@ -990,13 +982,95 @@ async def apply_job(
 # HR VIEW APPLICANTS
 # =============================================================================
 
+# รายการ: ลิงก์ไฟล์เท่านั้น / รายละเอียด: + ผลวิเคราะห์ certificate
+APPLICANT_RESUME_PROJECTION = {"_id": 0, "file_path": 1}
+APPLICANT_CERT_PROJECTION = {"_id": 0, "file_path": 1, "file_url": 1}
+DETAIL_RESUME_PROJECTION = {**APPLICANT_RESUME_PROJECTION, "cert_llm_analyses": 1}
+DETAIL_CERT_PROJECTION = {**APPLICANT_CERT_PROJECTION, "llm_analysis": 1}
+
+
+declare_index("applications", [("job_id", 1), ("ai_score", -1), ("_id", 1)],
+              query={"job_id": "?"}, sort=AI_SCORE_DESC)
+
+
+def applicants_pipeline(job_id: str, skip: int, limit: int, cursor: Optional[str] = None) -> list:
+    """
+    ใบสมัครของ job หนึ่งหน้า + resume ล่าสุด + certificates ของผู้สมัคร ใน aggregation เดียว
+
+    เรียง ai_score มาก→น้อย แล้วตาม _id เพื่อให้หน้าคงที่เมื่อคะแนนเท่ากัน; ส่ง cursor
+    มา → keyset แทน $skip. ดึง limit + 1 แถวเพื่อรู้ว่ามีหน้าถัดไป;
+    $lookup ทำหลัง $limit จึงดึง resume/cert เฉพาะผู้สมัครในหน้านั้น; ใบสมัครถูกตัดเหลือ
+    APPLICATION_SUMMARY_PROJECTION ก่อน $lookup
+    """
+    return [
+        {"$match": with_cursor({"job_id": job_id}, AI_SCORE_DESC, cursor)},
+        {"$sort": dict(AI_SCORE_DESC)},
+        {"$skip": 0 if cursor else skip},
+        {"$limit": limit + 1},
+        {"$project": APPLICATION_SUMMARY_PROJECTION},
+        # resume ที่ processed ล่าสุดก่อน, ไม่มีก็ใช้ตัวล่าสุด
+        {"$lookup": {
+            "from": "resumes",
+            "let": {"student_id": "$student_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$user_id", "$$student_id"]}}},
+                {"$addFields": {"_processed": {"$eq": ["$status", "processed"]}}},
+                {"$sort": {"_processed": -1, "uploaded_at": -1, "created_at": -1}},
+                {"$limit": 1},
+                {"$project": APPLICANT_RESUME_PROJECTION},
+            ],
+            "as": "_resume",
+        }},
+        {"$lookup": {
+            "from": "certificates",
+            "let": {"student_id": "$student_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$user_id", "$$student_id"]}}},
+                {"$limit": 20},
+                {"$project": APPLICANT_CERT_PROJECTION},
+            ],
+            "as": "_certificates",
+        }},
+    ]
+
+
+def backfill_applicant(item: dict, resume: Optional[dict], cert_docs: list) -> dict:
+    """เติม resume_file_url / cert_llm_analyses / certificate_urls ที่ใบสมัครเก่ายังไม่มี"""
+    if resume:
+        if not item.get("resume_file_url"):
+            fp = resume.get("file_path", "")
+            if fp:
+                item["resume_file_url"] = "/" + fp.replace("\\", "/")
+        cert_analyses = resume.get("cert_llm_analyses")
+        if cert_analyses and isinstance(cert_analyses, list) and not item.get("cert_llm_analyses"):
+            item["cert_llm_analyses"] = cert_analyses
+
+    if cert_docs and not item.get("certificate_urls"):
+        cert_urls = []
+        for c in cert_docs:
+            fp = c.get("file_path") or c.get("file_url") or ""
+            if fp:
+                url = "/" + fp.replace("\\", "/") if not fp.startswith("/") else fp
+                cert_urls.append(url)
+        if cert_urls:
+            item["certificate_urls"] = cert_urls
+        if not item.get("cert_llm_analyses"):
+            analyses = [c["llm_analysis"] for c in cert_docs if c.get("llm_analysis")]
+            if analyses:
+                item["cert_llm_analyses"] = analyses
+    return item
+
+
 @router.get("/{job_id}/applicants")
 async def get_applicants(
     job_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user_data),
     db=Depends(get_database),
 ):
-    """HR/Admin ดูรายชื่อผู้สมัคร (เรียงตาม AI score สูงสุด)"""
+    """HR/Admin ดูรายชื่อผู้สมัคร (เรียงตาม AI score สูงสุด) — aggregation เดียวต่อหน้า"""
     user_type = current_user.get("user_type")
     if user_type not in ["HR", "Admin"]:
         raise HTTPException(status_code=403, detail="HR or Admin only")
@@ -1024,77 +1098,69 @@ async def get_applicants(
         "department": job.get("department", ""),
     }
 
-    applications = await db.applications.find(
-        {"job_id": job_id}
-    ).sort("ai_score", -1).to_list(length=100)
+    total = await db.applications.count_documents({"job_id": job_id})
+    applications = await db.applications.aggregate(
+        applicants_pipeline(job_id, skip, limit, cursor)
+    ).to_list(length=limit + 1)
+    page = page_from(applications, AI_SCORE_DESC, limit)
 
     result = []
-    for app in applications:
-        item = {}
-        for key, value in app.items():
-            if isinstance(value, ObjectId):
-                item[key] = str(value)
-            elif hasattr(value, "isoformat"):
-                item[key] = value.isoformat()
-            else:
-                item[key] = value
-
-        if "_id" in item:
-            item["id"] = item.pop("_id")
-
-        student_id = item.get("student_id")
-
-        # ─── Backfill resume_file_url + cert_llm_analyses from resume doc ───
-        resume = None
-        if student_id and (not item.get("resume_file_url") or not item.get("cert_llm_analyses")):
-            resume = await db.resumes.find_one(
-                {"user_id": student_id, "status": "processed"},
-                sort=[("uploaded_at", -1)]
-            )
-            # Fallback to any resume if processed not found
-            if not resume:
-                resume = await db.resumes.find_one(
-                    {"user_id": student_id},
-                    sort=[("created_at", -1)]
-                )
-
-        if resume:
-            if not item.get("resume_file_url"):
-                fp = resume.get("file_path", "")
-                if fp:
-                    item["resume_file_url"] = "/" + fp.replace("\\", "/")
-            # Always overwrite with latest cert_llm_analyses from resume doc
-            cert_analyses = resume.get("cert_llm_analyses")
-            if cert_analyses and isinstance(cert_analyses, list) and not item.get("cert_llm_analyses"):
-                item["cert_llm_analyses"] = cert_analyses
-
-        # ─── Inject certificate_urls from certificates collection ───
-        if student_id and not item.get("certificate_urls"):
-            cert_docs = await db.certificates.find(
-                {"user_id": student_id}
-            ).to_list(length=20)
-            if cert_docs:
-                cert_urls = []
-                for c in cert_docs:
-                    fp = c.get("file_path") or c.get("file_url") or ""
-                    if fp:
-                        url = "/" + fp.replace("\\", "/") if not fp.startswith("/") else fp
-                        cert_urls.append(url)
-                if cert_urls:
-                    item["certificate_urls"] = cert_urls
-                # Also inject cert_llm_analyses if still missing
-                if not item.get("cert_llm_analyses"):
-                    analyses = [c["llm_analysis"] for c in cert_docs if c.get("llm_analysis")]
-                    if analyses:
-                        item["cert_llm_analyses"] = analyses
+    for app in page.items:
+        resume = (app.pop("_resume", None) or [None])[0]
+        cert_docs = app.pop("_certificates", None) or []
 
+        item = application_item(app)
+        backfill_applicant(item, resume, cert_docs)
         result.append(item)
 
-    return {"job": job_info, "applicants": result}
+    return {
+        "job": job_info, "applicants": result, "total": total,
+        "skip": skip, "limit": limit, "next_cursor": page.next_cursor,
+    }
 
 
 
 
+@router.get("/applications/{app_id}")
+async def get_application_detail(
+    app_id: str,
+    current_user: dict = Depends(get_current_user_data),
+    db=Depends(get_database),
+):
+    """ใบสมัครฉบับเต็ม (resume_data, status_history, cert analyses) — เจ้าของใบสมัคร, HR ของบริษัท, Admin"""
+    if not ObjectId.is_valid(app_id):
+        raise HTTPException(status_code=400, detail="Invalid application ID")
+
+    application = await db.applications.find_one({"_id": ObjectId(app_id)})
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    user_type = current_user.get("user_type")
+    if user_type == "HR":
+        user = await db.users.find_one({"_id": ObjectId(current_user["sub"])}, {"company_id": 1})
+        if not user or not user.get("company_id"):
+            raise HTTPException(status_code=403, detail="HR user must be assigned to a company")
+
+        job_id = application.get("job_id", "")
+        job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"company_id": 1}) if ObjectId.is_valid(job_id) else None
+        if not job or str(job.get("company_id")) != str(user["company_id"]):
+            raise HTTPException(status_code=403, detail="You can only view applications for your company's jobs")
+    elif user_type != "Admin" and application.get("student_id") != current_user.get("sub"):
+        raise HTTPException(status_code=403, detail="Not your application")
+
+    item = application_item(application)
+
+    student_id = application.get("student_id")
+    if user_type in ["HR", "Admin"] and student_id:
+        resume = await db.resumes.find_one(
+            {"user_id": student_id, "status": "processed"}, DETAIL_RESUME_PROJECTION, sort=[("uploaded_at", -1)],
+        ) or await db.resumes.find_one({"user_id": student_id}, DETAIL_RESUME_PROJECTION, sort=[("uploaded_at", -1)])
+        cert_docs = await db.certificates.find({"user_id": student_id}, DETAIL_CERT_PROJECTION).to_list(length=20)
+        backfill_applicant(item, resume, cert_docs)
+
+    return item
+
+
 @router.put("/applications/{app_id}")
 async def update_application_status(
     app_id: str,
@@ -1157,13 +1223,16 @@ async def update_application_status(
     except Exception as feat_err:
         logger.warning("[HR] Failed to extract XGBoost features: %s", feat_err)
 
-    result = await db.applications.update_one(
+    # คืน doc ก่อนแก้ → status เดิมสำหรับปรับ counter ของ job (atomic ต่อใบสมัคร)
+    previous = await db.applications.find_one_and_update(
         {"_id": ObjectId(app_id)},
         {"$set": update_data},
+        projection={"job_id": 1, "status": 1},
     )
 
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Application not found")
+    await count_status_change(db, previous.get("job_id"), previous.get("status"), new_status)
 
     # --- Add status_history entry for timeline ---
     await db.applications.update_one(
@@ -21,6 +21,7 @@ from core.database import get_database
 
 # Authentication
 from core.auth import get_current_user_id, get_current_user_data
+from core.resume_store import find_latest_processed_resume
 
 # Matching Service
 from services.matching_service import MatchingService
@@ -180,21 +181,8 @@ async def calculate_match_score(
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 2. Get user's resume (latest processed resume without error)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
-        resume = await db.resumes.find_one(
-            {
-                "user_id": user_id,
-                "status": "processed",
-                "extracted_features.extraction_error": {"$exists": False}
-            },
-            sort=[("uploaded_at", -1)]  # Get the latest one
-        )
-        
-        # Fallback: try any processed resume if above query fails
-        if not resume:
-            resume = await db.resumes.find_one(
-                {"user_id": user_id, "status": "processed"},
-                sort=[("uploaded_at", -1)]
-            )
+        # features only — extracted_text stays in resume_texts
+        resume = await find_latest_processed_resume(db, user_id)
         
         if not resume:
             raise HTTPException(
@@ -314,20 +302,8 @@ async def get_recommendations(
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 1. Get user's resume (latest without error)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━
-        resume = await db.resumes.find_one(
-            {
-                "user_id": user_id,
-                "status": "processed",
-                "extracted_features.extraction_error": {"$exists": False}
-            },
-            sort=[("uploaded_at", -1)]
-        )
-        
-        if not resume:
-            resume = await db.resumes.find_one(
-                {"user_id": user_id, "status": "processed"},
-                sort=[("uploaded_at", -1)]
-            )
+        # features only — extracted_text stays in resume_texts
+        resume = await find_latest_processed_resume(db, user_id)
         
         if not resume:
             raise HTTPException(
@@ -451,20 +427,8 @@ async def get_gap_analysis(
             )
         
         # Get user's resume (latest without error)
-        resume = await db.resumes.find_one(
-            {
-                "user_id": user_id,
-                "status": "processed",
-                "extracted_features.extraction_error": {"$exists": False}
-            },
-            sort=[("uploaded_at", -1)]
-        )
-        
-        if not resume:
-            resume = await db.resumes.find_one(
-                {"user_id": user_id, "status": "processed"},
-                sort=[("uploaded_at", -1)]
-            )
+        # features only — extracted_text stays in resume_texts
+        resume = await find_latest_processed_resume(db, user_id)
         
         if not resume:
             raise HTTPException(
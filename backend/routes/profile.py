@@ -4,12 +4,15 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from typing import Optional
 import os
-import uuid
 
 # Local imports
 from core.auth import get_current_user_id, hash_password, verify_password, get_current_user_data
 from core.database import get_database
+from core.blob_store import release_blob, store_blob
+from core.resume_store import delete_resume_texts
 from core.models import ChangePasswordRequest
+from services.application_counters import count_removed
+from services.user_stats import get_user_stats, invalidate_user_stats
 
 # Create router
 router = APIRouter(prefix="/profile", tags=["Profile Management"])
@@ -72,8 +75,10 @@ class ProfileResponse(BaseModel):
 # FILE UPLOAD CONFIGURATION
 # =============================================================================
 UPLOAD_DIR = "uploads/profiles"
+BLOB_AREA = "profiles"  # uploads/profiles/ab/cd/<sha256>.<ext> (core/blob_store.py)
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+ALLOWED_KINDS = {"jpeg", "png", "gif"}  # ตรวจจาก magic bytes
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -251,48 +256,32 @@ async def upload_profile_image(
                 detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
-        # ตรวจสอบขนาดไฟล์
-        contents = await file.read()
-        if len(contents) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File too large. Maximum size is 5MB"
-            )
-        
-        # สร้างชื่อไฟล์ใหม่
-        file_id = str(uuid.uuid4())
-        filename = f"{user_id}_{file_id}{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
+        # บันทึกไฟล์ใหม่ (stream — ตรวจขนาด / magic bytes ระหว่างอ่าน)
+        # เก็บตาม SHA-256: uploads/profiles/ab/cd/<sha>.png — รูปซ้ำใช้ไฟล์เดิม
+        blob = await store_blob(db, file, BLOB_AREA, max_size=MAX_FILE_SIZE, allowed_kinds=ALLOWED_KINDS)
+        image_url = f"/{blob.path}"
+        filename = os.path.basename(blob.path)
         
-        # ลบรูปเก่า (ถ้ามี)
+        # ลบรูปเก่า (ถ้ามี) — หลังรูปใหม่บันทึกสำเร็จแล้วเท่านั้น
         old_image = user.get("profile_image")
         if old_image and old_image.startswith("/uploads/profiles/"):
-            old_file_path = old_image[1:]  # เอา / หน้าออก
-            if os.path.exists(old_file_path):
-                try:
-                    os.remove(old_file_path)
-                except:
-                    pass  # ไม่สำคัญถ้าลบไม่ได้
-        
-        # บันทึกไฟล์ใหม่
-        with open(file_path, "wb") as buffer:
-            buffer.write(contents)
+            try:
+                await release_blob(db, old_image)
+            except Exception:
+                pass  # ไม่สำคัญถ้าลบไม่ได้
         
         # อัปเดตฐานข้อมูล
         update_result = await db.users.update_one(
             {"_id": user["_id"]},
             {"$set": {
-                "profile_image": f"/uploads/profiles/{filename}",
+                "profile_image": image_url,
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
         
         if update_result.modified_count == 0:
             # ลบไฟล์ถ้าอัปเดต DB ไม่สำเร็จ
-            try:
-                os.remove(file_path)
-            except:
-                pass
+            await release_blob(db, blob.path)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update profile image in database"
@@ -300,7 +289,7 @@ async def upload_profile_image(
         
         return {
             "message": "Profile image uploaded successfully",
-            "image_url": f"/uploads/profiles/{filename}",
+            "image_url": image_url,
             "filename": filename
         }
         
@@ -330,14 +319,12 @@ async def delete_profile_image(user_id: str = Depends(get_current_user_id)):
                 detail="No profile image found"
             )
         
-        # ลบไฟล์
+        # ลบไฟล์ (ลด refcount — ลบจริงเมื่อไม่มีใครใช้แล้ว)
         if current_image.startswith("/uploads/profiles/"):
-            file_path = current_image[1:]  # เอา / หน้าออก
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    print(f"Failed to delete file {file_path}: {e}")
+            try:
+                await release_blob(db, current_image)
+            except Exception as e:
+                print(f"Failed to delete file {current_image}: {e}")
         
         # อัปเดตฐานข้อมูล
         await db.users.update_one(
@@ -380,20 +367,17 @@ async def delete_account(user_id: str = Depends(get_current_user_id)):
         if user_type == "Student":
             # 1. Resumes — both string and ObjectId user_id variants
             resumes = await db.resumes.find(
-                {"$or": [{"user_id": user_id}, {"user_id": str(user_oid)}]}
+                {"$or": [{"user_id": user_id}, {"user_id": str(user_oid)}]}, {"file_path": 1}
             ).to_list(200)
 
             for resume in resumes:
-                file_path = resume.get("file_path", "")
-                if file_path:
-                    clean = file_path.lstrip("/")
-                    if os.path.exists(clean):
-                        try:
-                            os.remove(clean)
-                        except Exception:
-                            pass
+                try:
+                    await release_blob(db, resume.get("file_path"))
+                except Exception:
+                    pass
 
             resume_ids = [str(r["_id"]) for r in resumes]
+            await delete_resume_texts(db, [r["_id"] for r in resumes])
             await db.resumes.delete_many(
                 {"$or": [{"user_id": user_id}, {"user_id": str(user_oid)}]}
             )
@@ -405,12 +389,10 @@ async def delete_account(user_id: str = Depends(get_current_user_id)):
             ).to_list(200)
 
             for cert in certs:
-                file_path = cert.get("file_path", "")
-                if file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                    except Exception:
-                        pass
+                try:
+                    await release_blob(db, cert.get("file_path"))
+                except Exception:
+                    pass
 
             await db.certificates.delete_many(
                 {"$or": [{"user_id": user_id}, {"user_id": str(user_oid)}]}
@@ -425,14 +407,15 @@ async def delete_account(user_id: str = Depends(get_current_user_id)):
             deleted_summary["matching_results"] = del_match.deleted_count
 
             # 4. Applications — stored under student_id field
-            del_apps = await db.applications.delete_many(
-                {"$or": [
-                    {"student_id": user_id},
-                    {"student_id": str(user_oid)},
-                    {"user_id": user_id},
-                    {"user_id": str(user_oid)},
-                ]}
-            )
+            app_filter = {"$or": [
+                {"student_id": user_id},
+                {"student_id": str(user_oid)},
+                {"user_id": user_id},
+                {"user_id": str(user_oid)},
+            ]}
+            apps = await db.applications.find(app_filter, {"job_id": 1, "status": 1}).to_list(length=None)
+            del_apps = await db.applications.delete_many(app_filter)
+            await count_removed(db, apps)
             deleted_summary["applications"] = del_apps.deleted_count
 
         # ─────────────────────────────────────────
@@ -451,12 +434,10 @@ async def delete_account(user_id: str = Depends(get_current_user_id)):
         # ─────────────────────────────────────────
         profile_image = user.get("profile_image", "")
         if profile_image and profile_image.startswith("/uploads/profiles/"):
-            img_path = profile_image.lstrip("/")
-            if os.path.exists(img_path):
-                try:
-                    os.remove(img_path)
-                except Exception:
-                    pass
+            try:
+                await release_blob(db, profile_image)
+            except Exception:
+                pass
 
         try:
             del_notif = await db.notifications.delete_many(
@@ -470,6 +451,7 @@ async def delete_account(user_id: str = Depends(get_current_user_id)):
         # Final: delete user record
         # ─────────────────────────────────────────
         result = await db.users.delete_one({"_id": user_oid})
+        invalidate_user_stats()
         if result.deleted_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -572,17 +554,11 @@ async def get_dashboard_info(
                 "applications_received": 0,
             })
         elif user["user_type"] == "Admin":
-            # นับสถิติผู้ใช้
-            total_users = await db.users.count_documents({})
-            student_count = await db.users.count_documents({"user_type": "Student"})
-            hr_count = await db.users.count_documents({"user_type": "HR"})
-            admin_count = await db.users.count_documents({"user_type": "Admin"})
-            
+            # นับสถิติผู้ใช้ (cache ร่วมกับ /admin/dashboard)
+            user_stats = await get_user_stats(db)
             dashboard_data["stats"].update({
-                "total_users": total_users,
-                "student_count": student_count,
-                "hr_count": hr_count,
-                "admin_count": admin_count,
+                field: user_stats[field]
+                for field in ("total_users", "student_count", "hr_count", "admin_count")
             })
         
         return dashboard_data
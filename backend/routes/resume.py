@@ -3,32 +3,37 @@
 # ไฟล์: backend/routes/resume.py
 # =============================================================================
 
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends, UploadFile, File
 from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
 from bson import ObjectId
 from typing import Optional, List
+import asyncio
 import os
-import uuid
 import logging
 from pathlib import Path
 
-# PDF Processing Libraries
-import PyPDF2
-import pdfplumber
-import io
-
 # Local imports
 from core.database import get_database
 from core.auth import get_current_user_id
+from core.blob_store import release_blob, store_blob
+from core.resume_store import (
+    FILE_PROJECTION, SUMMARY_PROJECTION, delete_resume_texts, load_resume_text, save_resume_text, text_length,
+)
+from core.uploads import PDF_KINDS
 from pydantic import BaseModel, Field
 from typing import Dict, Any
 
 # AI Services
 from services.llm_service import LLMService
+from services.extraction_cache import extract_cached
+from services.extraction_cascade import get_extraction_cascade
+from services.pdf_pool import PDFExtractionError, get_pdf_pool
+from services.rule_extractor import get_rule_extractor
 
 # Initialize LLM Service (singleton)
 llm_service = LLMService()
+rule_extractor = get_rule_extractor()
 
 # สร้าง router สำหรับ Resume API
 router = APIRouter(prefix="/resumes", tags=["Resume Management"])
@@ -37,13 +42,16 @@ router = APIRouter(prefix="/resumes", tags=["Resume Management"])
 # 📁 CONFIGURATION - การตั้งค่า
 # =============================================================================
 UPLOAD_FOLDER = "uploads/resumes"  # โฟลเดอร์เก็บไฟล์
+BLOB_AREA = "resumes"              # uploads/resumes/ab/cd/<sha256>.pdf (core/blob_store.py)
 ALLOWED_EXTENSIONS = {".pdf"}      # อนุญาตเฉพาะ PDF
 MAX_FILE_SIZE = 15 * 1024 * 1024   # ขนาดไฟล์สูงสุด 15MB
 
 # Certificate upload config
 CERT_UPLOAD_FOLDER = "uploads/certificates"
+CERT_BLOB_AREA = "certificates"
 CERT_ALLOWED_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".webp"}
 CERT_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+CERT_ALLOWED_KINDS = {"pdf", "jpeg", "png", "webp"}  # ตรวจจาก magic bytes
 
 # สร้างโฟลเดอร์ถ้ายังไม่มี
 Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
@@ -84,6 +92,7 @@ class ResumeUploadResponse(BaseModel):
     message: str
     extracted_features: Optional[Dict[str, Any]] = None
     failure_type: Optional[str] = None  # image_only_pdf | ai_failed | partial_extraction | None
+    features_provisional: bool = False  # True = rule-based preview, LLM result still running
 
 class ResumeStatusResponse(BaseModel):
     """ข้อมูลสถานะการประมวลผล"""
@@ -95,6 +104,7 @@ class ResumeStatusResponse(BaseModel):
     file_size: int
     text_length: int
     error_message: Optional[str]
+    features_provisional: bool = False
 
 class ResumeDetailResponse(BaseModel):
     """ข้อมูลรายละเอียด Resume"""
@@ -126,112 +136,33 @@ def validate_file(file: UploadFile) -> tuple[bool, str]:
     
     return True, "ไฟล์ถูกต้อง"
 
-async def validate_file_size(file: UploadFile) -> tuple[bool, str, bytes]:
-    """ตรวจสอบขนาดไฟล์, อ่านข้อมูล และป้องกันการปลอมแปลงไฟล์ด้วย Magic bytes"""
-    
-    # อ่านไฟล์ทั้งหมด
-    contents = await file.read()
-    file_size = len(contents)
-    
-    # ตรวจสอบขนาด
-    if file_size > MAX_FILE_SIZE:
-        return False, f"ไฟล์ใหญ่เกินไป {file_size} bytes (สูงสุด {MAX_FILE_SIZE} bytes)", b""
-    
-    # ตรวจสอบ Magic Bytes สำหรับ PDF (%PDF-)
-    if not contents.startswith(b"%PDF-"):
-        return False, "ไฟล์ไม่ใช่รูปแบบ PDF ที่ถูกต้อง (Invalid magic bytes)", b""
-    
-    return True, f"ขนาดไฟล์และรูปแบบเหมาะสม", contents
-
-def _words_to_lines(words: list) -> str:
-    """Group pdfplumber word-dicts into lines by vertical position, return joined text."""
-    if not words:
-        return ""
-    lines, current_line, current_top = [], [], None
-    for w in words:
-        if current_top is None or abs(w["top"] - current_top) <= 5:
-            current_line.append(w["text"])
-            current_top = w["top"]
-        else:
-            lines.append(" ".join(current_line))
-            current_line, current_top = [w["text"]], w["top"]
-    if current_line:
-        lines.append(" ".join(current_line))
-    return "\n".join(lines)
-
-
-def extract_text_column_aware(file_content: bytes) -> str:
+async def extract_text_from_pdf(file_path: str, db=None, sha256: Optional[str] = None) -> str:
     """
-    Column-aware PDF extraction using pdfplumber word bboxes.
-    Splits each page into left/right columns by midpoint, reads in correct order.
-    Fixes garbled Thai text caused by multi-column resume layouts.
-    """
-    try:
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            pages_text = []
-            for page in pdf.pages:
-                words = page.extract_words(x_tolerance=5, y_tolerance=5, keep_blank_chars=False)
-                if not words:
-                    continue
-                mid_x = page.width / 2
-                left  = sorted([w for w in words if w["x0"] < mid_x],  key=lambda w: (round(w["top"] / 5) * 5, w["x0"]))
-                right = sorted([w for w in words if w["x0"] >= mid_x], key=lambda w: (round(w["top"] / 5) * 5, w["x0"]))
-                left_text  = _words_to_lines(left)
-                right_text = _words_to_lines(right)
-                page_text  = f"{left_text}\n\n{right_text}".strip() if right_text else left_text
-                if page_text:
-                    pages_text.append(page_text)
-        return "\n\n".join(pages_text).strip()
-    except Exception as e:
-        logger.error(f"Column-aware extraction failed: {e}")
-        return ""
-
-
-def _extract_plain_pdfplumber(file_content: bytes) -> str:
-    """Fallback: plain pdfplumber extraction (no column logic)."""
-    try:
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            return "\n".join(p.extract_text() or "" for p in pdf.pages).strip()
-    except Exception as e:
-        logger.error(f"pdfplumber plain extraction failed: {e}")
-        return ""
-
-
-def _extract_plain_pypdf2(file_content: bytes) -> str:
-    """Last-resort fallback using PyPDF2."""
-    try:
-        reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        return "\n".join(p.extract_text() or "" for p in reader.pages).strip()
-    except Exception as e:
-        logger.error(f"PyPDF2 extraction failed: {e}")
-        return ""
-
-
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """
-    Extract text from PDF using a 3-tier strategy:
-    1. Column-aware (best for Thai multi-column resumes)
-    2. Plain pdfplumber (fallback)
-    3. PyPDF2 (last resort)
+    Extract text from PDF with the "resume" extraction cascade
+    (services/extraction_cascade.py), run in the PDF process pool
+    (timeout + memory cap per document):
+    1. Column-aware + plain layouts from ONE pdfplumber pass
+       (column-aware preferred; plain only if it scores meaningfully higher)
+    2. PyPDF2 — only if the layout pass scores below the cascade threshold
+    With ``db``, results are cached by (SHA-256, extractor version) — identical
+    bytes are never parsed twice (services/extraction_cache.py).
     Always sanitizes the result before returning.
-    """
-    text = extract_text_column_aware(file_content)
-    plain = _extract_plain_pdfplumber(file_content)
-
-    # Prefer column-aware only if it yields meaningfully more content
-    if len(plain) > len(text) * 1.2:
-        text = plain
 
-    if not text or len(text.strip()) < 10:
-        text = _extract_plain_pypdf2(file_content)
+    Raises:
+        PDFExtractionError: document timed out / hit the memory cap / crashed the worker
+    """
+    extraction = await extract_cached(db, file_path, "resume", sha256)
+    source = "cache" if extraction.cached else "pool"
+    logger.info(f"PDF extracted via {extraction.method} ({source}): {len(extraction.text)} chars")
+    return llm_service.sanitize_text(extraction.text)
 
-    return llm_service.sanitize_text(text)
 
 
 def _diagnose_extraction(extracted_text: str, features: dict | None) -> str | None:
     """
     Diagnose extraction quality and return a failure_type code, or None on success.
     Codes: image_only_pdf | partial_extraction | ai_failed | None
+    (pdf_too_complex is set by upload_resume when the PDF pool aborts extraction)
     """
     if not extracted_text or len(extracted_text.strip()) < 50:
         return "image_only_pdf"
@@ -239,6 +170,15 @@ def _diagnose_extraction(extracted_text: str, features: dict | None) -> str | No
     if not features or "error" in features or features.get("extraction_error"):
         return "ai_failed"
 
+    # rule-based fallback (LLM ล้มเหลว/ไม่พร้อม) → status ยังเป็น processed (ใช้ match ได้)
+    # แต่ failure_type = ai_failed ให้ reprocess --failure-type ai_failed หาเจอ
+    if features.get("fallback_reason"):
+        return "ai_failed"
+
+    # chunked extraction ที่บาง chunk ล้มเหลว → profile ไม่ครบ
+    if features.get("partial_reason"):
+        return "partial_extraction"
+
     edu = features.get("education") or {}
     skills = features.get("skills") or {}
     techs = skills.get("technical_skills", [])
@@ -256,13 +196,47 @@ def _diagnose_extraction(extracted_text: str, features: dict | None) -> str | No
 # 📤 UPLOAD API - อัปโหลด Resume
 # =============================================================================
 
+async def _finalize_llm_features(resume_id: str, extracted_text: str, db) -> None:
+    """Background: replace the provisional rule-based profile with the LLM result."""
+    try:
+        logger.info(f"Resume {resume_id}: running AI analysis...")
+        extracted_features = await asyncio.to_thread(llm_service.extract_features, extracted_text)
+
+        # fallback / ผลไม่ครบ ถูกบอกด้วย failure_type เท่านั้น — status คง processed
+        # (find_latest_processed_resume จัดอันดับผล fallback ไว้หลังผล LLM เต็ม)
+        failure_type = _diagnose_extraction(extracted_text, extracted_features)
+        await db.resumes.update_one(
+            {"_id": ObjectId(resume_id), "features_provisional": True},
+            {"$set": {
+                "extracted_features": extracted_features,
+                "features_provisional": False,
+                "processed_at": datetime.now(timezone.utc),
+                "status": "processed",
+                "failure_type": failure_type,
+            }}
+        )
+        logger.info(f"Resume {resume_id}: AI analysis complete failure_type={failure_type}")
+    except Exception as e:
+        # Provisional rule-based features stay in place — matching keeps working
+        logger.error(f"Resume {resume_id}: AI error - {e}")
+        await db.resumes.update_one(
+            {"_id": ObjectId(resume_id)},
+            {"$set": {"features_provisional": False, "error_message": str(e)}}
+        )
+
+
 @router.post("/upload", response_model=ResumeUploadResponse)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="ไฟล์ Resume PDF"),
     user_id: str = Depends(get_current_user_id),
     db = Depends(get_database)
 ):
-    """📄 อัปโหลดและประมวลผล Resume PDF"""
+    """📄 อัปโหลดและประมวลผล Resume PDF
+
+    ส่งผล rule-based (provisional) กลับทันที แล้ว LLM วิเคราะห์ต่อเบื้องหลัง
+    และเขียนทับเมื่อเสร็จ (ดูสถานะได้จาก features_provisional)
+    """
     
     try:
         # ขั้นตอนที่ 1: ตรวจสอบไฟล์
@@ -270,21 +244,11 @@ async def upload_resume(
         if not is_valid:
             raise HTTPException(status_code=400, detail=message)
         
-        # ขั้นตอนที่ 2: ตรวจสอบขนาดและอ่านไฟล์
-        size_valid, size_message, file_content = await validate_file_size(file)
-        if not size_valid:
-            raise HTTPException(status_code=400, detail=size_message)
-        
-        file_size = len(file_content)
-        
-        # ขั้นตอนที่ 3: สร้างชื่อไฟล์ใหม่ — ใช้ relative path เสมอเพื่อรองรับ deployment
-        file_extension = Path(file.filename).suffix
-        unique_filename = f"{user_id}_{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)  # relative: uploads/resumes/xxx.pdf
-        
-        # ขั้นตอนที่ 4: บันทึกไฟล์
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        # ขั้นตอนที่ 2-4: stream ลงดิสก์ — ตรวจ magic bytes / ขนาดระหว่างอ่าน (ไม่ buffer ทั้งไฟล์)
+        # เก็บตาม SHA-256: uploads/resumes/ab/cd/<sha>.pdf — ไฟล์ซ้ำไม่เขียนลงดิสก์อีก
+        blob = await store_blob(db, file, BLOB_AREA, max_size=MAX_FILE_SIZE, allowed_kinds=PDF_KINDS)
+        file_path = blob.path  # relative เสมอเพื่อรองรับ deployment
+        file_size = blob.size
         
         # ขั้นตอนที่ 5: สร้างข้อมูลใน database
         resume_doc = {
@@ -293,7 +257,8 @@ async def upload_resume(
             "file_path": file_path,
             "file_type": "pdf",
             "file_size": file_size,
-            "extracted_text": "",  # จะอัปเดตทีหลัง
+            "file_sha256": blob.sha256,
+            "text_length": 0,  # ตัวข้อความเก็บแยกใน resume_texts (core/resume_store.py)
             "uploaded_at": datetime.now(timezone.utc),
             "processed_at": None,
             "status": "pending"  # pending = รอประมวลผล
@@ -303,43 +268,39 @@ async def upload_resume(
         resume_id = str(result.inserted_id)
         
         extracted_features = None
+        features_provisional = False
         try:
-            extracted_text = extract_text_from_pdf(file_content)
+            # ไฟล์เดิมเคยถูก extract แล้ว (hash + extractor version ตรงกัน) → ใช้ผลเดิมจาก cache
+            extracted_text = await extract_text_from_pdf(file_path, db, blob.sha256)
 
             if extracted_text and len(extracted_text.strip()) > 0:
                 logger.info(f"Resume {resume_id}: extracted {len(extracted_text)} chars")
 
-                try:
-                    if llm_service.is_ready():
-                        logger.info(f"Resume {resume_id}: running AI analysis...")
-                        extracted_features = llm_service.extract_features(extracted_text)
+                # Fast path: rule-based profile in milliseconds → returned immediately
+                extracted_features = rule_extractor.extract(extracted_text)
+                features_provisional = llm_service.is_ready()
+                if not features_provisional:
+                    logger.warning(f"Resume {resume_id}: LLM Service not ready — keeping rule-based features")
+                    extracted_features["fallback_reason"] = "LLM Service not ready"
 
-                        if extracted_features and not extracted_features.get("extraction_error"):
-                            extracted_features.pop("extraction_error", None)
-
-                        logger.info(f"Resume {resume_id}: AI analysis complete")
-                    else:
-                        logger.warning(f"Resume {resume_id}: LLM Service not ready")
-                        extracted_features = {"error": "LLM Service not ready"}
-
-                except Exception as ai_error:
-                    logger.error(f"Resume {resume_id}: AI error - {ai_error}")
-                    extracted_features = {"error": str(ai_error)}
-                
                 # Diagnose extraction quality → structured failure type
                 failure_type = _diagnose_extraction(extracted_text, extracted_features)
-                db_status = "processed" if failure_type != "ai_failed" else "ai_failed"
+                db_status = "processed"
+                text_chars = await save_resume_text(db, resume_id, extracted_text)
                 await db.resumes.update_one(
                     {"_id": ObjectId(resume_id)},
                     {"$set": {
-                        "extracted_text": extracted_text,
+                        "text_length": text_chars,
                         "extracted_features": extracted_features,
+                        "features_provisional": features_provisional,
                         "processed_at": datetime.now(timezone.utc),
                         "status": db_status,
                         "failure_type": failure_type,
                     }}
                 )
-                logger.info(f"Resume {resume_id}: status={db_status} failure_type={failure_type}")
+                if features_provisional:
+                    background_tasks.add_task(_finalize_llm_features, resume_id, extracted_text, db)
+                logger.info(f"Resume {resume_id}: status={db_status} provisional={features_provisional}")
                 status_message = db_status
             else:
                 failure_type = "image_only_pdf"
@@ -350,6 +311,16 @@ async def upload_resume(
                 logger.warning(f"Resume {resume_id}: empty text → image_only_pdf")
                 status_message = "ocr_not_supported"
 
+        except PDFExtractionError as e:
+            # Pathological PDF — killed by the pool before it could stall the API
+            failure_type = "pdf_too_complex"
+            await db.resumes.update_one(
+                {"_id": ObjectId(resume_id)},
+                {"$set": {"status": "error", "failure_type": failure_type, "error_message": str(e)}}
+            )
+            logger.error(f"Resume {resume_id} PDF extraction aborted ({e.kind}): {e}")
+            status_message = "error"
+
         except Exception as e:
             failure_type = "ai_failed"
             await db.resumes.update_one(
@@ -359,6 +330,13 @@ async def upload_resume(
             logger.error(f"Resume {resume_id} processing error: {e}")
             status_message = "error"
 
+        if features_provisional:
+            message = "Resume received — preview ready, AI analysis in progress"
+        elif not failure_type:
+            message = "Resume processed successfully"
+        else:
+            message = "Resume processed with warnings"
+
         return ResumeUploadResponse(
             id=resume_id,
             user_id=user_id,
@@ -367,9 +345,10 @@ async def upload_resume(
             file_size=file_size,
             status=status_message,
             uploaded_at=datetime.now(timezone.utc),
-            message="Resume processed successfully" if not failure_type else "Resume processed with warnings",
+            message=message,
             extracted_features=extracted_features,
             failure_type=failure_type,
+            features_provisional=features_provisional,
         )
 
         
@@ -399,8 +378,8 @@ async def get_resume_status(
         if not ObjectId.is_valid(resume_id):
             raise HTTPException(status_code=400, detail="รูปแบบ resume ID ไม่ถูกต้อง")
         
-        # หา Resume ในฐานข้อมูล
-        resume = await db.resumes.find_one({"_id": ObjectId(resume_id)})
+        # หา Resume ในฐานข้อมูล (ไม่ดึงข้อความ — ใช้ text_length)
+        resume = await db.resumes.find_one({"_id": ObjectId(resume_id)}, SUMMARY_PROJECTION)
         
         if not resume:
             raise HTTPException(status_code=404, detail="ไม่พบ Resume")
@@ -416,8 +395,9 @@ async def get_resume_status(
             processed_at=resume.get("processed_at"),
             file_name=resume["file_name"],
             file_size=resume["file_size"],
-            text_length=len(resume.get("extracted_text", "")),
-            error_message=resume.get("error_message")
+            text_length=text_length(resume),
+            error_message=resume.get("error_message"),
+            features_provisional=resume.get("features_provisional", False),
         )
         
     except HTTPException:
@@ -459,7 +439,7 @@ async def get_resume_details(
             user_id=resume["user_id"],
             file_name=resume["file_name"],
             file_size=resume["file_size"],
-            extracted_text=resume.get("extracted_text", ""),
+            extracted_text=await load_resume_text(db, resume),
             status=resume["status"],
             uploaded_at=resume["uploaded_at"],
             processed_at=resume.get("processed_at"),
@@ -488,7 +468,7 @@ async def get_my_resumes(
     
     try:
         # ดึงรายการ Resume ของผู้ใช้
-        resumes_cursor = db.resumes.find({"user_id": user_id}).sort("uploaded_at", -1)
+        resumes_cursor = db.resumes.find({"user_id": user_id}, SUMMARY_PROJECTION).sort("uploaded_at", -1)
         resumes = await resumes_cursor.to_list(length=100)
         
         # แปลงข้อมูล
@@ -501,9 +481,10 @@ async def get_my_resumes(
                 "status": resume["status"],
                 "uploaded_at": resume["uploaded_at"].isoformat(),
                 "processed_at": resume["processed_at"].isoformat() if resume.get("processed_at") else None,
-                "text_length": len(resume.get("extracted_text", "")),
+                "text_length": text_length(resume),
                 "has_error": bool(resume.get("error_message")),
-                "extracted_features": resume.get("extracted_features")
+                "extracted_features": resume.get("extracted_features"),
+                "features_provisional": resume.get("features_provisional", False),
             }
             resume_list.append(resume_data)
         
@@ -536,7 +517,7 @@ async def delete_resume(
         if not ObjectId.is_valid(resume_id):
             raise HTTPException(status_code=400, detail="รูปแบบ resume ID ไม่ถูกต้อง")
         
-        resume = await db.resumes.find_one({"_id": ObjectId(resume_id)})
+        resume = await db.resumes.find_one({"_id": ObjectId(resume_id)}, {**FILE_PROJECTION, "user_id": 1})
         
         if not resume:
             raise HTTPException(status_code=404, detail="ไม่พบ Resume")
@@ -545,15 +526,14 @@ async def delete_resume(
         if resume["user_id"] != user_id:
             raise HTTPException(status_code=403, detail="ไม่มีสิทธิ์เข้าถึง")
         
-        # ลบไฟล์จากระบบ
+        # ลบไฟล์จากระบบ (ลด refcount — ไฟล์ถูกลบเมื่อไม่มี document อื่นอ้างถึง)
         try:
-            if os.path.exists(resume["file_path"]):
-                os.remove(resume["file_path"])
-                logger.info(f"ลบไฟล์: {resume['file_path']}")
+            await release_blob(db, resume["file_path"])
         except Exception as e:
             logger.warning(f"ไม่สามารถลบไฟล์ {resume['file_path']}: {e}")
         
-        # ลบจากฐานข้อมูล
+        # ลบจากฐานข้อมูล (รวมข้อความที่เก็บแยก)
+        await delete_resume_texts(db, [resume_id])
         await db.resumes.delete_one({"_id": ObjectId(resume_id)})
         
         return {"message": "ลบ Resume สำเร็จ", "deleted_id": resume_id}
@@ -589,31 +569,20 @@ async def upload_certificate(
             detail=f"รองรับเฉพาะ: {', '.join(CERT_ALLOWED_EXTENSIONS)}"
         )
 
-    contents = await file.read()
-    if len(contents) > CERT_MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="ไฟล์ใหญ่เกิน 10MB")
-        
-    # ตรวจสอบว่ามี Magic bytes ที่คุ้นเคยของ JPG, PNG หรือ PDF
-    if not (contents.startswith(b"%PDF-") or contents.startswith(b"\xff\xd8\xff") or contents.startswith(b"\x89PNG\r\n\x1a\n") or contents.startswith(b"RIFF")):
-        raise HTTPException(status_code=400, detail="รูปแบบไฟล์ไม่ถูกต้อง (Invalid magic bytes)")
-
-    # ใช้ relative path เสมอ — CERT_UPLOAD_FOLDER เป็น relative อยู่แล้ว
-    user_cert_folder = os.path.join(CERT_UPLOAD_FOLDER, user_id)
-    Path(user_cert_folder).mkdir(parents=True, exist_ok=True)
-
-    unique_name = f"{uuid.uuid4()}{file_ext}"
-    relative_path = os.path.join(user_cert_folder, unique_name)  # uploads/certificates/{user_id}/xxx.pdf
+    # stream + ตรวจ magic bytes (JPG / PNG / WEBP / PDF) และขนาดระหว่างอ่าน
+    # เก็บตาม SHA-256 (relative เสมอ): uploads/certificates/ab/cd/<sha>.pdf
+    stored = await store_blob(db, file, CERT_BLOB_AREA, max_size=CERT_MAX_FILE_SIZE,
+                              allowed_kinds=CERT_ALLOWED_KINDS)
+    relative_path = stored.path
     cert_url = _to_relative_url(relative_path)
 
-    with open(relative_path, "wb") as f:
-        f.write(contents)
-
     cert_doc = {
         "user_id": user_id,
         "file_name": file.filename,
         "file_path": relative_path,   # always relative
         "file_url": cert_url,
-        "file_size": len(contents),
+        "file_size": stored.size,
+        "file_sha256": stored.sha256,
         "uploaded_at": datetime.now(timezone.utc),
     }
     result = await db.certificates.insert_one(cert_doc)
@@ -624,7 +593,7 @@ async def upload_certificate(
         "id": str(result.inserted_id),
         "file_name": file.filename,
         "file_url": cert_url,
-        "file_size": len(contents),
+        "file_size": stored.size,
         "message": "อัปโหลดใบ Certificate สำเร็จ"
     }
 
@@ -672,5 +641,8 @@ async def resume_api_health():
             "allowed_extensions": list(ALLOWED_EXTENSIONS),
             "upload_folder": UPLOAD_FOLDER
         },
+        "llm_providers": llm_service.router.stats_snapshot() if llm_service.router else None,
+        "pdf_pool": get_pdf_pool().stats(),
+        "extraction_cascade": get_extraction_cascade().stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
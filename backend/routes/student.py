@@ -1,5 +1,5 @@
 # backend/routes/student.py - Student-specific routes เท่านั้น
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from datetime import datetime
 from bson import ObjectId
 from typing import Optional
@@ -7,6 +7,7 @@ from typing import Optional
 # Local imports
 from core.auth import get_current_user_id, get_current_user_data
 from core.database import get_database
+from core.resume_store import SUMMARY_PROJECTION
 
 # Create router
 router = APIRouter(prefix="/student", tags=["Student Specific"])
@@ -109,7 +110,7 @@ async def get_resume_history(user_id: str = Depends(get_current_user_id)):
         user = await verify_student_access(user_id)
         
         # ดึงประวัติเรซูเม่
-        resumes = await db.resumes.find({"user_id": user["_id"]}).to_list(length=None)
+        resumes = await db.resumes.find({"user_id": user["_id"]}, SUMMARY_PROJECTION).to_list(length=None)
         
         return {
             "resumes": resumes,
@@ -230,7 +231,7 @@ async def get_resume_analysis(
         resume = await db.resumes.find_one({
             "_id": ObjectId(resume_id),
             "user_id": user["_id"]
-        })
+        }, {"_id": 1})
         
         if not resume:
             raise HTTPException(
@@ -256,8 +257,12 @@ async def get_resume_analysis(
 # NOTIFICATIONS - เฉพาะ Student
 # =============================================================================
 @router.get("/notifications")
-async def get_student_notifications(user_id: str = Depends(get_current_user_id)):
-    """ดูรายการแจ้งเตือนทั้งหมด (เฉพาะ Student)"""
+async def get_student_notifications(
+    user_id: str = Depends(get_current_user_id),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+):
+    """ดูรายการแจ้งเตือน (เฉพาะ Student) — หน้าถัดไปใช้ next_cursor"""
     try:
         db = get_database()
         await verify_student_access(user_id)
@@ -265,12 +270,13 @@ async def get_student_notifications(user_id: str = Depends(get_current_user_id))
         from services.notification_service import NotificationService
         svc = NotificationService(db)
 
-        notifications = await svc.get_notifications(user_id, limit=50)
+        notifications, next_cursor = await svc.get_notifications(user_id, limit=limit, cursor=cursor)
         unread_count = await svc.get_unread_count(user_id)
 
         return {
             "notifications": notifications,
             "unread_count": unread_count,
+            "next_cursor": next_cursor,
         }
 
     except HTTPException:
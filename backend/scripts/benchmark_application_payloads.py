@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+📦 Benchmark: application list payloads — full documents vs summary projection
+
+The applicant and application lists used to send whole application documents:
+``resume_data`` (the student's full extracted features),
+``xgboost_features_at_decision``, ``status_history`` and cert analyses. They
+now read APPLICATION_SUMMARY_PROJECTION (routes/job.py). The full document
+is served per application by GET /api/jobs/applications/{app_id}.
+
+Measured per list response (JSON bytes as sent, and serialize time):
+
+    all-applicants (200)  — a company with 200 applicants
+    applicants (40)       — one job's page
+    my-applications (10)  — one student
+
+Usage:
+    python backend/scripts/benchmark_application_payloads.py                      # synthetic company
+    python backend/scripts/benchmark_application_payloads.py --live --company-id <id>
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+from bson import ObjectId
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from benchmark_resume_reads import synthetic_resume
+from routes.job import APPLICATION_SUMMARY_PROJECTION, application_item
+
+XGB_FEATURES = ["skills_match", "skills_coverage", "major_match", "gpa", "experience_months", "project_count",
+                "project_relevance", "cert_count", "cert_relevance", "has_cert_files", "education_level",
+                "language_score", "portfolio", "sbert_similarity"]
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """What MongoDB returns for an inclusion projection with dotted paths (``_id`` always included)."""
+    out = {"_id": doc["_id"]}
+    for path in projection:
+        head, _, rest = path.partition(".")
+        if head not in doc:
+            continue
+        if not rest:
+            out[head] = doc[head]
+        elif isinstance(doc[head], dict) and rest in doc[head]:
+            out.setdefault(head, {})[rest] = doc[head][rest]
+    return out
+
+
+def synthetic_applications(n: int, jobs: int = 5) -> list:
+    features = synthetic_resume()["extracted_features"]
+    job_ids = [str(ObjectId()) for _ in range(jobs)]
+    now = datetime.now(timezone.utc)
+    cert = {"cert_name": "AWS Certified Cloud Practitioner", "domain": "cloud", "issuer": "Amazon",
+            "skills": ["aws", "cloud"], "relevance": 0.8, "summary": "Foundational cloud certification " * 4}
+    apps = []
+    for i in range(n):
+        rnd = random.Random(i)
+        submitted = now - timedelta(hours=i)
+        apps.append({
+            "_id": ObjectId(), "application_code": f"APP-2026-{i:08X}", "job_id": job_ids[i % jobs],
+            "job_title": "Backend Developer Intern", "company_name": "ACME Co., Ltd.",
+            "student_id": str(ObjectId()), "student_name": f"Student {i}", "student_email": f"s{i}@example.com",
+            "cover_letter": "I am interested in this internship because " * 20,
+            "portfolio_url": "https://github.com/example", "certificate_urls": ["/uploads/certificates/c1.pdf"],
+            "resume_data": features, "resume_file_url": "/uploads/resumes/ab/cd/" + "ab" * 32 + ".pdf",
+            "status": rnd.choice(["pending", "accepted", "rejected"]), "ai_score": round(rnd.random() * 100, 1),
+            "ai_method": "xgboost_v4", "ai_feedback": "Strong Python skills; limited production experience.",
+            "xgboost_score": rnd.random(), "xgboost_decision": "yellow", "xgboost_probability": rnd.random(),
+            "matching_breakdown": {k: rnd.randint(0, 100) for k in
+                                   ("skills", "major", "experience", "projects", "certification", "gpa")},
+            "matching_zone": "yellow", "cert_llm_analyses": [cert] * 3,
+            "xgboost_features_at_decision": {k: rnd.random() for k in XGB_FEATURES},
+            "ai_breakdown_at_decision": {"skills": 70, "education": 80, "experience": 40},
+            "status_history": [{"status": s, "at": (submitted + timedelta(days=d)).isoformat(), "by": str(ObjectId()),
+                                "reason": "Reviewed by HR"} for d, s in enumerate(["pending", "interview", "accepted"])],
+            "interview": {"status": "confirmed", "date": "2026-11-02", "time": "10:00", "method": "online",
+                          "link": "https://meet.example.com/abc", "note": "Prepare a short demo"},
+            "submitted_at": submitted,
+        })
+    return apps
+
+
+def response_bytes(items: list) -> tuple:
+    """JSON body as FastAPI sends it (UTF-8, non-ASCII kept) + serialize time in ms."""
+    started = time.perf_counter()
+    body = json.dumps([application_item(dict(doc)) for doc in items], ensure_ascii=False, default=str).encode("utf-8")
+    return len(body), (time.perf_counter() - started) * 1000
+
+
+def report(apps: list) -> None:
+    by_job, by_student = {}, {}
+    for app in apps:
+        by_job.setdefault(app.get("job_id"), []).append(app)
+        by_student.setdefault(app.get("student_id"), []).append(app)
+    requests = [
+        (f"all-applicants ({len(apps)})", apps),
+        (f"applicants ({min(len(apps), 40)})", max(by_job.values(), key=len)[:40]),
+        (f"my-applications ({min(len(apps), 10)})", max(by_student.values(), key=len)[:10] if len(by_student) < len(apps) else apps[:10]),
+    ]
+    print("=" * 84)
+    print(f"{'request':<26}{'full (KB)':>12}{'summary (KB)':>14}{'saved':>8}{'full ms':>12}{'summary ms':>12}")
+    print("-" * 84)
+    for name, items in requests:
+        full, full_ms = response_bytes(items)
+        small, small_ms = response_bytes([project(doc, APPLICATION_SUMMARY_PROJECTION) for doc in items])
+        print(f"{name:<26}{full / 1024:>12,.1f}{small / 1024:>14,.1f}{1 - small / full:>8.0%}{full_ms:>12.1f}{small_ms:>12.1f}")
+    detail, _ = response_bytes(apps[:1])
+    print("-" * 84)
+    print(f"  one detail response (GET /applications/{{id}}): {detail / 1024:,.1f} KB")
+    print("=" * 84)
+
+
+async def live_applications(company_id: str) -> list:
+    import motor.motor_asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv(BACKEND_DIR / ".env")
+    client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("DATABASE_NAME", "ai_resume_screening")]
+    try:
+        job_ids = [str(job["_id"]) async for job in db.jobs.find({"company_id": company_id}, {"_id": 1})]
+        return await db.applications.find({"job_id": {"$in": job_ids}}).to_list(200)
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--live", action="store_true", help="measure a real company's applications")
+    parser.add_argument("--company-id", help="company for --live")
+    parser.add_argument("--applicants", type=int, default=200, help="synthetic applicants (default 200)")
+    args = parser.parse_args()
+
+    if args.live:
+        if not args.company_id:
+            parser.error("--live needs --company-id")
+        apps = asyncio.run(live_applications(args.company_id))
+        if not apps:
+            print("No applications found for this company")
+            return
+        print(f"  {len(apps)} applications from the database")
+    else:
+        apps = synthetic_applications(args.applicants)
+        print(f"  synthetic company: {len(apps)} applicants over 5 jobs")
+    report(apps)
+
+
+if __name__ == "__main__":
+    main()
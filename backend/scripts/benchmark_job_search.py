@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+🔎 Benchmark: job search — case-insensitive $regex scan vs token index
+
+Generates a jobs collection (default 50,000 jobs, Thai + English text) in a
+scratch database, then runs the same queries both ways:
+
+    regex  — the old {"$or": [{field: {"$regex": q, "$options": "i"}}, ...]}
+             on title / description / company_name, newest first
+    tokens — services/job_search.py: $all on the search_terms multikey index,
+             ranked by weighted field matches
+
+and reports latency (median / p95 ms), documents examined (explain) and
+hits per query. The scratch database is dropped afterwards unless --keep.
+
+Usage:
+    python backend/scripts/benchmark_job_search.py
+    python backend/scripts/benchmark_job_search.py --jobs 10000 --runs 5 --keep
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import motor.motor_asyncio
+from dotenv import load_dotenv
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from services.job_search import parse_query, search_fields, search_pipeline, text_filter
+
+TITLES = ["Backend Developer", "Frontend Developer", "Data Analyst", "Data Engineer", "QA Tester",
+          "DevOps Engineer", "UX/UI Designer", "Mobile Developer", "นักพัฒนาซอฟต์แวร์", "นักวิเคราะห์ข้อมูล",
+          "ผู้ช่วยวิศวกรเครือข่าย", "Machine Learning Intern", "นักออกแบบกราฟิก", "Business Analyst"]
+COMPANIES = ["ACME Co., Ltd.", "Globex Thailand", "ไทยเทคโซลูชั่น", "Initech", "สยามดิจิทัล", "Umbrella Corp"]
+DEPARTMENTS = ["Engineering", "Data", "Design", "IT", "ฝ่ายไอที", "ฝ่ายการตลาด"]
+SKILLS = ["Python", "FastAPI", "React", "Node.js", "C++", "C#", "SQL", "Docker", "Kubernetes",
+          "Figma", "Power BI", "Java", "Go", "TensorFlow", "Excel"]
+SENTENCES = [
+    "พัฒนาและดูแลระบบภายในองค์กร ร่วมงานกับทีมออกแบบและทีมธุรกิจ",
+    "Build and maintain internal services used by thousands of customers.",
+    "วิเคราะห์ข้อมูลการขายและจัดทำรายงานประจำเดือนให้ผู้บริหาร",
+    "Work with a small agile team on cloud infrastructure and automation.",
+    "ทดสอบซอฟต์แวร์ เขียน test case และติดตามปัญหาร่วมกับนักพัฒนา",
+    "Design user flows, wireframes and prototypes for web and mobile apps.",
+]
+QUERIES = ["developer", "python", "data engineer", "node.js", "พัฒนา", "วิเคราะห์ข้อมูล", "ไอที",
+           "kubernetes docker", "globex", "ux"]
+
+
+def make_job(i: int, now: datetime) -> dict:
+    rnd = random.Random(i)
+    job = {
+        "title": rnd.choice(TITLES),
+        "company_name": rnd.choice(COMPANIES),
+        "department": rnd.choice(DEPARTMENTS),
+        "skills_required": rnd.sample(SKILLS, 4),
+        "description": " ".join(rnd.sample(SENTENCES, 3)),
+        "requirements": rnd.sample(SKILLS, 2),
+        "location": rnd.choice(["Bangkok", "เชียงใหม่", "Remote"]),
+        "is_active": rnd.random() < 0.9,
+        "created_at": now - timedelta(minutes=i),
+    }
+    job.update(search_fields(job))
+    return job
+
+
+def regex_filter(query: str) -> dict:
+    search_regex = {"$regex": query, "$options": "i"}
+    return {"is_active": True, "$or": [
+        {"title": search_regex}, {"description": search_regex}, {"company_name": search_regex}]}
+
+
+async def timed(make_call, runs: int) -> list:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await make_call()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def p95(times: list) -> float:
+    return statistics.quantiles(times, n=20)[-1] if len(times) > 1 else times[0]
+
+
+def docs_examined(plan: dict) -> int:
+    return plan.get("executionStats", {}).get("totalDocsExamined", -1)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark regex vs token-index job search")
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=10, help="runs per query and path")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database")
+    args = parser.parse_args()
+
+    client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    db_name = os.getenv("DATABASE_NAME", "ai_resume_screening") + "_search_bench"
+    db = client[db_name]
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"[ERROR] DB connection failed: {e}")
+        sys.exit(1)
+
+    await db.jobs.drop()
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    for start in range(0, args.jobs, 5000):
+        await db.jobs.insert_many([make_job(i, now) for i in range(start, min(start + 5000, args.jobs))])
+    await db.jobs.create_index([("is_active", 1), ("created_at", -1), ("_id", -1)])
+    await db.jobs.create_index("search_terms")
+    print(f"  {args.jobs:,} jobs in {db_name} ({time.perf_counter() - started:.1f}s)\n")
+
+    print("=" * 96)
+    print(f"{'query':<20}{'regex p50/p95 ms':>20}{'examined':>10}{'hits':>8}"
+          f"{'tokens p50/p95 ms':>20}{'examined':>10}{'hits':>8}")
+    print("-" * 96)
+    totals = {"regex": [], "tokens": []}
+    for query in QUERIES:
+        search = parse_query(query)
+        base = {"is_active": True}
+        old, new = regex_filter(query), text_filter(base, search)
+
+        def regex_page():
+            return db.jobs.find(old).sort([("created_at", -1), ("_id", -1)]).limit(20).to_list(20)
+
+        def token_page():
+            return db.jobs.aggregate(search_pipeline(base, search, 0, 20)).to_list(20)
+
+        regex_ms, token_ms = await timed(regex_page, args.runs), await timed(token_page, args.runs)
+        totals["regex"] += regex_ms
+        totals["tokens"] += token_ms
+        regex_plan, token_plan = await db.jobs.find(old).explain(), await db.jobs.find(new).explain()
+        regex_hits, token_hits = await db.jobs.count_documents(old), await db.jobs.count_documents(new)
+        print(f"{query:<20}"
+              f"{statistics.median(regex_ms):>9.1f} / {p95(regex_ms):>7.1f}"
+              f"{docs_examined(regex_plan):>10,}{regex_hits:>8,}"
+              f"{statistics.median(token_ms):>9.1f} / {p95(token_ms):>7.1f}"
+              f"{docs_examined(token_plan):>10,}{token_hits:>8,}")
+    print("-" * 96)
+    regex_p50, token_p50 = statistics.median(totals["regex"]), statistics.median(totals["tokens"])
+    print(f"{'all queries p50':<20}{regex_p50:>20.1f}{'':>18}{token_p50:>20.1f}"
+          f"   ({regex_p50 / token_p50:.1f}x)")
+    print("=" * 96)
+
+    if not args.keep:
+        await client.drop_database(db_name)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+📊 Benchmark: PDF text extraction — legacy two-open path vs the extraction cascade
+
+Legacy path (routes/resume.py before services/pdf_engine.py):
+    pdfplumber.open → extract_words      (column-aware)
+    pdfplumber.open → extract_text       (plain)
+    PyPDF2          → only if both empty
+
+Cascade: services/extraction_cascade.py with the resume profile (single-open
+layout engine first, scored candidates).
+
+Usage:
+    python backend/scripts/benchmark_pdf_extraction.py                 # synthetic resumes
+    python backend/scripts/benchmark_pdf_extraction.py a.pdf b.pdf     # real files
+"""
+
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import pdfplumber
+
+from services.extraction_cascade import run_cascade
+from services.pdf_engine import column_layout, extract_plain_pypdf2
+from synthetic_pdf import make_resume_pdf
+
+REPEATS = 5
+
+
+def legacy_extract(file_content: bytes) -> str:
+    """Reference copy of the pre-engine 3-tier strategy (two pdfplumber opens)."""
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        pages = []
+        for page in pdf.pages:
+            words = page.extract_words(x_tolerance=5, y_tolerance=5, keep_blank_chars=False)
+            if words:
+                pages.append(column_layout(words, page.width))
+        text = "\n\n".join(p for p in pages if p).strip()
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        plain = "\n".join(p.extract_text() or "" for p in pdf.pages).strip()
+    if len(plain) > len(text) * 1.2:
+        text = plain
+    if not text or len(text.strip()) < 10:
+        text = extract_plain_pypdf2(file_content)
+    return text
+
+
+def _time(fn, data: bytes) -> float:
+    runs = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(data)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        docs = [(Path(p).name, Path(p).read_bytes()) for p in sys.argv[1:]]
+    else:
+        docs = [(f"synthetic {n}p x2col", make_resume_pdf(pages=n, columns=2)) for n in (1, 3, 6, 12)]
+
+    print("=" * 72)
+    print(f"{'document':<28}{'legacy (ms)':>14}{'cascade (ms)':>14}{'speedup':>10}{'same':>6}")
+    print("-" * 72)
+    for name, data in docs:
+        legacy_ms = _time(legacy_extract, data) * 1000
+        engine_ms = _time(lambda d: run_cascade(d, "resume"), data) * 1000
+        same = legacy_extract(data) == run_cascade(data, "resume").text
+        print(f"{name:<28}{legacy_ms:>14.1f}{engine_ms:>14.1f}{legacy_ms / engine_ms:>9.2f}x{'✓' if same else '✗':>6}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+📊 Benchmark: column-aware layout — per-word Python path vs NumPy analyzer
+
+Both sides start from the same parsed ``page.chars`` (content-stream parsing
+is shared and excluded), so only the layout step is timed:
+
+    python  : pdfplumber extract_words → column_layout (midpoint split, lambda sorts)
+    numpy   : services/pdf_layout.layout_text (gutter detection, 1-3 columns)
+
+"cols" is the number of columns the analyzer found on the first page.
+
+Usage:
+    python backend/scripts/benchmark_pdf_layout.py                 # synthetic layouts
+    python backend/scripts/benchmark_pdf_layout.py a.pdf b.pdf     # real files
+"""
+
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import pdfplumber
+from pdfplumber.utils import extract_words
+
+from services.pdf_engine import COLUMN_WORD_KWARGS, column_layout
+from services.pdf_layout import chars_to_words, find_gutters, layout_text
+from synthetic_pdf import make_resume_pdf
+
+REPEATS = 5
+
+
+def python_layout(pages) -> list:
+    return [column_layout(extract_words(chars, **COLUMN_WORD_KWARGS), width) for chars, width in pages]
+
+
+def numpy_layout(pages) -> list:
+    return [layout_text(chars, width) for chars, width in pages]
+
+
+def _time(fn, pages) -> float:
+    runs = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(pages)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def _load(data: bytes) -> list:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [(page.chars, page.width) for page in pdf.pages]
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        docs = [(Path(p).name, Path(p).read_bytes()) for p in sys.argv[1:]]
+    else:
+        docs = [
+            ("synthetic 3p x1col", make_resume_pdf(pages=3, columns=1)),
+            ("synthetic 3p x2col", make_resume_pdf(pages=3, columns=2)),
+            ("synthetic 3p x3col", make_resume_pdf(pages=3, columns=3)),
+            ("synthetic 3p sidebar 30/70", make_resume_pdf(pages=3, widths=(0.3, 0.7))),
+            ("synthetic 3p sidebar 70/30", make_resume_pdf(pages=3, widths=(0.7, 0.3))),
+        ]
+
+    print("=" * 78)
+    print(f"{'document':<30}{'python (ms)':>13}{'numpy (ms)':>13}{'speedup':>10}{'cols':>6}{'same':>6}")
+    print("-" * 78)
+    for name, data in docs:
+        pages = _load(data)
+        python_ms = _time(python_layout, pages) * 1000
+        numpy_ms = _time(numpy_layout, pages) * 1000
+        cols = len(find_gutters(chars_to_words(pages[0][0])[0], pages[0][1])) + 1 if pages else 0
+        same = python_layout(pages) == numpy_layout(pages)
+        print(f"{name:<30}{python_ms:>13.1f}{numpy_ms:>13.1f}{python_ms / numpy_ms:>9.2f}x"
+              f"{cols:>6}{'✓' if same else '✗':>6}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
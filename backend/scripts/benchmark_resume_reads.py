@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+📊 Benchmark: resume bytes read per request — full documents vs projections
+
+Before core/resume_store.py every matching read was a bare
+``db.resumes.find_one`` returning the whole document, ``extracted_text``
+included. Now matching reads use MATCHING_PROJECTION, file lookups
+FILE_PROJECTION, and the text sits in ``resume_texts``.
+
+Bytes are BSON-encoded sizes of the documents MongoDB sends back, per request:
+
+    recommendations  — 1 resume read (features)
+    apply            — 2 resume reads (features + PDF link)
+    applicants (20)  — 20 resume reads (PDF link + cert analyses backfill)
+
+Usage:
+    python backend/scripts/benchmark_resume_reads.py          # synthetic resume document
+    python backend/scripts/benchmark_resume_reads.py --live   # real resumes from MONGODB_URL
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import bson
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from core.resume_store import FILE_PROJECTION, MATCHING_PROJECTION
+from services.extraction_cascade import run_cascade
+from services.pdf_service import MAX_TEXT_LENGTH
+from services.rule_extractor import get_rule_extractor
+from synthetic_pdf import make_resume_pdf
+
+APPLICANT_PROJECTION = {"file_path": 1, "cert_llm_analyses": 1}
+# (request, [projection per resume read]) — None = bare find_one (before)
+REQUESTS = [
+    ("recommendations", [MATCHING_PROJECTION]),
+    ("apply", [MATCHING_PROJECTION, FILE_PROJECTION]),
+    ("applicants (20)", [APPLICANT_PROJECTION] * 20),
+]
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """What MongoDB returns for an inclusion projection (``_id`` always included)."""
+    return {k: v for k, v in doc.items() if k == "_id" or projection.get(k)}
+
+
+def synthetic_resume() -> dict:
+    text = run_cascade(make_resume_pdf(pages=6, columns=2), "resume").text[:MAX_TEXT_LENGTH]
+    cert = {"name": "AWS Certified Cloud Practitioner", "issuer": "Amazon", "skills": ["aws", "cloud"],
+            "relevance": 0.8, "summary": "Foundational cloud certification " * 4}
+    return {
+        "_id": bson.ObjectId(), "user_id": str(bson.ObjectId()), "file_name": "resume.pdf",
+        "file_path": "uploads/resumes/ab/cd/" + "ab" * 32 + ".pdf", "file_type": "pdf",
+        "file_size": 184_000, "file_sha256": "ab" * 32, "extracted_text": text,
+        "extracted_features": get_rule_extractor().extract(text),
+        "cert_llm_analyses": [cert] * 3, "status": "processed", "failure_type": None,
+        "uploaded_at": datetime.now(timezone.utc), "processed_at": datetime.now(timezone.utc),
+    }
+
+
+def report(docs: list) -> None:
+    print("=" * 72)
+    print(f"{'request':<20}{'before (bytes)':>16}{'after (bytes)':>16}{'saved':>10}")
+    print("-" * 72)
+    for name, projections in REQUESTS:
+        before = statistics.mean(sum(len(bson.encode(d)) for _ in projections) for d in docs)
+        after = statistics.mean(sum(len(bson.encode(project(d, p))) for p in projections) for d in docs)
+        print(f"{name:<20}{before:>16,.0f}{after:>16,.0f}{1 - after / before:>9.0%}")
+    print("=" * 72)
+
+
+async def live_resumes(limit: int) -> list:
+    import motor.motor_asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv(BACKEND_DIR / ".env")
+    client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("DATABASE_NAME", "ai_resume_screening")]
+    try:
+        return await db.resumes.find({"status": "processed"}).to_list(limit)
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--live", action="store_true", help="measure real resumes instead of a synthetic one")
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.live:
+        docs = asyncio.run(live_resumes(args.limit))
+        if not docs:
+            print("No processed resumes found")
+            return
+        print(f"  {len(docs)} resumes from the database "
+              f"({sum('extracted_text' in d for d in docs)} still with inline text)")
+    else:
+        docs = [synthetic_resume()]
+        print(f"  synthetic resume: {len(docs[0]['extracted_text']):,} chars of text")
+    report(docs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+🧭 Check that the app's hot queries use an index (no COLLSCAN)
+
+Loads the index declarations (core/indexes.py), optionally creates them, then
+runs ``explain()`` on every declared query and prints its winning plan.
+The exit code is 1 if any plan still contains a COLLSCAN, so this can run in CI
+or after a deploy.
+
+Usage:
+    python backend/scripts/check_indexes.py            # report only
+    python backend/scripts/check_indexes.py --ensure   # create missing indexes first
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import motor.motor_asyncio
+from dotenv import load_dotenv
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from core.indexes import check_query_plans, declared_indexes, ensure_indexes, load_declarations
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Explain the declared hot queries and report COLLSCANs")
+    parser.add_argument("--ensure", action="store_true", help="create the declared indexes first")
+    args = parser.parse_args()
+
+    client = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("DATABASE_NAME", "ai_resume_screening")]
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"[ERROR] DB connection failed: {e}")
+        return 1
+
+    load_declarations()
+    print(f"  {len(declared_indexes())} declared indexes")
+    if args.ensure:
+        ensured = await ensure_indexes(db)
+        print(f"  ✅ {len(ensured)} ensured")
+
+    report = await check_query_plans(db)
+    print("=" * 72)
+    for row in report:
+        mark = "COLLSCAN" if row["collscan"] else "ok"
+        print(f"  {mark:<9}{row['name']:<50}{' > '.join(row['stages'])}")
+    print("=" * 72)
+    collscans = sum(row["collscan"] for row in report)
+    print(f"  {len(report)} query plans, {collscans} COLLSCAN")
+    client.close()
+    return 1 if collscans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
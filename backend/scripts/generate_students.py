@@ -41,6 +41,8 @@ sys.path.insert(0, str(BACKEND_DIR))
 load_dotenv(BACKEND_DIR / ".env")
 
 # Import real AI services
+from core.resume_store import save_resume_text
+from services.application_counters import count_added
 from services.pdf_service import PDFExtractor
 from services.llm_service import LLMService
 from services.matching_service import MatchingService
@@ -267,7 +269,7 @@ async def seed():
         file_path_rel = f"uploads/resumes/{unique_filename}"
 
         print(f"  [{username}] Extracting text from PDF...", end=" ")
-        extracted_text, method = pdf_extractor.extract_text(str(source_path))
+        extracted_text, method = await pdf_extractor.extract_text_async(str(source_path), db=db)
 
         if not extracted_text or method == "failed":
             print(f"FAILED")
@@ -324,7 +326,7 @@ async def seed():
             "file_path": file_path_rel,
             "file_type": "pdf",
             "file_size": file_size,
-            "extracted_text": extracted_text,
+            "text_length": len(extracted_text or ""),
             "extracted_features": extracted_features,
             "uploaded_at": now,
             "processed_at": datetime.utcnow(),
@@ -332,6 +334,7 @@ async def seed():
         }
 
         result = await db.resumes.insert_one(resume_doc)
+        await save_resume_text(db, result.inserted_id, extracted_text)
         resume_ids[username] = str(result.inserted_id)
         created_resumes += 1
 
@@ -432,10 +435,7 @@ async def seed():
 
             result = await db.applications.insert_one(app_doc)
 
-            await db.jobs.update_one(
-                {"_id": job["_id"]},
-                {"$inc": {"applications_count": 1}},
-            )
+            await count_added(db, job["_id"], app_doc["status"])
 
             total_applications += 1
             score_pct = match_result["overall_score"]
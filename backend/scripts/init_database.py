@@ -15,6 +15,8 @@ load_dotenv(os.path.join(backend_dir, '.env'))
 
 # ตอนนี้ import ได้แล้ว
 from core.database import connect_to_mongo, get_database
+from core.indexes import check_query_plans, ensure_indexes, load_declarations
+from services.job_search import reindex_jobs
 
 async def create_collections_and_indexes():
     """
@@ -157,7 +159,45 @@ async def create_collections_and_indexes():
         await db.user_role_assignments.create_index("role_id")
         await db.user_role_assignments.create_index("role_name")
         print("   ✅ user_role_assignments indexes created")
-        
+
+        # =================================================================
+        # 12. FILE_BLOBS / CERT_ANALYSIS_CACHE
+        # =================================================================
+        # index ประกาศไว้ข้าง query (core/blob_store.py, services/cert_cache.py) → สร้างในข้อ 15
+        print("1️⃣2️⃣ file_blobs / cert_analysis_cache indexes ประกาศใน core/indexes.py — สร้างในข้อ 15")
+
+        # =================================================================
+        # 13. EXTRACTION_CACHE COLLECTION (ข้อความ PDF ที่ extract แล้ว ตาม SHA-256 + version)
+        # =================================================================
+        print("1️⃣3️⃣ สร้าง extraction_cache collection...")
+
+        # ลบ entry ของ extractor version เก่า: delete_many({"version": {"$ne": EXTRACTOR_VERSION}})
+        await db.extraction_cache.create_index("version")
+        print("   ✅ extraction_cache indexes created")
+
+        # =================================================================
+        # 14. RESUME_TEXTS COLLECTION (ข้อความ Resume บีบอัด แยกจาก resumes)
+        # =================================================================
+        # _id = resume _id → ไม่ต้องมี index เพิ่ม (โหลดเฉพาะเมื่อต้องใช้ข้อความ)
+        print("1️⃣4️⃣ resume_texts collection ใช้ _id เดียวกับ resumes — ไม่ต้องสร้าง index")
+
+        # =================================================================
+        # 15. INDEXES ที่โค้ดใช้งานจริง (ประกาศไว้ข้าง query — core/indexes.py)
+        # =================================================================
+        # jobs / applications / resumes / certificates / notifications / file_blobs / cert_analysis_cache / ...
+        # main.py ก็ ensure ชุดเดียวกันตอน startup
+        print("1️⃣5️⃣ สร้าง indexes ที่ประกาศไว้ใน core/indexes.py...")
+        load_declarations()
+        ensured = await ensure_indexes(db)
+        print(f"   ✅ {len(ensured)} declared indexes ensured")
+
+        # =================================================================
+        # 16. JOB SEARCH (services/job_search.py — เติม token ให้งานเดิม)
+        # =================================================================
+        print("1️⃣6️⃣ เติม search token ให้งานที่ยังไม่มี (หรือเป็นรุ่นเก่า)...")
+        reindexed = await reindex_jobs(db)
+        print(f"   ✅ {reindexed} jobs re-indexed")
+
         print("🎉 สร้างโครงสร้างฐานข้อมูลสำเร็จแล้ว! (รวม Company Management)")
         
     except Exception as e:
@@ -199,6 +239,13 @@ async def verify_database_structure():
                 indexes = await db[col_name].list_indexes().to_list(length=None)
                 index_names = [idx['name'] for idx in indexes if idx['name'] != '_id_']
                 print(f"   🔍 {col_name}: {index_names}")
+
+        # ตรวจว่า query หลักใช้ index (ไม่มี COLLSCAN)
+        print("🧭 ตรวจ query plans:")
+        load_declarations()
+        for row in await check_query_plans(db):
+            mark = "⚠️ COLLSCAN" if row["collscan"] else "✅"
+            print(f"   {mark} {row['name']}: {' > '.join(row['stages'])}")
         
         print("✅ ตรวจสอบเสร็จสิ้น!")
         
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+📦 Move inline resume ``extracted_text`` into ``resume_texts`` (compressed)
+
+Resumes written before core/resume_store.py carry their text inline; reads
+still work (``load_resume_text`` falls back to it) but every matching read
+keeps paying for it. This moves the text out in batches and records
+``text_length`` on the resume. Safe to re-run — migrated resumes no longer
+match the query.
+
+Usage:
+    python backend/scripts/migrate_resume_texts.py [--batch-size 200]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import motor.motor_asyncio
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from core.resume_store import RESUME_TEXT_COLLECTION, text_update
+
+
+async def migrate(db, batch_size: int) -> int:
+    moved = 0
+    query = {"extracted_text": {"$exists": True}}
+    while True:
+        batch = await db.resumes.find(query, {"extracted_text": 1}).limit(batch_size).to_list(batch_size)
+        if not batch:
+            return moved
+        texts = [r.get("extracted_text") or "" for r in batch]
+        await db[RESUME_TEXT_COLLECTION].bulk_write(
+            [text_update(r["_id"], t) for r, t in zip(batch, texts)], ordered=False,
+        )
+        await db.resumes.bulk_write([
+            UpdateOne({"_id": r["_id"]}, {"$set": {"text_length": len(t)}, "$unset": {"extracted_text": ""}})
+            for r, t in zip(batch, texts)
+        ], ordered=False)
+        moved += len(batch)
+        print(f"     moved {moved}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Move inline resume text into resume_texts")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    mongo_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DATABASE_NAME", "ai_resume_screening")
+    client = motor.motor_asyncio.AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"[ERROR] DB connection failed: {e}")
+        sys.exit(1)
+
+    print("  📦 Moving inline extracted_text → resume_texts ...")
+    moved = await migrate(db, args.batch_size)
+    print(f"  ✅ {moved} resumes migrated")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+🔁 Bulk re-extraction of stored resumes (resumable)
+
+Refreshes ``extracted_text`` / ``extracted_features`` of existing resumes after
+the extraction logic or the LLM prompt changed — without wiping and reseeding.
+
+Pipeline (per batch of ``--batch-size`` documents, streamed by ``_id``):
+    1. PDF text   → services/extraction_cache.py: cached by (SHA-256, extractor
+                    version), misses go to the PDF process pool (whole batch at once)
+    2. LLM        → ``--concurrency`` calls in flight, at most ``--rate`` per minute
+    3. Write      → one ``bulk_write`` for ``resumes`` (+ one for ``resume_texts``,
+                    core/resume_store.py), then the checkpoint moves past the batch
+
+The checkpoint lives in ``reprocess_checkpoints`` (one document per ``--run-id``),
+so an interrupted run continues after the last fully written batch.
+
+Usage:
+    python backend/scripts/reprocess_resumes.py                      # text + LLM
+    python backend/scripts/reprocess_resumes.py --mode text          # PDF text only (keep features)
+    python backend/scripts/reprocess_resumes.py --mode llm --failure-type ai_failed   # rule-based fallbacks
+    python backend/scripts/reprocess_resumes.py --mode llm --status ai_failed         # legacy status=ai_failed docs
+    python backend/scripts/reprocess_resumes.py --run-id prompt-v5 --restart
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import motor.motor_asyncio
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from core.resume_store import RESUME_TEXT_COLLECTION, load_resume_text, text_update
+from routes.resume import _diagnose_extraction, llm_service
+from services.extraction_cache import extract_cached
+from services.llm_service import LLMService
+from services.pdf_pool import PDFExtractionError, get_pdf_pool
+
+CHECKPOINT_COLLECTION = "reprocess_checkpoints"
+PROJECTION = {"file_path": 1, "file_sha256": 1, "extracted_text": 1, "extracted_features": 1}
+
+
+class RateLimiter:
+    """Spaces calls evenly: at most ``per_minute`` starts per minute (0 = unlimited)."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Reprocessor:
+    def __init__(self, db, args: argparse.Namespace) -> None:
+        self.db = db
+        self.args = args
+        self.llm = llm_service if args.mode in ("all", "llm") else None
+        self.llm_slots = asyncio.Semaphore(args.concurrency)
+        self.limiter = RateLimiter(args.rate)
+        self.counts = {"processed": 0, "failed": 0, "skipped": 0}
+        self.cache_hits = 0
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def _query(self) -> dict:
+        query = {}
+        if self.args.status:
+            query["status"] = {"$in": self.args.status}
+        if self.args.failure_type:
+            query["failure_type"] = {"$in": self.args.failure_type}
+        if self.args.mode == "llm":
+            # text in resume_texts, or inline on resumes written before the split
+            query["$or"] = [{"text_length": {"$gt": 0}}, {"extracted_text": {"$nin": ["", None]}}]
+        return query
+
+    async def load_checkpoint(self) -> dict:
+        checkpoints = self.db[CHECKPOINT_COLLECTION]
+        if self.args.restart:
+            await checkpoints.delete_one({"_id": self.args.run_id})
+        settings = {"mode": self.args.mode, "status": self.args.status, "failure_type": self.args.failure_type}
+        checkpoint = await checkpoints.find_one({"_id": self.args.run_id})
+        if checkpoint and checkpoint.get("settings") != settings:
+            raise SystemExit(
+                f"[ERROR] run '{self.args.run_id}' was started with {checkpoint.get('settings')} "
+                f"— pass --restart or use another --run-id"
+            )
+        if checkpoint is None:
+            checkpoint = {
+                "_id": self.args.run_id, "settings": settings, "last_id": None,
+                "processed": 0, "failed": 0, "skipped": 0,
+                "started_at": datetime.now(timezone.utc), "finished_at": None,
+            }
+            if not self.args.dry_run:
+                await checkpoints.insert_one(checkpoint)
+        return checkpoint
+
+    async def save_checkpoint(self, last_id, counts: dict) -> None:
+        """Move the checkpoint past a fully written batch."""
+        if self.args.dry_run:
+            return
+        await self.db[CHECKPOINT_COLLECTION].update_one(
+            {"_id": self.args.run_id},
+            {"$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)}, "$inc": counts},
+        )
+
+    # ------------------------------------------------------------------
+    # Per document
+    # ------------------------------------------------------------------
+
+    async def _llm_features(self, text: str) -> dict:
+        async with self.llm_slots:
+            await self.limiter.wait()
+            return await asyncio.to_thread(self.llm.extract_features, text)
+
+    async def process(self, doc: dict) -> Optional[dict]:
+        """Fields to ``$set`` on the resume, or None to skip it."""
+        now = datetime.now(timezone.utc)
+        text = ""
+        fields = {"reprocessed_at": now, "reprocess_run": self.args.run_id}
+
+        if self.args.mode in ("all", "text"):
+            path = BACKEND_DIR / (doc.get("file_path") or "").lstrip("/\\")
+            if not doc.get("file_path") or not path.is_file():
+                print(f"     ⚠️ {doc['_id']}: file missing ({doc.get('file_path')})")
+                return None
+            try:
+                cache_db = None if self.args.dry_run else self.db
+                extraction = await extract_cached(cache_db, str(path), "resume", doc.get("file_sha256"))
+            except PDFExtractionError as e:
+                fields.update({"status": "error", "failure_type": "pdf_too_complex", "error_message": str(e)})
+                return fields
+            self.cache_hits += extraction.cached
+            text = LLMService.sanitize_text(extraction.text)
+            fields["extracted_text"] = text
+            if not text.strip():
+                fields.update({"status": "ocr_not_supported", "failure_type": "image_only_pdf"})
+                return fields
+
+        else:
+            text = await load_resume_text(self.db, doc)
+
+        features = doc.get("extracted_features")
+        if self.llm is not None:
+            features = await self._llm_features(text)
+            fields.update({"extracted_features": features, "features_provisional": False, "processed_at": now})
+
+        # เหมือน routes/resume.py: fallback / ผลไม่ครบ บอกด้วย failure_type, status คง processed
+        fields.update({"status": "processed", "failure_type": _diagnose_extraction(text, features)})
+        return fields
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+
+    async def run_batch(self, batch: list) -> dict:
+        results = await asyncio.gather(*(self.process(doc) for doc in batch), return_exceptions=True)
+        resume_ops, text_ops = [], []
+        counts = {"processed": 0, "failed": 0, "skipped": 0}
+        for doc, result in zip(batch, results):
+            if isinstance(result, Exception):
+                print(f"     ❌ {doc['_id']}: {result}")
+                counts["failed"] += 1
+                continue
+            if result is None:
+                counts["skipped"] += 1
+                continue
+            counts["failed" if result.get("status") == "error" else "processed"] += 1
+            update = {"$set": result}
+            text = result.pop("extracted_text", None)
+            if text is not None:
+                text_ops.append(text_update(doc["_id"], text))
+                result["text_length"] = len(text)
+                update["$unset"] = {"extracted_text": ""}  # moved to resume_texts
+            resume_ops.append(UpdateOne({"_id": doc["_id"]}, update))
+
+        if not self.args.dry_run:
+            # text first: a resume never points at text that was not written
+            if text_ops:
+                await self.db[RESUME_TEXT_COLLECTION].bulk_write(text_ops, ordered=False)
+            if resume_ops:
+                await self.db.resumes.bulk_write(resume_ops, ordered=False)
+        return counts
+
+    async def run(self) -> None:
+        checkpoint = await self.load_checkpoint()
+        query = self._query()
+        if checkpoint["last_id"] is not None:
+            query["_id"] = {"$gt": checkpoint["last_id"]}
+            print(f"  ⏩ Resuming run '{self.args.run_id}' after {checkpoint['last_id']} "
+                  f"({checkpoint['processed']} processed so far)")
+
+        total = await self.db.resumes.count_documents(query)
+        if self.args.limit:
+            total = min(total, self.args.limit)
+        print(f"  📄 {total} resumes to reprocess (mode={self.args.mode}, batch={self.args.batch_size})")
+
+        cursor = self.db.resumes.find(query, PROJECTION).sort("_id", 1).batch_size(self.args.batch_size)
+        if self.args.limit:
+            cursor = cursor.limit(self.args.limit)
+
+        started = time.perf_counter()
+        done = 0
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= self.args.batch_size:
+                done += await self._flush(batch, started, done, total)
+                batch = []
+        if batch:
+            done += await self._flush(batch, started, done, total)
+
+        await self._finish()
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed * 60 if elapsed else 0.0
+        print(f"\n  ✅ Done: {self.counts['processed']} processed, {self.counts['failed']} failed, "
+              f"{self.counts['skipped']} skipped in {elapsed:.1f}s ({rate:.1f} docs/min, "
+              f"{self.cache_hits} extraction cache hits)")
+
+    async def _flush(self, batch: list, started: float, done: int, total: int) -> int:
+        counts = await self.run_batch(batch)
+        for key, n in counts.items():
+            self.counts[key] += n
+        await self.save_checkpoint(batch[-1]["_id"], counts)
+        done += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"     {done}/{total}  ok={self.counts['processed']} failed={self.counts['failed']} "
+              f"skipped={self.counts['skipped']}  {done / elapsed * 60:.1f} docs/min")
+        return len(batch)
+
+    async def _finish(self) -> None:
+        """Mark the run finished (the checkpoint stays for the record)."""
+        if not self.args.dry_run:
+            await self.db[CHECKPOINT_COLLECTION].update_one(
+                {"_id": self.args.run_id}, {"$set": {"finished_at": datetime.now(timezone.utc)}}
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-extract stored resumes in resumable batches")
+    parser.add_argument("--mode", choices=("all", "text", "llm"), default="all",
+                        help="all = PDF text + LLM, text = PDF text only, llm = LLM on stored text")
+    parser.add_argument("--status", nargs="*", help="only resumes with these statuses (e.g. error)")
+    parser.add_argument("--failure-type", nargs="*",
+                        help="only resumes with these failure types (e.g. ai_failed partial_extraction)")
+    parser.add_argument("--run-id", default="default", help="checkpoint name (resume with the same id)")
+    parser.add_argument("--restart", action="store_true", help="drop the checkpoint and start over")
+    parser.add_argument("--batch-size", type=int, default=50, help="documents per bulk_write / checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM calls in flight")
+    parser.add_argument("--rate", type=float, default=30, help="max LLM calls per minute (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=0, help="stop after N documents (0 = all)")
+    parser.add_argument("--dry-run", action="store_true", help="extract but write nothing")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    mongo_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DATABASE_NAME", "ai_resume_screening")
+
+    client = motor.motor_asyncio.AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"[ERROR] DB connection failed: {e}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print(f"  🔁 REPROCESS RESUMES — run '{args.run_id}'")
+    print(f"  📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 70)
+
+    reprocessor = Reprocessor(db, args)
+    if reprocessor.llm is not None and not reprocessor.llm.is_ready():
+        print("  ⚠️ LLM not ready — features fall back to the rule-based extractor")
+    try:
+        await reprocessor.run()
+    finally:
+        get_pdf_pool().shutdown()
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
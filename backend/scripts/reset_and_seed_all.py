@@ -31,6 +31,8 @@ PROJECT_ROOT = BACKEND_DIR.parent
 sys.path.insert(0, str(BACKEND_DIR))
 load_dotenv(BACKEND_DIR / ".env")
 
+from core.resume_store import RESUME_TEXT_COLLECTION, save_resume_text
+from services.application_counters import reconcile as reconcile_counters
 from services.pdf_service import PDFExtractor
 from services.llm_service import LLMService
 from services.matching_service import MatchingService
@@ -143,6 +145,7 @@ async def main():
 
     # Delete resumes
     r2 = await db.resumes.delete_many({})
+    await db[RESUME_TEXT_COLLECTION].delete_many({})
     print(f"     Deleted {r2.deleted_count} resumes")
 
     # Delete role assignments for students
@@ -242,7 +245,7 @@ async def main():
         file_path_rel = f"uploads/resumes/{unique_name}"
 
         # Extract text
-        text, method = pdf_extractor.extract_text(str(pdf_path))
+        text, method = await pdf_extractor.extract_text_async(str(pdf_path), db=db)
         if not text or method == "failed":
             print(f"     ⚠️ {username}: Text extraction failed (scan PDF?)")
             await db.resumes.insert_one({
@@ -266,13 +269,14 @@ async def main():
                 print(f"     ⚠️ {username}: LLM error — {e}")
             time.sleep(2)  # Rate limit
 
-        await db.resumes.insert_one({
+        result = await db.resumes.insert_one({
             "user_id": uid, "file_name": s["pdf"],
             "file_path": file_path_rel, "file_type": "pdf",
-            "file_size": pdf_path.stat().st_size, "extracted_text": text,
+            "file_size": pdf_path.stat().st_size, "text_length": len(text),
             "extracted_features": features, "uploaded_at": now,
             "processed_at": datetime.utcnow(), "status": "processed",
         })
+        await save_resume_text(db, result.inserted_id, text)
 
         resume_features_map[username] = features or {}
         processed += 1
@@ -361,6 +365,10 @@ async def main():
         score_summary = f"{ai_method} | {apps_created} jobs"
         print(f"     ✅ {username:<20s} → {score_summary}")
 
+    # applications ถูกลบ/เพิ่มตรง ๆ ข้างบน → นับ counter ของ job ใหม่ทั้งหมด
+    fixed = await reconcile_counters(db)
+    print(f"\n  🔢 Reconciled application counters on {fixed} jobs")
+
     # ────────────────────────────────────────────────────
     # SUMMARY
     # ────────────────────────────────────────────────────
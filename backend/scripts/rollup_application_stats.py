@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+📅 Refresh the application_daily_stats rollup (per job, per day)
+
+GET /api/jobs/analytics/detailed?source=rollup reads this collection instead
+of grouping every application. Run it daily (cron / Task Scheduler). The
+default window of 30 days also picks up recent status changes, including HR
+decisions on older applications. Run --all weekly as well: ai_score
+re-scoring and deleted applications on days before the window are only
+corrected by a full rebuild.
+
+Usage:
+    python backend/scripts/rollup_application_stats.py             # last 30 days
+    python backend/scripts/rollup_application_stats.py --days 7
+    python backend/scripts/rollup_application_stats.py --all       # full rebuild (weekly)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+import motor.motor_asyncio
+from dotenv import load_dotenv
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / ".env")
+
+from services.application_stats import ROLLUP_COLLECTION, refresh_daily_rollup
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the per-job daily application rollup")
+    parser.add_argument("--days", type=int, default=30, help="days to rebuild (default 30)")
+    parser.add_argument("--all", action="store_true", help="rebuild the whole history")
+    args = parser.parse_args()
+
+    mongo_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DATABASE_NAME", "ai_resume_screening")
+    client = motor.motor_asyncio.AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        print(f"[ERROR] DB connection failed: {e}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    rows = await refresh_daily_rollup(db, None if args.all else args.days)
+    print(f"  ✅ {ROLLUP_COLLECTION}: {rows} job-day rows in {time.perf_counter() - started:.1f}s")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,6 +20,9 @@ from passlib.context import CryptContext
 # Load .env from backend directory
 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(backend_dir, ".env"))
+sys.path.insert(0, backend_dir)
+
+from services.job_search import search_fields
 
 # Password hashing — same as core/auth.py (SHA256 + bcrypt)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -473,6 +476,7 @@ async def seed():
             "created_at": now,
         }
 
+        job_doc.update(search_fields(job_doc))
         await db.jobs.insert_one(job_doc)
         created_jobs += 1
         short_company = COMPANIES[ci]["name"].split(" Co.")[0]
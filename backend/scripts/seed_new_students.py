@@ -35,6 +35,8 @@ PROJECT_ROOT = BACKEND_DIR.parent
 sys.path.insert(0, str(BACKEND_DIR))
 load_dotenv(BACKEND_DIR / ".env")
 
+from core.resume_store import save_resume_text
+from services.application_counters import count_added
 from services.pdf_service import PDFExtractor
 from services.llm_service import LLMService
 from services.matching_service import MatchingService
@@ -209,7 +211,7 @@ async def seed():
 
         # Extract text
         print(f"  [{username}] Extracting text...", end=" ")
-        extracted_text, method = pdf_extractor.extract_text(str(source_path))
+        extracted_text, method = await pdf_extractor.extract_text_async(str(source_path), db=db)
 
         if not extracted_text or method == "failed":
             print(f"FAILED (OCR not supported)")
@@ -244,11 +246,12 @@ async def seed():
         resume_doc = {
             "user_id": user_id, "file_name": pdf_filename,
             "file_path": file_path_rel, "file_type": "pdf",
-            "file_size": file_size, "extracted_text": extracted_text,
+            "file_size": file_size, "text_length": len(extracted_text or ""),
             "extracted_features": extracted_features, "uploaded_at": now,
             "processed_at": datetime.utcnow(), "status": "processed",
         }
-        await db.resumes.insert_one(resume_doc)
+        result = await db.resumes.insert_one(resume_doc)
+        await save_resume_text(db, result.inserted_id, extracted_text)
         resume_data_map[username] = extracted_features or {}
         created_resumes += 1
 
@@ -347,7 +350,7 @@ async def seed():
             }
 
             await db.applications.insert_one(app_doc)
-            await db.jobs.update_one({"_id": job["_id"]}, {"$inc": {"applications_count": 1}})
+            await count_added(db, job["_id"], app_doc["status"])
 
             total_apps += 1
             score_pct = ai_score * 100
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic resume PDFs for benchmarks and tests (no PDF library required).
+
+Writes a minimal PDF by hand — one Helvetica text object per line, laid out in
+1-3 columns (optionally an off-centre sidebar) — so extraction benchmarks run on any machine without the real
+resume set in ``resume test/``.
+
+Usage:
+    from synthetic_pdf import make_resume_pdf
+    data = make_resume_pdf(pages=4, columns=2)
+"""
+
+import random
+from typing import List, Optional, Sequence
+
+_WORDS = (
+    "python react docker fastapi mongodb kubernetes typescript nodejs sql git linux aws "
+    "project developed designed implemented team system api data analysis machine learning "
+    "internship university bachelor computer science engineering web mobile backend frontend"
+).split()
+
+_HEADINGS = ["Education", "Skills", "Projects", "Experience", "Certifications", "Languages"]
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN, LINE_HEIGHT, FONT_SIZE = 40, 13, 9
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(rng: random.Random, widths: Sequence[float], page_no: int) -> bytes:
+    ops: List[str] = []
+    x = MARGIN
+    for col, share in enumerate(widths):
+        col_width = (PAGE_WIDTH - 2 * MARGIN) * share
+        words_per_line = max(3, int(col_width / 45))
+        y = PAGE_HEIGHT - MARGIN
+        heading = 0
+        while y > MARGIN:
+            if heading % 12 == 0:
+                line = f"{_HEADINGS[(page_no + col + heading // 12) % len(_HEADINGS)]}"
+            else:
+                line = " ".join(rng.choice(_WORDS) for _ in range(words_per_line))
+            ops.append(f"BT /F1 {FONT_SIZE} Tf {x:.1f} {y:.1f} Td ({_escape(line)}) Tj ET")
+            y -= LINE_HEIGHT
+            heading += 1
+        x += col_width
+    return "\n".join(ops).encode("latin-1")
+
+
+def make_resume_pdf(pages: int = 3, columns: int = 2, seed: int = 42,
+                    widths: Optional[Sequence[float]] = None) -> bytes:
+    """Build a ``pages``-page PDF with ``columns`` text columns per page.
+
+    ``widths`` (fractions of the text width, e.g. ``(0.3, 0.7)`` for a left
+    sidebar) overrides ``columns`` with unequal columns.
+    """
+    widths = widths or [1 / columns] * columns
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # placeholders, filled once page ids are known
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_no in range(pages):
+        stream = _page_stream(rng, widths, page_no)
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_obj, PAGE_WIDTH, PAGE_HEIGHT, font, content)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref)
+    return bytes(out)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Application counters on job documents — ``applications_count`` plus
+``status_counts.<status>`` — kept authoritative so listings read them
+instead of running ``count_documents`` per job.
+
+Every write that adds, removes or re-statuses an application adjusts the
+counters with one atomic ``$inc`` (``count_added`` / ``count_removed`` /
+``count_status_change``). Writes that bypass these helpers (manual fixes,
+crashed requests between the two writes) are corrected by ``reconcile``,
+which recounts with one ``$group`` and rewrites only the jobs that drifted;
+``CounterReconciler`` runs it periodically in the app.
+
+Usage:
+    await count_added(db, job_id)                               # apply
+    await count_status_change(db, job_id, "pending", "accepted") # HR decision
+    await count_removed(db, deleted_applications)               # delete
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+TOTAL_FIELD = "applications_count"
+STATUS_FIELD = "status_counts"
+
+RECONCILE_INTERVAL = int(os.getenv("COUNTER_RECONCILE_INTERVAL", "3600"))  # วินาที, 0 = ปิด
+
+
+def _job_oid(job_id: Any) -> Optional[ObjectId]:
+    if isinstance(job_id, ObjectId):
+        return job_id
+    return ObjectId(job_id) if job_id and ObjectId.is_valid(str(job_id)) else None
+
+
+def _status(status: Optional[str]) -> str:
+    return status or "pending"
+
+
+# =============================================================================
+# INCREMENTS
+# =============================================================================
+
+async def count_added(db, job_id: Any, status: str = "pending") -> None:
+    oid = _job_oid(job_id)
+    if oid:
+        await db.jobs.update_one(
+            {"_id": oid}, {"$inc": {TOTAL_FIELD: 1, f"{STATUS_FIELD}.{_status(status)}": 1}},
+        )
+
+
+async def count_status_change(db, job_id: Any, old_status: Optional[str], new_status: str) -> None:
+    oid = _job_oid(job_id)
+    if oid and _status(old_status) != _status(new_status):
+        await db.jobs.update_one(
+            {"_id": oid},
+            {"$inc": {f"{STATUS_FIELD}.{_status(old_status)}": -1, f"{STATUS_FIELD}.{_status(new_status)}": 1}},
+        )
+
+
+def _removal_updates(applications: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    per_job: Dict[ObjectId, Counter] = {}
+    for app in applications:
+        oid = _job_oid(app.get("job_id"))
+        if oid:
+            per_job.setdefault(oid, Counter())[_status(app.get("status"))] += 1
+    return [
+        UpdateOne({"_id": oid}, {"$inc": {
+            TOTAL_FIELD: -sum(counts.values()),
+            **{f"{STATUS_FIELD}.{status}": -n for status, n in counts.items()},
+        }})
+        for oid, counts in per_job.items()
+    ]
+
+
+async def count_removed(db, applications: Iterable[Dict[str, Any]]) -> None:
+    """Decrement for deleted applications (each needs ``job_id`` + ``status``) — one bulk write"""
+    updates = _removal_updates(applications)
+    if updates:
+        await db.jobs.bulk_write(updates, ordered=False)
+
+
+# =============================================================================
+# RECONCILER
+# =============================================================================
+
+def _expected_counts(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """``$group`` rows ``{_id: {job_id, status}, n}`` → per job_id totals"""
+    expected: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        job = expected.setdefault(row["_id"].get("job_id"), {TOTAL_FIELD: 0, STATUS_FIELD: {}})
+        job[TOTAL_FIELD] += row["n"]
+        status = _status(row["_id"].get("status"))
+        job[STATUS_FIELD][status] = job[STATUS_FIELD].get(status, 0) + row["n"]
+    return expected
+
+
+def _stored_counts(job: Dict[str, Any]) -> Dict[str, Any]:
+    statuses = {k: v for k, v in (job.get(STATUS_FIELD) or {}).items() if v}
+    return {TOTAL_FIELD: job.get(TOTAL_FIELD, 0), STATUS_FIELD: statuses}
+
+
+async def reconcile(db) -> int:
+    """Recount every job's counters from ``applications`` → number of jobs corrected
+
+    Stored counters are read *before* the ``$group`` and each correction only
+    applies while they are still the values read. A job that received an
+    apply / status change in the meantime is skipped and left to the next run,
+    instead of being overwritten with a count that missed that change.
+    """
+    stored = await db.jobs.find({}, {TOTAL_FIELD: 1, STATUS_FIELD: 1}).to_list(length=None)
+    rows = await db.applications.aggregate([
+        {"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "n": {"$sum": 1}}},
+    ]).to_list(length=None)
+    expected = _expected_counts(rows)
+
+    fixes = []
+    for job in stored:
+        want = expected.get(str(job["_id"]), {TOTAL_FIELD: 0, STATUS_FIELD: {}})
+        if _stored_counts(job) != want:
+            # ค่าที่อ่านมาตรง ๆ (ลำดับ key เดิม) — subdocument เทียบแบบตรงลำดับ
+            unchanged = {"_id": job["_id"], TOTAL_FIELD: job.get(TOTAL_FIELD), STATUS_FIELD: job.get(STATUS_FIELD)}
+            fixes.append(UpdateOne(unchanged, {"$set": want}))
+
+    if not fixes:
+        return 0
+    result = await db.jobs.bulk_write(fixes, ordered=False)
+    skipped = len(fixes) - result.matched_count
+    logger.info(f"[Counters] Reconciled {result.matched_count} job(s) with drifted application counters"
+                + (f", {skipped} changed during the recount (next run)" if skipped else ""))
+    return result.matched_count
+
+
+class CounterReconciler:
+    """Background task: ``reconcile`` every ``interval`` seconds"""
+
+    def __init__(self, get_db, interval: int = RECONCILE_INTERVAL):
+        self.get_db = get_db
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"[Counters] Reconciler every {self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await reconcile(self.get_db())
+            except Exception as e:
+                logger.error(f"[Counters] Reconcile failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+_reconciler: Optional[CounterReconciler] = None
+
+
+def get_counter_reconciler(get_db=None) -> CounterReconciler:
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = CounterReconciler(get_db)
+    return _reconciler
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Application statistics — per-job counts, AI score averages and histograms
+computed by MongoDB instead of in Python.
+
+``job_stats_pipeline`` is one ``$match`` / ``$group`` over ``applications``
+keyed by ``job_id``. Every output field is an additive sum (counts,
+``score_sum`` / ``scored`` for the average, one counter per score bucket),
+so the same rows can be stored per day and re-summed later: the optional
+``application_daily_stats`` rollup (``refresh_daily_rollup``, run by
+scripts/rollup_application_stats.py) keeps company dashboards to one small
+document per job per day however long the history grows.
+
+Per-job histograms use ``$cond`` sums over ``SCORE_BOUNDARIES`` rather than
+``$bucket`` — ``$bucket`` groups by one expression only, so it cannot bucket
+by score within each job in the same ``$group``.
+
+``ai_score`` is stored 0-1; averages are reported 0-100 like the frontend expects.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from core.indexes import declare_index
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "application_daily_stats"
+
+STATUSES = ("pending", "accepted", "rejected")
+# ai_score 0-1 → 5 buckets of 20 points; last bound > 1 so a perfect 1.0 lands in 80-100
+SCORE_BOUNDARIES = [0, 0.2, 0.4, 0.6, 0.8, 1.000001]
+BUCKET_LABELS = ["0-20", "20-40", "40-60", "60-80", "80-100"]
+
+ADDITIVE_FIELDS = ["total", *STATUSES, "scored", "score_sum", *[f"bucket_{i}" for i in range(len(BUCKET_LABELS))]]
+
+
+def _count_if(condition: Dict[str, Any]) -> Dict[str, Any]:
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
+
+def _is_score() -> Dict[str, Any]:
+    return {"$in": [{"$type": "$ai_score"}, ["double", "int", "long", "decimal"]]}
+
+
+def _group_fields() -> Dict[str, Any]:
+    """``$group`` accumulators — all additive (see module docstring)"""
+    fields: Dict[str, Any] = {"total": {"$sum": 1}}
+    for status in STATUSES:
+        fields[status] = _count_if({"$eq": ["$status", status]})
+    fields["scored"] = _count_if(_is_score())
+    fields["score_sum"] = {"$sum": {"$cond": [_is_score(), "$ai_score", 0]}}
+    for i, (low, high) in enumerate(zip(SCORE_BOUNDARIES, SCORE_BOUNDARIES[1:])):
+        fields[f"bucket_{i}"] = _count_if({"$and": [
+            _is_score(), {"$gte": ["$ai_score", low]}, {"$lt": ["$ai_score", high]},
+        ]})
+    return fields
+
+
+# =============================================================================
+# PIPELINES
+# =============================================================================
+
+def job_stats_pipeline(job_ids: List[str]) -> List[Dict[str, Any]]:
+    """Live: one row per job_id straight from ``applications``"""
+    return [
+        {"$match": {"job_id": {"$in": job_ids}}},
+        {"$group": {"_id": "$job_id", **_group_fields()}},
+    ]
+
+
+def _day_range(day: str) -> Dict[str, Any]:
+    start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return {"submitted_at": {"$gte": start, "$lt": start + timedelta(days=1)}}
+
+
+def rollup_pipeline(since: Optional[datetime] = None, run: Optional[str] = None,
+                    days: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """One row per (job_id, UTC day of submitted_at), merged into ``ROLLUP_COLLECTION``
+
+    ``days`` adds whole days before ``since``; rows are stamped with ``run``.
+    """
+    match: Dict[str, Any] = {}
+    if since:
+        ranges = [{"submitted_at": {"$gte": since}}, *(_day_range(day) for day in days)]
+        match = {"$or": ranges} if len(ranges) > 1 else ranges[0]
+    day = {"$dateToString": {"format": "%Y-%m-%d", "date": "$submitted_at"}}
+    return [
+        {"$match": match},
+        {"$group": {"_id": {"job_id": "$job_id", "day": day}, **_group_fields()}},
+        {"$project": {
+            "_id": {"$concat": ["$_id.job_id", ":", "$_id.day"]},
+            "job_id": "$_id.job_id",
+            "day": "$_id.day",
+            **{f: 1 for f in ADDITIVE_FIELDS},
+            "rolled_up_at": "$$NOW",
+            "refresh_run": {"$literal": run},
+        }},
+        {"$merge": {"into": ROLLUP_COLLECTION, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+def rollup_stats_pipeline(job_ids: List[str]) -> List[Dict[str, Any]]:
+    """Rollup: re-sum the daily rows per job_id"""
+    return [
+        {"$match": {"job_id": {"$in": job_ids}}},
+        {"$group": {"_id": "$job_id", **{f: {"$sum": f"${f}"} for f in ADDITIVE_FIELDS}}},
+    ]
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+def _avg_percent(score_sum: float, scored: int) -> float:
+    return round(score_sum / scored * 100, 1) if scored else 0
+
+
+def summarize(jobs: Iterable[Dict[str, Any]], rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """``{"summary", "per_job", "score_histogram"}`` — jobs without applications get zeros"""
+    jobs = list(jobs)
+    by_job = {row["_id"]: row for row in rows}
+    totals = {f: 0 for f in ADDITIVE_FIELDS}
+
+    per_job = []
+    for job in jobs:
+        jid = str(job["_id"])
+        row = by_job.get(jid, {})
+        for f in ADDITIVE_FIELDS:
+            totals[f] += row.get(f, 0)
+        per_job.append({
+            "job_id": jid,
+            "title": job.get("title", ""),
+            "is_active": job.get("is_active", False),
+            "total": row.get("total", 0),
+            **{status: row.get(status, 0) for status in STATUSES},
+            "avg_ai_score": _avg_percent(row.get("score_sum", 0), row.get("scored", 0)),
+            "score_histogram": [row.get(f"bucket_{i}", 0) for i in range(len(BUCKET_LABELS))],
+        })
+
+    total_apps = totals["total"]
+    return {
+        "summary": {
+            "total_jobs": len(jobs),
+            "total_applications": total_apps,
+            "total_accepted": totals["accepted"],
+            "total_rejected": totals["rejected"],
+            "total_pending": totals["pending"],
+            "acceptance_rate": round(totals["accepted"] / total_apps * 100, 1) if total_apps else 0,
+            "avg_ai_score": _avg_percent(totals["score_sum"], totals["scored"]),
+        },
+        "per_job": per_job,
+        "score_histogram": [
+            {"range": label, "count": totals[f"bucket_{i}"]} for i, label in enumerate(BUCKET_LABELS)
+        ],
+    }
+
+
+declare_index(ROLLUP_COLLECTION, [("job_id", 1), ("day", 1)], query={"job_id": {"$in": ["?"]}})
+declare_index(ROLLUP_COLLECTION, [("day", 1)], query={"day": {"$gte": "2000-01-01"}})
+# refresh_daily_rollup(days) อ่านเฉพาะใบสมัครในช่วงเวลา + ใบสมัครเก่าที่ HR ตัดสินในช่วงนั้น
+declare_index("applications", [("submitted_at", 1)],
+              query={"submitted_at": {"$gte": datetime(2000, 1, 1, tzinfo=timezone.utc)}})
+declare_index("applications", [("decided_at", 1)],
+              query={"decided_at": {"$gte": datetime(2000, 1, 1, tzinfo=timezone.utc)}})
+
+
+async def job_stats(db, jobs: List[Dict[str, Any]], source: str = "live") -> Dict[str, Any]:
+    """Analytics for ``jobs`` from ``applications`` (live) or the daily rollup"""
+    job_ids = [str(job["_id"]) for job in jobs]
+    if source == "rollup":
+        rows = await db[ROLLUP_COLLECTION].aggregate(rollup_stats_pipeline(job_ids)).to_list(length=None)
+    else:
+        rows = await db.applications.aggregate(job_stats_pipeline(job_ids)).to_list(length=None)
+    return summarize(jobs, rows)
+
+
+async def _decided_days(db, since: datetime) -> List[str]:
+    """Submission days (before ``since``) of applications decided since ``since``"""
+    rows = await db.applications.aggregate([
+        {"$match": {"decided_at": {"$gte": since}, "submitted_at": {"$lt": since}}},
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$submitted_at"}}}},
+    ]).to_list(length=None)
+    return sorted(row["_id"] for row in rows if row["_id"])
+
+
+async def refresh_daily_rollup(db, days: Optional[int] = None) -> int:
+    """
+    Rebuild the rollup for the last ``days`` days (all history when None) → rows written.
+
+    Rows are replaced by ``$merge`` first; only then are rows in the window
+    that this run did not write (days / jobs with no applications left)
+    deleted. Readers of ``?source=rollup`` never see an emptied window.
+
+    HR decisions on older applications (``decided_at`` in the window) also
+    rebuild their submission day. Other changes to days before the window
+    (``ai_score`` re-scoring after a certificate upload, deleted
+    applications) wait for a full rebuild. Run ``--all`` periodically
+    (scripts/rollup_application_stats.py).
+    """
+    run = str(ObjectId())
+    since, extra_days = None, []
+    window: Dict[str, Any] = {}
+    if days is not None:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        extra_days = await _decided_days(db, since)
+        window = {"day": {"$gte": since.strftime("%Y-%m-%d")}}
+        if extra_days:
+            window = {"$or": [window, {"day": {"$in": extra_days}}]}
+
+    await db.applications.aggregate(rollup_pipeline(since, run, extra_days)).to_list(length=None)
+    await db[ROLLUP_COLLECTION].delete_many({**window, "refresh_run": {"$ne": run}})
+    rows = await db[ROLLUP_COLLECTION].count_documents(window)
+    logger.info(f"[ApplicationStats] Rolled up {rows} job-day rows" + (f" (last {days} days)" if days else ""))
+    return rows
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+CertAnalysisCache — reuse LLM certificate analyses for near-duplicate templates.
+
+Most uploaded certificates are the same few templates (Coursera, Cisco
+NetAcad, university e-certificates) with only the holder's name, dates and
+credential IDs changed. The text is normalized with those parts masked,
+fingerprinted with a 64-bit SimHash over word shingles, and looked up in the
+``cert_analysis_cache`` collection. A hit within ``max_distance`` bits reuses
+the stored cert_name / domain / skills_covered / relevance_tags without an
+LLM call.
+
+Lookups are LSH-banded: the fingerprint is split into ``max_distance + 1``
+bands, so any fingerprint within ``max_distance`` bits shares at least one
+band exactly and is found with a single ``$in`` query on the multikey
+``bands`` index. ``simhash`` is unique, so concurrent stores of one template
+keep one entry. Both indexes are declared here (core/indexes.py).
+"""
+
+import re
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from core.indexes import declare_index
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLLECTION = "cert_analysis_cache"
+
+declare_index(CACHE_COLLECTION, [("bands", 1)], query={"bands": {"$in": ["?"]}})
+declare_index(CACHE_COLLECTION, [("simhash", 1)], query={"simhash": "?"}, unique=True)
+
+# Only template-level fields are reused — nothing specific to the holder
+CACHED_FIELDS = ("cert_name", "domain", "skills_covered", "relevance_tags", "is_valid_cert")
+
+# ชื่อเดือนละตินต้องไม่ติดตัวอักษรอื่น ("Marketing", "junior", "decision" ไม่ใช่วันที่)
+# ใช้ lookaround แทน \b เพื่อให้ "12March2024" ยังนับเป็นวันที่
+_MONTHS = (
+    r"(?<![a-z])(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)(?![a-z])"
+    r"|มกราคม|กุมภาพันธ์|มีนาคม|เมษายน|พฤษภาคม|มิถุนายน|กรกฎาคม|สิงหาคม|กันยายน|ตุลาคม|พฤศจิกายน|ธันวาคม"
+    r"|ม\.ค\.|ก\.พ\.|มี\.ค\.|เม\.ย\.|พ\.ค\.|มิ\.ย\.|ก\.ค\.|ส\.ค\.|ก\.ย\.|ต\.ค\.|พ\.ย\.|ธ\.ค\."
+)
+_DATE_RES = [
+    re.compile(r"\b\d{1,4}[/\-.]\d{1,2}[/\-.]\d{1,4}\b"),
+    re.compile(rf"(?:\d{{1,2}}\s*)?(?:{_MONTHS})\s*,?\s*(?:\d{{1,2}}(?!\d)\s*,?\s*)?(?:\d{{4}})?", re.IGNORECASE),
+]
+# Phrases right before the holder's name — the rest of the line (or next line) is masked
+_NAME_BEFORE_RE = re.compile(
+    r"(certify that|certifies that|awarded to|presented to|granted to|this is to certify|"
+    r"มอบให้|ให้ไว้เพื่อแสดงว่า|ขอมอบ(?:เกียรติบัตร|ประกาศนียบัตร)[^\n]*ให้)",
+    re.IGNORECASE,
+)
+# Phrases right after the holder's name — the start of the line (or previous line) is masked
+_NAME_AFTER_RE = re.compile(
+    r"(has successfully completed|has completed|successfully completed|ได้ผ่านการ|ได้เข้าร่วม)",
+    re.IGNORECASE,
+)
+_ID_RE = re.compile(r"\b(?=[a-z0-9\-]*\d)[a-z0-9\-]{6,}\b", re.IGNORECASE)
+_NUM_RE = re.compile(r"\d+")
+_TOKEN_RE = re.compile(r"[a-z฀-๿#+]+", re.IGNORECASE)
+
+
+def normalize_cert_text(text: str, mask_terms: Optional[Iterable[str]] = None) -> str:
+    """Lowercase, mask names/dates/IDs/numbers and collapse whitespace."""
+    if not text:
+        return ""
+    for term in mask_terms or ():
+        if term and len(term.strip()) > 1:
+            text = re.sub(re.escape(term.strip()), " <name> ", text, flags=re.IGNORECASE)
+
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        m = _NAME_BEFORE_RE.search(line)
+        if m:
+            if line[m.end():].strip(" :,-"):
+                lines[i] = line[:m.end()] + " <name>"
+            elif i + 1 < len(lines):
+                lines[i + 1] = "<name>"
+            continue
+        m = _NAME_AFTER_RE.search(line)
+        if m:
+            if line[:m.start()].strip(" :,-"):
+                lines[i] = "<name> " + line[m.start():]
+            elif i > 0:
+                lines[i - 1] = "<name>"
+    text = "\n".join(lines).lower()
+
+    for rx in _DATE_RES:
+        text = rx.sub(" <date> ", text)
+    text = _ID_RE.sub(" <id> ", text)
+    text = _NUM_RE.sub(" <n> ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    """64-bit SimHash over word shingles of already-normalized text."""
+    tokens = _TOKEN_RE.findall(text) + re.findall(r"<\w+>", text)
+    if not tokens:
+        return 0
+    grams = (
+        [" ".join(tokens[i:i + shingle]) for i in range(len(tokens) - shingle + 1)]
+        if len(tokens) >= shingle else [" ".join(tokens)]
+    )
+    weights = [0] * 64
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class CertAnalysisCache:
+    """Mongo-backed SimHash cache of certificate LLM analyses with hit-ratio stats."""
+
+    def __init__(self, max_distance: int = 3, min_tokens: int = 8) -> None:
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.skipped = 0  # text too short/generic to fingerprint safely
+
+    # ------------------------------------------------------------------
+    # Fingerprinting
+    # ------------------------------------------------------------------
+
+    def fingerprint(self, text: str, mask_terms: Optional[Iterable[str]] = None) -> Optional[int]:
+        normalized = normalize_cert_text(text, mask_terms)
+        if len(_TOKEN_RE.findall(normalized)) < self.min_tokens:
+            return None
+        return simhash(normalized)
+
+    def band_keys(self, fp: int) -> List[int]:
+        """One key per band; band index is folded in so bands never collide."""
+        mask = (1 << self.band_bits) - 1
+        return [(i << self.band_bits) | ((fp >> (i * self.band_bits)) & mask) for i in range(self.bands)]
+
+    # ------------------------------------------------------------------
+    # Lookup / Store
+    # ------------------------------------------------------------------
+
+    async def lookup(self, db, text: str, mask_terms: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis for a near-duplicate certificate, or None."""
+        fp = self.fingerprint(text, mask_terms)
+        with self._lock:
+            self.lookups += 1
+            if fp is None:
+                self.skipped += 1
+        if fp is None:
+            return None
+
+        try:
+            candidates = await db[CACHE_COLLECTION].find(
+                {"bands": {"$in": self.band_keys(fp)}},
+                {"simhash": 1, "analysis": 1},
+            ).to_list(length=50)
+        except Exception as e:
+            logger.warning(f"[CertCache] lookup failed: {e}")
+            return None
+
+        best, best_dist = None, self.max_distance + 1
+        for doc in candidates:
+            dist = hamming(fp, int(doc["simhash"], 16))
+            if dist < best_dist:
+                best, best_dist = doc, dist
+        if best is None:
+            return None
+
+        with self._lock:
+            self.hits += 1
+        try:
+            await db[CACHE_COLLECTION].update_one(
+                {"_id": best["_id"]},
+                {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.now(timezone.utc)}},
+            )
+        except Exception as e:
+            logger.warning(f"[CertCache] hit counter update failed: {e}")
+        logger.info(f"[CertCache] HIT distance={best_dist} cert='{best['analysis'].get('cert_name')}'")
+        return dict(best["analysis"])
+
+    async def store(self, db, text: str, analysis: Dict[str, Any],
+                    mask_terms: Optional[Iterable[str]] = None) -> None:
+        """Remember an LLM analysis under the certificate's template fingerprint."""
+        fp = self.fingerprint(text, mask_terms)
+        if fp is None or not analysis:
+            return
+        cached = {k: analysis[k] for k in CACHED_FIELDS if k in analysis}
+        query = {"simhash": f"{fp:016x}"}
+        update = {
+            "$set": {"analysis": cached, "bands": self.band_keys(fp)},
+            "$setOnInsert": {"hits": 0, "created_at": datetime.now(timezone.utc)},
+        }
+        try:
+            try:
+                await db[CACHE_COLLECTION].update_one(query, update, upsert=True)
+            except DuplicateKeyError:
+                # store พร้อมกันของ template เดียวกัน — อีกฝั่ง insert ไปแล้ว อัปเดตทับแทน
+                await db[CACHE_COLLECTION].update_one(query, update)
+        except Exception as e:
+            logger.warning(f"[CertCache] store failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.lookups - self.hits,
+                "skipped": self.skipped,
+                "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            }
+
+
+# Singleton — counters are per-process
+_instance: Optional[CertAnalysisCache] = None
+
+
+def get_cert_cache() -> CertAnalysisCache:
+    global _instance
+    if _instance is None:
+        _instance = CertAnalysisCache()
+    return _instance
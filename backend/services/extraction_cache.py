@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 💾 EXTRACTION CACHE - เก็บผล extract PDF ตาม (SHA-256, extractor version)
+# =============================================================================
+"""
+Extraction-result cache keyed by file content.
+
+Re-uploads, reseeds, reprocess runs and certificate re-syncs of unchanged
+bytes should not parse the PDF again. Results live in ``extraction_cache``:
+
+    _id        "<sha256>:<profile>:<EXTRACTOR_VERSION>"
+    text       compressed raw cascade text (core/compression.py: zstd / zlib)
+    method     candidate that won ("column" | "plain" | "pypdf2" | "failed")
+    strategy / score / chars / attempts   — layout + quality metadata
+
+The key includes the cascade profile (resume / certificate / pdf_service,
+each scores candidates differently) and ``EXTRACTOR_VERSION`` from
+services/extraction_cascade.py — bumping the version invalidates every entry
+without a migration. The cached text is the raw cascade output; callers apply
+their own cleanup (``sanitize_text`` / ``_clean_text``) as before.
+
+Pool failures (timeout / memory / crash) are not cached.
+
+Usage:
+    result = await extract_cached(db, "uploads/resumes/ab/cd/<sha>.pdf", "resume", sha256)
+    result.text, result.method, result.cached
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.compression import compress_text, decompress_text
+from services.extraction_cascade import EXTRACTOR_VERSION, PROFILES, CascadeResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLLECTION = "extraction_cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class CachedExtraction:
+    text: str
+    method: str             # backwards-compatible label, as returned by CascadeResult.as_tuple()
+    strategy: Optional[str]
+    score: float
+    cached: bool = False    # True when served from the cache
+
+
+def cache_key(sha256: str, profile: str) -> str:
+    return f"{sha256}:{profile}:{EXTRACTOR_VERSION}"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def get_cached(db, sha256: str, profile: str) -> Optional[CachedExtraction]:
+    doc = await db[CACHE_COLLECTION].find_one_and_update(
+        {"_id": cache_key(sha256, profile)},
+        {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.now(timezone.utc)}},
+        projection={"attempts": 0},
+    )
+    if doc is None:
+        return None
+    try:
+        text = decompress_text(doc["codec"], doc["text"])
+    except Exception as e:
+        logger.warning(f"[ExtractionCache] Unreadable entry {doc['_id']}: {e}")
+        return None
+    return CachedExtraction(text, doc["method"], doc.get("strategy"), doc.get("score", 0.0), cached=True)
+
+
+async def put_cached(db, sha256: str, profile: str, result: CascadeResult) -> CachedExtraction:
+    text, method = result.as_tuple()
+    codec, data = compress_text(text)
+    await db[CACHE_COLLECTION].update_one(
+        {"_id": cache_key(sha256, profile)},
+        {"$set": {
+            "sha256": sha256, "profile": profile, "version": EXTRACTOR_VERSION,
+            "codec": codec, "text": data, "chars": len(text),
+            "method": method, "strategy": result.strategy, "score": result.score,
+            "early_exit": result.early_exit,
+            "attempts": [{"strategy": a.strategy, "ms": a.ms, "scores": a.scores} for a in result.attempts],
+            "created_at": datetime.now(timezone.utc),
+        }, "$setOnInsert": {"hits": 0}},
+        upsert=True,
+    )
+    return CachedExtraction(text, method, result.strategy, result.score)
+
+
+async def extract_cached(db, path: str, profile: str, sha256: Optional[str] = None) -> CachedExtraction:
+    """Cached result for the PDF at ``path``, extracting (and caching) it on a miss.
+
+    ``db`` may be None (no cache — extract only). ``sha256`` is computed from the
+    file when the caller does not already know it.
+
+    Raises:
+        PDFExtractionError: the pool aborted extraction (nothing is cached)
+    """
+    from services.pdf_pool import get_pdf_pool
+
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown extraction profile: {profile}")
+    if db is None:
+        result = await get_pdf_pool().extract_file_result(path, profile)
+        text, method = result.as_tuple()
+        return CachedExtraction(text, method, result.strategy, result.score)
+
+    sha256 = sha256 or await asyncio.to_thread(file_sha256, path)
+    try:
+        hit = await get_cached(db, sha256, profile)
+    except Exception as e:
+        logger.warning(f"[ExtractionCache] Lookup failed, extracting: {e}")
+        hit = None
+    if hit is not None:
+        logger.info(f"[ExtractionCache] Hit {sha256[:12]} ({profile}, {len(hit.text)} chars)")
+        return hit
+
+    result = await get_pdf_pool().extract_file_result(path, profile)
+    try:
+        return await put_cached(db, sha256, profile, result)
+    except Exception as e:
+        logger.warning(f"[ExtractionCache] Store failed: {e}")
+        text, method = result.as_tuple()
+        return CachedExtraction(text, method, result.strategy, result.score)
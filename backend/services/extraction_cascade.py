@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🪜 EXTRACTION CASCADE - ลองวิธีถูกก่อน ให้คะแนนผล หยุดทันทีเมื่อผ่านเกณฑ์
+# =============================================================================
+"""
+One PDF text-extraction path for every caller.
+
+A *strategy* extracts one or more candidate texts from a PDF:
+
+    pypdf2              → "pypdf2"               (cheapest, no layout)
+    pdfplumber_plain    → "plain"                (pdfplumber extract_text only)
+    pdfplumber_layout   → "column" + "plain"     (single open, services/pdf_engine.py)
+
+A *profile* (resume / certificate / pdf_service) lists the strategies a
+caller accepts, how candidates are scored and the score that counts as good
+enough. Strategies run cheapest-first by measured cost (EWMA of ms per KB of
+PDF, seeded with priors); the cascade stops as soon as a candidate crosses the
+threshold, otherwise the best-scoring candidate wins. Profiles that need a
+reading order (resume) try layout-aware strategies first regardless of cost.
+
+Scoring (0..1, weights per profile):
+    length    — usable characters vs the profile's expected length
+    clean     — penalizes (cid:N), U+FFFD and private-use glyphs
+    thai      — Thai combining marks detached from their base letter
+                (typical of broken Thai font maps); 1.0 for non-Thai text
+    headings  — recognizable resume section headings at line starts
+
+``run_cascade`` is pure and runs inside PDF pool workers; the parent records
+each result with ``get_extraction_cascade().record`` (timing + win rates).
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output can change (strategies, scoring, layout analysis):
+# cached results (services/extraction_cache.py) are keyed by this version
+EXTRACTOR_VERSION = "cascade-3"
+
+# Weight of the newest measurement in the per-strategy cost average
+COST_EWMA_ALPHA = 0.2
+# A later candidate must beat the current best by this much (ties → cheaper / preferred)
+PREFERENCE_MARGIN = 0.02
+
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+# Above/below vowels and tone marks that are not attached to a Thai base letter
+_ORPHAN_MARK_RE = re.compile(r"(?:^|(?<=[^\u0E00-\u0E7F]))[\u0E31\u0E34-\u0E3A\u0E47-\u0E4E]", re.MULTILINE)
+_GARBLED_RE = re.compile(r"\(cid:\d+\)|\uFFFD|[\uE000-\uF8FF]")
+_HEADING_RE = re.compile(
+    r"^\s*(education|skills?|experience|work experience|projects?|certifications?|languages?|"
+    r"summary|objective|profile|contact|activities|awards?|"
+    r"การศึกษา|ประวัติการศึกษา|ทักษะ|ประสบการณ์|โครงงาน|ผลงาน|ภาษา|ติดต่อ|กิจกรรม)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+# -----------------------------------------------------------------------------
+# Strategies
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Strategy:
+    name: str
+    run: Callable[[Any, Optional[int]], List[Tuple[str, str]]]
+    prior_ms_per_kb: float
+    layout_aware: bool = False
+
+
+def _run_pypdf2(source: Any, max_chars: Optional[int]) -> List[Tuple[str, str]]:
+    from services.pdf_engine import extract_plain_pypdf2
+    return [("pypdf2", extract_plain_pypdf2(source, max_chars))]
+
+
+def _run_pdfplumber_plain(source: Any, max_chars: Optional[int]) -> List[Tuple[str, str]]:
+    from services.pdf_engine import extract_plain
+    return [("plain", extract_plain(source, max_chars))]
+
+
+def _run_pdfplumber_layout(source: Any, max_chars: Optional[int]) -> List[Tuple[str, str]]:
+    from services.pdf_engine import extract_layouts
+    layouts = extract_layouts(source, max_chars=max_chars)
+    return [("column", layouts["column"]), ("plain", layouts["plain"])]
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    s.name: s for s in (
+        Strategy("pypdf2", _run_pypdf2, prior_ms_per_kb=0.5),
+        Strategy("pdfplumber_plain", _run_pdfplumber_plain, prior_ms_per_kb=4.0),
+        Strategy("pdfplumber_layout", _run_pdfplumber_layout, prior_ms_per_kb=6.0, layout_aware=True),
+    )
+}
+
+
+# -----------------------------------------------------------------------------
+# Profiles + scoring
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    strategies: Tuple[str, ...]
+    threshold: float
+    expected_chars: int
+    min_chars: int
+    weights: Dict[str, float]
+    require_layout: bool = False
+    # Backwards-compatible method labels returned to callers
+    method_names: Dict[str, str] = field(default_factory=dict)
+
+
+PROFILES: Dict[str, Profile] = {
+    "resume": Profile(
+        "resume", ("pdfplumber_layout", "pypdf2"), threshold=0.8, expected_chars=1500, min_chars=10,
+        weights={"length": 0.3, "clean": 0.35, "thai": 0.15, "headings": 0.2},
+        require_layout=True,
+    ),
+    "certificate": Profile(
+        "certificate", ("pypdf2", "pdfplumber_plain"), threshold=0.8, expected_chars=150, min_chars=1,
+        weights={"length": 0.4, "clean": 0.45, "thai": 0.15, "headings": 0.0},
+    ),
+    "pdf_service": Profile(
+        "pdf_service", ("pypdf2", "pdfplumber_plain"), threshold=0.8, expected_chars=1500, min_chars=50,
+        weights={"length": 0.3, "clean": 0.35, "thai": 0.15, "headings": 0.2},
+        method_names={"plain": "pdfplumber"},
+    ),
+}
+
+
+def score_components(text: str, expected_chars: int) -> Dict[str, float]:
+    """Individual 0..1 quality signals for one candidate text."""
+    stripped = (text or "").strip()
+    if not stripped:
+        return {"length": 0.0, "clean": 0.0, "thai": 0.0, "headings": 0.0, "thai_ratio": 0.0}
+    garbled = sum(len(m) for m in _GARBLED_RE.findall(stripped))
+    thai_chars = len(_THAI_RE.findall(stripped))
+    orphans = len(_ORPHAN_MARK_RE.findall(stripped)) if thai_chars else 0
+    headings = {m.group(1).lower() for m in _HEADING_RE.finditer(stripped)}
+    return {
+        "length": min(1.0, (len(stripped) - garbled) / expected_chars),
+        "clean": max(0.0, 1.0 - 10.0 * garbled / len(stripped)),
+        "thai": 1.0 if not thai_chars else max(0.0, 1.0 - 5.0 * orphans / thai_chars),
+        "headings": min(1.0, len(headings) / 3),
+        "thai_ratio": thai_chars / len(stripped),  # reported only
+    }
+
+
+def score_text(text: str, profile: Profile) -> float:
+    if len((text or "").strip()) < profile.min_chars:
+        return 0.0
+    components = score_components(text, profile.expected_chars)
+    return round(sum(w * components[k] for k, w in profile.weights.items()), 4)
+
+
+# -----------------------------------------------------------------------------
+# Running (worker side — pure, picklable results)
+# -----------------------------------------------------------------------------
+
+@dataclass
+class Attempt:
+    strategy: str
+    ms: float
+    scores: Dict[str, float]  # candidate name → score
+
+
+@dataclass
+class CascadeResult:
+    profile: str
+    text: str
+    method: str          # candidate name, or "failed"
+    score: float
+    strategy: Optional[str]
+    attempts: List[Attempt]
+    early_exit: bool
+
+    def as_tuple(self) -> Tuple[str, str]:
+        """``(text, method)`` with the profile's backwards-compatible method label."""
+        return self.text, PROFILES[self.profile].method_names.get(self.method, self.method)
+
+
+def new_result(profile_name: str) -> CascadeResult:
+    return CascadeResult(profile_name, "", "failed", 0.0, None, [], False)
+
+
+def offer(result: CascadeResult, strategy: str, ms: float, candidates: Sequence[Tuple[str, str]]) -> bool:
+    """Score ``candidates`` from one strategy run into ``result``; True once the threshold is crossed."""
+    profile = PROFILES[result.profile]
+    scores: Dict[str, float] = {}
+    for name, text in candidates:
+        score = scores[name] = score_text(text, profile)
+        if score <= 0:
+            continue
+        if result.strategy is None or score > result.score + PREFERENCE_MARGIN:
+            result.text, result.method, result.score, result.strategy = text, name, score, strategy
+    result.attempts.append(Attempt(strategy, round(ms, 2), scores))
+    result.early_exit = result.score >= profile.threshold
+    return result.early_exit
+
+
+def run_cascade(source: Any, profile_name: str, order: Optional[Sequence[str]] = None,
+                max_chars: Optional[int] = None, result: Optional[CascadeResult] = None) -> CascadeResult:
+    """Run strategies in ``order`` (default: profile order) until one is good enough.
+
+    ``result`` continues a cascade started elsewhere (e.g. page-parallel layout
+    extraction in services/pdf_pool.py).
+    """
+    result = result or new_result(profile_name)
+    if result.early_exit:
+        return result
+    for name in order or PROFILES[profile_name].strategies:
+        started = time.perf_counter()
+        try:
+            candidates = STRATEGIES[name].run(source, max_chars)
+        except Exception as e:
+            logger.warning(f"[Cascade] {name} failed: {e}")
+            candidates = []
+        if offer(result, name, (time.perf_counter() - started) * 1000, candidates):
+            break
+    return result
+
+
+# -----------------------------------------------------------------------------
+# Parent side — ordering by measured cost + statistics
+# -----------------------------------------------------------------------------
+
+class ExtractionCascade:
+    """Measured strategy costs (drive ordering) and per-profile win statistics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cost = {name: s.prior_ms_per_kb for name, s in STRATEGIES.items()}
+        self._strategy_stats = {name: {"runs": 0, "total_ms": 0.0} for name in STRATEGIES}
+        self._profile_stats = {
+            name: {"documents": 0, "early_exits": 0, "failed": 0,
+                   "wins": {s: 0 for s in p.strategies}}
+            for name, p in PROFILES.items()
+        }
+
+    def order(self, profile_name: str) -> List[str]:
+        """Profile strategies cheapest-first (layout-aware first when the profile needs layout)."""
+        profile = PROFILES[profile_name]
+        with self._lock:
+            return sorted(
+                profile.strategies,
+                key=lambda s: (profile.require_layout and not STRATEGIES[s].layout_aware, self._cost[s]),
+            )
+
+    def record(self, result: CascadeResult, size_bytes: int) -> None:
+        kb = max(1.0, size_bytes / 1024)
+        with self._lock:
+            for attempt in result.attempts:
+                stats = self._strategy_stats[attempt.strategy]
+                stats["runs"] += 1
+                stats["total_ms"] += attempt.ms
+                cost = self._cost[attempt.strategy]
+                self._cost[attempt.strategy] = cost + COST_EWMA_ALPHA * (attempt.ms / kb - cost)
+            profile = self._profile_stats[result.profile]
+            profile["documents"] += 1
+            profile["early_exits"] += result.early_exit
+            if result.strategy is None:
+                profile["failed"] += 1
+            else:
+                profile["wins"][result.strategy] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            strategies = {
+                name: {
+                    "runs": s["runs"],
+                    "avg_ms": round(s["total_ms"] / s["runs"], 2) if s["runs"] else 0.0,
+                    "ms_per_kb": round(self._cost[name], 3),
+                }
+                for name, s in self._strategy_stats.items()
+            }
+            profiles = {}
+            for name, p in self._profile_stats.items():
+                docs = p["documents"]
+                profiles[name] = {
+                    "documents": docs,
+                    "early_exit_rate": round(p["early_exits"] / docs, 3) if docs else 0.0,
+                    "failed": p["failed"],
+                    "win_rate": {s: round(w / docs, 3) if docs else 0.0 for s, w in p["wins"].items()},
+                }
+        return {"strategies": strategies, "profiles": profiles}
+
+
+_instance: Optional[ExtractionCascade] = None
+
+
+def get_extraction_cascade() -> ExtractionCascade:
+    global _instance
+    if _instance is None:
+        _instance = ExtractionCascade()
+    return _instance
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Job search on a token index stored in each job document.
+
+The old search was ``{"$regex": search, "$options": "i"}`` over title,
+description and company name inside an ``$or``. No index can serve that, so
+every search scanned all of ``jobs``. A MongoDB ``text`` index does not help
+much either: it splits words on whitespace, and Thai is written without spaces
+between words.
+
+Each job now carries the tokens of its searchable fields, written whenever the
+job is created or edited (``search_fields``):
+
+    search_terms   all tokens (multikey index — what ``$match`` uses)
+    search_fields  tokens per weighted field (title, company, ...) for ranking
+
+Tokenizer (``tokenize``), used for both jobs and queries:
+    - NFKC + casefold; Latin/digits → words, keeping ``c++`` / ``c#`` /
+      ``node.js`` (plus ``node``, ``js``)
+    - Thai runs → overlapping character bigrams ("พัฒนา" → พั ัฒ ฒน นา), so any
+      substring of 2+ characters matches without a dictionary. Jobs also
+      index the last character of each run ("า"), so every Thai character
+      starts some stored token
+
+A query matches jobs that contain all of its tokens (``$all``). With
+``prefix=True`` (job listings, autocomplete) the last, unfinished token is
+matched as a prefix with an anchored regex, which the index also serves:
+"dev" finds "developer", "java" finds "javascript". A single Thai character
+has no bigram, so it is always matched as a prefix. Results are ranked by
+``Σ weight × matched tokens`` per field, then newest first.
+
+Jobs without tokens, or tokenized by an older ``SEARCH_VERSION``, are
+backfilled by ``reindex_jobs``: at startup by IndexManager (core/indexes.py),
+and by scripts/init_database.py.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from pymongo import UpdateOne
+
+from core.indexes import declare_backfill, declare_index
+
+logger = logging.getLogger(__name__)
+
+# field → weight ในการจัดอันดับ
+WEIGHTED_FIELDS = {"title": 10, "company_name": 5, "department": 3, "skills_required": 3}
+# ค้นหาได้ แต่ไม่มีน้ำหนักเพิ่ม
+BODY_FIELDS = ("description", "requirements", "location")
+
+# เพิ่มเมื่อ token ที่เก็บเปลี่ยน → reindex_jobs ทำงานที่ยังเป็นรุ่นเก่าใหม่
+SEARCH_VERSION = 2
+
+# ไม่ส่ง token ออกไปใน response
+SEARCH_EXCLUDE = {"search_terms": 0, "search_fields": 0, "search_version": 0}
+
+_SEGMENT = re.compile(r"[\u0e00-\u0e7f]+|[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_THAI = re.compile(r"[\u0e00-\u0e7f]")
+
+
+class SearchQuery(NamedTuple):
+    terms: List[str]  # ต้องมีครบทุกตัว
+    prefix: Optional[str]  # token สุดท้ายที่ยังพิมพ์ไม่จบ (autocomplete)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(_text(v) for v in value)
+    return value if isinstance(value, str) else ""
+
+
+def _segments(text: str) -> List[str]:
+    # ZWSP (มองไม่เห็น) คั่นคำในข้อความไทยบางแหล่ง — ผู้ใช้พิมพ์ค้นหาโดยไม่มี จึงตัดทิ้ง
+    text = unicodedata.normalize("NFKC", text).replace("\u200b", "").casefold()
+    return _SEGMENT.findall(text)
+
+
+def _segment_tokens(segment: str) -> List[str]:
+    if _THAI.match(segment):
+        if len(segment) == 1:
+            return [segment]
+        return [segment[i:i + 2] for i in range(len(segment) - 1)]
+    tokens = [segment]
+    if "." in segment:
+        tokens.extend(part for part in segment.split(".") if part)
+    return tokens
+
+
+def tokenize(text: Any) -> List[str]:
+    """Tokens of ``text`` (str or list of str) in order, duplicates removed"""
+    tokens: Dict[str, None] = {}
+    for segment in _segments(_text(text)):
+        tokens.update(dict.fromkeys(_segment_tokens(segment)))
+    return list(tokens)
+
+
+def _index_tokens(text: Any) -> List[str]:
+    """``tokenize`` + the last character of each Thai run (query side never adds these)"""
+    tokens = dict.fromkeys(tokenize(text))
+    for segment in _segments(_text(text)):
+        if _THAI.match(segment):
+            tokens.setdefault(segment[-1], None)
+    return list(tokens)
+
+
+def search_fields(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Token fields to ``$set`` on a job whenever its searchable fields change"""
+    per_field = {field: _index_tokens(job.get(field)) for field in WEIGHTED_FIELDS}
+    terms = set(_index_tokens([job.get(field) for field in BODY_FIELDS]))
+    for tokens in per_field.values():
+        terms.update(tokens)
+    return {"search_terms": sorted(terms), "search_fields": per_field, "search_version": SEARCH_VERSION}
+
+
+def parse_query(text: Optional[str], prefix: bool = False) -> Optional[SearchQuery]:
+    """Search text → tokens to match; None when the text has nothing searchable"""
+    segments = _segments(text or "")
+    if not segments:
+        return None
+    last = segments[-1]
+    thai = bool(_THAI.match(last))
+    # bigram ไทยจับ substring ได้อยู่แล้ว — prefix จำเป็นเฉพาะคำละติน (ที่ยังพิมพ์ไม่จบ)
+    # อักษรไทยตัวเดียวไม่มี bigram ให้เทียบ → เป็น prefix เสมอ
+    if not (thai and len(last) == 1) and (not prefix or thai or text[-1:].isspace()):
+        return SearchQuery(tokenize(" ".join(segments)), None)
+    tail = _segment_tokens(last)
+    partial = tail.pop()
+    terms = list(dict.fromkeys(tokenize(" ".join(segments[:-1])) + tail))
+    return SearchQuery(terms, None if partial in terms else partial)
+
+
+# multikey: $all และ prefix แบบ ^regex ใช้ index เดียวกัน
+declare_index("jobs", [("search_terms", 1)], query={"search_terms": {"$all": ["?"]}})
+
+
+def text_filter(query: Dict[str, Any], search: SearchQuery) -> Dict[str, Any]:
+    """``query`` narrowed to jobs matching ``search`` (served by the search_terms index)"""
+    clauses = []
+    if search.terms:
+        clauses.append({"search_terms": {"$all": search.terms}})
+    if search.prefix:
+        clauses.append({"search_terms": {"$regex": "^" + re.escape(search.prefix)}})
+    return {"$and": [query, *clauses]} if query else {"$and": clauses}
+
+
+def _matched(field: str, search: SearchQuery) -> Dict[str, Any]:
+    """Number of query tokens found in ``search_fields.<field>``"""
+    array = {"$ifNull": [f"$search_fields.{field}", []]}
+    count: Dict[str, Any] = {"$size": {"$setIntersection": [array, search.terms]}}
+    if search.prefix:
+        prefixed = {"$filter": {"input": array, "as": "t", "cond": {
+            "$regexMatch": {"input": "$$t", "regex": "^" + re.escape(search.prefix)}}}}
+        count = {"$add": [count, {"$min": [1, {"$size": prefixed}]}]}
+    return count
+
+
+def search_pipeline(query: Dict[str, Any], search: SearchQuery, skip: int, limit: int) -> list:
+    """Matching jobs ranked by weighted token matches, newest first on ties"""
+    score = {"$add": [{"$multiply": [weight, _matched(field, search)]}
+                      for field, weight in WEIGHTED_FIELDS.items()]}
+    return [
+        {"$match": text_filter(query, search)},
+        {"$addFields": {"relevance": score}},
+        {"$sort": {"relevance": -1, "created_at": -1, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": SEARCH_EXCLUDE},
+    ]
+
+
+async def search_jobs(db, query: Dict[str, Any], text: str, skip: int = 0, limit: int = 20,
+                      prefix: bool = False) -> List[Dict[str, Any]]:
+    """One page of jobs matching ``text`` (plus ``query``) by relevance"""
+    search = parse_query(text, prefix)
+    if search is None:
+        return await (db.jobs.find(query, SEARCH_EXCLUDE)
+                      .sort([("created_at", -1), ("_id", -1)]).skip(skip).limit(limit).to_list(length=limit))
+    return await db.jobs.aggregate(search_pipeline(query, search, skip, limit)).to_list(length=limit)
+
+
+async def autocomplete(db, text: str, limit: int = 8) -> List[str]:
+    """Distinct titles of active jobs matching the text typed so far"""
+    search = parse_query(text, prefix=True)
+    if search is None:
+        return []
+    pipeline = search_pipeline({"is_active": True}, search, 0, limit * 3)
+    pipeline.append({"$project": {"title": 1}})
+    titles: Dict[str, None] = {}
+    async for job in db.jobs.aggregate(pipeline):
+        if job.get("title"):
+            titles.setdefault(job["title"], None)
+    return list(titles)[:limit]
+
+
+async def reindex_jobs(db, query: Optional[Dict[str, Any]] = None, batch_size: int = 500) -> int:
+    """Recompute token fields for jobs matching ``query`` (default: jobs without current tokens)"""
+    if query is None:
+        query = {"search_version": {"$ne": SEARCH_VERSION}}
+    projection = {field: 1 for field in (*WEIGHTED_FIELDS, *BODY_FIELDS)}
+    updated, batch = 0, []
+    async for job in db.jobs.find(query, projection):
+        batch.append(UpdateOne({"_id": job["_id"]}, {"$set": search_fields(job)}))
+        if len(batch) >= batch_size:
+            updated += (await db.jobs.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await db.jobs.bulk_write(batch, ordered=False)).modified_count
+    if updated:
+        logger.info("[JobSearch] Re-indexed %d jobs", updated)
+    return updated
+
+
+# งานเดิมที่ยังไม่มี token (หรือ token รุ่นเก่า) ค้นหาไม่เจอ → เติมเบื้องหลังตอน startup
+declare_backfill("jobs.search_terms", reindex_jobs)
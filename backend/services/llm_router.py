@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+LLMRouter — hedged, multi-provider routing for OpenAI-compatible chat endpoints.
+
+Providers are tried in configured order. If the current provider has not
+answered within its hedge delay (p95 of its recent latencies, clamped), a
+duplicate request is sent to the next provider; errors fail over immediately.
+The first response whose content passes ``validate`` wins.
+
+Configuration (env ``LLM_PROVIDERS``, JSON list, ordered by preference):
+    [
+      {"name": "groq", "base_url": "https://api.groq.com/openai/v1",
+       "model": "llama-3.3-70b-versatile", "api_key_env": "GROQ_API_KEY"},
+      {"name": "local", "base_url": "http://127.0.0.1:8080/v1", "model": "qwen2.5-7b"}
+    ]
+Optional: LLM_HEDGE_DELAY_MS (initial delay before enough samples),
+LLM_HEDGE_MIN_MS / LLM_HEDGE_MAX_MS (clamp), LLM_PROVIDER_TIMEOUT_S.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class LLMRouterError(Exception):
+    """Raised when every provider failed or returned unusable content."""
+
+
+class LLMProvider:
+    """One OpenAI-compatible endpoint + model."""
+
+    def __init__(self, name: str, base_url: str, model: str,
+                 api_key: Optional[str] = None, timeout: float = 60.0) -> None:
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"LLMProvider({self.name!r}, model={self.model!r})"
+
+
+class ProviderStats:
+    """Rolling latency window + counters for one provider (thread-safe)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._lock = threading.Lock()
+        self.latencies: deque = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.invalid = 0
+        self.wins = 0
+        self.hedged = 0  # times this provider was launched as a hedge
+
+    def record(self, latency: float, ok: bool, valid: bool = True) -> None:
+        with self._lock:
+            self.requests += 1
+            if ok:
+                self.latencies.append(latency)
+                if not valid:
+                    self.invalid += 1
+            else:
+                self.errors += 1
+
+    def mark_win(self) -> None:
+        with self._lock:
+            self.wins += 1
+
+    def mark_hedged(self) -> None:
+        with self._lock:
+            self.hedged += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95, p99 = self.percentile(50), self.percentile(95), self.percentile(99)
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "invalid": self.invalid,
+                "wins": self.wins,
+                "hedged": self.hedged,
+                "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+                "samples": len(self.latencies),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            }
+
+
+class LLMRouter:
+    """Route chat completions across ordered providers with hedged requests."""
+
+    def __init__(self, providers: List[LLMProvider], hedge_delay: float = 2.0,
+                 hedge_min: float = 0.25, hedge_max: float = 15.0,
+                 min_samples: int = 10, max_workers: int = 16) -> None:
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.hedge_min = hedge_min
+        self.hedge_max = hedge_max
+        self.min_samples = min_samples
+        self.stats: Dict[str, ProviderStats] = {p.name: ProviderStats() for p in providers}
+        self._http = httpx.Client()
+        # Shared pool: abandoned (losing) requests finish in the background
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-router")
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMRouter"]:
+        """Build a router from ``LLM_PROVIDERS``; returns None when not configured."""
+        raw = os.getenv("LLM_PROVIDERS")
+        if not raw:
+            return None
+        try:
+            entries = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.error(f"[LLMRouter] Invalid LLM_PROVIDERS JSON: {e}")
+            return None
+
+        timeout = float(os.getenv("LLM_PROVIDER_TIMEOUT_S", "60"))
+        providers = []
+        for i, entry in enumerate(entries):
+            if not entry.get("base_url") or not entry.get("model"):
+                logger.warning(f"[LLMRouter] Skipping provider #{i}: base_url and model are required")
+                continue
+            api_key = entry.get("api_key") or (os.getenv(entry["api_key_env"]) if entry.get("api_key_env") else None)
+            providers.append(LLMProvider(
+                name=entry.get("name") or f"provider{i}",
+                base_url=entry["base_url"],
+                model=entry["model"],
+                api_key=api_key,
+                timeout=float(entry.get("timeout", timeout)),
+            ))
+        if not providers:
+            return None
+
+        return cls(
+            providers,
+            hedge_delay=float(os.getenv("LLM_HEDGE_DELAY_MS", "2000")) / 1000,
+            hedge_min=float(os.getenv("LLM_HEDGE_MIN_MS", "250")) / 1000,
+            hedge_max=float(os.getenv("LLM_HEDGE_MAX_MS", "15000")) / 1000,
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.0,
+                 max_tokens: int = 1024,
+                 validate: Optional[Callable[[str], bool]] = None) -> str:
+        """Return the content of the first valid completion across providers.
+
+        Raises:
+            LLMRouterError: every provider errored or returned invalid content.
+        """
+        queue = list(self.providers)
+        pending: Dict[Future, LLMProvider] = {}
+        failures: List[str] = []
+
+        def _launch(hedge: bool) -> None:
+            provider = queue.pop(0)
+            if hedge:
+                self.stats[provider.name].mark_hedged()
+                logger.info(f"[LLMRouter] Hedging to {provider.name}")
+            pending[self._pool.submit(self._call, provider, messages, temperature, max_tokens, validate)] = provider
+
+        _launch(hedge=False)
+        while pending:
+            timeout = self._hedge_delay(pending) if queue else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                _launch(hedge=True)  # slowest-provider tail: race the next one
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                content, error = future.result()
+                if error is None:
+                    self.stats[provider.name].mark_win()
+                    return content
+                failures.append(f"{provider.name}: {error}")
+                if queue:
+                    _launch(hedge=False)  # fail over immediately
+
+        raise LLMRouterError("; ".join(failures) or "no providers")
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            p.name: {"model": p.model, **self.stats[p.name].snapshot(),
+                     "hedge_delay_ms": round(self.hedge_delay_for(p) * 1000, 1)}
+            for p in self.providers
+        }
+
+    def hedge_delay_for(self, provider: LLMProvider) -> float:
+        """p95 of recent latencies once warmed up, else the configured default."""
+        stats = self.stats[provider.name]
+        p95 = stats.percentile(95) if len(stats.latencies) >= self.min_samples else None
+        delay = p95 if p95 is not None else self.hedge_delay
+        return max(self.hedge_min, min(self.hedge_max, delay))
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _hedge_delay(self, pending: Dict[Future, LLMProvider]) -> float:
+        # The newest in-flight request decides when to launch the next hedge
+        return self.hedge_delay_for(list(pending.values())[-1])
+
+    def _call(self, provider: LLMProvider, messages: List[Dict[str, str]],
+              temperature: float, max_tokens: int,
+              validate: Optional[Callable[[str], bool]]):
+        """Run one request. Returns ``(content, None)`` or ``(None, error_str)``; never raises."""
+        headers = {"Content-Type": "application/json"}
+        if provider.api_key:
+            headers["Authorization"] = f"Bearer {provider.api_key}"
+        payload = {
+            "model": provider.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        start = time.perf_counter()
+        try:
+            resp = self._http.post(
+                f"{provider.base_url}/chat/completions",
+                json=payload, headers=headers, timeout=provider.timeout,
+            )
+            resp.raise_for_status()
+            content = resp.json()["choices"][0]["message"]["content"]
+        except Exception as e:
+            self.stats[provider.name].record(time.perf_counter() - start, ok=False)
+            logger.warning(f"[LLMRouter] {provider.name} failed: {e}")
+            return None, str(e) or type(e).__name__
+
+        valid = validate(content) if validate else bool(content)
+        self.stats[provider.name].record(time.perf_counter() - start, ok=True, valid=valid)
+        if not valid:
+            return None, "invalid content"
+        return content, None
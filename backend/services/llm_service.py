@@ -8,7 +8,8 @@ import os
 import re
 import json
 import logging
-from typing import ClassVar, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,8 @@ try:
 except ImportError:
     GROQ_AVAILABLE = False
 
+from services.llm_router import LLMRouter
+
 load_dotenv(Path(__file__).parent.parent / ".env")
 logger = logging.getLogger(__name__)
 
@@ -115,6 +118,29 @@ RULES:
 - Output ONLY the raw JSON object. No markdown, no explanation.
 """
 
+# Section headings used to split long resumes into independently extractable chunks.
+# Order matters only for readability; matching is done on the start of each line.
+_SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "education":      ("education", "academic", "ประวัติการศึกษา", "การศึกษา"),
+    "skills":         ("skills", "technical skills", "hard skills", "soft skills", "ทักษะ", "ความสามารถ"),
+    "projects":       ("projects", "portfolio", "ผลงาน", "โปรเจกต์", "โปรเจค", "โครงงาน"),
+    "experience":     ("experience", "work experience", "internship", "employment", "ประสบการณ์", "การฝึกงาน"),
+    "certifications": ("certifications", "certificates", "certification", "ใบรับรอง", "ใบประกาศ"),
+    "languages":      ("languages", "ภาษา"),
+}
+
+_SECTION_RE = re.compile(
+    r"^[\s\-•*#]*(?:"
+    + "|".join(
+        re.escape(h)
+        for h in sorted({h for hs in _SECTION_HEADINGS.values() for h in hs}, key=len, reverse=True)
+    )
+    + r")(?=[\s:：]|$)[^\n]{0,40}$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_LEVEL_RANK: Dict[str, int] = {"phd": 3, "doctor": 3, "master": 2, "bachelor": 1}
+
 
 # ---------------------------------------------------------------------------
 # LLMService
@@ -129,17 +155,32 @@ class LLMService:
         self.temperature = 0.0
         self.max_tokens = 2048
 
-        if not self.api_key:
+        # Chunked mode: long resumes are split by section and extracted concurrently
+        self.chunk_threshold = int(os.getenv("LLM_CHUNK_THRESHOLD", "6000"))
+        self.chunk_max_chars = int(os.getenv("LLM_CHUNK_MAX_CHARS", "4000"))
+        self.chunk_max_tokens = 1024
+        self.chunk_workers = int(os.getenv("LLM_CHUNK_WORKERS", "4"))
+
+        # Batch cert analysis: total cert text sent in one request
+        self.cert_batch_chars = int(os.getenv("LLM_CERT_BATCH_CHARS", "12000"))
+
+        # Multi-provider hedged routing when LLM_PROVIDERS is configured;
+        # otherwise the single Groq client below is used directly.
+        self.router: Optional[LLMRouter] = LLMRouter.from_env()
+        if self.router:
+            logger.info(f"[LLMService] Routing across providers: {self.router.providers}")
+
+        if not self.api_key and not self.router:
             logger.warning("[LLMService] GROQ_API_KEY not set")
 
         self.client = (
             Groq(api_key=self.api_key)
-            if GROQ_AVAILABLE and self.api_key
+            if GROQ_AVAILABLE and self.api_key and not self.router
             else None
         )
         if self.client:
             logger.info(f"[LLMService] Initialized: {self.model}")
-        else:
+        elif not self.router:
             logger.warning("[LLMService] Groq client unavailable")
 
     # ------------------------------------------------------------------
@@ -147,42 +188,82 @@ class LLMService:
     # ------------------------------------------------------------------
 
     def extract_features(self, resume_text: str) -> Dict[str, Any]:
-        """Extract structured features from resume text (Thai or English)."""
-        if not self.client:
-            return self._empty("Client not initialized")
+        """Extract structured features from resume text (Thai or English).
+
+        Resumes longer than ``chunk_threshold`` are routed to
+        :meth:`extract_features_chunked` so the tail is not truncated.
+        If the LLM is unavailable or fails, rule-based features are returned
+        (tagged with ``fallback_reason``) instead of an empty profile.
+        """
+        if not self.is_ready():
+            return self._fallback(resume_text, "Client not initialized")
         if not resume_text or len(resume_text.strip()) < 50:
             return self._empty("Resume text too short")
 
+        if len(resume_text) > self.chunk_threshold:
+            return self.extract_features_chunked(resume_text)
+
         lang = self.detect_language(resume_text)
         logger.info(f"[LLMService] Detected language: {lang}")
 
         try:
             prompt = self._build_prompt(resume_text, lang)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a strict data extraction API. Output ONLY valid JSON."},
-                    {"role": "user",   "content": prompt},
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            raw = response.choices[0].message.content
+            raw = self._complete(prompt, self.max_tokens)
             logger.info(f"[LLMService] Response: {len(raw)} chars")
 
             features = self._parse_json(raw)
             if not features:
                 logger.warning("[LLMService] JSON parse failed")
-                return self._empty("JSON parse failed")
+                return self._fallback(resume_text, "JSON parse failed")
 
             return self._post_process(features)
 
         except Exception as e:
             logger.error(f"[LLMService] Error: {e}")
-            return self._empty(str(e))
+            return self._fallback(resume_text, str(e))
+
+    def extract_features_chunked(self, resume_text: str) -> Dict[str, Any]:
+        """Extract features from a long resume by running one prompt per section chunk.
+
+        Chunks are sent concurrently, so latency is close to the slowest chunk
+        rather than one completion over the whole document. Partial results are
+        merged back into the standard schema; when some chunks fail the result
+        carries ``partial_reason`` (routes/resume.py diagnoses it as
+        partial_extraction, so reprocessing can find it).
+        """
+        if not self.is_ready():
+            return self._fallback(resume_text, "Client not initialized")
+        if not resume_text or len(resume_text.strip()) < 50:
+            return self._empty("Resume text too short")
+
+        lang = self.detect_language(resume_text)
+        chunks = self.split_sections(resume_text, self.chunk_max_chars)
+        logger.info(f"[LLMService] Chunked extraction: {len(chunks)} chunk(s), lang={lang}")
+
+        def _run(chunk: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+            section, text = chunk
+            try:
+                raw = self._complete(self._build_section_prompt(text, lang, section), self.chunk_max_tokens)
+                return self._parse_json(raw)
+            except Exception as e:
+                logger.warning(f"[LLMService] Chunk '{section}' failed: {e}")
+                return None
+
+        workers = max(1, min(self.chunk_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = [p for p in pool.map(_run, chunks) if p]
+
+        if not partials:
+            return self._fallback(resume_text, "All chunks failed")
+
+        merged = self.merge_partials(partials)
+        if len(partials) < len(chunks):
+            merged["partial_reason"] = f"{len(chunks) - len(partials)}/{len(chunks)} chunks failed"
+            logger.warning(f"[LLMService] Chunked extraction incomplete: {merged['partial_reason']}")
+        return self._post_process(merged)
 
     def is_ready(self) -> bool:
-        return self.client is not None
+        return self.client is not None or self.router is not None
 
     def analyze_certificate(self, cert_text: str) -> Optional[Dict[str, Any]]:
         """Analyze certificate text and return structured info via LLM.
@@ -194,7 +275,7 @@ class LLMService:
             relevance_tags  — short keyword tags for job matching
             is_valid_cert   — bool, True if this looks like a legitimate cert
         """
-        if not self.client:
+        if not self.is_ready():
             return None
         if not cert_text or len(cert_text.strip()) < 10:
             return None
@@ -224,16 +305,7 @@ Certificate Text:
 OUTPUT ONLY VALID JSON:"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a strict data extraction API. Output ONLY valid JSON."},
-                    {"role": "user",   "content": prompt},
-                ],
-                temperature=0.0,
-                max_tokens=512,
-            )
-            raw = response.choices[0].message.content
+            raw = self._complete(prompt, 512)
             result = self._parse_json(raw)
             if result:
                 logger.info(f"[LLMService] Certificate analyzed: {result.get('cert_name')} | domain={result.get('domain')}")
@@ -242,6 +314,78 @@ OUTPUT ONLY VALID JSON:"""
             logger.error(f"[LLMService] analyze_certificate error: {e}")
             return None
 
+    def analyze_certificates_batch(self, certs: Dict[str, str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Analyze several certificates in ONE LLM call.
+
+        Args:
+            certs: ``{file_key: cert_text}``
+
+        Returns:
+            ``{file_key: analysis_dict_or_None}`` — same per-cert schema as
+            analyze_certificate. Keys the model leaves out are retried one
+            by one so a partial answer never loses a certificate.
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {key: None for key in certs}
+        todo = {k: t for k, t in certs.items() if t and len(t.strip()) >= 10}
+        if not self.is_ready() or not todo:
+            return results
+        if len(todo) == 1:
+            key, text = next(iter(todo.items()))
+            results[key] = self.analyze_certificate(text)
+            return results
+
+        # Shared input budget so the whole batch still fits one context window
+        per_cert = max(1500, self.cert_batch_chars // len(todo))
+        blocks = "\n\n".join(
+            f'=== CERTIFICATE file="{key}" ===\n{text[:per_cert]}' for key, text in todo.items()
+        )
+        prompt = f"""You are a certificate analysis API. Analyze EACH certificate below and extract structured data.
+
+Return ONLY valid JSON with this exact schema — one entry per certificate, "file" copied exactly from its header:
+{{
+  "certificates": [
+    {{
+      "file": "file key from the header",
+      "cert_name": "Official certificate name (string)",
+      "domain": "Field/domain of this certificate (e.g. Data Science, Web Dev, Networking)",
+      "skills_covered": ["skill1", "skill2"],
+      "relevance_tags": ["tag1", "tag2"],
+      "is_valid_cert": true
+    }}
+  ]
+}}
+
+RULES:
+- cert_name: the main title/name of the certificate
+- domain: 1-3 word category of the certificate
+- skills_covered: specific technical skills this cert validates (max 8)
+- relevance_tags: short keywords useful for job matching (max 6)
+- is_valid_cert: true if it's a legitimate academic/professional certificate, false if unknown
+- Analyze every certificate independently. Output ONLY the raw JSON object.
+
+{blocks}
+
+OUTPUT ONLY VALID JSON:"""
+
+        try:
+            raw = self._complete(prompt, min(4096, 400 * len(todo) + 200))
+            parsed = self._parse_json(raw) or {}
+            for entry in parsed.get("certificates") or []:
+                key = entry.pop("file", None) if isinstance(entry, dict) else None
+                if key in todo and results[key] is None:
+                    results[key] = entry
+            logger.info(
+                f"[LLMService] Batch analyzed {sum(r is not None for r in results.values())}"
+                f"/{len(todo)} certificates in one call"
+            )
+        except Exception as e:
+            logger.error(f"[LLMService] analyze_certificates_batch error: {e}")
+
+        for key in todo:
+            if results[key] is None:
+                results[key] = self.analyze_certificate(todo[key])
+        return results
+
 
     # ------------------------------------------------------------------
     # Static Utilities (used by other modules)
@@ -262,6 +406,141 @@ OUTPUT ONLY VALID JSON:"""
         text = re.sub(r"[ \t]{2,}", " ", text)
         return text.strip()
 
+    @staticmethod
+    def find_sections(text: str) -> List[Tuple[str, str]]:
+        """Split resume text on section headings into ``(section, body)`` pairs.
+
+        Text before the first recognised heading is returned as ``"general"``.
+        """
+        starts = [m.start() for m in _SECTION_RE.finditer(text)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        starts.append(len(text))
+
+        sections: List[Tuple[str, str]] = []
+        for begin, end in zip(starts, starts[1:]):
+            body = text[begin:end].strip()
+            if not body:
+                continue
+            heading = body.split("\n", 1)[0].strip().lower().lstrip("-•*# ")
+            name = next(
+                (key for key, hs in _SECTION_HEADINGS.items() if any(heading.startswith(h) for h in hs)),
+                "general",
+            )
+            sections.append((name, body))
+        return sections
+
+    @staticmethod
+    def split_sections(text: str, max_chars: int = 4000) -> List[Tuple[str, str]]:
+        """Pack :meth:`find_sections` output into ``(section, text)`` chunks.
+
+        Adjacent small sections are packed together up to ``max_chars``;
+        oversized sections are split on paragraph boundaries.
+        """
+        sections = LLMService.find_sections(text)
+
+        chunks: List[Tuple[str, str]] = []
+        for name, body in sections:
+            pieces = [body]
+            if len(body) > max_chars:
+                pieces, current = [], ""
+                for para in re.split(r"\n\s*\n", body):
+                    while len(para) > max_chars:
+                        if current:
+                            pieces.append(current)
+                            current = ""
+                        pieces.append(para[:max_chars])
+                        para = para[max_chars:]
+                    if current and len(current) + len(para) + 2 > max_chars:
+                        pieces.append(current)
+                        current = ""
+                    current = f"{current}\n\n{para}" if current else para
+                if current:
+                    pieces.append(current)
+
+            for piece in pieces:
+                if chunks and len(chunks[-1][1]) + len(piece) + 2 <= max_chars:
+                    prev_name, prev_text = chunks[-1]
+                    merged_name = prev_name if name in prev_name.split("+") else f"{prev_name}+{name}"
+                    chunks[-1] = (merged_name, f"{prev_text}\n\n{piece}")
+                else:
+                    chunks.append((name, piece))
+        return chunks
+
+    @staticmethod
+    def merge_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge per-chunk extraction results into a single schema-shaped dict.
+
+        - education: keep the entry with the highest confidence (most fields filled)
+        - skills / languages: case-insensitive dedupe, first spelling wins
+        - projects / experience / certifications: dedupe on their identifying fields
+        - experience_months: total of the merged experience_details durations (an
+          experience section split across chunks is reported piecewise), at least
+          the largest per-chunk value when durations cannot be parsed
+        """
+        from services.rule_extractor import MAX_EXPERIENCE_MONTHS, duration_months  # lazy: rule_extractor imports this module
+
+        merged = LLMService._empty()
+        merged.pop("extraction_error", None)
+
+        def _edu_confidence(edu: Dict[str, Any]) -> Tuple[int, int, float]:
+            filled = sum(1 for k in ("major", "university", "level") if str(edu.get(k) or "").strip())
+            gpa = LLMService._to_float(edu.get("gpa"))
+            level = str(edu.get("level") or "").lower()
+            rank = max((r for k, r in _LEVEL_RANK.items() if k in level), default=0)
+            return filled + (1 if gpa > 0 else 0), rank, gpa
+
+        def _dedupe(items: List[Any], key) -> List[Any]:
+            out, seen = [], set()
+            for item in items:
+                k = key(item)
+                if not k or k in seen:
+                    continue
+                seen.add(k)
+                out.append(item)
+            return out
+
+        def _norm(value: Any) -> str:
+            return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+        best_edu, best_score = None, (-1, -1, -1.0)
+        technical, soft, projects, exp_details, languages, certs = [], [], [], [], [], []
+        for part in partials:
+            edu = part.get("education")
+            if isinstance(edu, dict):
+                score = _edu_confidence(edu)
+                if score > best_score:
+                    best_edu, best_score = edu, score
+
+            skills = part.get("skills") or {}
+            if isinstance(skills, dict):
+                technical.extend(s for s in skills.get("technical_skills") or [] if isinstance(s, str))
+                soft.extend(s for s in skills.get("soft_skills") or [] if isinstance(s, str))
+
+            projects.extend(p for p in part.get("projects") or [] if isinstance(p, dict))
+            exp_details.extend(e for e in part.get("experience_details") or [] if isinstance(e, dict))
+            languages.extend(l for l in part.get("languages") or [] if isinstance(l, str))
+            certs.extend(c for c in part.get("certifications") or [] if isinstance(c, dict))
+
+            months = LLMService._to_float(part.get("experience_months"))
+            merged["experience_months"] = max(merged["experience_months"], int(months))
+
+        if best_edu is not None and best_score[0] > 0:
+            merged["education"] = {**merged["education"], **best_edu}
+        merged["skills"] = {
+            "technical_skills": _dedupe(technical, _norm),
+            "soft_skills": _dedupe(soft, _norm),
+        }
+        merged["projects"] = _dedupe(projects, lambda p: _norm(p.get("name")))
+        merged["experience_details"] = _dedupe(
+            exp_details, lambda e: (_norm(e.get("position")), _norm(e.get("company"))) if any(e.values()) else None
+        )
+        from_details = sum(duration_months(str(e.get("duration") or "")) for e in merged["experience_details"])
+        merged["experience_months"] = max(merged["experience_months"], min(from_details, MAX_EXPERIENCE_MONTHS))
+        merged["languages"] = _dedupe(languages, _norm)
+        merged["certifications"] = _dedupe(certs, lambda c: _norm(c.get("name")))
+        return merged
+
     # ------------------------------------------------------------------
     # Prompt Builders
     # ------------------------------------------------------------------
@@ -320,6 +599,15 @@ Resume Text:
 
 OUTPUT ONLY VALID JSON:"""
 
+    def _build_section_prompt(self, text: str, lang: str, section: str) -> str:
+        """Prompt for one chunk of a long resume — same schema, partial input."""
+        base = self._build_prompt_th(text) if lang == "th" else self._build_prompt_en(text)
+        note = (
+            f"NOTE: The text below is ONE PART of a longer resume (section: {section}). "
+            "Extract only what appears in this part and leave everything else empty.\n\n"
+        )
+        return note + base
+
     # ------------------------------------------------------------------
     # Post-Processing
     # ------------------------------------------------------------------
@@ -352,6 +640,44 @@ OUTPUT ONLY VALID JSON:"""
     # Helpers
     # ------------------------------------------------------------------
 
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Run one JSON-extraction chat completion and return the raw content."""
+        messages = [
+            {"role": "system", "content": "You are a strict data extraction API. Output ONLY valid JSON."},
+            {"role": "user",   "content": prompt},
+        ]
+        if self.router:
+            return self.router.complete(
+                messages,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                validate=lambda raw: self._parse_json(raw) is not None,
+            )
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _fallback(resume_text: str, reason: str) -> Dict[str, Any]:
+        """Rule-based features for when the LLM is unavailable or its output is unusable."""
+        from services.rule_extractor import get_rule_extractor  # lazy: rule_extractor imports this module
+
+        logger.warning(f"[LLMService] Falling back to rule-based extraction: {reason}")
+        features = get_rule_extractor().extract(resume_text)
+        features["fallback_reason"] = reason
+        return features
+
+    @staticmethod
+    def _to_float(value: Any) -> float:
+        try:
+            return float(value or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
     @staticmethod
     def _parse_json(response: str) -> Optional[Dict[str, Any]]:
         """Try to parse JSON from LLM response, with markdown-fence fallback."""
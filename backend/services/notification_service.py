@@ -8,10 +8,13 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from bson import ObjectId
 
+from core.indexes import declare_index
+from core.pagination import CREATED_DESC, keyset_page
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +54,12 @@ class SSEConnectionManager:
 sse_manager = SSEConnectionManager()
 
 
+declare_index("notifications", [("user_id", 1), ("created_at", -1), ("_id", -1)],
+              query={"user_id": "?"}, sort=CREATED_DESC)
+declare_index("notifications", [("user_id", 1), ("is_read", 1)],
+              query={"user_id": "?", "is_read": False})
+
+
 class NotificationService:
     """Creates, stores, and manages notifications."""
 
@@ -125,15 +134,11 @@ class NotificationService:
         )
         return notification_doc
 
-    async def get_notifications(self, user_id: str, limit: int = 50) -> list[dict]:
-        cursor = self.db.notifications.find(
-            {"user_id": user_id}
-        ).sort("created_at", -1).limit(limit)
-
-        notifications = []
-        async for doc in cursor:
-            notifications.append(self._serialize(doc))
-        return notifications
+    async def get_notifications(self, user_id: str, limit: int = 50,
+                                cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """Newest first → (notifications, cursor for the next page or None)"""
+        page = await keyset_page(self.db.notifications, {"user_id": user_id}, CREATED_DESC, limit, cursor=cursor)
+        return [self._serialize(doc) for doc in page.items], page.next_cursor
 
     async def get_unread_count(self, user_id: str) -> int:
         return await self.db.notifications.count_documents(
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 📄 PDF ENGINE - เปิด PDF ครั้งเดียว ได้ทั้ง column-aware และ plain text
+# =============================================================================
+"""
+Single-open PDF text engine.
+
+pdfplumber parses a page's content stream the first time ``page.chars`` is
+touched and caches the result on the page. Opening the same bytes twice (once
+for ``extract_words`` and once for ``extract_text``) therefore parses every
+page twice. Here the document is opened once and, per page:
+
+    chars  → column-aware text (services/pdf_layout.py: 1-3 columns detected
+             from word-box gutters, read column by column)
+    chars  → plain text (pdfplumber's default extract_text)
+
+The quality heuristic is computed in the same pass, and the page cache is
+flushed right after so memory stays flat on long documents. Per-page results
+can be produced for any page subset and recombined in order, which is how
+services/pdf_pool.py extracts long documents page-parallel. Which layout (or
+PyPDF2) wins is decided by services/extraction_cascade.py.
+"""
+
+import io
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pdfplumber
+    from pdfplumber.utils import extract_words
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    import PyPDF2
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    from services.pdf_layout import layout_text
+    NUMPY_LAYOUT_AVAILABLE = True
+except ImportError:
+    NUMPY_LAYOUT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Word grouping used by the midpoint-split fallback (no NumPy)
+COLUMN_WORD_KWARGS = {"x_tolerance": 5, "y_tolerance": 5, "keep_blank_chars": False}
+
+# Glyphs pdfminer could not map to unicode — worth nothing to the LLM
+_GARBLED_RE = re.compile(r"\(cid:\d+\)|�")
+
+
+# -----------------------------------------------------------------------------
+# Layout helpers
+# -----------------------------------------------------------------------------
+
+def words_to_lines(words: list) -> str:
+    """Group pdfplumber word-dicts into lines by vertical position, return joined text."""
+    if not words:
+        return ""
+    lines, current_line, current_top = [], [], None
+    for w in words:
+        if current_top is None or abs(w["top"] - current_top) <= 5:
+            current_line.append(w["text"])
+            current_top = w["top"]
+        else:
+            lines.append(" ".join(current_line))
+            current_line, current_top = [w["text"]], w["top"]
+    if current_line:
+        lines.append(" ".join(current_line))
+    return "\n".join(lines)
+
+
+def column_layout(words: list, page_width: float) -> str:
+    """Fallback layout (no NumPy): split words at the page midpoint, read left then right."""
+    if not words:
+        return ""
+    mid_x = page_width / 2
+    order = lambda w: (round(w["top"] / 5) * 5, w["x0"])
+    left_text = words_to_lines(sorted((w for w in words if w["x0"] < mid_x), key=order))
+    right_text = words_to_lines(sorted((w for w in words if w["x0"] >= mid_x), key=order))
+    return f"{left_text}\n\n{right_text}".strip() if right_text else left_text
+
+
+def page_column_text(chars: list, page_width: float) -> str:
+    """Column-aware text for one page — NumPy analyzer, else the midpoint split."""
+    if NUMPY_LAYOUT_AVAILABLE:
+        return layout_text(chars, page_width)
+    return column_layout(extract_words(chars, **COLUMN_WORD_KWARGS), page_width)
+
+
+def text_quality(text: str) -> float:
+    """Usable-character score: text length, penalizing unmapped (cid:N) / U+FFFD glyphs."""
+    if not text:
+        return 0.0
+    garbled = sum(len(m) for m in _GARBLED_RE.findall(text))
+    return float(len(text) - 2 * garbled)
+
+
+def _open(source: Any):
+    return pdfplumber.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+
+def extract_page_layouts(source: Any, pages: Optional[Iterable[int]] = None,
+                         max_chars: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Open the PDF once and build both layouts per page from the same chars.
+
+    Args:
+        source:    PDF bytes, a file path, or any seekable binary stream (e.g. mmap)
+        pages:     optional 0-based page indexes, in order (default: all pages)
+        max_chars: stop after the page where the text budget is reached
+
+    Returns:
+        ``(page_results, total_pages)`` — one dict per processed page with
+        ``page``, ``column``, ``plain`` and their ``quality`` scores.
+    """
+    results: List[Dict[str, Any]] = []
+    if not PDFPLUMBER_AVAILABLE:
+        return results, 0
+
+    used = 0
+    try:
+        with _open(source) as pdf:
+            total_pages = len(pdf.pages)
+            for idx in (range(total_pages) if pages is None else pages):
+                page = pdf.pages[idx]
+                try:
+                    chars = page.chars  # parsed once, shared by both layouts
+                    column_text = page_column_text(chars, page.width)
+                    plain_text = page.extract_text() or ""
+                except Exception as e:
+                    logger.warning(f"[PDFEngine] Error on page {idx + 1}: {e}")
+                    continue
+                finally:
+                    page.flush_cache()
+                results.append({
+                    "page": idx,
+                    "column": column_text,
+                    "plain": plain_text,
+                    "quality": {"column": text_quality(column_text), "plain": text_quality(plain_text)},
+                })
+                used += page_chars(results[-1])
+                if max_chars and used >= max_chars:
+                    break
+    except Exception as e:
+        logger.error(f"[PDFEngine] pdfplumber open failed: {e}")
+        return results, 0
+    return results, total_pages
+
+
+def page_chars(page_result: Dict[str, Any]) -> int:
+    """Characters a page contributes toward the text budget (longer layout)."""
+    return max(len(page_result["column"]), len(page_result["plain"]))
+
+
+def combine_page_layouts(page_results: List[Dict[str, Any]], total_pages: int) -> Dict[str, Any]:
+    """Reassemble per-page results (any order) into document-level layouts."""
+    ordered = sorted(page_results, key=lambda r: r["page"])
+    quality = {
+        "column": sum(r["quality"]["column"] for r in ordered),
+        "plain": sum(r["quality"]["plain"] for r in ordered),
+    }
+    return {
+        "column": "\n\n".join(r["column"] for r in ordered if r["column"]).strip(),
+        "plain": "\n".join(r["plain"] for r in ordered).strip(),
+        "quality": quality,
+        "pages": len(ordered),
+        "total_pages": total_pages,
+    }
+
+
+def extract_layouts(source: Any, pages: Optional[Iterable[int]] = None,
+                    max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """Open the PDF once and build both layouts from the same per-page chars.
+
+    Returns:
+        dict with ``column`` / ``plain`` texts, their ``quality`` scores,
+        ``pages`` processed and ``total_pages``. Choosing between the layouts
+        is up to the caller (services/extraction_cascade.py scores them).
+    """
+    return combine_page_layouts(*extract_page_layouts(source, pages, max_chars))
+
+
+def extract_plain(source: Any, max_chars: Optional[int] = None) -> str:
+    """pdfplumber's default ``extract_text`` only — skips the word / column pass."""
+    if not PDFPLUMBER_AVAILABLE:
+        return ""
+    parts: List[str] = []
+    used = 0
+    try:
+        with _open(source) as pdf:
+            for idx, page in enumerate(pdf.pages):
+                try:
+                    parts.append(page.extract_text() or "")
+                except Exception as e:
+                    logger.warning(f"[PDFEngine] Error on page {idx + 1}: {e}")
+                    continue
+                finally:
+                    page.flush_cache()
+                used += len(parts[-1])
+                if max_chars and used >= max_chars:
+                    break
+    except Exception as e:
+        logger.error(f"[PDFEngine] pdfplumber open failed: {e}")
+    return "\n".join(parts).strip()
+
+
+def extract_plain_pypdf2(source: Any, max_chars: Optional[int] = None) -> str:
+    """Last-resort fallback using PyPDF2."""
+    if not PYPDF2_AVAILABLE:
+        return ""
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+        parts: List[str] = []
+        used = 0
+        for page in reader.pages:
+            parts.append(page.extract_text() or "")
+            used += len(parts[-1])
+            if max_chars and used >= max_chars:
+                break
+        return "\n".join(parts).strip()
+    except Exception as e:
+        logger.error(f"[PDFEngine] PyPDF2 extraction failed: {e}")
+        return ""
+
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧮 PDF LAYOUT - หา column จาก bounding box ด้วย NumPy แล้วเรียงลำดับการอ่าน
+# =============================================================================
+"""
+Vectorized reading-order analysis for one PDF page.
+
+The previous column pass (``pdf_engine.column_layout``) grouped chars into
+words with pdfplumber's per-char Python loop, split the page at a fixed
+``page.width / 2`` and sorted each half with Python lambdas. Three-column
+templates and off-centre sidebars were read across columns.
+
+Here every step works on arrays of bounding boxes:
+
+    chars  → arrays (x0, x1, top, bottom)
+           → lines   : chain-cluster sorted ``top`` (gap > y_tolerance = new line)
+           → words   : break on blank chars / x gap > x_tolerance (same rules as
+                       pdfplumber ``extract_words``), boxes via ``reduceat``
+    words  → gutters : x-coverage histogram of word boxes; wide, (almost) empty
+                       runs between the text edges become column boundaries
+           → columns : ``searchsorted`` of each word's x0 into the gutters
+           → reading order: column, then per-column line (y-gap clustering), then x0
+
+Only the final string joins run in Python, once per word and once per line.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Same tolerances as the pdfplumber word pass this replaces
+X_TOLERANCE = 5.0
+Y_TOLERANCE = 5.0
+# Supported column counts: 1 (no gutter) .. MAX_COLUMNS
+MAX_COLUMNS = 3
+# A gutter is at least this wide (pt) — wider than any word space
+MIN_GUTTER_WIDTH = 12
+# Words allowed to cross a gutter (full-width headers, names) as a share of all words
+GUTTER_NOISE = 0.02
+# Every column must hold at least this share of the page's words
+MIN_COLUMN_SHARE = 0.1
+# Pages with fewer words are read as a single column
+MIN_WORDS_FOR_COLUMNS = 20
+
+
+# -----------------------------------------------------------------------------
+# Chars → words
+# -----------------------------------------------------------------------------
+
+def _chain_breaks(values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Cluster ids for already-sorted ``values`` — a gap > tolerance starts a new cluster."""
+    breaks = np.empty(len(values), dtype=bool)
+    breaks[:1] = False
+    np.greater(np.diff(values), tolerance, out=breaks[1:])
+    return np.cumsum(breaks)
+
+
+def chars_to_words(chars: Sequence[Dict[str, Any]],
+                   x_tolerance: float = X_TOLERANCE,
+                   y_tolerance: float = Y_TOLERANCE) -> Tuple[np.ndarray, List[str]]:
+    """Group pdfplumber chars into words.
+
+    Returns:
+        ``(boxes, texts)`` — ``boxes`` is an ``(n, 4)`` float array of
+        ``x0, x1, top, bottom`` per word, ``texts`` the word strings.
+    """
+    if not chars:
+        return np.empty((0, 4)), []
+    boxes = np.array([(c["x0"], c["x1"], c["top"], c["bottom"]) for c in chars], dtype=float)
+    texts = [c["text"] for c in chars]
+    x0, x1, top = boxes[:, 0], boxes[:, 1], boxes[:, 2]
+
+    # lines: chain clustering on top, then x0 within a line (stable, like pdfplumber)
+    by_top = np.argsort(top, kind="stable")
+    line = np.empty(len(chars), dtype=np.int64)
+    line[by_top] = _chain_breaks(top[by_top], y_tolerance)
+    order = np.lexsort((x0, line))
+
+    blank = np.fromiter((t.isspace() for t in texts), dtype=bool, count=len(texts))[order]
+    blanks_before = np.cumsum(blank)
+    kept = order[~blank]
+    if not len(kept):
+        return np.empty((0, 4)), []
+    blanks_before = blanks_before[~blank]
+
+    starts = np.empty(len(kept), dtype=bool)
+    starts[0] = True
+    starts[1:] = (
+        (line[kept[1:]] != line[kept[:-1]])
+        | (np.diff(blanks_before) > 0)                       # blank char between → new word
+        | (x0[kept[1:]] > x1[kept[:-1]] + x_tolerance)
+        | (top[kept[1:]] > top[kept[:-1]] + y_tolerance)
+    )
+    bounds = np.flatnonzero(starts)
+    kb = boxes[kept]
+    words = np.column_stack((
+        np.minimum.reduceat(kb[:, 0], bounds),
+        np.maximum.reduceat(kb[:, 1], bounds),
+        np.minimum.reduceat(kb[:, 2], bounds),
+        np.maximum.reduceat(kb[:, 3], bounds),
+    ))
+    kept_texts = [texts[i] for i in kept.tolist()]
+    ends = np.append(bounds[1:], len(kept)).tolist()
+    return words, ["".join(kept_texts[s:e]) for s, e in zip(bounds.tolist(), ends)]
+
+
+# -----------------------------------------------------------------------------
+# Words → columns
+# -----------------------------------------------------------------------------
+
+def find_gutters(words: np.ndarray, page_width: float, max_columns: int = MAX_COLUMNS) -> np.ndarray:
+    """x positions of column boundaries (0 .. max_columns - 1 of them, ascending)."""
+    n = len(words)
+    if n < MIN_WORDS_FOR_COLUMNS or max_columns < 2:
+        return np.empty(0)
+    x0, x1 = words[:, 0], words[:, 1]
+    size = int(np.ceil(max(page_width, x1.max()))) + 2
+    start = np.clip(np.floor(x0).astype(np.int64), 0, size - 1)
+    end = np.clip(np.ceil(x1).astype(np.int64), 0, size - 1)
+    coverage = np.cumsum(np.bincount(start, minlength=size) - np.bincount(end, minlength=size))
+
+    # (almost) empty runs strictly between the leftmost and rightmost text
+    left, right = int(start.min()), int(end.max())
+    low = coverage[left:right] <= int(n * GUTTER_NOISE)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], low.astype(np.int8), [0]))))
+    run_start, run_end = edges[::2] + left, edges[1::2] + left
+    wide = (run_end - run_start) >= MIN_GUTTER_WIDTH
+    run_start, run_end = run_start[wide], run_end[wide]
+    if not len(run_start):
+        return np.empty(0)
+
+    # widest gutters first; keep one only if every column stays substantial
+    sorted_x0 = np.sort(x0)
+    chosen: List[float] = []
+    for i in np.argsort(run_start - run_end, kind="stable"):
+        candidate = np.sort(np.append(chosen, (run_start[i] + run_end[i]) / 2))
+        counts = np.diff(np.concatenate(([0], np.searchsorted(sorted_x0, candidate), [n])))
+        if counts.min() >= n * MIN_COLUMN_SHARE:
+            chosen = candidate.tolist()
+            if len(chosen) == max_columns - 1:
+                break
+    return np.array(chosen)
+
+
+def reading_order(words: np.ndarray, gutters: np.ndarray,
+                  y_tolerance: float = Y_TOLERANCE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Word order for reading column by column, top to bottom, left to right.
+
+    Returns:
+        ``(order, column, line)`` — ``order`` indexes ``words``; ``column`` and
+        ``line`` are per-word ids aligned with ``order`` (lines numbered across
+        the whole page).
+    """
+    if not len(words):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    x0, top = words[:, 0], words[:, 2]
+    column = np.searchsorted(gutters, x0, side="right")
+
+    # lines per column: y-gap chain clustering on (column, top)
+    by_col_top = np.lexsort((top, column))
+    breaks = np.empty(len(words), dtype=bool)
+    breaks[0] = False
+    breaks[1:] = (np.diff(column[by_col_top]) != 0) | (np.diff(top[by_col_top]) > y_tolerance)
+    line = np.empty(len(words), dtype=np.int64)
+    line[by_col_top] = np.cumsum(breaks)
+
+    order = np.lexsort((x0, line))
+    return order, column[order], line[order]
+
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+
+def layout_text(chars: Sequence[Dict[str, Any]], page_width: float,
+                max_columns: int = MAX_COLUMNS) -> str:
+    """Column-aware text for one page: columns separated by a blank line."""
+    words, texts = chars_to_words(chars)
+    if not texts:
+        return ""
+    order, column, line = reading_order(words, find_gutters(words, page_width, max_columns))
+
+    ordered = [texts[i] for i in order.tolist()]
+    line_starts = np.flatnonzero(np.diff(line)) + 1
+    bounds = np.concatenate(([0], line_starts, [len(ordered)])).tolist()
+    column_change = np.concatenate(([False], np.diff(column)[line_starts - 1] != 0)).tolist()
+
+    parts: List[str] = []
+    for s, e, new_column in zip(bounds[:-1], bounds[1:], column_change):
+        if new_column:
+            parts.append("")
+        parts.append(" ".join(ordered[s:e]))
+    return "\n".join(parts)
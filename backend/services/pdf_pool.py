@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# ⚙️ PDF POOL - ดึงข้อความ PDF ใน process pool (จำกัดเวลา / หน่วยความจำ)
+# =============================================================================
+"""
+PDFExtractionPool — run PDF text extraction in worker processes.
+
+pdfplumber layout analysis is pure-Python CPU work that holds the GIL, so
+running it inside an async handler (or a thread) stalls the whole API. Here
+each document is extracted in a separate process with:
+
+    - a hard wall-clock timeout; the pool is killed and recycled on expiry
+    - an address-space cap (RLIMIT_AS) set in the worker initializer, so a
+      pathological PDF raises MemoryError instead of swapping the host
+    - worker recycling after ``max_tasks_per_child`` documents
+
+The timeout only covers execution: a semaphore sized to the pool keeps
+queued documents from burning their budget while waiting for a worker.
+
+Workers run the extraction cascade (services/extraction_cascade.py) for
+the caller's profile; ``strategy`` names the profile. The parent picks the
+strategy order from measured costs and records every result.
+
+Page-parallel mode (resume profile, whose cascade starts with the layout
+pass): the bytes are written once to a temp file that every worker
+memory-maps read-only. A probe task runs the cascade on short documents
+directly; documents with ``parallel_min_pages`` or more pages have their
+layout pass split into page ranges extracted concurrently and reassembled
+in order, then scored like any other cascade step. No new ranges are
+scheduled once the in-order text reaches the profile's text budget.
+
+Text budgets: the certificate / pdf_service profiles stop at the 15,000
+chars PDFExtractor._clean_text keeps anyway. Resumes are extracted whole —
+LLMService chunks long input, so the tail must reach it — with only a
+safety cap (``resume_max_chars``, default 200,000 chars) against
+pathological documents.
+
+Usage:
+    text, method = await get_pdf_pool().extract(pdf_bytes)                 # resume profile
+    text, method = await get_pdf_pool().extract(pdf_bytes, "certificate")  # certificate profile
+    text, method = await get_pdf_pool().extract_file("uploads/resumes/x.pdf")  # already on disk
+    result = await get_pdf_pool().extract_file_result(path, "certificate")  # CascadeResult
+
+Env: PDF_POOL_WORKERS, PDF_TIMEOUT_S, PDF_WORKER_MAX_MEMORY_MB, PDF_WORKER_MAX_TASKS,
+     PDF_PARALLEL_MIN_PAGES (0 = off), PDF_PAGES_PER_TASK, PDF_RESUME_MAX_CHARS (0 = no cap)
+"""
+
+import asyncio
+import logging
+import mmap
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.extraction_cascade import (
+    PROFILES, CascadeResult, get_extraction_cascade, new_result, offer, run_cascade,
+)
+from services.pdf_engine import combine_page_layouts, page_chars
+from services.pdf_service import MAX_TEXT_LENGTH
+
+try:
+    import resource  # POSIX only
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = tuple(PROFILES)  # cascade profiles
+PAGE_PARALLEL_STRATEGIES = ("resume",)
+
+
+class PDFExtractionError(Exception):
+    """Extraction aborted by the pool. ``kind``: timeout | memory | crashed."""
+
+    def __init__(self, kind: str, message: str) -> None:
+        super().__init__(message)
+        self.kind = kind
+
+
+# -----------------------------------------------------------------------------
+# Worker side (runs in the child process)
+# -----------------------------------------------------------------------------
+
+def _init_worker(max_memory_mb: int) -> None:
+    if RESOURCE_AVAILABLE and max_memory_mb > 0:
+        limit = max_memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+@contextmanager
+def _mapped(path: str):
+    """Read-only memory map of the shared temp file (pages are shared, not copied)."""
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def _worker_cascade(strategy: str, order: List[str], source: Any,
+                    max_chars: Optional[int] = None, result: Optional[CascadeResult] = None) -> CascadeResult:
+    """Run the extraction cascade on PDF bytes / a file path (mapped read-only)."""
+    if isinstance(source, str):
+        with _mapped(source) as mm:
+            return run_cascade(mm, strategy, order, max_chars, result)
+    return run_cascade(source, strategy, order, max_chars, result)
+
+
+def _worker_probe(path: str, strategy: str, order: List[str],
+                  min_pages: int, max_chars: Optional[int]) -> Tuple[str, Any]:
+    """Count pages; run the cascade right away when the document is too short to split.
+
+    Returns ``("done", CascadeResult)`` or ``("pages", page_count)``.
+    """
+    import pdfplumber
+    with _mapped(path) as mm:
+        with pdfplumber.open(mm) as pdf:
+            total_pages = len(pdf.pages)
+        if total_pages < min_pages:
+            return "done", run_cascade(mm, strategy, order, max_chars)
+    return "pages", total_pages
+
+
+def _worker_pages(path: str, pages: List[int]) -> List[Dict[str, Any]]:
+    from services.pdf_engine import extract_page_layouts
+    with _mapped(path) as mm:
+        return extract_page_layouts(mm, pages)[0]
+
+
+def _write_temp(data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(prefix="pdfpool_", suffix=".pdf", delete=False) as f:
+        f.write(data)
+        return f.name
+
+
+# -----------------------------------------------------------------------------
+# Parent side
+# -----------------------------------------------------------------------------
+
+class PDFExtractionPool:
+    """Process pool with per-document timeout, memory cap and worker recycling."""
+
+    def __init__(self, workers: Optional[int] = None, timeout_s: float = 20.0,
+                 max_memory_mb: int = 1024, max_tasks_per_child: int = 50,
+                 parallel_min_pages: int = 4, pages_per_task: int = 2,
+                 resume_max_chars: int = 200_000) -> None:
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout_s = timeout_s
+        self.max_memory_mb = max_memory_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        self.parallel_min_pages = parallel_min_pages
+        self.pages_per_task = max(1, pages_per_task)
+        self.resume_max_chars = resume_max_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self.stats_counters = {
+            "documents": 0, "page_parallel_documents": 0, "pages_skipped_by_budget": 0,
+            "timeouts": 0, "memory_errors": 0, "crashes": 0, "recycles": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "PDFExtractionPool":
+        workers = os.getenv("PDF_POOL_WORKERS")
+        return cls(
+            workers=int(workers) if workers else None,
+            timeout_s=float(os.getenv("PDF_TIMEOUT_S", "20")),
+            max_memory_mb=int(os.getenv("PDF_WORKER_MAX_MEMORY_MB", "1024")),
+            max_tasks_per_child=int(os.getenv("PDF_WORKER_MAX_TASKS", "50")),
+            parallel_min_pages=int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4")),
+            pages_per_task=int(os.getenv("PDF_PAGES_PER_TASK", "2")),
+            resume_max_chars=int(os.getenv("PDF_RESUME_MAX_CHARS", "200000")),
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def extract(self, data: bytes, strategy: str = "resume",
+                      timeout_s: Optional[float] = None) -> Tuple[str, str]:
+        """Extract text from PDF bytes in worker processes.
+
+        Raises:
+            PDFExtractionError: timeout, memory cap hit, or worker crash.
+        """
+        timeout = self._check(strategy, timeout_s)
+        order = get_extraction_cascade().order(strategy)
+        if not self._page_parallel(strategy):
+            result = await self._call(_worker_cascade, strategy, order, data, self._budget(strategy),
+                                      timeout=timeout)
+            return self._finish(result, len(data)).as_tuple()
+
+        path = await asyncio.to_thread(_write_temp, data)
+        try:
+            result = await self._extract_mapped(path, strategy, order, timeout)
+            return self._finish(result, len(data)).as_tuple()
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    async def extract_file(self, path: str, strategy: str = "resume",
+                           timeout_s: Optional[float] = None) -> Tuple[str, str]:
+        """Same as ``extract`` for a PDF already on disk — workers map the file directly."""
+        return (await self.extract_file_result(path, strategy, timeout_s)).as_tuple()
+
+    async def extract_file_result(self, path: str, strategy: str = "resume",
+                                  timeout_s: Optional[float] = None) -> CascadeResult:
+        """``extract_file`` returning the full cascade result (score, strategy, attempts)."""
+        timeout = self._check(strategy, timeout_s)
+        order = get_extraction_cascade().order(strategy)
+        path = os.path.abspath(path)  # workers may not share our cwd
+        if self._page_parallel(strategy):
+            result = await self._extract_mapped(path, strategy, order, timeout)
+        else:
+            result = await self._call(_worker_cascade, strategy, order, path, self._budget(strategy),
+                                      timeout=timeout)
+        return self._finish(result, os.path.getsize(path))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "timeout_s": self.timeout_s,
+            "max_memory_mb": self.max_memory_mb,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "parallel_min_pages": self.parallel_min_pages,
+            "resume_max_chars": self.resume_max_chars,
+            **self.stats_counters,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Page-parallel mode
+    # ------------------------------------------------------------------
+
+    async def _extract_mapped(self, path: str, strategy: str, order: List[str],
+                              timeout: float) -> CascadeResult:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        budget = self._budget(strategy)
+        kind, value = await self._call(
+            _worker_probe, path, strategy, order, self.parallel_min_pages, budget, timeout=timeout,
+        )
+        if kind == "done":
+            return value
+
+        # First cascade step (layout pass) runs page-parallel, the rest as usual
+        total_pages = value
+        deadline = loop.time() + max(0.0, timeout - (loop.time() - started))
+        layout_started = loop.time()
+        page_results = await self._extract_pages(path, total_pages, budget, deadline, timeout)
+        self._count("page_parallel_documents")
+        layouts = combine_page_layouts(page_results, total_pages)
+        logger.info(f"[PDFPool] Page-parallel: {layouts['pages']}/{total_pages} pages extracted")
+
+        result = new_result(strategy)
+        offer(result, order[0], (loop.time() - layout_started) * 1000,
+              [("column", layouts["column"]), ("plain", layouts["plain"])])
+        if result.early_exit or len(order) == 1:
+            return result
+        return await self._call(
+            _worker_cascade, strategy, order[1:], path, budget, result,
+            timeout=max(0.1, deadline - loop.time()),
+        )
+
+    async def _extract_pages(self, path: str, total_pages: int, budget: Optional[int],
+                             deadline: float, timeout: float) -> List[Dict[str, Any]]:
+        """Schedule page ranges in order; stop scheduling once the in-order text hits ``budget`` (None = all pages)."""
+        loop = asyncio.get_running_loop()
+        slots = self._get_slots()
+        executor = self._get_executor()
+        ranges = [
+            list(range(start, min(start + self.pages_per_task, total_pages)))
+            for start in range(0, total_pages, self.pages_per_task)
+        ]
+        pending: Dict[asyncio.Future, int] = {}
+        finished: Dict[int, List[Dict[str, Any]]] = {}
+        next_range = contiguous = used = 0
+
+        def more() -> bool:
+            return next_range < len(ranges) and (not budget or used < budget)
+
+        try:
+            while pending or more():
+                while more():
+                    if pending and slots.locked():
+                        break  # other documents hold the remaining workers
+                    await slots.acquire()
+                    future = asyncio.wrap_future(executor.submit(_worker_pages, path, ranges[next_range]))
+                    pending[future] = next_range
+                    next_range += 1
+
+                done, _ = await asyncio.wait(
+                    list(pending), timeout=max(0.0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self._count("timeouts")
+                    self._recycle(executor, "timeout")
+                    raise PDFExtractionError("timeout", f"PDF extraction exceeded {timeout:g}s")
+
+                for future in done:
+                    idx = pending.pop(future)
+                    slots.release()
+                    finished[idx] = future.result()
+
+                # Budget counts only the in-order prefix — text is always kept from page 1
+                while contiguous in finished:
+                    used += sum(page_chars(p) for p in finished[contiguous])
+                    contiguous += 1
+        except MemoryError:
+            self._count("memory_errors")
+            raise PDFExtractionError("memory", f"PDF extraction exceeded {self.max_memory_mb}MB")
+        except BrokenProcessPool:
+            self._count("crashes")
+            self._recycle(executor, "broken")
+            raise PDFExtractionError("crashed", "PDF extraction worker crashed")
+        finally:
+            for future in pending:
+                future.cancel()
+                slots.release()
+
+        skipped = sum(len(r) for r in ranges[next_range:])
+        if skipped:
+            self._count("pages_skipped_by_budget", skipped)
+        return [page for idx in sorted(finished) for page in finished[idx]]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _check(self, strategy: str, timeout_s: Optional[float]) -> float:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown PDF strategy: {strategy}")
+        return timeout_s or self.timeout_s
+
+    def _budget(self, strategy: str) -> Optional[int]:
+        """Chars worth extracting: the whole resume (up to the safety cap), MAX_TEXT_LENGTH otherwise."""
+        if strategy == "resume":
+            return self.resume_max_chars or None
+        return MAX_TEXT_LENGTH
+
+    def _page_parallel(self, strategy: str) -> bool:
+        return strategy in PAGE_PARALLEL_STRATEGIES and self.parallel_min_pages > 0
+
+    def _finish(self, result: CascadeResult, size_bytes: int) -> CascadeResult:
+        get_extraction_cascade().record(result, size_bytes)
+        self._count("documents")
+        return result
+
+    async def _call(self, fn, *args, timeout: float):
+        """Run one task in the pool under a slot, with timeout / memory / crash handling."""
+        async with self._get_slots():
+            for attempt in (1, 2):
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+                try:
+                    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                except asyncio.TimeoutError:
+                    self._count("timeouts")
+                    self._recycle(executor, "timeout")
+                    raise PDFExtractionError("timeout", f"PDF extraction exceeded {timeout:g}s")
+                except MemoryError:
+                    self._count("memory_errors")
+                    raise PDFExtractionError("memory", f"PDF extraction exceeded {self.max_memory_mb}MB")
+                except BrokenProcessPool:
+                    # Either this document crashed the worker, or another document's
+                    # timeout recycled the pool under us — retry once on a fresh pool.
+                    self._recycle(executor, "broken")
+                    if attempt == 2:
+                        self._count("crashes")
+                        raise PDFExtractionError("crashed", "PDF extraction worker crashed")
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats_counters[key] += n
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores are bound to one event loop (tests / scripts may run several)
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # max_tasks_per_child is incompatible with "fork"
+                method = "forkserver" if sys.platform != "win32" else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=_init_worker,
+                    initargs=(self.max_memory_mb,),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor, reason: str) -> None:
+        """Kill every worker of ``executor`` and drop it; the next call starts a fresh pool."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # already recycled by a concurrent failure
+            self._executor = None
+            self.stats_counters["recycles"] += 1
+        logger.warning(f"[PDFPool] Recycling worker pool ({reason})")
+        # No public API to stop a running task — terminate the processes directly
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.kill()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton — one pool per API process
+_instance: Optional[PDFExtractionPool] = None
+
+
+def get_pdf_pool() -> PDFExtractionPool:
+    global _instance
+    if _instance is None:
+        _instance = PDFExtractionPool.from_env()
+    return _instance
@@ -4,15 +4,17 @@
 # =============================================================================
 """
 PDFExtractor Class:
-- ใช้ PyPDF2 เป็นตัวหลัก (เร็ว)
-- ถ้าไม่ได้ใช้ pdfplumber เป็น fallback (แม่นยำกว่า)
+- ใช้ extraction cascade (services/extraction_cascade.py, profile "pdf_service"):
+  PyPDF2 / pdfplumber เรียงตาม cost ที่วัดได้ หยุดทันทีเมื่อคะแนนผ่านเกณฑ์
 - Clean text (ลบอักขระพิเศษ, whitespace ซ้ำ)
+- extract_text_async: รันใน process pool (services/pdf_pool.py) มี timeout / memory cap
+  ส่ง db มาด้วย → ใช้ extraction cache (services/extraction_cache.py) ไฟล์เดิมไม่ parse ซ้ำ
 """
 
 import re
 import logging
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 # PDF Libraries
 try:
@@ -31,6 +33,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# จำกัดความยาว text (สำหรับ AI ไม่ควรยาวเกิน 15000 chars) — ใช้เป็น budget ของ pdf_pool ด้วย
+MAX_TEXT_LENGTH = 15000
+
 
 class PDFExtractor:
     """
@@ -39,11 +44,12 @@ class PDFExtractor:
     วิธีใช้:
         extractor = PDFExtractor()
         text, method = extractor.extract_text("path/to/resume.pdf")
+        text, method = await extractor.extract_text_async("path/to/resume.pdf")  # process pool
+        text, method = await extractor.extract_text_async(path, db=db)  # + cache by SHA-256
     """
     
     def __init__(self):
         """Initialize PDFExtractor"""
-        self.min_text_length = 50  # ถ้าได้น้อยกว่านี้ = ไม่สำเร็จ
         logger.info(f"[PDFExtractor] PyPDF2: {PYPDF2_AVAILABLE}, pdfplumber: {PDFPLUMBER_AVAILABLE}")
     
     def extract_text(self, pdf_path: str) -> Tuple[Optional[str], str]:
@@ -57,76 +63,76 @@ class PDFExtractor:
             Tuple[text, method]: (ข้อความที่ดึงได้, วิธีที่ใช้)
             - method: "pypdf2", "pdfplumber", หรือ "failed"
         """
-        # ตรวจสอบไฟล์
+        error = self._check_path(pdf_path)
+        if error:
+            return None, error
+        
+        text, method = self.extract_from_source(pdf_path)
+        return self._finish(text, method, pdf_path)
+    
+    async def extract_text_async(self, pdf_path: str, db=None) -> Tuple[Optional[str], str]:
+        """
+        📖 เหมือน extract_text แต่รันใน process pool (ไม่บล็อก event loop)
+        
+        Args:
+            pdf_path: path ไปยังไฟล์ PDF
+            db: (optional) Motor database — เปิดใช้ extraction cache ตาม SHA-256
+        
+        Returns:
+            Tuple[text, method] — method เพิ่ม "timeout" / "memory" / "crashed"
+            เมื่อ pool ยกเลิกงาน
+        """
+        from services.extraction_cache import extract_cached
+        from services.pdf_pool import PDFExtractionError
+        
+        error = self._check_path(pdf_path)
+        if error:
+            return None, error
+        
+        try:
+            extraction = await extract_cached(db, pdf_path, "pdf_service")
+            text, method = extraction.text, extraction.method
+        except PDFExtractionError as e:
+            logger.error(f"[PDFExtractor] {e} ({pdf_path})")
+            return None, e.kind
+        return self._finish(text, method, pdf_path)
+    
+    def extract_from_source(self, source: Union[str, bytes]) -> Tuple[Optional[str], str]:
+        """
+        ดึงข้อความดิบจาก path หรือ bytes ผ่าน extraction cascade
+        
+        Returns:
+            Tuple[raw_text, method] — ยังไม่ clean; method: "pypdf2" | "pdfplumber" | "failed"
+        """
+        from services.extraction_cascade import get_extraction_cascade, run_cascade
+        
+        cascade = get_extraction_cascade()
+        result = run_cascade(source, "pdf_service", cascade.order("pdf_service"), MAX_TEXT_LENGTH)
+        size = len(source) if isinstance(source, (bytes, bytearray)) else Path(source).stat().st_size
+        cascade.record(result, size)
+        text, method = result.as_tuple()
+        return (text, method) if text else (None, "failed")
+    
+    def _check_path(self, pdf_path: str) -> Optional[str]:
+        """ตรวจสอบไฟล์ → error code หรือ None"""
         path = Path(pdf_path)
         if not path.exists():
             logger.error(f"[PDFExtractor] File not found: {pdf_path}")
-            return None, "file_not_found"
+            return "file_not_found"
         
         if path.suffix.lower() != ".pdf":
             logger.error(f"[PDFExtractor] Not a PDF file: {pdf_path}")
-            return None, "not_pdf"
-        
-        # วิธีที่ 1: ลอง PyPDF2 ก่อน (เร็ว)
-        if PYPDF2_AVAILABLE:
-            text = self._extract_with_pypdf2(pdf_path)
-            if text and len(text) >= self.min_text_length:
-                cleaned = self._clean_text(text)
-                logger.info(f"[PDFExtractor] Success with PyPDF2 ({len(cleaned)} chars)")
-                return cleaned, "pypdf2"
-        
-        # วิธีที่ 2: ใช้ pdfplumber (แม่นยำกว่า)
-        if PDFPLUMBER_AVAILABLE:
-            text = self._extract_with_pdfplumber(pdf_path)
-            if text and len(text) >= self.min_text_length:
-                cleaned = self._clean_text(text)
-                logger.info(f"[PDFExtractor] Success with pdfplumber ({len(cleaned)} chars)")
-                return cleaned, "pdfplumber"
-        
-        # ไม่สำเร็จทั้ง 2 วิธี
-        logger.error(f"[PDFExtractor] Failed to extract text from: {pdf_path}")
-        return None, "failed"
-    
-    def _extract_with_pypdf2(self, pdf_path: str) -> Optional[str]:
-        """ดึงข้อความด้วย PyPDF2"""
-        try:
-            text_parts = []
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                    except Exception as e:
-                        logger.warning(f"[PyPDF2] Error on page {page_num + 1}: {e}")
-                        continue
-            
-            return "\n".join(text_parts) if text_parts else None
-            
-        except Exception as e:
-            logger.error(f"[PyPDF2] Error: {e}")
-            return None
+            return "not_pdf"
+        return None
     
-    def _extract_with_pdfplumber(self, pdf_path: str) -> Optional[str]:
-        """ดึงข้อความด้วย pdfplumber"""
-        try:
-            text_parts = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                    except Exception as e:
-                        logger.warning(f"[pdfplumber] Error on page {page_num + 1}: {e}")
-                        continue
-            
-            return "\n".join(text_parts) if text_parts else None
-            
-        except Exception as e:
-            logger.error(f"[pdfplumber] Error: {e}")
-            return None
+    def _finish(self, text: Optional[str], method: str, pdf_path: str) -> Tuple[Optional[str], str]:
+        if not text:
+            # ไม่สำเร็จทั้ง 2 วิธี
+            logger.error(f"[PDFExtractor] Failed to extract text from: {pdf_path}")
+            return None, "failed"
+        cleaned = self._clean_text(text)
+        logger.info(f"[PDFExtractor] Success with {method} ({len(cleaned)} chars)")
+        return cleaned, method
     
     def _clean_text(self, text: str) -> str:
         """
@@ -154,7 +160,7 @@ class PDFExtractor:
         text = text.strip()
         
         # จำกัดความยาว (สำหรับ AI ไม่ควรยาวเกิน 15000 chars)
-        max_length = 15000
+        max_length = MAX_TEXT_LENGTH
         if len(text) > max_length:
             text = text[:max_length] + "..."
             logger.warning(f"[PDFExtractor] Text truncated to {max_length} chars")
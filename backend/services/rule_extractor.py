@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+RuleBasedExtractor — offline, millisecond resume feature extraction.
+
+Built on the same vocabularies the rest of the pipeline already trusts:
+    - MatchingService.SKILL_ALIASES  → technical skills
+    - THAI_SOFT_SKILLS               → soft skills
+    - THAI_UNIVERSITIES              → university names
+plus regexes for GPA, majors, degree level and work-date ranges.
+
+All dictionary terms are compiled into ONE alternation regex so the text is
+scanned once regardless of vocabulary size. Output uses the exact schema of
+LLMService.extract_features, so matching works unchanged. Used as:
+    - the provisional profile returned immediately on resume upload
+    - the fallback whenever the LLM call fails or is unavailable
+"""
+
+import re
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.llm_service import LLMService, THAI_SOFT_SKILLS, THAI_UNIVERSITIES
+from services.matching_service import MatchingService
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Vocabularies
+# ---------------------------------------------------------------------------
+
+# Aliases that are ordinary English words — too noisy to match in free text
+_AMBIGUOUS_ALIASES = {
+    "go", "next", "node", "rest", "ts", "tf", "rn", "ml", "dl", "stat", "stats",
+    "express", "swift", "c language",
+}
+
+# Thai/English major names → canonical English (mirrors the LLM prompt glossary)
+MAJOR_NAMES: Dict[str, str] = {
+    "เทคโนโลยีสารสนเทศ":       "Information Technology",
+    "วิทยาการคอมพิวเตอร์":      "Computer Science",
+    "วิศวกรรมคอมพิวเตอร์":      "Computer Engineering",
+    "วิศวกรรมซอฟต์แวร์":        "Software Engineering",
+    "วิทยาศาสตร์ข้อมูล":        "Data Science",
+    "เครือข่ายคอมพิวเตอร์":     "Computer Networks",
+    "information technology":  "Information Technology",
+    "computer science":        "Computer Science",
+    "computer engineering":    "Computer Engineering",
+    "software engineering":    "Software Engineering",
+    "data science":            "Data Science",
+    "computer networks":       "Computer Networks",
+    "cybersecurity":           "Cybersecurity",
+    "digital media":           "Digital Media",
+}
+
+LANGUAGE_NAMES: Dict[str, str] = {
+    "english": "English", "ภาษาอังกฤษ": "English",
+    "thai": "Thai", "ภาษาไทย": "Thai",
+    "chinese": "Chinese", "ภาษาจีน": "Chinese",
+    "japanese": "Japanese", "ภาษาญี่ปุ่น": "Japanese",
+    "korean": "Korean", "ภาษาเกาหลี": "Korean",
+}
+
+_LEVELS: List[Tuple[str, str]] = [
+    (r"ph\.?d|doctor|ปริญญาเอก", "PhD"),
+    (r"master|m\.sc|ปริญญาโท", "Master"),
+    (r"bachelor|b\.sc|b\.eng|ปริญญาตรี", "Bachelor"),
+]
+
+_THAI_MONTHS = {
+    "ม.ค.": 1, "มกราคม": 1, "ก.พ.": 2, "กุมภาพันธ์": 2, "มี.ค.": 3, "มีนาคม": 3,
+    "เม.ย.": 4, "เมษายน": 4, "พ.ค.": 5, "พฤษภาคม": 5, "มิ.ย.": 6, "มิถุนายน": 6,
+    "ก.ค.": 7, "กรกฎาคม": 7, "ส.ค.": 8, "สิงหาคม": 8, "ก.ย.": 9, "กันยายน": 9,
+    "ต.ค.": 10, "ตุลาคม": 10, "พ.ย.": 11, "พฤศจิกายน": 11, "ธ.ค.": 12, "ธันวาคม": 12,
+}
+_EN_MONTHS = {m: i + 1 for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+)}
+
+_GPA_RE = re.compile(
+    r"(?:GPAX?|G\.P\.A\.?|เกรดเฉลี่ย(?:สะสม)?)\s*[:：=]?\s*([0-4](?:\.\d{1,2})?)(?!\d)",
+    re.IGNORECASE,
+)
+_EN_UNIVERSITY_RE = re.compile(
+    r"((?:[A-Z][\w'&.\-]*\s+){0,6}University(?:\s+of(?:\s+[A-Z][\w'&.\-]*){1,5})?)"
+)
+_MONTH_TOKEN = (
+    r"(?:" + "|".join(re.escape(m) for m in sorted(_THAI_MONTHS, key=len, reverse=True))
+    + r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?|\d{1,2}/)"
+)
+_DATE_TOKEN = rf"(?:{_MONTH_TOKEN}\s*)?(?:19|20|25)\d{{2}}"
+_DATE_RANGE_RE = re.compile(
+    rf"({_DATE_TOKEN})\s*(?:-|–|—|to|ถึง)\s*({_DATE_TOKEN}|present|current|now|ปัจจุบัน)",
+    re.IGNORECASE,
+)
+_MONTHS_STATED_RE = re.compile(r"(\d{1,2})\s*(?:months?|เดือน)", re.IGNORECASE)
+MAX_EXPERIENCE_MONTHS = 120  # date-range totals above 10 years are parsing noise
+
+
+class RuleBasedExtractor:
+    """Dictionary + regex resume extractor. Thread-safe and stateless after init."""
+
+    def __init__(self) -> None:
+        # term (lowercased) → (kind, canonical value)
+        self._terms: Dict[str, Tuple[str, str]] = {}
+        for canonical, variations in MatchingService.SKILL_ALIASES.items():
+            display = variations[0] if variations else canonical
+            for v in variations:
+                if v not in _AMBIGUOUS_ALIASES:
+                    self._terms.setdefault(v.lower(), ("skill", display))
+        for th, en in THAI_SOFT_SKILLS.items():
+            self._terms.setdefault(th.lower(), ("soft", en))
+        for en in set(THAI_SOFT_SKILLS.values()):
+            self._terms.setdefault(en.lower(), ("soft", en))
+        for th, en in THAI_UNIVERSITIES.items():
+            self._terms.setdefault(th.lower(), ("university", en))
+        for name, en in MAJOR_NAMES.items():
+            self._terms.setdefault(name.lower(), ("major", en))
+        for name, en in LANGUAGE_NAMES.items():
+            self._terms.setdefault(name.lower(), ("language", en))
+
+        # Thai terms have no word boundaries; ASCII terms must not touch other ASCII word chars
+        thai = sorted((t for t in self._terms if not t.isascii()), key=len, reverse=True)
+        ascii_ = sorted((t for t in self._terms if t.isascii()), key=len, reverse=True)
+        self._pattern = re.compile(
+            r"(?P<th>" + "|".join(map(re.escape, thai)) + r")"
+            r"|(?<![a-z0-9.+#])(?P<en>" + "|".join(map(re.escape, ascii_)) + r")(?![a-z0-9+#])",
+            re.IGNORECASE,
+        )
+        self._level_res = [(re.compile(p, re.IGNORECASE), lvl) for p, lvl in _LEVELS]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """Extract features in the LLMService schema. Never raises."""
+        features = LLMService._empty()
+        features.pop("extraction_error", None)
+        features["extraction_source"] = "rule_based"
+        if not text:
+            return features
+
+        try:
+            found: Dict[str, List[str]] = {"skill": [], "soft": [], "university": [], "major": [], "language": []}
+            seen = set()
+            for m in self._pattern.finditer(text):
+                kind, value = self._terms[(m.group("th") or m.group("en")).lower()]
+                if (kind, value) not in seen:
+                    seen.add((kind, value))
+                    found[kind].append(value)
+
+            features["skills"] = {"technical_skills": found["skill"], "soft_skills": found["soft"]}
+            features["languages"] = found["language"]
+            features["education"] = {
+                "major": found["major"][0] if found["major"] else "",
+                "gpa": self._find_gpa(text),
+                "university": found["university"][0] if found["university"] else self._find_en_university(text),
+                "level": self._find_level(text),
+            }
+            features["experience_months"] = self._find_experience_months(text)
+        except Exception as e:  # fast path must never break upload
+            logger.error(f"[RuleExtractor] Error: {e}")
+        return features
+
+    # ------------------------------------------------------------------
+    # Field helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _find_gpa(text: str) -> float:
+        for m in _GPA_RE.finditer(text):
+            gpa = float(m.group(1))
+            if 0 < gpa <= 4.0:
+                return gpa
+        return 0.0
+
+    @staticmethod
+    def _find_en_university(text: str) -> str:
+        m = _EN_UNIVERSITY_RE.search(text)
+        return m.group(1).strip() if m else ""
+
+    def _find_level(self, text: str) -> str:
+        for rx, level in self._level_res:
+            if rx.search(text):
+                return level
+        return ""
+
+    @staticmethod
+    def _find_experience_months(text: str) -> int:
+        """Sum date ranges inside experience sections; fall back to explicit 'N months'."""
+        sections = [body for name, body in LLMService.find_sections(text) if name == "experience"]
+        scope = "\n".join(sections)
+        if not scope:
+            return 0
+
+        return min(duration_months(scope), MAX_EXPERIENCE_MONTHS)
+
+    @staticmethod
+    def _parse_date(token: str) -> Optional[Tuple[int, int]]:
+        token = token.strip().lower()
+        if token in ("present", "current", "now", "ปัจจุบัน"):
+            now = datetime.now(timezone.utc)
+            return now.year, now.month
+        year_m = re.search(r"(?:19|20|25)\d{2}", token)
+        if not year_m:
+            return None
+        year = int(year_m.group(0))
+        if year > 2400:  # Buddhist Era
+            year -= 543
+        month = 1
+        head = token[:year_m.start()].strip()
+        if head.endswith("/") and head[:-1].isdigit():
+            month = int(head[:-1])
+        elif head:
+            month = _THAI_MONTHS.get(head) or _EN_MONTHS.get(head[:3], 1)
+        return year, max(1, min(month, 12))
+
+
+def duration_months(text: str) -> int:
+    """Months covered by the date ranges in ``text`` ('มิ.ย. 2566 - ต.ค. 2566', 'Jun 2023 - present');
+    explicit 'N months' / 'N เดือน' when there is no range."""
+    total = 0
+    for start, end in _DATE_RANGE_RE.findall(text or ""):
+        a, b = RuleBasedExtractor._parse_date(start), RuleBasedExtractor._parse_date(end)
+        if a and b and b >= a:
+            total += (b[0] - a[0]) * 12 + (b[1] - a[1]) + 1
+    if total:
+        return total
+    return sum(int(n) for n in _MONTHS_STATED_RE.findall(text or ""))
+
+
+# Singleton — vocab regex is compiled once per process
+_instance: Optional[RuleBasedExtractor] = None
+
+
+def get_rule_extractor() -> RuleBasedExtractor:
+    global _instance
+    if _instance is None:
+        _instance = RuleBasedExtractor()
+    return _instance
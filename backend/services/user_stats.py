@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+User statistics for the admin and profile dashboards.
+
+Both dashboards used to run up to six ``count_documents`` scans on ``users``
+per page load. ``user_stats_pipeline`` computes every role / active count with
+one ``$group`` on (user_type, is_active), and ``UserStatsCache`` keeps the
+result in process for ``USER_STATS_TTL`` seconds, shared by both endpoints.
+
+Routes that create, update or delete users call ``invalidate_user_stats()``
+so the next dashboard load recounts. The cache is per process: with several
+workers, the other workers catch up within the TTL.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_STATS_TTL = float(os.getenv("USER_STATS_TTL", "30"))  # วินาที
+
+USER_TYPES = {"Student": "student_count", "HR": "hr_count", "Admin": "admin_count"}
+
+
+def user_stats_pipeline() -> list:
+    return [{"$group": {"_id": {"user_type": "$user_type", "is_active": "$is_active"}, "n": {"$sum": 1}}}]
+
+
+def summarize_user_stats(rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """``$group`` rows → total / per-role / active / inactive (same rules as the old count_documents)"""
+    stats = {"total_users": 0, **{field: 0 for field in USER_TYPES.values()},
+             "active_users": 0, "inactive_users": 0}
+    for row in rows:
+        key, n = row["_id"], row["n"]
+        stats["total_users"] += n
+        if key.get("user_type") in USER_TYPES:
+            stats[USER_TYPES[key["user_type"]]] += n
+        if key.get("is_active") is True:
+            stats["active_users"] += n
+        elif key.get("is_active") is False:
+            stats["inactive_users"] += n
+    return stats
+
+
+class UserStatsCache:
+    """In-process TTL cache — one aggregation per TTL however many dashboards load"""
+
+    def __init__(self, ttl: float = USER_STATS_TTL):
+        self.ttl = ttl
+        self._stats: Optional[Dict[str, int]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db) -> Dict[str, int]:
+        if self._stats is not None and time.monotonic() < self._expires_at:
+            return dict(self._stats)
+        async with self._lock:  # โหลดพร้อมกันหลาย request → aggregate ครั้งเดียว
+            if self._stats is not None and time.monotonic() < self._expires_at:
+                return dict(self._stats)
+            generation = self._generation
+            rows = await db.users.aggregate(user_stats_pipeline()).to_list(length=None)
+            stats = summarize_user_stats(rows)
+            if generation == self._generation:  # ไม่มี invalidate ระหว่างนับ
+                self._stats, self._expires_at = stats, time.monotonic() + self.ttl
+            return dict(stats)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._stats = None
+
+
+_instance: Optional[UserStatsCache] = None
+
+
+def get_user_stats_cache() -> UserStatsCache:
+    global _instance
+    if _instance is None:
+        _instance = UserStatsCache()
+    return _instance
+
+
+async def get_user_stats(db) -> Dict[str, int]:
+    return await get_user_stats_cache().get(db)
+
+
+def invalidate_user_stats() -> None:
+    get_user_stats_cache().invalidate()
@@ -3,7 +3,31 @@
 # =============================================================================
 """
 Tests สำหรับ AI Resume Screening System:
+- fakes: in-memory MongoDB (FakeDB / FakeCollection / FakeCursor) ที่ทุก test ใช้ร่วมกัน
 - test_pdf_extraction: ทดสอบดึงข้อความจาก PDF
 - test_llm_extraction: ทดสอบ AI วิเคราะห์ Resume
 - test_end_to_end: ทดสอบ Full Flow
+- test_llm_chunking: ทดสอบแบ่ง Resume ยาวเป็น chunk แล้วรวมผล
+- test_rule_extractor: ทดสอบ rule-based fast path / LLM fallback
+- test_llm_router: ทดสอบ hedged multi-provider routing กับ stand-in server
+- test_cert_cache: ทดสอบ certificate template cache (SimHash)
+- test_pdf_engine: ทดสอบ single-open PDF extraction (column-aware + plain)
+- test_pdf_pool: ทดสอบ process-pool extraction (timeout / recycle)
+- test_uploads: ทดสอบ streaming upload (magic bytes / size limit / sha256)
+- test_blob_store: ทดสอบ content-addressed storage (dedup / refcount)
+- test_extraction_cascade: ทดสอบ cost-ordered extraction cascade (scoring / early exit)
+- test_pdf_layout: ทดสอบ NumPy column detection (1-3 columns / sidebar)
+- test_extraction_cache: ทดสอบ cache ผล extract ตาม SHA-256 + extractor version
+- test_resume_store: ทดสอบแยกข้อความ Resume (resume_texts) + projected reads
+- test_applicants_pipeline: ทดสอบ aggregation รายชื่อผู้สมัคร ($lookup + stable sort)
+- test_dataloader: ทดสอบ DataLoader รวม lookup เป็น $in query เดียวต่อ request
+- test_application_stats: ทดสอบ $group analytics ต่อ job + daily rollup
+- test_application_counters: ทดสอบ applications_count / status_counts + reconciler
+- test_company_listing: ทดสอบ $facet รายการบริษัท + HR counts ใน query เดียว
+- test_user_stats: ทดสอบสถิติผู้ใช้ด้วย $group เดียว + TTL cache
+- test_pagination: keyset cursor — เดินครบทุกหน้า (ties/null), cursor เสีย → 400
+- test_job_search: token index ไทย bigram/ละติน + autocomplete แทน $regex
+- test_indexes: index ที่ประกาศข้าง query รองรับ filter+sort, รายงาน COLLSCAN
+- test_application_detail: summary projection ของ list ใบสมัคร + สิทธิ์ของ GET /applications/{id}
+- test_reprocess_resumes: reprocess ทีละ batch + checkpoint ทำต่อได้, เขียน text ก่อน, rate limit LLM
 """
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 FAKE MONGO - in-memory collection / cursor ที่ test ทุกไฟล์ใช้ร่วมกัน
+# =============================================================================
+"""
+Motor-like in-memory fakes (ไม่ต้องมี MongoDB):
+- FakeCursor: sort / skip / limit / batch_size, to_list และ ``async for``
+- FakeCollection: find / find_one / insert / update / delete / count_documents /
+  find_one_and_update / bulk_write; ``aggregate`` คืนแถวจาก ``aggregate_result``
+  (list หรือ callable(pipeline)) — ไม่ได้จำลอง pipeline จริง
+- FakeDB: เข้าถึงได้ทั้ง ``db.jobs`` และ ``db["jobs"]``, collection ถูกสร้างเมื่อใช้ครั้งแรก
+
+ทุก call ถูกบันทึกใน ``calls`` เป็น (collection, operation, argument) —
+FakeDB ใช้ list เดียวกันทุก collection จึงตรวจลำดับข้าม collection ได้
+query รองรับ field แบบ dotted path, $or/$and, $eq/$ne/$in/$nin/$all/$exists
+และ $gt/$gte/$lt/$lte (null/missing ไม่ match การเปรียบเทียบ เหมือน MongoDB)
+"""
+
+import copy
+from functools import cmp_to_key
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+_MISSING = object()
+
+
+# -----------------------------------------------------------------------------
+# Query / update helpers
+# -----------------------------------------------------------------------------
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(op, value, arg):
+    if value is _MISSING or value is None:
+        return False
+    try:
+        return {"$gt": value > arg, "$gte": value >= arg, "$lt": value < arg, "$lte": value <= arg}[op]
+    except TypeError:
+        return False
+
+
+def _equals(value, arg):
+    if value is _MISSING:
+        return arg is None
+    if isinstance(value, list) and not isinstance(arg, list):
+        return arg in value
+    return value == arg
+
+
+def _matches_condition(value, cond):
+    if not (isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond)):
+        return _equals(value, cond)
+    for op, arg in cond.items():
+        if op == "$eq":
+            ok = _equals(value, arg)
+        elif op == "$ne":
+            ok = not _equals(value, arg)
+        elif op == "$in":
+            ok = any(_equals(value, a) for a in arg)
+        elif op == "$nin":
+            ok = not any(_equals(value, a) for a in arg)
+        elif op == "$all":
+            ok = isinstance(value, list) and all(a in value for a in arg)
+        elif op == "$exists":
+            ok = (value is not _MISSING) == bool(arg)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            values = value if isinstance(value, list) else [value]
+            ok = any(_compare(op, v, arg) for v in values)
+        else:
+            raise NotImplementedError(f"fake query operator {op}")
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc, query):
+    """True ถ้า ``doc`` ตรงกับ MongoDB filter ``query``"""
+    for field, cond in (query or {}).items():
+        if field == "$or":
+            if not any(matches(doc, q) for q in cond):
+                return False
+        elif field == "$and":
+            if not all(matches(doc, q) for q in cond):
+                return False
+        elif not _matches_condition(_get(doc, field), cond):
+            return False
+    return True
+
+
+def sort_key(value):
+    """ลำดับแบบ MongoDB อย่างง่าย: null/missing ต่ำสุด"""
+    return (0, 0) if value is None or value is _MISSING else (1, value)
+
+
+def sort_docs(docs, keys):
+    def cmp(a, b):
+        for field, direction in keys:
+            ka, kb = sort_key(_get(a, field)), sort_key(_get(b, field))
+            if ka != kb:
+                return (-1 if ka < kb else 1) * direction
+        return 0
+    return sorted(docs, key=cmp_to_key(cmp))
+
+
+def project(doc, projection):
+    """inclusion / exclusion projection (``_id`` ติดมาเสมอ ยกเว้นสั่ง 0)"""
+    if not projection:
+        return doc
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if fields and not any(fields.values()):
+        out = copy.deepcopy(doc)
+        for path in fields:
+            *parents, leaf = path.split(".")
+            target = _get(out, ".".join(parents)) if parents else out
+            if isinstance(target, dict):
+                target.pop(leaf, None)
+    else:
+        out = {}
+        for path in fields:
+            value = _get(doc, path)
+            if value is _MISSING:
+                continue
+            *parents, leaf = path.split(".")
+            target = out
+            for p in parents:
+                target = target.setdefault(p, {})
+            target[leaf] = copy.deepcopy(value)
+    if projection.get("_id", 1) and "_id" in doc:
+        out["_id"] = doc["_id"]
+    elif not projection.get("_id", 1):
+        out.pop("_id", None)
+    return out
+
+
+def _set_path(doc, path, value):
+    *parents, leaf = path.split(".")
+    for p in parents:
+        doc = doc.setdefault(p, {})
+    doc[leaf] = value
+
+
+def _unset_path(doc, path):
+    *parents, leaf = path.split(".")
+    target = _get(doc, ".".join(parents)) if parents else doc
+    if isinstance(target, dict):
+        target.pop(leaf, None)
+
+
+def apply_update(doc, update, inserting=False):
+    for path, value in update.get("$set", {}).items():
+        _set_path(doc, path, copy.deepcopy(value))
+    if inserting:
+        for path, value in update.get("$setOnInsert", {}).items():
+            _set_path(doc, path, copy.deepcopy(value))
+    for path in update.get("$unset", {}):
+        _unset_path(doc, path)
+    for path, n in update.get("$inc", {}).items():
+        current = _get(doc, path)
+        _set_path(doc, path, (0 if current is _MISSING else current) + n)
+    for path, value in update.get("$push", {}).items():
+        current = _get(doc, path)
+        _set_path(doc, path, ([] if current is _MISSING else current) + [copy.deepcopy(value)])
+
+
+def _seed(query):
+    """เอกสารเริ่มต้นของ upsert: field ที่ query เทียบค่าตรง ๆ"""
+    doc = {}
+    for field, cond in query.items():
+        if not field.startswith("$") and not (isinstance(cond, dict) and any(k.startswith("$") for k in cond)):
+            _set_path(doc, field, copy.deepcopy(cond))
+    return doc
+
+
+# -----------------------------------------------------------------------------
+# Cursor / Collection / DB
+# -----------------------------------------------------------------------------
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction or 1)] if isinstance(key, str) else key
+        self.docs = sort_docs(self.docs, keys)
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        if n:
+            self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length else self.docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs=(), name="collection", calls=None):
+        self.name = name
+        self.docs = list(docs)
+        self.calls = [] if calls is None else calls
+        self.aggregate_result = []
+
+    def _log(self, op, arg):
+        self.calls.append((self.name, op, arg))
+
+    def ops(self, op):
+        """argument ของทุก call ชนิด ``op`` ที่ collection นี้ได้รับ"""
+        return [arg for name, o, arg in self.calls if name == self.name and o == op]
+
+    def _find(self, query, sort=None):
+        docs = [d for d in self.docs if matches(d, query)]
+        return sort_docs(docs, sort) if sort else docs
+
+    # -- reads ----------------------------------------------------------------
+
+    def find(self, query=None, projection=None, **kwargs):
+        self._log("find", query)
+        return FakeCursor([project(copy.deepcopy(d), projection) for d in self._find(query)])
+
+    async def find_one(self, query=None, projection=None, sort=None, **kwargs):
+        self._log("find_one", query)
+        found = self._find(query, sort)
+        return project(copy.deepcopy(found[0]), projection) if found else None
+
+    async def count_documents(self, query=None, **kwargs):
+        self._log("count_documents", query)
+        return len(self._find(query))
+
+    def aggregate(self, pipeline, **kwargs):
+        self._log("aggregate", pipeline)
+        rows = self.aggregate_result
+        return FakeCursor(rows(pipeline) if callable(rows) else copy.deepcopy(rows))
+
+    # -- writes ---------------------------------------------------------------
+
+    def _insert(self, doc):
+        doc = copy.deepcopy(doc)
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(doc)
+        return doc
+
+    def _update(self, query, update, upsert=False, many=False):
+        found = self._find(query)
+        if not many:
+            found = found[:1]
+        for doc in found:
+            apply_update(doc, update)
+        upserted = None
+        if not found and upsert:
+            doc = _seed(query)
+            apply_update(doc, update, inserting=True)
+            upserted = self._insert(doc)["_id"]
+        return SimpleNamespace(matched_count=len(found), modified_count=len(found), upserted_id=upserted)
+
+    def _delete(self, query, many=False):
+        found = self._find(query)
+        if not many:
+            found = found[:1]
+        self.docs = [d for d in self.docs if not any(d is f for f in found)]
+        return SimpleNamespace(deleted_count=len(found))
+
+    async def insert_one(self, doc, **kwargs):
+        self._log("insert_one", doc)
+        return SimpleNamespace(inserted_id=self._insert(doc)["_id"])
+
+    async def insert_many(self, docs, **kwargs):
+        self._log("insert_many", docs)
+        return SimpleNamespace(inserted_ids=[self._insert(d)["_id"] for d in docs])
+
+    async def update_one(self, query, update, upsert=False, **kwargs):
+        self._log("update_one", (query, update))
+        return self._update(query, update, upsert)
+
+    async def update_many(self, query, update, upsert=False, **kwargs):
+        self._log("update_many", (query, update))
+        return self._update(query, update, upsert, many=True)
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False,
+                                  return_document=False, **kwargs):
+        """``return_document`` ตาม pymongo: False (BEFORE) = ค่าก่อนแก้, True (AFTER) = ค่าหลังแก้"""
+        self._log("find_one_and_update", (query, update))
+        found = self._find(query)
+        if found:
+            before = copy.deepcopy(found[0])
+            apply_update(found[0], update)
+            doc = found[0] if return_document else before
+        elif upsert:
+            doc = _seed(query)
+            apply_update(doc, update, inserting=True)
+            doc = self._insert(doc) if return_document else None
+        else:
+            doc = None
+        return project(copy.deepcopy(doc), projection) if doc is not None else None
+
+    async def delete_one(self, query, **kwargs):
+        self._log("delete_one", query)
+        return self._delete(query)
+
+    async def delete_many(self, query, **kwargs):
+        self._log("delete_many", query)
+        return self._delete(query, many=True)
+
+    async def bulk_write(self, requests, ordered=True, **kwargs):
+        """รองรับ UpdateOne / UpdateMany / InsertOne / DeleteOne ของ pymongo"""
+        self._log("bulk_write", requests)
+        matched = inserted = deleted = 0
+        for request in requests:
+            kind = type(request).__name__
+            if kind in ("UpdateOne", "UpdateMany"):
+                result = self._update(request._filter, request._doc, request._upsert, many=kind == "UpdateMany")
+                matched += result.matched_count
+            elif kind == "InsertOne":
+                self._insert(request._doc)
+                inserted += 1
+            elif kind in ("DeleteOne", "DeleteMany"):
+                deleted += self._delete(request._filter, many=kind == "DeleteMany").deleted_count
+            else:
+                raise NotImplementedError(f"fake bulk_write {kind}")
+        return SimpleNamespace(matched_count=matched, modified_count=matched,
+                               inserted_count=inserted, deleted_count=deleted)
+
+
+class FakeDB(dict):
+    """``FakeDB(jobs=[...], resumes=[...])`` — ทุก collection บันทึก call ลง ``db.calls`` ร่วมกัน"""
+
+    def __init__(self, **collections):
+        super().__init__()
+        self.calls = []
+        for name, docs in collections.items():
+            self[name] = FakeCollection(docs, name, self.calls)
+
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection((), name, self.calls)
+        return collection
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def ops(self, op):
+        """(collection, argument) ของทุก call ชนิด ``op`` ตามลำดับ"""
+        return [(name, arg) for name, o, arg in self.calls if o == op]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST APPLICANTS PIPELINE - ทดสอบ aggregation รายชื่อผู้สมัครของ HR
+# =============================================================================
+"""
+ทดสอบ routes/job.py (GET /jobs/{job_id}/applicants):
+- pipeline เรียง ai_score แล้ว _id (แบ่งหน้าคงที่) และ $lookup หลัง $limit
+  ด้วย projection เท่านั้น (ไม่ดึง extracted_text)
+- backfill resume_file_url / cert_llm_analyses / certificate_urls
+  จากผล $lookup เหมือนเดิม โดยไม่ทับค่าที่ใบสมัครมีอยู่แล้ว
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routes.job import applicants_pipeline, backfill_applicant
+
+
+def test_pipeline_sorts_stably_and_looks_up_after_paging():
+    pipeline = applicants_pipeline("job1", skip=40, limit=20)
+    stages = [next(iter(stage)) for stage in pipeline]
+
+    assert stages == ["$match", "$sort", "$skip", "$limit", "$project", "$lookup", "$lookup"]
+    assert pipeline[1]["$sort"] == {"ai_score": -1, "_id": 1}
+    assert (pipeline[2]["$skip"], pipeline[3]["$limit"]) == (40, 21)  # +1 → รู้ว่ามีหน้าถัดไป
+
+    summary = pipeline[4]["$project"]  # ตัด resume_data / status_history ก่อน $lookup
+    assert "resume_data.skills" in summary and not {"resume_data", "status_history", "cert_llm_analyses"} & set(summary)
+
+    resume_lookup, cert_lookup = pipeline[5]["$lookup"], pipeline[6]["$lookup"]
+    assert (resume_lookup["from"], cert_lookup["from"]) == ("resumes", "certificates")
+    resume_stages = resume_lookup["pipeline"]
+    assert {"$limit": 1} in resume_stages
+    assert "extracted_text" not in resume_stages[-1]["$project"]
+    assert {"$limit": 20} in cert_lookup["pipeline"]
+
+
+def test_backfill_from_lookup_results():
+    resume = {"file_path": "uploads\\resumes\\ab.pdf", "cert_llm_analyses": [{"name": "AWS"}]}
+    certs = [{"file_path": "uploads/certificates/c1.pdf", "llm_analysis": {"name": "CCNA"}},
+             {"file_url": "/uploads/certificates/c2.png"}]
+
+    item = backfill_applicant({"student_id": "s1"}, resume, certs)
+    assert item["resume_file_url"] == "/uploads/resumes/ab.pdf"
+    assert item["cert_llm_analyses"] == [{"name": "AWS"}]  # resume ก่อน certificates
+    assert item["certificate_urls"] == ["/uploads/certificates/c1.pdf", "/uploads/certificates/c2.png"]
+
+    existing = {"resume_file_url": "/r.pdf", "certificate_urls": ["/c.pdf"]}
+    assert backfill_applicant(dict(existing), resume, certs)["resume_file_url"] == "/r.pdf"
+    assert backfill_applicant(dict(existing), None, [])["certificate_urls"] == ["/c.pdf"]
+    assert backfill_applicant({}, None, [{"llm_analysis": {"name": "CCNA"}}])["cert_llm_analyses"] == [{"name": "CCNA"}]
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_pipeline_sorts_stably_and_looks_up_after_paging()
+    test_backfill_from_lookup_results()
+    print("✅ All applicants pipeline tests passed")
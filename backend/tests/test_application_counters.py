@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST APPLICATION COUNTERS - ทดสอบ counter ใบสมัครบน job + reconciler
+# =============================================================================
+"""
+ทดสอบ services/application_counters.py:
+- apply / เปลี่ยน status / ลบ ปรับ applications_count + status_counts
+  ให้ตรงกับการนับจริง (reconcile ไม่ต้องแก้อะไร)
+- reconcile แก้เฉพาะ job ที่ counter คลาดเคลื่อน (รวม job ที่ไม่มีใบสมัครแล้ว)
+  และไม่เขียนทับ job ที่มีใบสมัครเข้ามาระหว่างนับ
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+
+from bson import ObjectId
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.application_counters import count_added, count_removed, count_status_change, reconcile
+from tests.fakes import FakeDB, apply_update
+
+
+def _db(jobs):
+    """applications.aggregate นับ (job_id, status) จากใบสมัครจริง; ``db.during_count`` จำลอง request ที่เขียนระหว่าง $group"""
+    db = FakeDB(jobs=jobs, applications=[])
+    db.during_count = None
+
+    def group(pipeline):
+        if db.during_count:
+            db.during_count()
+        counts = Counter((a["job_id"], a.get("status")) for a in db.applications.docs)
+        return [{"_id": {"job_id": j, "status": s}, "n": n} for (j, s), n in counts.items()]
+
+    db.applications.aggregate_result = group
+    return db
+
+
+def _job(db, job_id):
+    return next(job for job in db.jobs.docs if job["_id"] == job_id)
+
+
+def _writes(db):
+    return len(db.jobs.ops("update_one")) + len(db.jobs.ops("bulk_write"))
+
+
+def test_counters_follow_apply_decide_and_delete():
+    jobs = [{"_id": ObjectId(), "applications_count": 0} for _ in range(2)]
+    db = _db(jobs)
+
+    async def run():
+        for i in range(5):
+            app = {"job_id": str(jobs[i % 2]["_id"]), "status": "pending"}
+            db.applications.docs.append(app)
+            await count_added(db, app["job_id"])
+        decided = db.applications.docs[0]
+        decided["status"] = "accepted"
+        await count_status_change(db, decided["job_id"], "pending", "accepted")
+        await count_status_change(db, decided["job_id"], "accepted", "accepted")  # ไม่เปลี่ยน → ไม่เขียน
+        removed = db.applications.docs[:2]
+        del db.applications.docs[:2]
+        await count_removed(db, removed)
+        return await reconcile(db)
+
+    assert asyncio.run(run()) == 0  # counters ตรงกับการนับจริง
+    first, second = db.jobs.docs
+    assert first["applications_count"] == 2 and first["status_counts"] == {"pending": 2, "accepted": 0}
+    assert second["applications_count"] == 1 and second["status_counts"] == {"pending": 1}
+
+
+def test_reconcile_fixes_only_drifted_jobs():
+    ok, drifted, emptied = (ObjectId() for _ in range(3))
+    db = _db([
+        {"_id": ok, "applications_count": 1, "status_counts": {"pending": 1}},
+        {"_id": drifted, "applications_count": 7, "status_counts": {"pending": 7}},
+        {"_id": emptied, "applications_count": 2, "status_counts": {"rejected": 2}},
+    ])
+    db.applications.docs[:] = [
+        {"job_id": str(ok), "status": "pending"},
+        {"job_id": str(drifted), "status": "pending"},
+        {"job_id": str(drifted), "status": "accepted"},
+    ]
+
+    assert asyncio.run(reconcile(db)) == 2
+    assert _job(db, drifted)["applications_count"] == 2
+    assert _job(db, drifted)["status_counts"] == {"pending": 1, "accepted": 1}
+    assert _job(db, emptied)["applications_count"] == 0 and _job(db, emptied)["status_counts"] == {}
+    assert _writes(db) == 1  # bulk_write เดียว
+    assert asyncio.run(reconcile(db)) == 0
+
+    # apply ที่ลงหลังอ่าน counter (นับใน $group ไม่ทัน) → ไม่เขียนทับด้วยค่าเก่า
+    _job(db, ok).update(applications_count=5, status_counts={"pending": 5})
+
+    def late_apply():
+        apply_update(_job(db, ok), {"$inc": {"applications_count": 1, "status_counts.pending": 1}})
+
+    db.during_count = late_apply
+    assert asyncio.run(reconcile(db)) == 0
+    assert _job(db, ok)["applications_count"] == 6  # รอบหน้าค่อยแก้
+    db.during_count = None
+    assert asyncio.run(reconcile(db)) == 1 and _job(db, ok)["applications_count"] == 1
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_counters_follow_apply_decide_and_delete()
+    test_reconcile_fixes_only_drifted_jobs()
+    print("✅ All application counter tests passed")
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST APPLICATION DETAIL - ทดสอบ summary projection ของ list + endpoint รายละเอียด
+# =============================================================================
+"""
+ทดสอบ routes/job.py:
+- APPLICATION_SUMMARY_PROJECTION ตัด resume_data (เหลือ skills / ประสบการณ์),
+  status_history, xgboost_features_at_decision, cert analyses ออกจาก list
+- GET /applications/{app_id} ส่งใบสมัครฉบับเต็มให้เจ้าของ, HR ของบริษัท
+  และ Admin (HR/Admin ได้ไฟล์ resume + cert analyses เติมให้) ส่วนคนอื่นได้ 403
+"""
+
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmark_application_payloads import project, synthetic_applications
+from routes.job import APPLICATION_SUMMARY_PROJECTION, application_item, get_application_detail
+from tests.fakes import FakeDB
+
+
+def test_summary_projection_keeps_list_fields_only():
+    (doc,) = synthetic_applications(1)
+    summary = project(doc, APPLICATION_SUMMARY_PROJECTION)
+
+    assert summary["resume_data"]["skills"] == doc["resume_data"]["skills"]
+    assert set(summary["resume_data"]) <= {"skills", "experience_months", "total_experience_months"}
+    assert len(doc["resume_data"]) > len(summary["resume_data"])
+    for field in ["status", "ai_score", "matching_breakdown", "interview", "student_name", "resume_file_url"]:
+        assert summary[field] == doc[field], field
+    for field in ["status_history", "xgboost_features_at_decision", "cert_llm_analyses", "cover_letter"]:
+        assert field not in summary, field
+
+    full = json.dumps(application_item(dict(doc)), default=str)
+    small = json.dumps(application_item(summary), default=str)
+    assert len(small) < len(full) / 2
+
+
+def test_detail_authorizes_owner_company_hr_and_admin():
+    company, other_company, job_id, orphan_job_id = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    student, hr, other_hr, no_company_hr = str(ObjectId()), ObjectId(), ObjectId(), ObjectId()
+    app = {"_id": ObjectId(), "job_id": str(job_id), "student_id": student, "status": "pending",
+           "resume_data": {"skills": ["python"], "projects": [{"name": "x"}]},
+           "status_history": [{"status": "pending"}], "submitted_at": datetime.now(timezone.utc)}
+    orphan = {**app, "_id": ObjectId(), "job_id": str(orphan_job_id)}  # งานที่ไม่มี company_id
+    db = FakeDB(
+        applications=[app, orphan],
+        jobs=[{"_id": job_id, "company_id": str(company)}, {"_id": orphan_job_id}],
+        users=[{"_id": hr, "company_id": str(company)}, {"_id": other_hr, "company_id": str(other_company)},
+               {"_id": no_company_hr}],
+        resumes=[{"user_id": student, "status": "processed", "file_path": "uploads\\resumes\\r.pdf",
+                  "cert_llm_analyses": [{"cert_name": "AWS"}]}],
+        certificates=[{"user_id": student, "file_path": "uploads/certificates/c.pdf"}],
+    )
+
+    def detail(user, application=app):
+        return asyncio.run(get_application_detail(app_id=str(application["_id"]), current_user=user, db=db))
+
+    own = detail({"sub": student, "user_type": "Student"})
+    assert own["id"] == str(app["_id"]) and own["resume_data"]["projects"] and own["status_history"]
+    assert "resume_file_url" not in own  # นักศึกษาเห็นแค่ใบสมัครของตัวเอง ไม่ต้องเติมไฟล์
+
+    hr_view = detail({"sub": str(hr), "user_type": "HR"})
+    assert hr_view["resume_file_url"] == "/uploads/resumes/r.pdf"
+    assert hr_view["cert_llm_analyses"] == [{"cert_name": "AWS"}]
+    assert hr_view["certificate_urls"] == ["/uploads/certificates/c.pdf"]
+    assert detail({"sub": str(ObjectId()), "user_type": "Admin"})["id"] == own["id"]
+
+    for user, application in [({"sub": str(ObjectId()), "user_type": "Student"}, app),
+                              ({"sub": str(other_hr), "user_type": "HR"}, app),
+                              ({"sub": str(no_company_hr), "user_type": "HR"}, orphan)]:  # None == None ต้องไม่ผ่าน
+        with pytest.raises(HTTPException) as exc:
+            detail(user, application)
+        assert exc.value.status_code == 403
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_application_detail(app_id="nope", current_user={"sub": student}, db=db))
+    assert exc.value.status_code == 400
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_summary_projection_keeps_list_fields_only()
+    test_detail_authorizes_owner_company_hr_and_admin()
+    print("✅ All application detail tests passed")
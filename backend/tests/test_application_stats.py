@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST APPLICATION STATS - ทดสอบ $group analytics + daily rollup
+# =============================================================================
+"""
+ทดสอบ services/application_stats.py:
+- $group ต่อ job ให้ผลเท่ากับการนับแบบเดิมใน Python (status, avg ai_score,
+  histogram) — ประเมิน expression ด้วย evaluator ขนาดเล็กในไฟล์นี้
+- rollup รายวันรวมกลับแล้วได้ผลเท่ากับ live; refresh เขียน ($merge) ก่อนแล้วค่อยลบ
+  เฉพาะแถวที่รอบนี้ไม่ได้เขียน และรวมวันของใบสมัครเก่าที่ HR ตัดสินในช่วงนั้น
+"""
+
+import asyncio
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bson import ObjectId
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.application_stats import (
+    ADDITIVE_FIELDS, ROLLUP_COLLECTION, job_stats_pipeline, refresh_daily_rollup, rollup_pipeline,
+    rollup_stats_pipeline, summarize,
+)
+from tests.fakes import FakeDB
+
+_TYPES = {float: "double", int: "int", str: "string", type(None): "null"}
+
+
+def _eval(expr, doc):
+    """ตัวประเมิน aggregation expression เฉพาะ operator ที่ pipeline ใช้"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, list):
+        return [_eval(e, doc) for e in expr]
+    if not isinstance(expr, dict):
+        return expr
+    (op, arg), = expr.items()
+    if op == "$cond":
+        return _eval(arg[1], doc) if _eval(arg[0], doc) else _eval(arg[2], doc)
+    if op == "$type":
+        return _TYPES[type(doc.get(arg[1:]))] if arg[1:] in doc else "missing"
+    if op == "$dateToString":
+        return _eval(arg["date"], doc).strftime(arg["format"])
+    a = _eval(arg, doc)
+    return {
+        "$eq": lambda: a[0] == a[1],
+        "$in": lambda: a[0] in a[1],
+        "$and": lambda: all(a),
+        "$gte": lambda: a[0] is not None and a[0] >= a[1],
+        "$lt": lambda: a[0] is not None and a[0] < a[1],
+    }[op]()
+
+
+def _group(docs, stage):
+    rows = {}
+    for doc in docs:
+        key = _eval(stage["_id"], doc) if not isinstance(stage["_id"], dict) else \
+            tuple(_eval(v, doc) for v in stage["_id"].values())
+        row = rows.setdefault(key, {"_id": key, **{f: 0 for f in stage if f != "_id"}})
+        for field, acc in stage.items():
+            if field != "_id":
+                row[field] += _eval(acc["$sum"], doc)
+    return list(rows.values())
+
+
+def _apps():
+    now = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    jobs = [{"_id": ObjectId(), "title": f"Job {i}", "is_active": True} for i in range(3)]
+    statuses = ["pending", "accepted", "rejected", "reviewing"]
+    apps = []
+    for i in range(40):
+        app = {"job_id": str(jobs[i % 2]["_id"]), "status": statuses[i % 4],
+               "submitted_at": now + timedelta(days=i % 5)}
+        if i % 7:
+            app["ai_score"] = (i * 37 % 101) / 100
+        apps.append(app)
+    return jobs, apps
+
+
+def test_group_matches_python_counting():
+    jobs, apps = _apps()
+    pipeline = job_stats_pipeline([str(j["_id"]) for j in jobs])
+    assert [next(iter(s)) for s in pipeline] == ["$match", "$group"]
+    result = summarize(jobs, _group(apps, pipeline[1]["$group"]))
+
+    for job, stats in zip(jobs, result["per_job"]):
+        mine = [a for a in apps if a["job_id"] == str(job["_id"])]
+        scores = [a["ai_score"] for a in mine if a.get("ai_score") is not None]
+        assert stats["total"] == len(mine)
+        assert stats["accepted"] == sum(a["status"] == "accepted" for a in mine)
+        assert stats["pending"] == sum(a["status"] == "pending" for a in mine)
+        assert stats["avg_ai_score"] == (round(sum(scores) / len(scores) * 100, 1) if scores else 0)
+        assert sum(stats["score_histogram"]) == len(scores)
+
+    assert result["per_job"][2]["total"] == 0  # job ไม่มีใบสมัคร → 0
+    assert result["summary"]["total_applications"] == 40
+    assert sum(b["count"] for b in result["score_histogram"]) == sum("ai_score" in a for a in apps)
+
+
+def test_daily_rollup_resums_to_live():
+    jobs, apps = _apps()
+    job_ids = [str(j["_id"]) for j in jobs]
+    live = summarize(jobs, _group(apps, job_stats_pipeline(job_ids)[1]["$group"]))
+
+    stages = rollup_pipeline()
+    assert "$merge" in stages[-1] and set(ADDITIVE_FIELDS) <= set(stages[2]["$project"])
+    daily = [{**row, "job_id": row["_id"][0], "day": row["_id"][1]}
+             for row in _group(apps, stages[1]["$group"])]
+    assert len(daily) == 10  # 2 jobs × 5 days
+
+    resum = rollup_stats_pipeline(job_ids)[1]["$group"]
+    totals = defaultdict(lambda: {f: 0 for f in ADDITIVE_FIELDS})
+    for row in daily:
+        for f in ADDITIVE_FIELDS:
+            totals[row["job_id"]][f] += _eval(resum[f]["$sum"], row)
+    rolled = summarize(jobs, [{"_id": jid, **t} for jid, t in totals.items()])
+    assert rolled == live
+
+    # refresh: $merge ก่อน → ลบเฉพาะแถวในช่วงที่ run นี้ไม่ได้เขียน (ไม่มีช่วงที่ rollup ว่าง)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    db = FakeDB(**{ROLLUP_COLLECTION: [
+        {"_id": "stale", "day": today, "refresh_run": "old"},        # ในช่วง แต่รอบนี้ไม่ได้เขียน → ลบ
+        {"_id": "history", "day": "2019-01-01", "refresh_run": "old"},  # นอกช่วง → เก็บไว้
+    ]})
+
+    def applications(pipeline):
+        if "$group" in pipeline[-1]:  # วันของใบสมัครเก่าที่ HR ตัดสินในช่วงนี้
+            return [{"_id": "2020-01-05"}]
+        run = pipeline[2]["$project"]["refresh_run"]["$literal"]  # จำลอง $merge
+        db[ROLLUP_COLLECTION].docs.extend(
+            {"_id": f"j{i}", "day": day, "refresh_run": run} for i, day in enumerate([today, today, "2020-01-05"]))
+        return []
+
+    db.applications.aggregate_result = applications
+    assert asyncio.run(refresh_daily_rollup(db, 30)) == 3
+    (_, decided), (_, merge) = db.ops("aggregate")
+    assert decided[0]["$match"]["decided_at"]["$gte"] == decided[0]["$match"]["submitted_at"]["$lt"]
+    assert "$merge" in merge[-1] and len(merge[0]["$match"]["$or"]) == 2  # ช่วง 30 วัน + 2020-01-05
+    assert [op for _, op, _ in db.calls] == ["aggregate", "aggregate", "delete_many", "count_documents"]
+    (_, delete), = db.ops("delete_many")
+    assert {"day": {"$in": ["2020-01-05"]}} in delete["$or"]
+    assert sorted(doc["_id"] for doc in db[ROLLUP_COLLECTION].docs) == ["history", "j0", "j1", "j2"]
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_group_matches_python_counting()
+    test_daily_rollup_resums_to_live()
+    print("✅ All application stats tests passed")
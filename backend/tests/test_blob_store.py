@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST BLOB STORE - ทดสอบ Content-addressed Upload Storage
+# =============================================================================
+"""
+ทดสอบ core/blob_store.py:
+- ไฟล์เดียวกันอัปโหลดซ้ำ → ไฟล์บนดิสก์เดียว (sharded path), refcount = 2
+- release ครบทุก reference → ยังไม่ลบทันที (กัน race กับอัปโหลดซ้ำ) รอ collect_blobs
+  ลบไฟล์ + blob document; ถ้ามีอัปโหลดซ้ำแทรกระหว่าง GC ไฟล์ต้องยังอยู่;
+  ไฟล์ legacy ถูกลบตรง ๆ
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.blob_store import BLOB_COLLECTION, collect_blobs, release_blob, store_blob
+from core.uploads import PDF_KINDS
+from tests.fakes import FakeCollection
+
+PDF = b"%PDF-1.4\n" + b"resume body " * 200
+
+
+class _FakeBlobs(FakeCollection):
+    """``on_delete`` จำลองอัปโหลดที่แทรกเข้ามาหลัง GC ลบ document"""
+
+    def __init__(self):
+        super().__init__(name=BLOB_COLLECTION)
+        self.on_delete = None
+
+    async def delete_one(self, query, **kwargs):
+        result = await super().delete_one(query, **kwargs)
+        if result.deleted_count and self.on_delete:
+            await self.on_delete()
+        return result
+
+    def get(self, _id):
+        return next((doc for doc in self.docs if doc["_id"] == _id), None)
+
+
+def _in_tmp(fn):
+    """รันใน temp dir — blob store ใช้ relative path ``uploads/...``"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            fn()
+        finally:
+            os.chdir(cwd)
+
+
+def blob_key(blob):
+    return f"resumes:{blob.sha256}"
+
+
+def _upload():
+    return UploadFile(file=io.BytesIO(PDF), filename="resume.pdf")
+
+
+def test_identical_upload_is_deduplicated():
+    def run():
+        db = {BLOB_COLLECTION: _FakeBlobs()}
+
+        async def flow():
+            first = await store_blob(db, _upload(), "resumes", max_size=1 << 20, allowed_kinds=PDF_KINDS)
+            second = await store_blob(db, _upload(), "resumes", max_size=1 << 20, allowed_kinds=PDF_KINDS)
+            return first, second
+
+        first, second = asyncio.run(flow())
+        sha = first.sha256
+        assert first.path == f"uploads/resumes/{sha[:2]}/{sha[2:4]}/{sha}.pdf"
+        assert (first.deduplicated, second.deduplicated) == (False, True)
+        assert second.path == first.path
+        assert db[BLOB_COLLECTION].get(f"resumes:{sha}")["refcount"] == 2
+        # ไม่มี temp file ค้าง — มีแค่ไฟล์ blob เดียว
+        assert os.listdir("uploads/resumes") == [sha[:2]]
+        assert Path(first.path).read_bytes() == PDF
+
+    _in_tmp(run)
+
+
+def test_release_leaves_blob_to_gc_and_legacy_files_are_deleted():
+    def run():
+        blobs = _FakeBlobs()
+        db = {BLOB_COLLECTION: blobs}
+        os.makedirs("uploads/resumes")
+        Path("uploads/resumes/u1_legacy.pdf").write_bytes(PDF)
+
+        async def upload():
+            return await store_blob(db, _upload(), "resumes", max_size=1 << 20, allowed_kinds=PDF_KINDS)
+
+        async def flow():
+            blob = await upload()
+            await upload()
+            await release_blob(db, blob.path)
+            await release_blob(db, "/" + blob.path)  # URL form ก็ใช้ได้
+            await release_blob(db, "uploads/resumes/u1_legacy.pdf")
+            assert os.path.exists(blob.path)       # ไม่ลบ inline — รอ GC
+            assert not os.path.exists("uploads/resumes/u1_legacy.pdf")
+            assert await collect_blobs(db, grace=3600) == 0  # ยังไม่พ้น grace period
+
+            # อัปโหลดซ้ำแทรกหลัง GC ลบ document → ไฟล์ต้องยังอยู่สำหรับ document ใหม่
+            blobs.on_delete = upload
+            assert await collect_blobs(db, grace=0) == 0
+            assert Path(blob.path).read_bytes() == PDF and blobs.get(blob_key(blob))["refcount"] == 1
+
+            blobs.on_delete = None
+            await release_blob(db, blob.path)
+            assert await collect_blobs(db, grace=0) == 1
+            return blob
+
+        blob = asyncio.run(flow())
+        assert not os.path.exists(blob.path) and not os.path.exists(blob.path + ".gc")
+        assert blobs.docs == []
+
+    _in_tmp(run)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_identical_upload_is_deduplicated()
+    test_release_leaves_blob_to_gc_and_legacy_files_are_deleted()
+    print("✅ All blob store tests passed")
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST CERT CACHE - ทดสอบ Certificate Template Cache
+# =============================================================================
+"""
+ทดสอบ CertAnalysisCache:
+- cert template เดียวกัน (ต่างแค่ชื่อ / วันที่ / credential ID) → cache hit
+- คอร์สต่างกันบน template เดียวกัน → cache miss
+- hit ratio ถูกนับ
+- analyze_certificates_batch: หลาย cert ใน LLM call เดียว, key ที่ขาดหาย retry ทีละใบ
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.cert_cache import CertAnalysisCache, hamming, normalize_cert_text
+from services.llm_service import LLMService
+from tests.fakes import FakeDB
+
+
+COURSERA_CERT = """Coursera
+COURSE CERTIFICATE
+Mar 14, 2024
+Somchai Jaidee
+has successfully completed
+Machine Learning Specialization
+an online non-credit course authorized by Stanford University and DeepLearning.AI and offered through Coursera
+Verify at coursera.org/verify/ABCD1234EFGH
+"""
+
+ANALYSIS = {
+    "cert_name": "Machine Learning Specialization",
+    "domain": "AI/ML",
+    "skills_covered": ["machine learning", "python"],
+    "relevance_tags": ["ai", "data"],
+    "is_valid_cert": True,
+}
+
+
+def test_same_template_hits_cache():
+    db = FakeDB()
+    cache = CertAnalysisCache()
+
+    async def run():
+        assert await cache.lookup(db, COURSERA_CERT) is None
+        await cache.store(db, COURSERA_CERT, {**ANALYSIS, "raw": "ignored"})
+
+        other_student = (COURSERA_CERT.replace("Somchai Jaidee", "Suda Rakthai")
+                         .replace("Mar 14, 2024", "January 3, 2025")
+                         .replace("ABCD1234EFGH", "XZ9Q8W7E6R5T"))
+        hit = await cache.lookup(db, other_student)
+        assert hit == ANALYSIS  # เก็บเฉพาะ field ระดับ template
+
+        other_course = COURSERA_CERT.replace("Machine Learning Specialization", "Deep Learning Specialization")
+        assert await cache.lookup(db, other_course) is None
+
+    asyncio.run(run())
+    stats = cache.stats()
+    assert (stats["lookups"], stats["hits"]) == (3, 1)
+    assert stats["hit_ratio"] == round(1 / 3, 4)
+    assert db["cert_analysis_cache"].docs[0]["hits"] == 1
+
+
+def test_mask_terms_and_short_text():
+    cache = CertAnalysisCache()
+    # ชื่อที่ไม่มี marker นำหน้า → mask ได้ด้วยชื่อผู้ใช้ที่รู้อยู่แล้ว
+    a = "Certificate of Achievement\nSomchai Jaidee\nCompleted Cisco Networking Essentials course with distinction"
+    b = a.replace("Somchai Jaidee", "Suda Rakthai")
+    fa = cache.fingerprint(a, ["Somchai Jaidee"])
+    fb = cache.fingerprint(b, ["Suda Rakthai"])
+    assert hamming(fa, fb) == 0
+    assert cache.fingerprint("Certificate\nJohn Doe") is None  # สั้นเกินไป ไม่ cache
+
+    # ชื่อเดือนถูก mask เฉพาะเมื่อเป็นคำเดี่ยว ไม่ใช่ส่วนหนึ่งของคำ
+    text = normalize_cert_text("Digital Marketing for junior developer decision makers, 12March2024 / 5 ธันวาคม 2566")
+    assert "digital marketing for junior developer decision makers" in text
+    assert text.count("<date>") == 2 and "<n>" not in text  # ปีไม่ถูกตัดเป็นวันที่ + ตัวเลข
+
+
+class _BatchCompletions:
+    """จำลอง LLM: batch prompt ตอบเฉพาะ cert_1 (จำลองคำตอบไม่ครบ), prompt เดี่ยวตอบ object เดียว"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def create(self, model, messages, temperature, max_tokens):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if '"certificates"' in prompt:
+            content = json.dumps({"certificates": [{"file": "cert_1", **ANALYSIS}]})
+        else:
+            content = json.dumps({**ANALYSIS, "cert_name": "AWS Cloud Practitioner"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_batch_analysis_single_call_with_retry():
+    svc = LLMService()
+    svc.router = None
+    svc.client = SimpleNamespace(chat=SimpleNamespace(completions=_BatchCompletions()))
+
+    results = svc.analyze_certificates_batch({
+        "cert_1": COURSERA_CERT,
+        "cert_2": "AWS Certified Cloud Practitioner — Amazon Web Services validation number 123",
+        "cert_3": "",  # image cert: ไม่มี text
+    })
+    prompts = svc.client.chat.completions.prompts
+    assert len(prompts) == 2  # batch 1 ครั้ง + retry cert_2 ที่ขาดไป
+    assert 'file="cert_1"' in prompts[0] and 'file="cert_2"' in prompts[0]
+    assert results["cert_1"] == ANALYSIS
+    assert results["cert_2"]["cert_name"] == "AWS Cloud Practitioner"
+    assert results["cert_3"] is None
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_same_template_hits_cache()
+    test_mask_terms_and_short_text()
+    test_batch_analysis_single_call_with_retry()
+    print("✅ All cert cache tests passed")
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST COMPANY LISTING - ทดสอบ $facet รายการบริษัท + HR counts
+# =============================================================================
+"""
+ทดสอบ routes/company.py:
+- pipeline: $facet เดียวให้ทั้ง total และหน้าของ companies; join HR
+  assignments + users ทำหลัง $limit (เฉพาะบริษัทในหน้านั้น)
+- GET /companies ยิง aggregate ครั้งเดียว, body ยังเป็น list,
+  total อยู่ใน header X-Total-Count
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import Response
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import routes.company as company_routes
+from routes.company import companies_page_pipeline
+from tests.fakes import FakeDB
+
+
+def test_facet_pipeline_counts_and_joins_after_paging():
+    pipeline = companies_page_pipeline({"is_active": True}, skip=20, limit=10)
+    assert [next(iter(s)) for s in pipeline] == ["$match", "$facet"]
+
+    facet = pipeline[1]["$facet"]
+    assert facet["total"] == [{"$count": "count"}]
+    stages = [next(iter(s)) for s in facet["companies"]]
+    assert stages[:3] == ["$sort", "$skip", "$limit"] and "$lookup" in stages[3:]
+
+    hr_lookup = facet["companies"][3]["$lookup"]
+    assert hr_lookup["from"] == "company_hr_assignments"
+    inner = [next(iter(s)) for s in hr_lookup["pipeline"]]
+    assert inner == ["$match", "$lookup", "$group"]  # users join ครั้งเดียวต่อ assignment
+    assert set(hr_lookup["pipeline"][2]["$group"]) == {"_id", "hr_count", "active_hr_count"}
+
+
+def test_get_companies_is_one_aggregate_with_total_header():
+    now = datetime.now(timezone.utc)
+    companies = [
+        {"_id": ObjectId(), "name": "ACME", "industry": "IT", "is_active": True, "created_at": now,
+         "hr_stats": {"hr_count": 3, "active_hr_count": 2}},
+        {"_id": ObjectId(), "name": "Globex", "industry": "Data", "is_active": True, "created_at": now},
+    ]
+    fake_db = FakeDB()
+    fake_db.companies.aggregate_result = [{"total": [{"count": 12}], "companies": companies}]
+
+    get_database = company_routes.get_database
+    company_routes.get_database = lambda: fake_db
+    try:
+        response = Response()
+        result = asyncio.run(company_routes.get_companies(
+            response=response, page=2, limit=10, search=None, industry=None,
+            is_active=None, cursor=None, admin_data={},
+        ))
+    finally:
+        company_routes.get_database = get_database
+
+    assert [op for _, op, _ in fake_db.calls] == ["aggregate"]
+    assert [(c.name, c.hr_count, c.active_hr_count) for c in result] == [("ACME", 3, 2), ("Globex", 0, 0)]
+    assert response.headers["X-Total-Count"] == "12" and response.headers["X-Total-Pages"] == "2"
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_facet_pipeline_counts_and_joins_after_paging()
+    test_get_companies_is_one_aggregate_with_total_header()
+    print("✅ All company listing tests passed")
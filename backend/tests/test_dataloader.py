@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST DATALOADER - ทดสอบการรวม lookup เป็น $in query เดียวต่อ request
+# =============================================================================
+"""
+ทดสอบ core/dataloader.py:
+- load ที่เรียกใน tick เดียวกันรวมเป็น query เดียว, id ซ้ำได้จาก cache,
+  id ไม่ถูกต้อง → None โดยไม่ query, field อื่น + sort ได้ doc แรกตาม sort
+- GET /jobs/my-applications ใช้ round trip คงที่ (2) ไม่ว่าจะมีกี่ใบสมัคร
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import Response
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.dataloader import DataLoader
+from routes.job import get_my_applications
+from tests.fakes import FakeDB
+
+
+def _finds(db):
+    return len(db.ops("find"))
+
+
+def test_loads_in_one_tick_share_one_query():
+    jobs = [{"_id": ObjectId(), "title": f"Job {i}"} for i in range(5)]
+    resumes = [{"_id": ObjectId(), "user_id": "s1", "created_at": 1, "file_path": "old.pdf"},
+               {"_id": ObjectId(), "user_id": "s1", "created_at": 2, "file_path": "new.pdf"}]
+    db = FakeDB(jobs=jobs, resumes=resumes)
+    loader = DataLoader(db)
+
+    async def run():
+        ids = [str(j["_id"]) for j in jobs] + [str(jobs[0]["_id"]), "not-an-id", None]
+        loaded = await loader.load_many("jobs", ids)
+        again = await loader.load("jobs", jobs[3]["_id"])
+        resume = await loader.load("resumes", "s1", field="user_id", sort=[("created_at", -1)])
+        return loaded, again, resume
+
+    loaded, again, resume = asyncio.run(run())
+    assert [d["title"] for d in loaded[:6]] == ["Job 0", "Job 1", "Job 2", "Job 3", "Job 4", "Job 0"]
+    assert loaded[6:] == [None, None]
+    assert again is loaded[3]  # cache — ไม่ query ซ้ำ
+    assert resume["file_path"] == "new.pdf"
+    assert loader.round_trips == _finds(db) == 2
+
+
+def test_my_applications_round_trips_do_not_grow_with_applications():
+    jobs = [{"_id": ObjectId(), "title": f"Job {i}", "company_name": "ACME"} for i in range(3)]
+    apps = [{"_id": ObjectId(), "student_id": "s1", "job_id": str(jobs[i % 3]["_id"]), "submitted_at": i}
+            for i in range(30)]
+    db = FakeDB(applications=apps, jobs=jobs)
+
+    result = asyncio.run(get_my_applications(
+        response=Response(), limit=100, cursor=None, user_id="s1", db=db, loader=DataLoader(db),
+    ))
+    assert len(result) == 30
+    assert {r["job_title"] for r in result} == {"Job 0", "Job 1", "Job 2"}
+    assert _finds(db) == 2  # applications + jobs ($in)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_loads_in_one_tick_share_one_query()
+    test_my_applications_round_trips_do_not_grow_with_applications()
+    print("✅ All dataloader tests passed")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST EXTRACTION CACHE - ทดสอบ cache ผล extract PDF ตาม SHA-256 + version
+# =============================================================================
+"""
+ทดสอบ services/extraction_cache.py + core/compression.py:
+- บีบอัด/คลายข้อความไทยกลับได้ตรงทุกตัวอักษร (zlib และ zstd ถ้าติดตั้ง)
+- ไฟล์เดิม → ครั้งที่สองได้จาก cache (ไม่เข้า PDF pool), เปลี่ยน extractor
+  version → cache miss แล้ว extract ใหม่
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import services.extraction_cache as extraction_cache
+import services.pdf_pool as pdf_pool
+from core.compression import ZSTD_AVAILABLE, compress_text, decompress_text
+from services.extraction_cache import CACHE_COLLECTION, extract_cached, file_sha256
+from synthetic_pdf import make_resume_pdf
+from tests.fakes import FakeDB
+
+THAI = "ประวัติการศึกษา มหาวิทยาลัยเกษตรศาสตร์ — Python, SQL\n" * 50
+
+
+def test_compression_round_trip():
+    for codec in ["zlib"] + (["zstd"] if ZSTD_AVAILABLE else []):
+        name, data = compress_text(THAI, codec)
+        assert name == codec and len(data) < len(THAI.encode("utf-8")) / 5
+        assert decompress_text(name, data) == THAI
+    try:
+        compress_text(THAI, "lz4")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_second_extraction_is_served_from_cache():
+    db = FakeDB()
+    pool = pdf_pool._instance = pdf_pool.PDFExtractionPool(workers=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.pdf")
+        Path(path).write_bytes(make_resume_pdf(pages=2, columns=2))
+        sha = file_sha256(path)
+
+        async def run():
+            first = await extract_cached(db, path, "resume")
+            second = await extract_cached(db, path, "resume", sha)
+            extraction_cache.EXTRACTOR_VERSION = "test-next"
+            third = await extract_cached(db, path, "resume")
+            return first, second, third
+
+        version = extraction_cache.EXTRACTOR_VERSION
+        try:
+            first, second, third = asyncio.run(run())
+        finally:
+            extraction_cache.EXTRACTOR_VERSION = version
+            pool.shutdown()
+            pdf_pool._instance = None
+
+    assert (first.cached, second.cached, third.cached) == (False, True, False)
+    assert second.text == first.text and second.method == first.method == "column"
+    assert pool.stats()["documents"] == 2  # cache hit never reached the pool
+    entry = next(doc for doc in db[CACHE_COLLECTION].docs if doc["_id"] == f"{sha}:resume:{version}")
+    assert entry["hits"] == 1 and entry["chars"] == len(first.text)
+    assert len(db[CACHE_COLLECTION].docs) == 2  # one entry per extractor version
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_compression_round_trip()
+    test_second_extraction_is_served_from_cache()
+    print("✅ All extraction cache tests passed")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST EXTRACTION CASCADE - ทดสอบ cost-ordered cascade + quality scoring
+# =============================================================================
+"""
+ทดสอบ services/extraction_cascade.py:
+- คะแนน: ข้อความ (cid:N) / สระไทยลอย ได้คะแนนต่ำกว่าข้อความปกติ
+- early exit: วิธีแรกผ่านเกณฑ์ → ไม่รันวิธีถัดไป, ไม่ผ่าน → ลองต่อแล้วเลือกคะแนนสูงสุด
+- ลำดับ strategy เปลี่ยนตาม cost ที่วัดได้ (resume ยังเริ่มที่ layout pass)
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from services.extraction_cascade import (
+    PROFILES, Attempt, ExtractionCascade, new_result, run_cascade, score_text,
+)
+from synthetic_pdf import make_resume_pdf
+
+RESUME = PROFILES["resume"]
+THAI_OK = "ประวัติการศึกษา\nมหาวิทยาลัยเกษตรศาสตร์ วิศวกรรมคอมพิวเตอร์\nทักษะ\nไพทอน ฐานข้อมูล\n" * 20
+THAI_BROKEN = "ประว ั ต ิ การศ ึ กษา\nมหาว ิ ทยาล ั ยเกษตรศาสตร ์\n" * 40
+
+
+def test_scores_penalize_garbled_and_broken_thai():
+    english = "Education\nBSc Computer Engineering\nSkills\nPython SQL Docker\nProjects\n" * 30
+    garbled = english.replace("o", "(cid:3)")
+    assert score_text(english, RESUME) >= RESUME.threshold
+    assert score_text(garbled, RESUME) < RESUME.threshold
+    assert score_text(THAI_OK, RESUME) > score_text(THAI_BROKEN, RESUME) + 0.1
+    assert score_text("short", PROFILES["pdf_service"]) == 0.0  # below min_chars
+
+
+def test_early_exit_and_fallback():
+    data = make_resume_pdf(pages=2, columns=2)
+    result = run_cascade(data, "certificate", ["pypdf2", "pdfplumber_plain"])
+    assert result.early_exit and [a.strategy for a in result.attempts] == ["pypdf2"]
+
+    # seed a poor first step → cascade continues and the better candidate wins
+    seeded = new_result("resume")
+    seeded.attempts.append(Attempt("pdfplumber_layout", 1.0, {"column": 0.1}))
+    seeded.text, seeded.method, seeded.score, seeded.strategy = "(cid:1)" * 20, "column", 0.1, "pdfplumber_layout"
+    result = run_cascade(data, "resume", ["pypdf2"], result=seeded)
+    assert result.method == "pypdf2" and result.score >= RESUME.threshold
+    assert [a.strategy for a in result.attempts] == ["pdfplumber_layout", "pypdf2"]
+
+
+def test_order_follows_measured_cost():
+    cascade = ExtractionCascade()
+    assert cascade.order("pdf_service") == ["pypdf2", "pdfplumber_plain"]
+    slow = new_result("pdf_service")
+    slow.attempts.append(Attempt("pypdf2", 500.0, {"pypdf2": 0.9}))
+    slow.strategy = "pypdf2"
+    for _ in range(20):
+        cascade.record(slow, size_bytes=10 * 1024)  # 50 ms/KB — slower than the pdfplumber prior
+    assert cascade.order("pdf_service") == ["pdfplumber_plain", "pypdf2"]
+    assert cascade.order("resume")[0] == "pdfplumber_layout"  # layout pinned first
+    stats = cascade.stats()
+    assert stats["profiles"]["pdf_service"]["win_rate"]["pypdf2"] == 1.0
+    assert stats["strategies"]["pypdf2"]["runs"] == 20
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_scores_penalize_garbled_and_broken_thai()
+    test_early_exit_and_fallback()
+    test_order_follows_measured_cost()
+    print("✅ All extraction cascade tests passed")
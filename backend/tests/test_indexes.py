@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST INDEXES - ทดสอบ index ที่ประกาศไว้ข้าง query + ตรวจ explain()
+# =============================================================================
+"""
+ทดสอบ core/indexes.py:
+- collections ที่โค้ดใช้จริงมี index ประกาศไว้ และทุก query ที่ประกาศ
+  ใช้ index ได้ทั้ง filter (equality ก่อน) และ sort (ตามลำดับ key)
+- IndexManager สร้าง index เบื้องหลัง ข้าม index ที่ชนกับของเดิม, รัน backfill
+  ที่ประกาศไว้ (เช่น search token ของงานเดิม) และรายงาน plan ที่ยังเป็น COLLSCAN
+  (ทั้ง plan แบบ classic และ SBE)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo.errors import OperationFailure
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.indexes as indexes
+from core.indexes import IndexManager, IndexSpec, declared_indexes, load_declarations
+
+
+def test_declared_indexes_serve_their_queries():
+    load_declarations()
+    specs = declared_indexes()
+    names = {(s.collection, tuple(f for f, _ in s.keys)) for s in specs}
+    for expected in [
+        ("jobs", ("is_active", "created_at", "_id")),
+        ("jobs", ("company_id", "created_at", "_id")),
+        ("applications", ("job_id", "ai_score", "_id")),
+        ("applications", ("student_id", "submitted_at", "_id")),
+        ("resumes", ("user_id", "status", "uploaded_at")),
+        ("certificates", ("user_id", "uploaded_at")),
+        ("notifications", ("user_id", "created_at", "_id")),
+        ("cert_analysis_cache", ("bands",)),
+        ("cert_analysis_cache", ("simhash",)),
+        ("file_blobs", ("path",)),
+    ]:
+        assert expected in names, expected
+    assert "jobs.search_terms" in indexes.declared_backfills()
+
+    for spec in specs:
+        assert spec.query is not None, spec.name
+        equality = [f for f, v in spec.query.items() if not isinstance(v, dict)]
+        ranged = [f for f, v in spec.query.items() if isinstance(v, dict)]
+        fields = [f for f, _ in spec.keys]
+        assert set(fields[:len(equality)]) == set(equality), spec.name  # equality fields นำหน้า
+        rest = spec.keys[len(equality):]
+        if spec.sort:
+            flipped = [(f, -d) for f, d in spec.sort]
+            assert rest[:len(spec.sort)] in (spec.sort, flipped), spec.name  # index ให้ลำดับ sort ได้เลย
+        elif ranged:
+            assert fields[len(equality)] in ranged, spec.name
+
+
+class _Cursor:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def sort(self, keys):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def explain(self):
+        return self.plan
+
+
+class _Collection:
+    def __init__(self, plan, conflict=False):
+        self.plan, self.conflict, self.created = plan, conflict, []
+
+    async def create_index(self, keys, **options):
+        if self.conflict:
+            raise OperationFailure("Index already exists with a different name", code=85)
+        self.created.append(keys)
+
+    def find(self, query):
+        return _Cursor(self.plan)
+
+
+def test_manager_ensures_in_background_and_reports_collscan():
+    ixscan = {"queryPlanner": {"winningPlan": {"stage": "LIMIT", "inputStage": {
+        "stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}}
+    sbe_collscan = {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "SORT", "inputStage": {
+        "stage": "COLLSCAN"}}, "slotBasedPlan": {}}}}
+    db = {"a": _Collection(ixscan), "b": _Collection(sbe_collscan), "c": _Collection(ixscan, conflict=True)}
+    specs = [IndexSpec("a", [("x", 1)], {}, {"x": 1}, None),
+             IndexSpec("b", [("y", 1)], {}, {"y": 1}, [("z", -1)]),
+             IndexSpec("c", [("w", 1)], {}, {"w": 1}, None)]
+
+    backfilled = []
+
+    async def backfill(database):
+        backfilled.append(database)
+        return 3
+
+    async def broken(database):
+        raise RuntimeError("boom")
+
+    async def run():
+        manager = IndexManager(lambda: db)
+        declared, declared_backfills = indexes.declared_indexes, indexes.declared_backfills
+        indexes.declared_indexes = lambda: specs
+        indexes.declared_backfills = lambda: {"broken": broken, "jobs.search_terms": backfill}
+        try:
+            manager.start()
+            assert not manager.report  # start() ไม่รอให้สร้าง index เสร็จ
+            await manager._task
+        finally:
+            indexes.declared_indexes, indexes.declared_backfills = declared, declared_backfills
+        return manager.report
+
+    report = asyncio.run(run())
+    assert backfilled == [db]  # backfill ที่ล้มไม่หยุดตัวอื่น
+    assert db["a"].created == [[("x", 1)]] and db["b"].created == [[("y", 1)]] and db["c"].created == []
+    assert [(r["name"], r["collscan"]) for r in report] == [("a.x_1", False), ("b.y_1", True), ("c.w_1", False)]
+    assert report[1]["stages"] == ["SORT", "COLLSCAN"]
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_declared_indexes_serve_their_queries()
+    test_manager_ensures_in_background_and_reports_collscan()
+    print("✅ All index tests passed")
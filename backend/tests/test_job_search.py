@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST JOB SEARCH - ทดสอบ token index (ไทย bigram + ละติน) แทน $regex
+# =============================================================================
+"""
+ทดสอบ services/job_search.py:
+- substring ภาษาไทย / คำละติน (c++, node.js) ของงานใด ๆ ได้ token ที่อยู่ใน
+  search_terms ของงานนั้นเสมอ; รายการงาน/autocomplete จับคำสุดท้ายแบบ prefix
+  และอักษรไทยตัวเดียวเจอได้ทุกตำแหน่ง
+- GET /jobs?search= ใช้ aggregate บน search_terms ($all) เรียงตาม relevance
+  และไม่ส่ง token ออกไปใน response
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import Response
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routes.job import get_jobs
+from services.job_search import parse_query, search_fields, tokenize
+from tests.fakes import FakeDB
+
+JOB = {
+    "title": "นักพัฒนาซอฟต์แวร์ Backend",
+    "company_name": "ไทยเทคโซลูชั่น",
+    "department": "ฝ่ายไอที",
+    "skills_required": ["Python", "Node.js", "C++"],
+    "description": "พัฒนาและดูแลระบบ​ภายในองค์กร",  # มี ZWSP (มองไม่เห็น) คั่นคำ
+}
+
+
+def test_query_tokens_are_indexed_for_substrings():
+    terms = set(search_fields(JOB)["search_terms"])
+    for query in ["พัฒนา", "ซอฟต์แวร์", "ไอที", "ระบบภายใน", "BACKEND", "node.js", "node", "c++", "ไทยเทค python"]:
+        search = parse_query(query)
+        assert search.terms and set(search.terms) <= terms, query
+        assert search.prefix is None
+
+    assert tokenize("C# / .NET") == ["c#", "net"]
+    assert parse_query("  ?! ") is None
+
+    # autocomplete: token สุดท้ายที่ยังพิมพ์ไม่จบ → prefix (ยกเว้นไทย 2+ ตัวอักษร ซึ่ง bigram จับได้อยู่แล้ว)
+    assert parse_query("python back", prefix=True) == (["python"], "back")
+    assert parse_query("python ", prefix=True) == (["python"], None)
+    assert parse_query("นักพั", prefix=True).prefix is None
+    assert parse_query("data น", prefix=True) == (["data"], "น")
+    assert any(t.startswith("back") for t in terms)
+
+    # รายการงานค้นด้วย prefix=True: "java" ต้องเจอ javascript, "dev" เจอ developer (แบบ $regex เดิม)
+    listed = set(search_fields({"title": "Senior JavaScript Developer"})["search_terms"])
+    for query in ["java", "senior dev"]:
+        search = parse_query(query, prefix=True)
+        assert set(search.terms) <= listed and any(t.startswith(search.prefix) for t in listed), query
+    # อักษรไทยตัวเดียว (แม้เป็นตัวท้ายคำ เช่น "ี" ใน ไอที) → prefix ที่มี token ขึ้นต้นด้วยเสมอ
+    for char in set("".join(JOB["department"].split())):
+        assert parse_query(char) == ([], char) and any(t.startswith(char) for t in terms), char
+
+
+def test_get_jobs_search_uses_token_index_and_hides_tokens():
+    doc = {"_id": ObjectId(), **JOB, **search_fields(JOB), "is_active": True,
+           "created_at": datetime.now(timezone.utc), "relevance": 13}
+    db = FakeDB()
+    db.jobs.aggregate_result = [doc]
+
+    response = Response()
+    result = asyncio.run(get_jobs(response=response, skip=0, limit=20, search="python พัฒนา", cursor=None, db=db))
+
+    (pipeline,) = db.jobs.ops("aggregate")
+    assert [op for _, op, _ in db.calls] == ["aggregate"]  # ไม่ย้อนไปใช้ find()
+    assert [next(iter(s)) for s in pipeline] == ["$match", "$addFields", "$sort", "$skip", "$limit", "$project"]
+    match = pipeline[0]["$match"]["$and"]
+    assert match[0] == {"is_active": True}
+    assert match[1]["search_terms"]["$all"] == ["python", "พั", "ัฒ", "ฒน", "นา"]
+    assert "$regex" not in str(match)
+    assert list(pipeline[2]["$sort"]) == ["relevance", "created_at", "_id"]
+
+    assert [r["id"] for r in result] == [str(doc["_id"])]
+    assert "search_terms" not in result[0] and "search_fields" not in result[0]
+    assert "X-Next-Cursor" not in response.headers  # relevance order แบ่งหน้าด้วย skip
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_query_tokens_are_indexed_for_substrings()
+    test_get_jobs_search_uses_token_index_and_hides_tokens()
+    print("✅ All job search tests passed")
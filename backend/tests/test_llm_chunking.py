@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST LLM CHUNKING - ทดสอบ Chunked Extraction สำหรับ Resume ยาว
+# =============================================================================
+"""
+ทดสอบ LLMService chunked mode (ไม่ต้องใช้ Groq API จริง):
+- แบ่ง text ตาม section ได้ถูกต้อง
+- รวมผลลัพธ์ย่อย: dedupe skills/projects, เลือก education ที่ครบที่สุด,
+  experience_months รวมจาก duration ของงานทุก chunk (section ที่ถูกแบ่ง)
+- ส่ง chunk พร้อมกัน → latency ใกล้เคียง chunk ที่ช้าที่สุด
+- บาง chunk ล้มเหลว → ผลมี partial_reason → failure_type partial_extraction
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routes.resume import _diagnose_extraction
+from services.llm_service import LLMService
+
+
+LONG_RESUME = (
+    "Education\nBachelor of Science in Computer Science\nKMUTT GPA 3.45\n\n"
+    "Skills\nPython, React, Docker\n\n"
+    "Projects\n" + "Resume screening system built with FastAPI and React. " * 120 + "\n\n"
+    "Experience\nSoftware Intern at Tech Co (6 months)\n"
+)
+
+
+class _FakeCompletions:
+    """จำลอง client.chat.completions — ตอบ JSON ตาม section ที่อยู่ใน prompt"""
+
+    def __init__(self, delay: float = 0.2, fail_on: str = ""):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, messages, temperature, max_tokens):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        prompt = messages[-1]["content"]
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("rate limited")
+        part = {"skills": {"technical_skills": ["python"], "soft_skills": []}}
+        if "Bachelor of Science" in prompt:
+            part["education"] = {"major": "Computer Science", "gpa": 3.45, "university": "KMUTT", "level": "Bachelor"}
+        else:
+            part["education"] = {"major": "", "gpa": 0.0, "university": "", "level": ""}
+        if "Python, React" in prompt:
+            part["skills"]["technical_skills"] = ["Python", "React", "Docker"]
+        if "Resume screening system" in prompt:
+            part["projects"] = [{"name": "Resume Screening", "description": "", "technologies": ["FastAPI"]}]
+        if "Software Intern" in prompt:
+            part["experience_months"] = 6
+        content = json.dumps(part)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _make_service(delay: float = 0.2, fail_on: str = "") -> LLMService:
+    svc = LLMService()
+    svc.router = None
+    svc.client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(delay, fail_on)))
+    svc.chunk_threshold = 1000
+    svc.chunk_max_chars = 2000
+    svc.chunk_workers = 8
+    return svc
+
+
+def test_split_sections_covers_whole_text():
+    chunks = LLMService.split_sections(LONG_RESUME, 2000)
+    assert len(chunks) > 1
+    assert all(len(text) <= 2000 for _, text in chunks)
+    joined = "".join(text for _, text in chunks)
+    assert "Software Intern" in joined  # tail ของ resume ต้องไม่หาย
+
+
+def test_merge_partials_dedupes_and_keeps_best_education():
+    partials = [
+        {"education": {"major": "", "gpa": 0.0, "university": "KMUTT", "level": ""},
+         "skills": {"technical_skills": ["Python", "React"], "soft_skills": ["Teamwork"]},
+         "projects": [{"name": "Web App"}]},
+        {"education": {"major": "Computer Science", "gpa": 3.2, "university": "KMUTT", "level": "Bachelor"},
+         "skills": {"technical_skills": ["python", "Docker"], "soft_skills": ["teamwork"]},
+         "projects": [{"name": "web app "}, {"name": "Chatbot"}],
+         "experience_months": 6},
+    ]
+    merged = LLMService.merge_partials(partials)
+    assert merged["education"]["major"] == "Computer Science"
+    assert merged["skills"]["technical_skills"] == ["Python", "React", "Docker"]
+    assert merged["skills"]["soft_skills"] == ["Teamwork"]
+    assert [p["name"] for p in merged["projects"]] == ["Web App", "Chatbot"]
+    assert merged["experience_months"] == 6
+    assert "extraction_error" not in merged
+
+    # section ประสบการณ์ถูกแบ่ง 2 chunk: แต่ละ chunk เห็นแค่งานของตัวเอง → รวม duration (งานซ้ำนับครั้งเดียว)
+    intern = {"position": "Intern", "company": "Tech Co", "duration": "Jun 2023 - Oct 2023"}
+    dev = {"position": "Developer", "company": "ACME", "duration": "ม.ค. 2567 - มิ.ย. 2567"}
+    merged = LLMService.merge_partials([
+        {"experience_details": [intern], "experience_months": 5},
+        {"experience_details": [dict(intern), dev], "experience_months": 6},
+    ])
+    assert [e["company"] for e in merged["experience_details"]] == ["Tech Co", "ACME"]
+    assert merged["experience_months"] == 11
+
+
+def test_chunked_extraction_runs_concurrently():
+    svc = _make_service(delay=0.2)
+    start = time.perf_counter()
+    features = svc.extract_features(LONG_RESUME)
+    elapsed = time.perf_counter() - start
+
+    calls = svc.client.chat.completions.calls
+    assert calls > 1
+    # ถ้าเรียงทีละ chunk จะใช้ ~calls × 0.2s — แบบ concurrent ต้องใกล้ 1 chunk
+    assert elapsed < 0.2 * calls * 0.75
+    assert features["education"]["university"] == "KMUTT"
+    assert features["experience_months"] == 6
+    assert "Docker" in features["skills"]["technical_skills"]
+    assert "partial_reason" not in features
+
+
+def test_failed_chunks_mark_partial_result():
+    svc = _make_service(delay=0, fail_on="Software Intern")
+    features = svc.extract_features(LONG_RESUME)
+    assert features["education"]["university"] == "KMUTT"  # chunk ที่สำเร็จยังถูกรวม
+    assert features["experience_months"] == 0
+    assert features["partial_reason"].startswith("1/")
+    assert _diagnose_extraction(LONG_RESUME, features) == "partial_extraction"
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_split_sections_covers_whole_text()
+    test_merge_partials_dedupes_and_keeps_best_education()
+    test_chunked_extraction_runs_concurrently()
+    test_failed_chunks_mark_partial_result()
+    print("✅ All chunking tests passed")
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST LLM ROUTER - ทดสอบ Hedged / Multi-provider Routing
+# =============================================================================
+"""
+ทดสอบ LLMRouter กับ stand-in server (OpenAI-compatible) บนเครื่อง:
+- provider แรกช้า → ส่ง hedge ไป provider ถัดไป แล้วรับคำตอบแรกที่ valid
+- provider แรก error / ตอบ JSON เสีย → fail over ทันที
+- เก็บสถิติ latency / error rate ต่อ provider
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.llm_router import LLMProvider, LLMRouter, LLMRouterError
+from services.llm_service import LLMService
+
+
+MESSAGES = [{"role": "user", "content": "extract"}]
+
+
+def _start_stub(delay: float = 0.0, status: int = 200, content: str = '{"ok": true}'):
+    """เปิด stand-in server ที่ตอบ /chat/completions หลัง delay วินาที"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            time.sleep(delay)
+            body = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def _validate(raw: str) -> bool:
+    return LLMService._parse_json(raw) is not None
+
+
+def test_hedge_beats_slow_primary():
+    slow, slow_url = _start_stub(delay=1.5, content='{"from": "slow"}')
+    fast, fast_url = _start_stub(delay=0.05, content='{"from": "fast"}')
+    router = LLMRouter(
+        [LLMProvider("slow", slow_url, "m1", timeout=5), LLMProvider("fast", fast_url, "m2", timeout=5)],
+        hedge_delay=0.2, hedge_min=0.05,
+    )
+    try:
+        start = time.perf_counter()
+        content = router.complete(MESSAGES, validate=_validate)
+        elapsed = time.perf_counter() - start
+
+        assert json.loads(content) == {"from": "fast"}
+        assert elapsed < 1.0  # ไม่ต้องรอ provider ที่ช้า
+        stats = router.stats_snapshot()
+        assert stats["fast"]["hedged"] == 1
+        assert stats["fast"]["wins"] == 1
+    finally:
+        router.close()
+        slow.shutdown()
+        fast.shutdown()
+
+
+def test_failover_on_error_and_invalid_json():
+    broken, broken_url = _start_stub(status=500)
+    garbage, garbage_url = _start_stub(content="not json at all")
+    good, good_url = _start_stub(content='{"from": "good"}')
+    router = LLMRouter(
+        [LLMProvider("broken", broken_url, "m"), LLMProvider("garbage", garbage_url, "m"),
+         LLMProvider("good", good_url, "m")],
+        hedge_delay=5.0,  # ไม่ hedge — ต้อง fail over จาก error เท่านั้น
+    )
+    try:
+        start = time.perf_counter()
+        content = router.complete(MESSAGES, validate=_validate)
+        assert json.loads(content) == {"from": "good"}
+        assert time.perf_counter() - start < 2.0
+
+        stats = router.stats_snapshot()
+        assert stats["broken"]["errors"] == 1
+        assert stats["broken"]["error_rate"] == 1.0
+        assert stats["garbage"]["invalid"] == 1
+        assert stats["good"]["p95_ms"] is not None
+    finally:
+        router.close()
+        for server in (broken, garbage, good):
+            server.shutdown()
+
+
+def test_all_providers_fail():
+    broken, broken_url = _start_stub(status=503)
+    router = LLMRouter([LLMProvider("broken", broken_url, "m")])
+    try:
+        try:
+            router.complete(MESSAGES, validate=_validate)
+            assert False, "expected LLMRouterError"
+        except LLMRouterError:
+            pass
+    finally:
+        router.close()
+        broken.shutdown()
+
+
+def test_hedge_delay_tracks_p95():
+    router = LLMRouter([LLMProvider("a", "http://unused", "m")], hedge_delay=2.0,
+                       hedge_min=0.01, min_samples=10)
+    try:
+        assert router.hedge_delay_for(router.providers[0]) == 2.0  # ยังไม่มีข้อมูลพอ
+        for ms in range(1, 21):
+            router.stats["a"].record(ms / 1000, ok=True)
+        assert abs(router.hedge_delay_for(router.providers[0]) - 0.019) < 0.002
+    finally:
+        router.close()
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_hedge_beats_slow_primary()
+    test_failover_on_error_and_invalid_json()
+    test_all_providers_fail()
+    test_hedge_delay_tracks_p95()
+    print("✅ All router tests passed")
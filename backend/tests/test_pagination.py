@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST PAGINATION - ทดสอบ keyset (cursor) pagination
+# =============================================================================
+"""
+ทดสอบ core/pagination.py:
+- เดินทีละหน้าด้วย cursor ได้ครบทุกแถว ไม่ซ้ำ ไม่ขาด และลำดับเท่ากับ sort เต็ม
+  — ทั้ง desc/asc, คะแนนซ้ำ และค่า null/ไม่มี field (ประเมิน filter ด้วย tests/fakes.py)
+- cursor เก็บ datetime/ObjectId ได้ตรงชนิด; cursor เสีย/ต่าง sort → 400
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pagination import (
+    AI_SCORE_DESC, CREATED_DESC, decode_cursor, encode_cursor, keyset_page,
+)
+from tests.fakes import FakeCollection, FakeCursor
+
+
+def _walk(collection, sort, limit):
+    async def run():
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await keyset_page(collection, {"job_id": "j1"}, sort, limit, cursor=cursor)
+            seen.extend(page.items)
+            pages += 1
+            if not page.next_cursor:
+                return seen, pages
+            cursor = page.next_cursor
+    return asyncio.run(run())
+
+
+def test_walk_all_pages_with_ties_and_nulls():
+    docs = [{"_id": ObjectId(), "job_id": "j1", "ai_score": [0.9, 0.5, None, 0.5, 0.7][i % 5]}
+            for i in range(23)]
+    del docs[4]["ai_score"]  # missing = null
+    docs.append({"_id": ObjectId(), "job_id": "other", "ai_score": 1.0})
+    collection = FakeCollection(docs)
+
+    for sort in (AI_SCORE_DESC, [("ai_score", 1), ("_id", -1)]):
+        expected = FakeCursor([d for d in docs if d["job_id"] == "j1"]).sort(sort).docs
+        for limit in (1, 4, 7, 50):
+            seen, pages = _walk(collection, sort, limit)
+            assert [d["_id"] for d in seen] == [d["_id"] for d in expected], (sort, limit)
+            assert pages == max(1, -(-len(expected) // limit))
+
+
+def test_cursor_round_trip_and_rejection():
+    now = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    doc = {"_id": ObjectId(), "created_at": now - timedelta(days=1)}
+    cursor = encode_cursor(doc, CREATED_DESC)
+
+    created_at, _id = decode_cursor(cursor, CREATED_DESC)
+    assert _id == doc["_id"] and created_at.replace(tzinfo=timezone.utc) == doc["created_at"]
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor  # url-safe
+
+    for bad, sort in [(cursor, AI_SCORE_DESC), ("not-a-cursor", CREATED_DESC), (cursor[:-3], CREATED_DESC)]:
+        try:
+            decode_cursor(bad, sort)
+            assert False, "expected HTTPException"
+        except HTTPException as e:
+            assert e.status_code == 400
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_walk_all_pages_with_ties_and_nulls()
+    test_cursor_round_trip_and_rejection()
+    print("✅ All pagination tests passed")
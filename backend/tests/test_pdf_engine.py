@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST PDF ENGINE - ทดสอบ Single-open PDF Extraction
+# =============================================================================
+"""
+ทดสอบ services/pdf_engine.py กับ PDF สังเคราะห์ (scripts/synthetic_pdf.py):
+- เปิด pdfplumber แค่ครั้งเดียวต่อเอกสาร
+- column-aware อ่านคอลัมน์ซ้ายจบก่อนแล้วค่อยขวา
+- quality score คำนวณใน pass เดียวกัน; cascade (profile resume) เลือก column-aware
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import services.pdf_engine as pdf_engine
+from services.extraction_cascade import run_cascade
+from services.pdf_engine import extract_layouts, text_quality
+from synthetic_pdf import make_resume_pdf
+
+
+def test_single_open_both_layouts():
+    data = make_resume_pdf(pages=3, columns=2)
+    opens = []
+    real_open = pdf_engine.pdfplumber.open
+    pdf_engine.pdfplumber.open = lambda *a, **kw: opens.append(1) or real_open(*a, **kw)
+    try:
+        layouts = extract_layouts(data)
+    finally:
+        pdf_engine.pdfplumber.open = real_open
+
+    assert len(opens) == 1
+    assert layouts["pages"] == layouts["total_pages"] == 3
+    # plain อ่านข้ามคอลัมน์ ("Education Skills") / column-aware อ่านทีละคอลัมน์
+    assert layouts["plain"].startswith("Education Skills")
+    assert layouts["column"].startswith("Education\n")
+    assert layouts["quality"]["column"] > 0
+    assert run_cascade(data, "resume").as_tuple() == (layouts["column"], "column")
+
+
+def test_quality_penalizes_garbled_glyphs():
+    assert text_quality("(cid:12)(cid:34)") < 0 < text_quality("Python")
+    assert run_cascade(b"%PDF-1.4 broken", "resume").as_tuple() == ("", "failed")
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_single_open_both_layouts()
+    test_quality_penalizes_garbled_glyphs()
+    print("✅ All PDF engine tests passed")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST PDF LAYOUT - ทดสอบ NumPy column detection + reading order
+# =============================================================================
+"""
+ทดสอบ services/pdf_layout.py:
+- 2 columns แบ่งครึ่ง → ผลตรงกับ path เดิม (extract_words + column_layout)
+- 1 / 3 columns และ sidebar ไม่อยู่กลางหน้า → หา gutter ถูกตำแหน่ง,
+  อ่านทีละ column (ไม่ปนข้าม column)
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pdfplumber
+from pdfplumber.utils import extract_words
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from services.pdf_engine import COLUMN_WORD_KWARGS, column_layout
+from services.pdf_layout import chars_to_words, find_gutters, layout_text
+from synthetic_pdf import MARGIN, PAGE_WIDTH, make_resume_pdf
+
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+
+def _first_page(data: bytes):
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        page = pdf.pages[0]
+        return page.chars, page.width
+
+
+def _column_lines(data: bytes, x_from: float, x_to: float):
+    """บรรทัดของ column หนึ่งตามที่เขียนลง PDF (อ้างอิงจาก word box ของ pdfplumber)"""
+    chars, _ = _first_page(data)
+    words = [w for w in extract_words(chars, **COLUMN_WORD_KWARGS) if x_from <= w["x0"] < x_to]
+    lines = {}
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        lines.setdefault(round(w["top"]), []).append(w["text"])
+    return [" ".join(ws) for ws in lines.values()]
+
+
+def test_two_columns_match_previous_layout():
+    chars, width = _first_page(make_resume_pdf(pages=1, columns=2))
+    words, texts = chars_to_words(chars)
+    assert sorted(texts) == sorted(w["text"] for w in extract_words(chars, **COLUMN_WORD_KWARGS))
+    (gutter,) = find_gutters(words, width)
+    assert PAGE_WIDTH / 2 - 60 < gutter < PAGE_WIDTH / 2
+    assert layout_text(chars, width) == column_layout(extract_words(chars, **COLUMN_WORD_KWARGS), width)
+
+
+def test_one_three_columns_and_sidebars_read_column_by_column():
+    cases = [
+        ((1.0,), []),
+        ((1 / 3, 1 / 3, 1 / 3), [MARGIN + TEXT_WIDTH / 3, MARGIN + 2 * TEXT_WIDTH / 3]),
+        ((0.3, 0.7), [MARGIN + 0.3 * TEXT_WIDTH]),
+        ((0.7, 0.3), [MARGIN + 0.7 * TEXT_WIDTH]),
+    ]
+    for widths, starts in cases:
+        data = make_resume_pdf(pages=1, widths=widths)
+        chars, width = _first_page(data)
+        gutters = find_gutters(chars_to_words(chars)[0], width)
+        assert len(gutters) == len(starts), widths
+        # gutter อยู่ในช่องว่างก่อนจุดเริ่ม column ถัดไป
+        assert all(start - 60 < g < start for g, start in zip(gutters, starts)), (widths, gutters)
+
+        edges = [0] + [s - 1 for s in starts] + [PAGE_WIDTH]
+        expected = [_column_lines(data, a, b) for a, b in zip(edges[:-1], edges[1:])]
+        assert layout_text(chars, width) == "\n\n".join("\n".join(lines) for lines in expected)
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_two_columns_match_previous_layout()
+    test_one_three_columns_and_sidebars_read_column_by_column()
+    print("✅ All PDF layout tests passed")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST PDF POOL - ทดสอบ Process-pool PDF Extraction
+# =============================================================================
+"""
+ทดสอบ PDFExtractionPool:
+- ผลลัพธ์จาก worker process ตรงกับ run_cascade ที่รันใน process เดียวกัน
+- เอกสารที่เกิน timeout ถูกยกเลิก → pool ถูก recycle แล้วใช้งานต่อได้
+- page-parallel: ประกอบหน้ากลับตามลำดับ; resume ยาวได้ครบทุกหน้า (หน้าสุดท้ายถึง LLM)
+  ส่วน certificate / resume_max_chars หยุดเมื่อครบ budget
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from services.extraction_cascade import run_cascade
+from services.pdf_engine import extract_layouts
+from services.pdf_pool import PDFExtractionError, PDFExtractionPool
+from services.pdf_service import MAX_TEXT_LENGTH
+from synthetic_pdf import make_resume_pdf
+
+
+def test_pool_matches_inline_engine():
+    data = make_resume_pdf(pages=2, columns=2)
+    pool = PDFExtractionPool(workers=2)
+
+    async def run():
+        return await asyncio.gather(pool.extract(data), pool.extract(data, "certificate"))
+
+    try:
+        (resume_text, method), (cert_text, cert_method) = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert (resume_text, method) == run_cascade(data, "resume").as_tuple()
+    # certificate profile: cheapest strategy (PyPDF2) is good enough → early exit
+    assert (cert_text, cert_method) == run_cascade(data, "certificate").as_tuple()
+    assert cert_method == "pypdf2" and cert_text.startswith("Education")
+
+
+def test_timeout_recycles_pool():
+    pool = PDFExtractionPool(workers=1)
+
+    async def run():
+        try:
+            await pool.extract(make_resume_pdf(pages=12, columns=2), timeout_s=0.2)
+            assert False, "expected PDFExtractionError"
+        except PDFExtractionError as e:
+            assert e.kind == "timeout"
+        # pool ใหม่ต้องใช้งานได้ทันที
+        return await pool.extract(make_resume_pdf(pages=1, columns=1))
+
+    try:
+        text, method = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert method == "column" and text
+    stats = pool.stats()
+    assert (stats["timeouts"], stats["recycles"], stats["documents"]) == (1, 1, 1)
+
+
+def test_page_parallel_keeps_long_resumes_whole():
+    short_doc = make_resume_pdf(pages=3, columns=2)
+    long_doc = make_resume_pdf(pages=12, columns=1)   # ~52k chars — เกิน 15,000 ของ certificate
+    pool = PDFExtractionPool(workers=2, parallel_min_pages=2, pages_per_task=1)
+    capped = PDFExtractionPool(workers=2, parallel_min_pages=2, pages_per_task=1, resume_max_chars=MAX_TEXT_LENGTH)
+
+    async def run():
+        return (await pool.extract(short_doc), await pool.extract(long_doc),
+                await pool.extract(long_doc, "certificate"), await capped.extract(long_doc))
+
+    try:
+        short_result, (long_text, long_method), (cert_text, _), (capped_text, _) = asyncio.run(run())
+    finally:
+        pool.shutdown()
+        capped.shutdown()
+    assert short_result == run_cascade(short_doc, "resume").as_tuple()
+
+    # resume: ทุกหน้า ตามลำดับ — ท้าย resume ไม่หาย
+    full_text, full_method = run_cascade(long_doc, "resume").as_tuple()
+    assert (long_text, long_method) == (full_text, full_method)
+    assert extract_layouts(long_doc, pages=[11])["column"] in long_text
+    assert pool.stats()["page_parallel_documents"] == 2 and pool.stats()["pages_skipped_by_budget"] == 0
+
+    # certificate / resume ที่ตั้ง cap: หยุดที่ budget (เก็บส่วนต้นของเอกสาร)
+    assert MAX_TEXT_LENGTH <= len(cert_text) < len(full_text)
+    assert MAX_TEXT_LENGTH <= len(capped_text) < len(full_text) and full_text.startswith(capped_text)
+    assert capped.stats()["pages_skipped_by_budget"] > 0
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_pool_matches_inline_engine()
+    test_timeout_recycles_pool()
+    test_page_parallel_keeps_long_resumes_whole()
+    print("✅ All PDF pool tests passed")
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST REPROCESS RESUMES - ทดสอบ batch / checkpoint / rate limit ของ reprocess
+# =============================================================================
+"""
+ทดสอบ scripts/reprocess_resumes.py กับ fake db:
+- ทำทีละ batch: bulk_write ละครั้ง แล้วเลื่อน checkpoint; run ที่ถูกขัดจังหวะ
+  ทำต่อจาก last_id, settings ไม่ตรงกับ run เดิม → หยุด
+- run_batch: เขียน resume_texts ก่อน resumes, ย้าย extracted_text ออก ($unset)
+  นับ processed / failed / skipped; RateLimiter เว้นระยะการเรียก LLM
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from core.resume_store import RESUME_TEXT_COLLECTION
+from reprocess_resumes import CHECKPOINT_COLLECTION, RateLimiter, Reprocessor
+from tests.fakes import FakeDB
+
+TEXT = "มหาวิทยาลัยเกษตรศาสตร์ วิศวกรรมคอมพิวเตอร์ Python, React โครงงาน ระบบคัดกรองเรซูเม่ " * 2
+FEATURES = {"education": {"university": "KU"}, "skills": {"technical_skills": ["python"]}, "projects": [{"name": "x"}]}
+
+
+def _args(**overrides):
+    args = dict(mode="llm", status=None, failure_type=None, run_id="test", restart=False, batch_size=2,
+                concurrency=2, rate=0, limit=0, dry_run=False)
+    return argparse.Namespace(**{**args, **overrides})
+
+
+def _checkpoint(db):
+    return next(doc for doc in db[CHECKPOINT_COLLECTION].docs if doc["_id"] == "test")
+
+
+def _bulk_writes(db):
+    """(collection, [(_id, update), ...]) ของทุก bulk_write ตามลำดับ"""
+    return [(name, [(op._filter["_id"], op._doc) for op in ops]) for name, ops in db.ops("bulk_write")]
+
+
+class _LLM:
+    def __init__(self, fail_on=(), fallback=False):
+        self.fail_on, self.fallback, self.calls = set(fail_on), fallback, 0
+
+    def extract_features(self, text):
+        self.calls += 1
+        if text in self.fail_on:
+            raise RuntimeError("LLM down")
+        return {**FEATURES, "fallback_reason": "LLM down"} if self.fallback else dict(FEATURES)
+
+
+def _run(db, llm, **args):
+    reprocessor = Reprocessor(db, _args(**args))
+    reprocessor.llm = llm
+    asyncio.run(reprocessor.run())
+    return reprocessor
+
+
+def test_batches_checkpoint_and_resume():
+    ids = sorted(ObjectId() for _ in range(5))
+    db = FakeDB(resumes=[{"_id": i, "extracted_text": f"{TEXT} #{n}"} for n, i in enumerate(ids)])
+    failing = f"{TEXT} #3"
+
+    reprocessor = _run(db, _LLM(fail_on=[failing]))
+    writes = [ops for name, ops in _bulk_writes(db) if name == "resumes"]
+    assert [len(ops) for ops in writes] == [2, 1, 1]  # bulk_write ละ batch (#3 ล้ม → ไม่เขียน)
+    assert reprocessor.counts == {"processed": 4, "failed": 1, "skipped": 0}
+    checkpoint = _checkpoint(db)
+    assert checkpoint["last_id"] == ids[-1] and checkpoint["processed"] == 4 and checkpoint["finished_at"]
+    _, update = writes[0][0]
+    assert update["$set"]["status"] == "processed" and update["$set"]["reprocess_run"] == "test"
+
+    # run ที่ถูกขัดจังหวะหลัง batch แรก → ทำต่อจาก last_id เท่านั้น
+    db = FakeDB(resumes=[{"_id": i, "extracted_text": TEXT} for i in ids])
+    db[CHECKPOINT_COLLECTION].docs.append({
+        "_id": "test", "settings": {"mode": "llm", "status": None, "failure_type": None}, "last_id": ids[1],
+        "processed": 2, "failed": 0, "skipped": 0,
+    })
+    llm = _LLM()
+    _run(db, llm)
+    assert llm.calls == 3
+    assert [op_id for _, ops in _bulk_writes(db) for op_id, _ in ops] == ids[2:]
+    assert _checkpoint(db)["processed"] == 5
+
+    with pytest.raises(SystemExit):  # run id เดิมแต่ settings ต่างกัน
+        _run(db, _LLM(), failure_type=["ai_failed"])
+
+    # --restart เริ่มใหม่ได้; เลือกตาม failure_type — fallback ยังเป็น status=processed ไม่ใช่ ai_failed
+    fallback = db.resumes.docs[0]
+    fallback["failure_type"] = "ai_failed"
+    llm = _LLM(fallback=True)
+    _run(db, llm, failure_type=["ai_failed"], restart=True)
+    assert llm.calls == 1
+    assert (fallback["status"], fallback["failure_type"]) == ("processed", "ai_failed")
+
+
+def test_run_batch_writes_text_first_and_rate_limits():
+    docs = [{"_id": ObjectId()} for _ in range(4)]
+    results = iter([
+        {"status": "processed", "extracted_text": TEXT},
+        None,
+        {"status": "error", "failure_type": "pdf_too_complex"},
+        RuntimeError("boom"),
+    ])
+    db = FakeDB(resumes=docs)
+    reprocessor = Reprocessor(db, _args(mode="text"))
+
+    async def process(doc):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    reprocessor.process = process
+    counts = asyncio.run(reprocessor.run_batch(docs))
+    assert counts == {"processed": 1, "failed": 2, "skipped": 1}
+    (texts, text_ops), (resumes, resume_ops) = _bulk_writes(db)
+    assert (texts, resumes) == (RESUME_TEXT_COLLECTION, "resumes")  # text ก่อน resume
+    assert [op_id for op_id, _ in text_ops] == [docs[0]["_id"]]
+    (_, moved), (_, errored) = resume_ops
+    assert moved["$unset"] == {"extracted_text": ""} and moved["$set"]["text_length"] == len(TEXT)
+    assert "extracted_text" not in moved["$set"] and errored["$set"]["status"] == "error"
+
+    # 1,200 ครั้ง/นาที → ห่างกัน 50 ms; 0 = ไม่จำกัด
+    async def waits(limiter, n):
+        started = time.perf_counter()
+        await asyncio.gather(*(limiter.wait() for _ in range(n)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(waits(RateLimiter(1200), 4)) >= 0.14
+    assert asyncio.run(waits(RateLimiter(0), 50)) < 0.05
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_batches_checkpoint_and_resume()
+    test_run_batch_writes_text_first_and_rate_limits()
+    print("✅ All reprocess tests passed")
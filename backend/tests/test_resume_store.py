@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST RESUME STORE - ทดสอบการแยกข้อความ Resume + projected reads
+# =============================================================================
+"""
+ทดสอบ core/resume_store.py:
+- ข้อความถูกเก็บแบบบีบอัดใน resume_texts แล้วโหลดกลับได้ตรง;
+  resume เก่าที่ยังมี extracted_text inline ก็อ่านได้
+- การหา resume สำหรับ matching ส่ง projection (ไม่ดึง extracted_text)
+  และ fallback ไป resume processed ล่าสุดเมื่อไม่มีตัวที่ไม่มี error
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from bson import ObjectId
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.resume_store import (
+    MATCHING_PROJECTION, RESUME_TEXT_COLLECTION, delete_resume_texts,
+    find_latest_processed_resume, load_resume_text, save_resume_text,
+)
+from tests.fakes import FakeDB
+
+TEXT = "ประวัติการศึกษา\nมหาวิทยาลัยเกษตรศาสตร์\nSkills: Python, FastAPI, MongoDB\n" * 100
+
+
+def test_text_round_trip_and_legacy_inline():
+    db = FakeDB()
+    resume_id = ObjectId()
+
+    async def run():
+        length = await save_resume_text(db, str(resume_id), TEXT)
+        (stored,) = db[RESUME_TEXT_COLLECTION].docs
+        assert length == len(TEXT) and len(stored["data"]) < len(TEXT.encode("utf-8")) / 5
+        assert await load_resume_text(db, {"_id": resume_id, "text_length": length}) == TEXT
+        assert await load_resume_text(db, {"_id": ObjectId(), "extracted_text": "inline"}) == "inline"
+        await delete_resume_texts(db, [resume_id])
+        assert await load_resume_text(db, {"_id": resume_id}) == ""
+
+    asyncio.run(run())
+
+
+def test_matching_read_is_projected_with_fallback():
+    processed = {"_id": ObjectId(), "user_id": "u1", "status": "processed", "extracted_text": TEXT,
+                 "extracted_features": {"skills": {}, "extraction_error": "JSON parse failed"}}
+    db = FakeDB(resumes=[processed])
+
+    resume = asyncio.run(find_latest_processed_resume(db, "u1"))
+    assert resume["_id"] == processed["_id"]
+    assert len(db.resumes.ops("find_one")) == 2  # error-free query missed → any processed
+    assert set(resume) <= set(MATCHING_PROJECTION) | {"_id"} and "extracted_text" not in resume
+    assert "extracted_text" not in MATCHING_PROJECTION and MATCHING_PROJECTION["extracted_features"]
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_text_round_trip_and_legacy_inline()
+    test_matching_read_is_projected_with_fallback()
+    print("✅ All resume store tests passed")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST RULE EXTRACTOR - ทดสอบ Rule-based Fast Path
+# =============================================================================
+"""
+ทดสอบ RuleBasedExtractor (offline, ไม่ใช้ LLM):
+- ดึง skills / soft skills / มหาวิทยาลัย / สาขา / GPA / ประสบการณ์ จาก Resume ภาษาไทย
+- LLMService fallback เป็น rule-based เมื่อ LLM ใช้งานไม่ได้
+- LLM ล้มเหลวหลังอัปโหลด → profile fallback ยังเป็น processed และถูกส่งให้ matching
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import routes.resume as resume_routes
+from core.resume_store import find_latest_processed_resume
+from routes.resume import _diagnose_extraction, _finalize_llm_features
+from services.llm_service import LLMService
+from services.rule_extractor import get_rule_extractor
+from tests.fakes import FakeDB
+
+
+SAMPLE_RESUME_TH = """
+ประวัติการศึกษา
+ปริญญาตรี สาขาเทคโนโลยีสารสนเทศ
+มหาวิทยาลัยเทคโนโลยีราชมงคลธัญบุรี เกรดเฉลี่ย: 3.25 (2563 - 2567)
+
+ทักษะ
+Hard Skills: Python, JavaScript, React.js, Node.js, MySQL, Docker
+Soft Skills: ทักษะการสื่อสาร, ทักษะการแก้ไขปัญหา
+ภาษาอังกฤษ (ดี)
+
+ประสบการณ์
+ฝึกงาน บริษัท ABC มิ.ย. 2566 - ต.ค. 2566
+"""
+
+
+def test_rule_extractor_th():
+    features = get_rule_extractor().extract(SAMPLE_RESUME_TH)
+
+    edu = features["education"]
+    assert edu["major"] == "Information Technology"
+    assert edu["university"] == "Rajamangala University of Technology Thanyaburi"
+    assert edu["gpa"] == 3.25
+    assert edu["level"] == "Bachelor"
+
+    techs = features["skills"]["technical_skills"]
+    for skill in ("python", "javascript", "react", "node.js", "mysql", "docker"):
+        assert skill in techs
+    assert features["skills"]["soft_skills"] == ["Communication", "Problem-Solving"]
+    assert features["languages"] == ["English"]
+    # มิ.ย.–ต.ค. 2566 = 5 เดือน (ไม่นับช่วงปีการศึกษา)
+    assert features["experience_months"] == 5
+    assert features["extraction_source"] == "rule_based"
+
+
+def test_rule_extractor_is_fast():
+    extractor = get_rule_extractor()
+    text = SAMPLE_RESUME_TH * 50
+    start = time.perf_counter()
+    extractor.extract(text)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_llm_failure_falls_back_to_rules():
+    svc = LLMService()
+    svc.client = None  # จำลอง Groq ใช้งานไม่ได้
+    features = svc.extract_features(SAMPLE_RESUME_TH)
+    assert "extraction_error" not in features
+    assert features["fallback_reason"] == "Client not initialized"
+    assert "python" in features["skills"]["technical_skills"]
+    # ผล fallback ยังใช้ match ได้ แต่ failure_type = ai_failed (ให้ reprocess --failure-type ai_failed หาเจอ)
+    assert _diagnose_extraction(SAMPLE_RESUME_TH, features) == "ai_failed"
+
+
+def test_llm_failure_after_upload_keeps_fallback_for_matching():
+    def down(**kwargs):
+        raise RuntimeError("LLM down")
+
+    svc = LLMService()
+    svc.router = None
+    svc.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=down)))
+    resume_id = ObjectId()
+    db = FakeDB(resumes=[{
+        "_id": resume_id, "user_id": "s1", "status": "processed", "uploaded_at": datetime.now(timezone.utc),
+        "extracted_features": get_rule_extractor().extract(SAMPLE_RESUME_TH), "features_provisional": True,
+    }])
+
+    llm_service, resume_routes.llm_service = resume_routes.llm_service, svc
+    try:
+        asyncio.run(_finalize_llm_features(str(resume_id), SAMPLE_RESUME_TH, db))
+    finally:
+        resume_routes.llm_service = llm_service
+
+    (stored,) = db.resumes.docs
+    assert (stored["status"], stored["failure_type"]) == ("processed", "ai_failed")
+    assert stored["extracted_features"]["fallback_reason"] == "LLM down"
+    resume = asyncio.run(find_latest_processed_resume(db, "s1"))
+    assert resume["_id"] == resume_id
+    assert "python" in resume["extracted_features"]["skills"]["technical_skills"]
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_rule_extractor_th()
+    test_rule_extractor_is_fast()
+    test_llm_failure_falls_back_to_rules()
+    test_llm_failure_after_upload_keeps_fallback_for_matching()
+    print("✅ All rule extractor tests passed")
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST STREAMING UPLOADS - ทดสอบ core/uploads.py
+# =============================================================================
+"""
+ทดสอบ save_upload:
+- ไฟล์ถูกต้อง → rename เข้าที่, sha256 ตรง, ไม่มี temp file ค้าง
+- magic bytes ผิด → ปฏิเสธตั้งแต่ chunk แรก (ไม่อ่านส่วนที่เหลือ)
+- ไฟล์เกินขนาด → หยุดทันทีที่เกิน limit
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.uploads import IMAGE_KINDS, PDF_KINDS, UploadRejected, save_upload
+
+CHUNK = 1024
+
+
+class _CountingStream(io.BytesIO):
+    """BytesIO that records how many bytes the uploader pulled."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _upload(data: bytes, name: str):
+    stream = _CountingStream(data)
+    return UploadFile(file=stream, filename=name), stream
+
+
+def _save(upload, dest, max_size, kinds):
+    return asyncio.run(save_upload(upload, dest, max_size=max_size, allowed_kinds=kinds, chunk_size=CHUNK))
+
+
+def test_valid_pdf_is_stored_with_hash():
+    data = b"%PDF-1.4\n" + os.urandom(5 * CHUNK)
+    with tempfile.TemporaryDirectory() as tmp:
+        dest = os.path.join(tmp, "resumes", "a.pdf")
+        upload, _ = _upload(data, "a.pdf")
+        stored = _save(upload, dest, 10 * CHUNK, PDF_KINDS)
+
+        assert (stored.kind, stored.size) == ("pdf", len(data))
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert Path(dest).read_bytes() == data
+        assert os.listdir(os.path.dirname(dest)) == ["a.pdf"]
+
+
+def test_rejects_early_and_cleans_up():
+    with tempfile.TemporaryDirectory() as tmp:
+        # PNG bytes disguised as .pdf → rejected on the first chunk
+        upload, stream = _upload(b"\x89PNG\r\n\x1a\n" + bytes(20 * CHUNK), "fake.pdf")
+        try:
+            _save(upload, os.path.join(tmp, "fake.pdf"), 100 * CHUNK, PDF_KINDS)
+            assert False, "expected UploadRejected"
+        except UploadRejected as e:
+            assert e.reason == "bad_magic" and e.status_code == 400
+        assert stream.bytes_read == CHUNK
+
+        # Oversized image → stops right after crossing the limit
+        upload, stream = _upload(b"\xff\xd8\xff\xe0" + bytes(50 * CHUNK), "big.jpg")
+        try:
+            _save(upload, os.path.join(tmp, "big.jpg"), 3 * CHUNK, IMAGE_KINDS)
+            assert False, "expected UploadRejected"
+        except UploadRejected as e:
+            assert e.reason == "too_large"
+        assert stream.bytes_read == 4 * CHUNK
+
+        assert os.listdir(tmp) == []
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_valid_pdf_is_stored_with_hash()
+    test_rejects_early_and_cleans_up()
+    print("✅ All streaming upload tests passed")
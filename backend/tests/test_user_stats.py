@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# 🧪 TEST USER STATS - ทดสอบสถิติผู้ใช้ ($group เดียว + TTL cache)
+# =============================================================================
+"""
+ทดสอบ services/user_stats.py:
+- $group ตาม (user_type, is_active) ให้ตัวเลขเท่ากับ count_documents แบบเดิม
+  (is_active ที่ไม่มีค่า ไม่นับเป็น active หรือ inactive)
+- cache: หลาย request → aggregate ครั้งเดียว, invalidate → นับใหม่
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.user_stats import UserStatsCache, summarize_user_stats
+from tests.fakes import FakeDB
+
+USERS = (
+    [{"user_type": "Student", "is_active": True}] * 7
+    + [{"user_type": "Student", "is_active": False}] * 2
+    + [{"user_type": "HR", "is_active": True}] * 3
+    + [{"user_type": "Admin"}]
+    + [{"user_type": "Guest", "is_active": False}]
+)
+
+
+def _db(users):
+    """users.aggregate นับ (user_type, is_active) จากผู้ใช้ใน collection"""
+    db = FakeDB(users=users)
+
+    def group(pipeline):
+        counts = Counter((u.get("user_type"), u.get("is_active")) for u in db.users.docs)
+        return [{"_id": {"user_type": t, "is_active": a}, "n": n} for (t, a), n in counts.items()]
+
+    db.users.aggregate_result = group
+    return db
+
+
+def test_group_matches_count_documents():
+    rows = asyncio.run(_db(USERS).users.aggregate([]).to_list())
+    assert summarize_user_stats(rows) == {
+        "total_users": len(USERS),
+        "student_count": sum(u["user_type"] == "Student" for u in USERS),
+        "hr_count": 3,
+        "admin_count": 1,
+        "active_users": sum(u.get("is_active") is True for u in USERS),
+        "inactive_users": sum(u.get("is_active") is False for u in USERS),
+    }
+
+
+def test_cache_serves_until_invalidated():
+    db = _db(USERS)
+    cache = UserStatsCache(ttl=60)
+
+    async def run():
+        first = await asyncio.gather(*(cache.get(db) for _ in range(5)))
+        db.users.docs.append({"user_type": "HR", "is_active": True})
+        stale = await cache.get(db)
+        cache.invalidate()
+        fresh = await cache.get(db)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(run())
+    assert all(stats == first[0] for stats in first)
+    assert stale["hr_count"] == 3 and fresh["hr_count"] == 4
+    assert len(db.users.ops("aggregate")) == 2  # 5 concurrent loads + 1 cached → 1, invalidate → 1
+
+    expired = UserStatsCache(ttl=0)
+    asyncio.run(expired.get(db))
+    asyncio.run(expired.get(db))
+    assert len(db.users.ops("aggregate")) == 4
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    test_group_matches_count_documents()
+    test_cache_serves_until_invalidated()
+    print("✅ All user stats tests passed")
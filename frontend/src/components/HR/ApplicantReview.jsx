@@ -113,6 +113,7 @@ const ApplicantReview = () => {
     const [modal, setModal] = useState(null);
     const [reason, setReason] = useState('');
     const [expandedId, setExpandedId] = useState(null);
+    const [details, setDetails] = useState({});
     const [scheduleModal, setScheduleModal] = useState(null);
     const [rescheduleModal, setRescheduleModal] = useState(null);
     const [interviewData, setInterviewData] = useState({
@@ -132,6 +133,7 @@ const ApplicantReview = () => {
             if (result.success) {
                 setJobInfo(result.data.job || {});
                 setApplicants(result.data.applicants || []);
+                setDetails({});
             } else {
                 showToast(result.error || 'โหลดข้อมูลผิดพลาด', 'error');
             }
@@ -148,6 +150,16 @@ const ApplicantReview = () => {
         loadApplicants();
     }, [isAuthenticated, user, navigate, loadApplicants]);
 
+    // รายการได้ข้อมูลย่อ — โหลดใบสมัครฉบับเต็ม (resume_data, cert analyses) ของแถวที่กางอยู่
+    useEffect(() => {
+        if (typeof expandedId !== 'string' || details[expandedId]) return;
+        let cancelled = false;
+        jobService.getApplication(expandedId).then(result => {
+            if (!cancelled && result.success) setDetails(prev => ({ ...prev, [expandedId]: result.data }));
+        });
+        return () => { cancelled = true; };
+    }, [expandedId, details]);
+
     const openModal = (applicant, action) => { setModal({ applicant, action }); setReason(''); };
 
     const handleDecision = async () => {
@@ -342,7 +354,8 @@ const ApplicantReview = () => {
                 {/* Applicant List */}
                 {filteredApplicants.length > 0 ? (
                     <div className="space-y-4">
-                        {filteredApplicants.map((app, index) => {
+                        {filteredApplicants.map((row, index) => {
+                            const app = details[row.id] ? { ...row, ...details[row.id] } : row;
                             const isPending = !app.status || app.status === 'pending';
                             const isExpanded = expandedId === (app.id || index);
                             const skills = app.resume_data?.skills?.technical_skills || app.resume_data?.skills || [];
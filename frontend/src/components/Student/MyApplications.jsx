@@ -151,6 +151,7 @@ const MyApplications = () => {
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState('all');
     const [expandedId, setExpandedId] = useState(null);
+    const [details, setDetails] = useState({});
     const [rescheduleData, setRescheduleData] = useState({ reason: '', preferred_date: '' });
     const [showRescheduleForm, setShowRescheduleForm] = useState(null);
 
@@ -188,7 +189,10 @@ const MyApplications = () => {
         try {
             setLoading(true);
             const result = await jobService.getMyApplications();
-            if (result.success) setApplications(Array.isArray(result.data) ? result.data : []);
+            if (result.success) {
+                setApplications(Array.isArray(result.data) ? result.data : []);
+                setDetails({});
+            }
         } catch (error) {
             console.error('Error loading applications:', error);
         } finally {
@@ -201,6 +205,16 @@ const MyApplications = () => {
         loadApplications();
     }, [isAuthenticated, navigate, loadApplications]);
 
+    // รายการได้ข้อมูลย่อ — โหลดใบสมัครฉบับเต็ม (status_history, resume_data) ของแถวที่กางอยู่
+    useEffect(() => {
+        if (typeof expandedId !== 'string' || details[expandedId]) return;
+        let cancelled = false;
+        jobService.getApplication(expandedId).then(result => {
+            if (!cancelled && result.success) setDetails(prev => ({ ...prev, [expandedId]: result.data }));
+        });
+        return () => { cancelled = true; };
+    }, [expandedId, details]);
+
     const filteredApps = filter === 'all' ? applications : applications.filter((app) => app.status === filter);
     const statusCounts = applications.reduce((acc, app) => { acc[app.status] = (acc[app.status] || 0) + 1; return acc; }, {});
 
@@ -268,7 +282,8 @@ const MyApplications = () => {
                 {/* Application Cards */}
                 <div className="space-y-4">
                     {filteredApps.length > 0 ? (
-                        filteredApps.map((app, index) => {
+                        filteredApps.map((row, index) => {
+                            const app = details[row.id] ? { ...row, ...details[row.id] } : row;
                             const status = STATUS_MAP[app.status] || STATUS_MAP.pending;
                             const Icon = iconMap[status.icon] || ClockIcon;
                             const isExpanded = expandedId === (app.id || app._id);
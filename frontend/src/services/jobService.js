@@ -346,6 +346,26 @@ class JobService {
     }
   }
 
+  // ✅ ใบสมัครฉบับเต็ม (resume_data, status_history) — รายการส่งมาแค่ข้อมูลย่อ
+  async getApplication(appId) {
+    try {
+      const response = await fetch(`${this.baseURL}/api/jobs/applications/${appId}`, {
+        method: 'GET',
+        headers: this.getAuthHeaders()
+      });
+
+      if (!response.ok) {
+        const err = await response.json();
+        throw new Error(err.detail || 'Failed to fetch application');
+      }
+
+      const data = await response.json();
+      return { success: true, data: data };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  }
+
   // ✅ ดูผู้สมัครของตำแหน่งงาน (HR/Admin only)
   async getApplicants(jobId) {
     try {